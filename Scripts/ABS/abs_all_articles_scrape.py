@@ -8,6 +8,7 @@ import requests
 from bs4 import BeautifulSoup
 import json
 import os
+import sys
 import time
 import random
 import logging
@@ -23,16 +24,22 @@ import urllib3
 from typing import Dict, List, Optional, Set
 from dataclasses import dataclass, asdict
 
+# Shared helpers live in Scripts/common
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.async_http import fetch_all
+
 # Excel processing imports
-try:
-    import pandas as pd
-    import openpyxl
-    EXCEL_AVAILABLE = True
-except ImportError:
-    EXCEL_AVAILABLE = False
-    print("WARNING: pandas/openpyxl not found. Excel extraction will be disabled.")
+from common.tabular import TabularExtractor
+EXCEL_AVAILABLE = TabularExtractor.is_available()
+if not EXCEL_AVAILABLE:
+    print("WARNING: pandas not found. Excel extraction will be disabled.")
     print("Run: pip install pandas openpyxl")
 
+# Concurrent article detail fetches against abs.gov.au
+DETAIL_CONCURRENCY = 4
+DETAIL_MIN_INTERVAL = 0.5  # seconds between request starts
+
 # Suppress SSL warnings
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -88,6 +95,9 @@ class EnhancedABSArticlesScraper:
         # Track processed files to avoid duplicates within same run
         self.processed_files: Set[str] = set()
         
+        # Excel/CSV summaries, cached by file hash across runs
+        self.tabular = TabularExtractor(cache_dir=self.data_dir / "tabular_cache", logger=self.logger)
+        
         # Statistics
         self.stats = {
             'pages_processed': 0,
@@ -348,51 +358,18 @@ class EnhancedABSArticlesScraper:
             if not response:
                 return ""
             
-            file_extension = os.path.splitext(urlparse(excel_url).path)[1].lower()
+            file_name = os.path.basename(urlparse(excel_url).path) or 'attachment.xlsx'
             
             try:
-                if file_extension == '.csv':
-                    # Try different encodings for CSV
-                    for encoding in ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']:
-                        try:
-                            df = pd.read_csv(BytesIO(response.content), encoding=encoding)
-                            break
-                        except UnicodeDecodeError:
-                            continue
-                    else:
-                        self.logger.error(f"Could not decode CSV with any encoding: {excel_url}")
-                        return ""
-                    
-                    content = self.process_dataframe_for_llm(df, "CSV Data")
-                    if content:
-                        self.processed_files.add(excel_hash)
-                        self.stats['excel_files_processed'] += 1
-                        return content
-                        
-                else:
-                    # Handle Excel files
-                    try:
-                        excel_file = pd.ExcelFile(BytesIO(response.content), engine='openpyxl')
-                    except Exception as e:
-                        self.logger.error(f"Error reading Excel file {excel_url}: {e}")
-                        return ""
-                    
-                    # Process all sheets
-                    all_sheets_content = []
-                    for sheet_name in excel_file.sheet_names:
-                        try:
-                            df = pd.read_excel(excel_file, sheet_name=sheet_name)
-                            sheet_content = self.process_dataframe_for_llm(df, sheet_name)
-                            if sheet_content:
-                                all_sheets_content.append(sheet_content)
-                        except Exception as e:
-                            self.logger.warning(f"Error processing sheet '{sheet_name}': {e}")
-                    
-                    if all_sheets_content:
-                        full_content = '\n\n'.join(all_sheets_content)
-                        self.processed_files.add(excel_hash)
-                        self.stats['excel_files_processed'] += 1
-                        return full_content
+                # Streaming read of every sheet, summarized in one pass per chunk.
+                # CSV encoding and delimiter are sniffed from a prefix and parsed once.
+                content = self.tabular.extract_text(response.content, file_name)
+                
+                content = self.clean_text_for_llm(content)
+                if content:
+                    self.processed_files.add(excel_hash)
+                    self.stats['excel_files_processed'] += 1
+                    return content
                 
             except Exception as e:
                 self.logger.error(f"Error processing Excel file {excel_url}: {e}")
@@ -402,73 +379,6 @@ class EnhancedABSArticlesScraper:
         
         return ""
     
-    def process_dataframe_for_llm(self, df: pd.DataFrame, sheet_name: str) -> str:
-        """Process DataFrame into LLM-friendly format with no limits"""
-        try:
-            if df.empty:
-                return ""
-            
-            content_parts = [f"DATA SHEET: {sheet_name}"]
-            
-            # Basic info
-            content_parts.append(f"Dimensions: {df.shape[0]} rows × {df.shape[1]} columns")
-            
-            # All column names
-            col_names = list(df.columns.astype(str))
-            content_parts.append(f"Columns: {', '.join(col_names)}")
-            
-            # Data types summary
-            try:
-                numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
-                if numeric_cols:
-                    content_parts.append(f"Numeric columns: {', '.join(numeric_cols)}")
-                    
-                text_cols = df.select_dtypes(include=['object']).columns.tolist()
-                if text_cols:
-                    content_parts.append(f"Text columns: {', '.join(text_cols)}")
-                    
-                date_cols = df.select_dtypes(include=['datetime']).columns.tolist()
-                if date_cols:
-                    content_parts.append(f"Date columns: {', '.join(date_cols)}")
-            except Exception:
-                pass
-            
-            # Full sample data (first 10 rows instead of 3)
-            try:
-                sample_df = df.head(10)
-                content_parts.append("Sample data (first 10 rows):")
-                sample_str = sample_df.to_string(index=False)
-                content_parts.append(sample_str)
-            except Exception as e:
-                self.logger.warning(f"Error displaying sample data: {e}")
-            
-            # Complete summary statistics for all numeric columns
-            try:
-                if numeric_cols and len(df) > 0:
-                    stats_df = df[numeric_cols].describe()
-                    content_parts.append("Complete summary statistics for numeric columns:")
-                    content_parts.append(stats_df.to_string())
-            except Exception as e:
-                self.logger.warning(f"Error generating statistics: {e}")
-            
-            # Value counts for categorical columns (top 10 values per column)
-            try:
-                categorical_cols = df.select_dtypes(include=['object']).columns
-                for col in categorical_cols:
-                    if df[col].nunique() <= 50:  # Only for columns with reasonable number of unique values
-                        value_counts = df[col].value_counts().head(10)
-                        if not value_counts.empty:
-                            content_parts.append(f"Top values in '{col}':")
-                            content_parts.append(value_counts.to_string())
-            except Exception as e:
-                self.logger.warning(f"Error generating value counts: {e}")
-            
-            return self.clean_text_for_llm('\n'.join(content_parts))
-            
-        except Exception as e:
-            self.logger.warning(f"Error processing DataFrame: {e}")
-            return ""
-    
     def extract_embedded_links(self, soup: BeautifulSoup, current_url: str) -> List[Dict]:
         """Extract embedded links from article content with strict filtering"""
         embedded_links = []
@@ -739,8 +649,8 @@ class EnhancedABSArticlesScraper:
         
         return '\n\n'.join(chart_table_info) if chart_table_info else ""
     
-    def extract_article_content(self, article_link: Dict) -> Optional[Article]:
-        """Extract comprehensive content from individual article page"""
+    def extract_article_content(self, article_link: Dict, response=None) -> Optional[Article]:
+        """Extract comprehensive content from individual article page (optionally prefetched)"""
         url = article_link.get('url', '')
         headline = article_link.get('headline', '')
         
@@ -749,7 +659,8 @@ class EnhancedABSArticlesScraper:
         
         self.logger.info(f"Extracting: {headline[:60]}...")
         
-        response = self.safe_request(url)
+        if response is None:
+            response = self.safe_request(url)
         if not response:
             return None
         
@@ -1021,10 +932,23 @@ class EnhancedABSArticlesScraper:
             
             consecutive_empty_pages = 0  # Reset counter
             
+            # Fetch this page's article details concurrently; parsing stays sequential
+            responses = fetch_all(
+                [link.get('url', '') for link in article_links],
+                session=self.session,
+                per_host_limit=DETAIL_CONCURRENCY,
+                min_interval=DETAIL_MIN_INTERVAL,
+                verify=False,
+                logger=self.logger,
+            )
+            
             # Process each article
-            for i, article_link in enumerate(article_links, 1):
+            for i, (article_link, prefetched) in enumerate(zip(article_links, responses), 1):
                 try:
-                    article = self.extract_article_content(article_link)
+                    # Falls back to a sequential request if the concurrent fetch failed
+                    article = self.extract_article_content(
+                        article_link, response=prefetched if prefetched.ok else None
+                    )
                     if article:
                         all_new_articles.append(article)
                         self.existing_urls.add(article.url)
@@ -1034,9 +958,6 @@ class EnhancedABSArticlesScraper:
                         if len(all_new_articles) % 10 == 0:
                             self.logger.info(f"Progress checkpoint: {len(all_new_articles)} articles scraped")
                     
-                    # Random delay between articles
-                    time.sleep(random.uniform(2, 5))
-                    
                 except Exception as e:
                     self.logger.error(f"Error processing article {i}: {e}")
                     continue
@@ -1,9 +1,9 @@
 import os
-import json
 import time
 import logging
 import sys
 import re
+import signal
 from datetime import datetime
 from bs4 import BeautifulSoup
 import requests
@@ -14,6 +14,10 @@ import urllib3
 from pathlib import Path
 import io
 
+# Shared helpers live in Scripts/common
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.append_log import AppendLog
+
 # Suppress urllib3 warnings
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -25,6 +29,7 @@ NEWS_CENTRE_URL = f"{BASE_URL}/news-centre"
 SCRIPT_DIR = Path(__file__).parent
 DATA_FOLDER = SCRIPT_DIR / "data"
 OUTPUT_JSON = DATA_FOLDER / "accc_news_complete.json"
+JOURNAL_FILE = DATA_FOLDER / "journal" / "accc_news_complete.jsonl"  # run log, compacted into OUTPUT_JSON
 LOG_FILE = SCRIPT_DIR / "accc_scraper_production.log"
 
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
@@ -37,7 +42,6 @@ RATE_LIMIT_DELAY = 1.5  # Slightly slower for production
 
 # PRODUCTION CONFIGURATION
 MAX_PAGES = 2  # For 398 pages + buffer
-SAVE_INTERVAL = 20  # Save progress every 20 pages
 
 # Content extraction settings
 MIN_CONTENT_LENGTH = 100
@@ -59,6 +63,18 @@ class ACCCScraperProduction:
         self.total_excel_processed = 0
         self.start_time = time.time()
 
+        # Articles are appended to the run log during the run and compacted
+        # into OUTPUT_JSON once at the end; a log left by a crashed run is
+        # merged back in here
+        self.journal = AppendLog(JOURNAL_FILE, logger=self.logger)
+        for article in self.journal.recover():
+            if article.get('url') and article['url'] not in self.processed_urls:
+                self.all_articles.append(article)
+                self.processed_urls.add(article['url'])
+        self.logged_count = len(self.all_articles)
+        self.saved_on_shutdown = False
+        self.setup_signal_handlers()
+
     def setup_logging(self):
         """Setup production logging"""
         self.logger = logging.getLogger("accc_scraper_production")
@@ -81,6 +97,16 @@ class ACCCScraperProduction:
             ch.setFormatter(formatter)
             self.logger.addHandler(ch)
 
+    def setup_signal_handlers(self):
+        """Compact the run log into OUTPUT_JSON when the orchestrator's timeout sends SIGTERM"""
+        def signal_handler(signum, frame):
+            self.logger.info(f"Shutdown signal {signum} received, saving {len(self.all_articles)} articles and stopping...")
+            self.save_data(force_save=True)
+            self.saved_on_shutdown = True
+            sys.exit(128 + signum)
+        
+        signal.signal(signal.SIGTERM, signal_handler)
+
     def setup_session(self):
         """Configure session for production scraping"""
         try:
@@ -122,12 +148,16 @@ class ACCCScraperProduction:
             raise
 
     def save_data(self, force_save=False):
-        """Save data to single JSON file - NO STATS"""
+        """Append new articles to the run log; on force_save compact into the single JSON file - NO STATS"""
         try:
             if not self.all_articles and not force_save:
                 self.logger.warning("No data to save")
                 return
             
+            if not force_save:
+                self.log_new_articles()
+                return
+            
             # Sort by scraped_date (newest first)
             try:
                 self.all_articles.sort(key=lambda x: x.get('scraped_date', ''), reverse=True)
@@ -144,8 +174,9 @@ class ACCCScraperProduction:
                 "articles": self.all_articles
             }
             
-            with open(OUTPUT_JSON, 'w', encoding='utf-8') as f:
-                json.dump(output_data, f, indent=2, ensure_ascii=False)
+            # Atomic swap; the run log is dropped only once the file is in place
+            self.journal.compact(OUTPUT_JSON, output_data, indent=2)
+            self.logged_count = len(self.all_articles)
             
             self.logger.info(f"Saved {len(self.all_articles)} articles")
             
@@ -153,6 +184,13 @@ class ACCCScraperProduction:
             self.logger.error(f"Error saving data: {e}")
             raise
 
+    def log_new_articles(self):
+        """Append articles scraped since the last call to the run log (fsynced), for crash recovery"""
+        new_articles = self.all_articles[self.logged_count:]
+        if self.journal.append(new_articles):
+            self.logged_count = len(self.all_articles)
+            self.logger.info(f"Logged {len(new_articles)} new articles ({len(self.all_articles)} this run)")
+
     def get_page(self, url, binary=False):
         """Fetch page with robust error handling"""
         for attempt in range(MAX_RETRIES + 1):
@@ -824,6 +862,7 @@ class ACCCScraperProduction:
                     if article_data:
                         self.all_articles.append(article_data)
                         self.processed_urls.add(url)
+                        self.log_new_articles()
                         articles_scraped_this_page += 1
                         self.total_scraped += 1
                         
@@ -849,12 +888,6 @@ class ACCCScraperProduction:
                 
                 print(f"Page {page + 1} complete: {articles_scraped_this_page} articles scraped")
                 
-                # Save progress periodically
-                if (page + 1) % SAVE_INTERVAL == 0:
-                    print(f"Saving progress after page {page + 1}...")
-                    self.save_data()
-                    print(f"Saved {len(self.all_articles)} articles so far")
-                
                 page += 1
                 
         except KeyboardInterrupt:
@@ -938,9 +971,10 @@ class ACCCScraperProduction:
             sys.exit(1)
         finally:
             try:
-                print(f"\nSaving final data...")
-                self.save_data(force_save=True)
-                print(f"Final data saved: {len(self.all_articles)} articles")
+                if not self.saved_on_shutdown:
+                    print(f"\nSaving final data...")
+                    self.save_data(force_save=True)
+                    print(f"Final data saved: {len(self.all_articles)} articles")
                 
                 self.print_final_summary()
                 
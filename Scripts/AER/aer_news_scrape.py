@@ -8,6 +8,7 @@ and related resources with proper categorization and error handling.
 
 import json
 import os
+import sys
 import time
 import logging
 import re
@@ -28,6 +29,10 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
 
+# Shared helpers live in Scripts/common
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.append_log import AppendLog
+
 # File processing imports
 try:
     import PyPDF2
@@ -73,6 +78,11 @@ class EnhancedAERNewsScraper:
         self.driver = None
         self.session = requests.Session()
         self.existing_articles = self.load_existing_data()
+        # New articles go to a run log as they are scraped; JSON_FILE is rewritten
+        # once at the end. Anything logged by a crashed run is merged back in.
+        self.journal = AppendLog(os.path.join(self.DATA_DIR, "journal", "aer_news.jsonl"), logger=self.logger)
+        for article in self.journal.recover():
+            self.existing_articles[article['url']] = article
         self.processed_files: Set[str] = set()
         self.session_retry_count = 0
         self.max_session_retries = 3
@@ -614,12 +624,11 @@ class EnhancedAERNewsScraper:
             return None
 
     def save_results(self):
-        """Save results to single JSON file"""
+        """Compact the run log into the single JSON file (atomic swap)"""
         try:
             all_articles = list(self.existing_articles.values())
             
-            with open(self.JSON_FILE, 'w', encoding='utf-8') as f:
-                json.dump(all_articles, f, indent=2, ensure_ascii=False, sort_keys=True)
+            self.journal.compact(self.JSON_FILE, all_articles, indent=2, sort_keys=True)
             
             # Generate summary for console
             stats = {'total_articles': len(all_articles), 'by_type': {}}
@@ -631,7 +640,7 @@ class EnhancedAERNewsScraper:
             self.logger.info(f"Types: {dict(stats['by_type'])}")
             
         except Exception as e:
-            self.logger.error(f"Error saving results: {e}")
+            self.logger.error(f"Error saving results (run log kept for the next run): {e}")
 
     def handle_session_recovery(self) -> bool:
         """Handle session recovery when driver fails"""
@@ -682,13 +691,10 @@ class EnhancedAERNewsScraper:
                             article = self.parse_article(article_info)
                             if article:
                                 self.existing_articles[url] = article
+                                self.journal.append([article], sort_keys=True)
                                 new_articles_count += 1
                         except Exception as article_error:
                             self.logger.error(f"Error processing article {url}: {article_error}")
-                        
-                        # Save progress periodically
-                        if new_articles_count > 0 and new_articles_count % 25 == 0:
-                            self.save_results()
 
                         time.sleep(random.uniform(1, 3))
                     
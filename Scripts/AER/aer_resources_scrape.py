@@ -8,6 +8,7 @@ and related resources with proper categorization and error handling.
 
 import json
 import os
+import sys
 import time
 import logging
 import re
@@ -28,6 +29,10 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
 
+# Shared helpers live in Scripts/common
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.append_log import AppendLog
+
 # File processing imports
 try:
     import PyPDF2
@@ -72,6 +77,11 @@ class EnhancedAERNewsScraper:
         self.driver = None
         self.session = requests.Session()
         self.existing_articles = self.load_existing_data()
+        # New articles go to a run log as they are scraped; JSON_FILE is rewritten
+        # once at the end. Anything logged by a crashed run is merged back in.
+        self.journal = AppendLog(os.path.join(self.DATA_DIR, "journal", "aer_resources.jsonl"), logger=self.logger)
+        for article in self.journal.recover():
+            self.existing_articles[article['url']] = article
         self.processed_files: Set[str] = set()
         self.session_retry_count = 0
         self.max_session_retries = 3
@@ -873,22 +883,13 @@ class EnhancedAERNewsScraper:
             return None
 
     def save_results(self):
-        """Save results with enhanced error handling - single JSON file output only"""
+        """Compact the run log into the single JSON file output"""
         try:
             all_articles = list(self.existing_articles.values())
             
-            # Create temporary backup in memory only - no backup files
-            temp_backup_data = None
-            if os.path.exists(self.JSON_FILE):
-                try:
-                    with open(self.JSON_FILE, 'r', encoding='utf-8') as f:
-                        temp_backup_data = f.read()
-                except Exception as e:
-                    self.logger.warning(f"Failed to create temporary backup: {e}")
-            
-            # Save with pretty formatting - single file only
-            with open(self.JSON_FILE, 'w', encoding='utf-8') as f:
-                json.dump(all_articles, f, indent=2, ensure_ascii=False, sort_keys=True)
+            # Written to a temp file and swapped in, so a failed save leaves the
+            # previous file untouched and the run log in place for recovery
+            self.journal.compact(self.JSON_FILE, all_articles, indent=2, sort_keys=True)
             
             # Generate summary statistics for console output only
             stats = {
@@ -922,15 +923,7 @@ class EnhancedAERNewsScraper:
             self.logger.info(f"Sectors: {dict(stats['by_sector'])}")
             
         except Exception as e:
-            self.logger.error(f"Error saving results: {e}")
-            # Try to restore from memory backup if save failed
-            if temp_backup_data:
-                try:
-                    with open(self.JSON_FILE, 'w', encoding='utf-8') as f:
-                        f.write(temp_backup_data)
-                    self.logger.info("Restored from temporary backup after save error")
-                except:
-                    self.logger.error("Failed to restore from temporary backup")
+            self.logger.error(f"Error saving results (run log kept for the next run): {e}")
 
     def handle_session_recovery(self) -> bool:
         """Handle session recovery when driver fails"""
@@ -988,6 +981,7 @@ class EnhancedAERNewsScraper:
                             article = self.parse_article(article_info)
                             if article:
                                 self.existing_articles[url] = article
+                                self.journal.append([article], sort_keys=True)
                                 new_articles_count += 1
                                 self.logger.info(f"Successfully scraped article {new_articles_count}: {article['headline'][:50]}...")
                             else:
@@ -1000,11 +994,6 @@ class EnhancedAERNewsScraper:
                                 if not self.handle_session_recovery():
                                     return
                         
-                        # Periodic save
-                        if new_articles_count > 0 and new_articles_count % 25 == 0:
-                            self.logger.info(f"Saving progress after scraping {new_articles_count} new articles...")
-                            self.save_results()
-
                         # Random delay between articles
                         time.sleep(random.uniform(1, 3))
                     
@@ -17,6 +17,7 @@ TARGET_URL = f"{BASE_URL}/news-and-notices"
 # Output settings
 DATA_DIR = "./data"
 OUTPUT_FILE = "aicis_news.json"
+JOURNAL_DIR = "journal"  # run logs, compacted into OUTPUT_FILE at the end of a run
 LOG_FILE = "aicis_scrape.log"
 
 # Deduplication settings
@@ -39,6 +40,7 @@ import logging
 import time
 import re
 import subprocess
+import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Any
@@ -57,6 +59,10 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
+# Shared helpers live in Scripts/common
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.append_log import AppendLog
+
 
 class DateTimeEncoder(json.JSONEncoder):
     """Custom JSON encoder for datetime objects."""
@@ -89,6 +95,12 @@ class AICISNewsScraper:
         self.driver = None
         self.existing_articles = self._load_existing_articles()
         
+        # New articles go to a run log as they are scraped and the JSON file is
+        # rewritten once at the end; anything logged by a crashed run is merged back
+        self.journal = AppendLog(self.data_dir / JOURNAL_DIR / f"{self.data_file.stem}.jsonl", logger=self.logger)
+        for article in self.journal.recover():
+            self.existing_articles[article['url']] = article
+        
         # Statistics
         self.stats = {
             'articles_found': 0,
@@ -144,8 +156,8 @@ class AICISNewsScraper:
             'articles': articles
         }
         
-        with open(self.data_file, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, indent=2, ensure_ascii=False, cls=DateTimeEncoder)
+        # Atomic swap; the run log is dropped only once the file is in place
+        self.journal.compact(self.data_file, output_data, indent=2, cls=DateTimeEncoder)
         
         self.logger.info(f"Saved {len(articles)} articles to {self.data_file}")
     
@@ -985,7 +997,7 @@ class AICISNewsScraper:
         self._setup_session()
         self._setup_driver()
         
-        all_articles = list(self.existing_articles.values())
+        all_articles = dict(self.existing_articles)
         
         try:
             # Get the main news page
@@ -994,7 +1006,7 @@ class AICISNewsScraper:
             
             if not soup:
                 self.logger.error("Failed to get main page content")
-                return all_articles
+                return list(all_articles.values())
             
             # Extract article links from main page
             article_metas = self._extract_article_links(soup)
@@ -1004,7 +1016,7 @@ class AICISNewsScraper:
             
             if not article_metas:
                 self.logger.warning("No articles found on main page")
-                return all_articles
+                return list(all_articles.values())
             
             # Scrape each article
             for i, article_meta in enumerate(article_metas):
@@ -1015,9 +1027,10 @@ class AICISNewsScraper:
                 
                 article_data = self._scrape_article(article_meta)
                 if article_data:
-                    # Remove existing version if updating
-                    all_articles = [a for a in all_articles if a['url'] != article_data['url']]
-                    all_articles.append(article_data)
+                    # Replace any existing version, keeping the newest last
+                    all_articles.pop(article_data['url'], None)
+                    all_articles[article_data['url']] = article_data
+                    self.journal.append([article_data], cls=DateTimeEncoder)
                 
                 # Rate limiting between articles
                 time.sleep(REQUEST_DELAY)
@@ -1032,6 +1045,7 @@ class AICISNewsScraper:
                 self.driver.quit()
         
         # Save results
+        all_articles = list(all_articles.values())
         self._save_articles(all_articles)
         
         # Log final statistics
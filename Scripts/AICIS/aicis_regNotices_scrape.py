@@ -19,6 +19,7 @@ TIMEOUT = 30       # Request timeout in seconds
 # Paths
 DATA_DIR = "./data"
 OUTPUT_FILE = "aicis_reg_notices.json"
+JOURNAL_DIR = "journal"  # run logs, compacted into OUTPUT_FILE at the end of a run
 LOG_FILE = "scraper.log"
 
 # Website URLs
@@ -37,6 +38,7 @@ import hashlib
 import logging
 import time
 import re
+import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Any
@@ -55,6 +57,10 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import undetected_chromedriver as uc
 
+# Shared helpers live in Scripts/common
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.append_log import AppendLog
+
 
 class DateTimeEncoder(json.JSONEncoder):
     """Custom JSON encoder for datetime objects."""
@@ -95,6 +101,12 @@ class AICISScraper:
         self.driver = None
         self.existing_notices = self._load_existing_notices()
         
+        # New notices go to a run log as they are scraped and the JSON file is
+        # rewritten once at the end; anything logged by a crashed run is merged back
+        self.journal = AppendLog(self.data_dir / JOURNAL_DIR / f"{self.data_file.stem}.jsonl", logger=self.logger)
+        for notice in self.journal.recover():
+            self.existing_notices[notice['url']] = notice
+        
         # Statistics
         self.stats = {
             'pages_visited': 0,
@@ -179,8 +191,8 @@ class AICISScraper:
             'notices': notices
         }
         
-        with open(self.data_file, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, indent=2, ensure_ascii=False, cls=DateTimeEncoder)
+        # Atomic swap; the run log is dropped only once the file is in place
+        self.journal.compact(self.data_file, output_data, indent=2, cls=DateTimeEncoder)
         
         self.logger.info(f"Saved {len(notices)} notices to {self.data_file}")
     
@@ -635,7 +647,7 @@ class AICISScraper:
         self._setup_session()
         self._setup_driver()
         
-        all_notices = list(self.existing_notices.values())
+        all_notices = dict(self.existing_notices)
         current_page = 0
         current_url = self.start_url
         
@@ -664,9 +676,10 @@ class AICISScraper:
                 for notice_url in notice_links:
                     notice_data = self._scrape_notice(notice_url)
                     if notice_data:
-                        # Remove existing version if updating
-                        all_notices = [n for n in all_notices if n['url'] != notice_url]
-                        all_notices.append(notice_data)
+                        # Replace any existing version, keeping the newest last
+                        all_notices.pop(notice_url, None)
+                        all_notices[notice_url] = notice_data
+                        self.journal.append([notice_data], cls=DateTimeEncoder)
                     
                     # Rate limiting
                     time.sleep(REQUEST_DELAY)
@@ -690,6 +703,7 @@ class AICISScraper:
                 self.driver.quit()
         
         # Save results
+        all_notices = list(all_notices.values())
         self._save_notices(all_notices)
         
         # Log final statistics
@@ -1,19 +1,12 @@
 import os
-import json
+import sys
 import logging
-import hashlib
 from datetime import datetime
 import re
-import requests
-from bs4 import BeautifulSoup
-import time
-from io import BytesIO
 
-try:
-    import pdfplumber
-except ImportError:
-    print("pdfplumber is not installed. Please install it using 'pip install pdfplumber'")
-    exit()
+# Shared helpers live in Scripts/common
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.runtime import RegulatorPlugin, run_plugin
 
 # --- Configuration ---
 BASE_URL = "https://www.amsa.gov.au"
@@ -38,33 +31,6 @@ def setup_logging():
         handlers=[logging.FileHandler(log_filename), logging.StreamHandler()]
     )
 
-def get_session():
-    session = requests.Session()
-    session.headers.update({
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        'Accept-Language': 'en-US,en;q=0.9',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
-    })
-    try:
-        session.get(BASE_URL, timeout=10)
-        logging.info("Session initialized and cookies gathered.")
-    except requests.exceptions.RequestException as e:
-        logging.error(f"Failed to initialize session: {e}")
-    return session
-
-def load_existing_data():
-    if not os.path.exists(DATA_FILE):
-        return [], set()
-    try:
-        with open(DATA_FILE, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        processed_urls = {item.get('url') for item in data}
-        logging.info(f"Loaded {len(processed_urls)} existing articles.")
-        return data, processed_urls
-    except (json.JSONDecodeError, FileNotFoundError):
-        logging.warning("Could not read existing data file. Starting fresh.")
-        return [], set()
-
 # --- Content Extraction and Cleaning ---
 
 def clean_text(text):
@@ -72,32 +38,6 @@ def clean_text(text):
         return ""
     return re.sub(r'\s+', ' ', text).strip()
 
-def extract_pdf_content(pdf_url, session):
-    try:
-        logging.info(f"Processing PDF with pdfplumber: {pdf_url}")
-        response = session.get(pdf_url, timeout=30)
-        response.raise_for_status()
-        
-        pdf_bytes = response.content
-        if not pdf_bytes:
-            logging.error(f"PDF download was empty for {pdf_url}")
-            return None
-
-        with BytesIO(pdf_bytes) as pdf_file:
-            text_content = ""
-            with pdfplumber.open(pdf_file) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text_content += page_text + "\n"
-        
-        logging.info(f"Successfully extracted text with pdfplumber from: {pdf_url}")
-        return clean_text(text_content)
-        
-    except Exception as e:
-        logging.error(f"Failed to process PDF {pdf_url} with pdfplumber: {e}", exc_info=True)
-        return None
-
 def find_published_date(content_area):
     """Try multiple strategies to find the published date."""
     # Strategy 1: Original selector
@@ -140,13 +80,31 @@ def find_published_date(content_area):
 
 # --- Scraping Logic ---
 
-def scrape_article_page(article_url, session):
-    """Scrapes a single news article, capturing both web and PDF content if available."""
-    try:
-        response = session.get(article_url, timeout=15)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
+class AmsaNewsPlugin(RegulatorPlugin):
+    """AMSA news and media releases; fetching, PDFs and saving are handled by the shared runtime"""
+
+    name = "amsa_news"
+    base_url = BASE_URL
+    output_file = os.path.basename(DATA_FILE)
+    max_pages = MAX_PAGE
+    warmup_url = BASE_URL
+    request_delay = 0.5
+    dump_kwargs = {'indent': 4}
+    chunk_fields = ('web_content', 'pdf_content')
+
+    def listing_urls(self):
+        for page_num in range(self.max_pages):
+            yield f"{NEWS_URL}?page={page_num}"
+
+    def parse_listing(self, page):
+        return [link['href'] for link in page.soup.select('.view-content .views-field-title a')
+                if link.has_attr('href')]
+
+    def parse_item(self, item, page, runtime):
+        """Scrapes a single news article, capturing both web and PDF content if available."""
+        article_url = item.url
+        soup = page.soup
+
         # Extract title with fallback
         title_element = soup.find('h1', class_='page-title')
         if not title_element:
@@ -155,7 +113,7 @@ def scrape_article_page(article_url, session):
             logging.warning(f"Could not find title for {article_url}")
             return None
         title = clean_text(title_element.text)
-        
+
         # Find content area with fallback
         content_area = soup.find('div', class_='node__content')
         if not content_area:
@@ -165,7 +123,7 @@ def scrape_article_page(article_url, session):
         if not content_area:
             logging.warning(f"Could not find main content area for {article_url}")
             return None
-            
+
         # Extract published date - simple null check
         date_element = content_area.find('div', class_='mb-0 text-base')
         if date_element:
@@ -173,7 +131,7 @@ def scrape_article_page(article_url, session):
         else:
             logging.warning(f"Date element 'mb-0 text-base' not found for {article_url}")
             published_date = "Date not found"
-        
+
         # Extract image with fallback
         image_tag = content_area.find('img')
         image_url = "N/A"
@@ -192,10 +150,6 @@ def scrape_article_page(article_url, session):
             main_text_area = content_area
             logging.info(f"Using entire content area as fallback for main text in {article_url}")
 
-        if not main_text_area:
-            logging.warning(f"Main text area not found in {article_url}")
-            return None
-
         # *** ALWAYS capture web content ***
         web_content = clean_text(main_text_area.get_text(separator='\n', strip=True))
         logging.info(f"Extracted web content for: {title}")
@@ -208,7 +162,7 @@ def scrape_article_page(article_url, session):
             pdf_url = pdf_link_tag['href']
             if not pdf_url.startswith('http'):
                 pdf_url = f"{BASE_URL}{pdf_url}"
-            pdf_content = extract_pdf_content(pdf_url, session)
+            pdf_content = clean_text(runtime.pdf_text(pdf_url)) or None
 
         # Scrape links from the main text area ONLY
         links = []
@@ -218,7 +172,8 @@ def scrape_article_page(article_url, session):
                 href = f"{BASE_URL}{href}"
             links.append(href)
 
-        article_data = {
+        logging.info(f"Finished scraping: {title}")
+        return {
             'title': title,
             'theme': "N/A",
             'published_date': published_date,
@@ -229,59 +184,12 @@ def scrape_article_page(article_url, session):
             'links': list(set(links)),
             'url': article_url,
         }
-        
-        logging.info(f"Finished scraping: {title}")
-        return article_data
-
-    except Exception as e:
-        logging.error(f"An error occurred while scraping {article_url}: {e}", exc_info=True)
-        return None
 
 def main():
-    setup_logging()
     setup_directories()
+    setup_logging()
     logging.info("Starting AMSA News Scraper")
-    
-    session = get_session()
-    all_articles, processed_urls = load_existing_data()
-    new_articles_count = 0
-
-    for page_num in range(MAX_PAGE):
-        page_url = f"{NEWS_URL}?page={page_num}"
-        logging.info(f"Scraping listing page: {page_url}")
-        try:
-            response = session.get(page_url, timeout=15)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
-
-            article_links = soup.select('.view-content .views-field-title a')
-            if not article_links:
-                logging.warning(f"No articles found on page {page_num + 1}. Last page reached.")
-                break
-
-            for link in article_links:
-                if not link.has_attr('href'): 
-                    continue
-                
-                article_url = f"{BASE_URL}{link['href']}"
-                if article_url in processed_urls: 
-                    continue
-
-                article_data = scrape_article_page(article_url, session)
-                if article_data:
-                    all_articles.append(article_data)
-                    processed_urls.add(article_url)
-                    new_articles_count += 1
-                time.sleep(0.5)
-
-        except Exception as e:
-            logging.error(f"An error occurred processing page {page_url}: {e}", exc_info=True)
-            
-    logging.info(f"Scraping complete. Found {new_articles_count} new articles.")
-
-    with open(DATA_FILE, 'w', encoding='utf-8') as f:
-        json.dump(all_articles, f, indent=4, ensure_ascii=False)
-    logging.info(f"Successfully saved {len(all_articles)} total articles to {DATA_FILE}")
+    run_plugin(AmsaNewsPlugin(), data_dir=DATA_DIR)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
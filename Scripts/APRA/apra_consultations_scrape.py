@@ -10,6 +10,8 @@ import json
 import logging
 import os
 import re
+import signal
+import sys
 import time
 import subprocess
 from datetime import datetime, timedelta
@@ -29,6 +31,10 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import PyPDF2
 import io
 
+# Shared helpers live in Scripts/common
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.checkpoint import Checkpoint, resume_requested
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -43,12 +49,13 @@ logger = logging.getLogger(__name__)
 class APRAConsultationScraper:
     """Main scraper class for APRA consultations with status update tracking"""
     
-    def __init__(self, force_fresh_scrape=False):
+    def __init__(self, force_fresh_scrape=False, resume=False):
         """
         Initialize scraper
         
         Args:
             force_fresh_scrape (bool): If True, ignores previously seen URLs and scrapes everything fresh
+            resume (bool): If True, continues from the checkpoint of an interrupted run
         """
         self.base_url = "https://www.apra.gov.au"
         self.consultation_urls = {
@@ -75,6 +82,13 @@ class APRAConsultationScraper:
         else:
             self.seen_urls = self._load_seen_urls()
         
+        # Checkpoint of scraped consultations so a timed-out run is not repeated from scratch
+        self.checkpoint = Checkpoint(Path("data") / "checkpoints" / "apra_consultations.json",
+                                     save_every=1, logger=logger)
+        if resume:
+            self.checkpoint.load()
+        self._setup_signal_handlers()
+        
         # Setup session with realistic headers
         self.session = requests.Session()
         self.session.headers.update({
@@ -90,6 +104,15 @@ class APRAConsultationScraper:
         self.driver = None
         self._setup_driver()
 
+    def _setup_signal_handlers(self):
+        """Save the checkpoint and stop when the orchestrator's timeout sends SIGTERM"""
+        def signal_handler(signum, frame):
+            logger.info(f"Shutdown signal {signum} received, saving checkpoint and stopping...")
+            self.checkpoint.save()
+            sys.exit(128 + signum)
+            
+        signal.signal(signal.SIGTERM, signal_handler)
+        
     def _migrate_data_format(self):
         """Migrate existing data to new format with status history"""
         if not self.existing_consultations:
@@ -834,6 +857,10 @@ class APRAConsultationScraper:
                         is_update = False
                     
                     if should_scrape:
+                        if self.checkpoint.is_done(consultation_url):
+                            logger.info(f"Skipping '{title}' - already scraped before the checkpoint")
+                            continue
+                        
                         # Scrape detailed content
                         detail_content = self._scrape_consultation_detail(consultation_url)
                         
@@ -860,6 +887,9 @@ class APRAConsultationScraper:
                             # Update existing consultation record
                             updated_consultation = self._update_consultation_record(existing_consultation, consultation)
                             updated_consultations.append(updated_consultation)
+                            self.checkpoint.mark_done(consultation_url, {
+                                'industry': industry, 'update': True, 'consultation': updated_consultation
+                            })
                             logger.info(f"Successfully updated: {title} (Status: {status})")
                         else:
                             # New consultation - add tracking fields
@@ -872,6 +902,9 @@ class APRAConsultationScraper:
                             }]
                             consultations.append(consultation)
                             self.seen_urls.add(consultation_url)
+                            self.checkpoint.mark_done(consultation_url, {
+                                'industry': industry, 'update': False, 'consultation': consultation
+                            })
                             logger.info(f"Successfully scraped new: {title} (Status: {status})")
                         
                         # Add delay between requests
@@ -889,17 +922,31 @@ class APRAConsultationScraper:
 
     def scrape_all_consultations(self) -> Dict:
         """Scrape all consultations from all industries with update tracking"""
-        all_consultations = {}
-        all_updates = {}
+        all_consultations = {industry: [] for industry in self.consultation_urls}
+        all_updates = {industry: [] for industry in self.consultation_urls}
+        
+        # Restore consultations scraped before an interrupted run was killed
+        for output in self.checkpoint.outputs:
+            target = all_updates if output['update'] else all_consultations
+            target.setdefault(output['industry'], []).append(output['consultation'])
+            if not output['update']:
+                self.seen_urls.add(output['consultation']['url'])
+        industries_done = list(self.checkpoint.frontier.get('industries_done', []))
         
         # Perform session walking
         self._session_walk()
         
         for industry, url in self.consultation_urls.items():
+            if industry in industries_done:
+                logger.info(f"Skipping {industry} - completed before the checkpoint")
+                continue
+                
             try:
                 consultations, updated_consultations = self._scrape_consultation_page(industry, url)
-                all_consultations[industry] = consultations
-                all_updates[industry] = updated_consultations
+                all_consultations[industry].extend(consultations)
+                all_updates[industry].extend(updated_consultations)
+                industries_done.append(industry)
+                self.checkpoint.set_frontier(industries_done=industries_done)
                 
                 logger.info(f"Scraped {len(consultations)} new and updated {len(updated_consultations)} consultations from {industry}")
                 
@@ -908,8 +955,6 @@ class APRAConsultationScraper:
                 
             except Exception as e:
                 logger.error(f"Failed to scrape {industry}: {e}")
-                all_consultations[industry] = []
-                all_updates[industry] = []
                 
         return all_consultations, all_updates
 
@@ -965,9 +1010,11 @@ class APRAConsultationScraper:
             
             logger.info("Results saved successfully")
             logger.info(f"Backup created: {backup_path}")
+            return True
             
         except Exception as e:
             logger.error(f"Failed to save results: {e}")
+            return False
 
     def generate_status_report(self) -> Dict:
         """Generate a report of status changes and updates"""
@@ -1048,7 +1095,8 @@ def main():
         force_fresh_scrape = True
         logger.info("Fresh scrape mode enabled via command line argument")
     
-    scraper = APRAConsultationScraper(force_fresh_scrape=force_fresh_scrape)
+    # --resume (or SCRAPER_RESUME=1 from the orchestrator) continues an interrupted run
+    scraper = APRAConsultationScraper(force_fresh_scrape=force_fresh_scrape, resume=resume_requested())
     
     try:
         logger.info("Starting APRA consultation scraping in batch mode...")
@@ -1060,7 +1108,8 @@ def main():
             logger.info(f"Running in INCREMENTAL mode - found {len(scraper.seen_urls)} previously seen URLs")
         
         consultations, updated_consultations = scraper.scrape_all_consultations()
-        scraper.save_results(consultations, updated_consultations)
+        if scraper.save_results(consultations, updated_consultations):
+            scraper.checkpoint.clear()
         
         # Generate status report
         status_report = scraper.generate_status_report()
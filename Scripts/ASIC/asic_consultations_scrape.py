@@ -29,6 +29,8 @@ import json
 import logging
 import hashlib
 import re
+import signal
+import subprocess
 import time
 import requests
 from datetime import datetime, timedelta
@@ -36,6 +38,15 @@ from pathlib import Path
 from typing import Dict, List, Optional, Set, Any
 from urllib.parse import urljoin, urlparse
 import os
+import sys
+
+# Shared helpers live in Scripts/common
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.checkpoint import Checkpoint, resume_requested
+from common.lazy_import import is_installed, lazy_import
+from common.near_duplicates import NearDuplicateIndex, near_duplicates_disabled
+from common.table_export import TableExport
+from common.tabular import TabularExtractor
 
 # Third-party imports
 try:
@@ -47,21 +58,27 @@ try:
     from selenium.webdriver.chrome.service import Service
     from selenium.common.exceptions import TimeoutException, NoSuchElementException
     from bs4 import BeautifulSoup
-    import PyPDF2
-    import fitz  # PyMuPDF
-    import pandas as pd
     from fake_useragent import UserAgent
-    import subprocess
 except ImportError as e:
     print(f"Required dependency missing: {e}")
     print("Install with: pip install selenium beautifulsoup4 PyPDF2 PyMuPDF pandas fake-useragent openpyxl")
     exit(1)
 
+# PDF/table libraries are only imported when a run first needs them
+for _module, _package in (('PyPDF2', 'PyPDF2'), ('fitz', 'PyMuPDF'), ('pandas', 'pandas')):
+    if not is_installed(_module):
+        print(f"Required dependency missing: {_package}")
+        print("Install with: pip install selenium beautifulsoup4 PyPDF2 PyMuPDF pandas fake-useragent openpyxl")
+        exit(1)
+PyPDF2 = lazy_import('PyPDF2')
+fitz = lazy_import('fitz')  # PyMuPDF
+pd = lazy_import('pandas')
+
 
 class ASICResourceScraper:
     """Main scraper class for ASIC regulatory resources"""
     
-    def __init__(self, max_pages = 2, data_dir: str = "data"):
+    def __init__(self, max_pages = 2, data_dir: str = "data", resume: bool = False):
         self.base_url = "https://www.asic.gov.au"
         self.search_url = f"{self.base_url}/regulatory-resources/regulatory-resources-search/"
         
@@ -82,10 +99,26 @@ class ASICResourceScraper:
         self.scraped_data: List[Dict] = []
         self.processed_urls: Set[str] = set()
         self.processed_pdfs: Set[str] = set()  # PDF checksums
+        # Shared index of extracted texts; catches PDFs re-issued with minor edits
+        self.near_duplicates = None
+        if not near_duplicates_disabled():
+            try:
+                self.near_duplicates = NearDuplicateIndex(logger=self.logger)
+            except Exception as e:
+                self.logger.warning(f"Near-duplicate index unavailable, not flagging PDFs: {e}")
         
         # Load existing data for incremental updates
         self._load_existing_data()
         
+        # Checkpoint of the resource list and processed entries so a killed run can resume
+        self.checkpoint = Checkpoint(self.data_dir / "checkpoints" / "asic_regulatory_resources.json",
+                                     run_key=str(self.max_pages), logger=self.logger)
+        if resume and self.checkpoint.load():
+            self._restore_checkpoint()
+        # Entries that failed this run; the checkpoint is kept for a resumed run if any did
+        self.errors = 0
+        self._setup_signal_handlers()
+        
         # Initialize browser
         self.driver = None
         self.session = requests.Session()
@@ -114,6 +147,15 @@ class ASICResourceScraper:
         self.logger = logging.getLogger(__name__)
         self.logger.info("ASIC Scraper initialized")
     
+    def _setup_signal_handlers(self):
+        """Save the checkpoint and stop when the orchestrator's timeout sends SIGTERM"""
+        def signal_handler(signum, frame):
+            self.logger.info(f"Shutdown signal {signum} received, saving checkpoint and stopping...")
+            self.checkpoint.save()
+            sys.exit(128 + signum)
+        
+        signal.signal(signal.SIGTERM, signal_handler)
+    
     def _setup_session(self):
         """Setup requests session with stealth headers"""
         ua = UserAgent()
@@ -146,6 +188,17 @@ class ASICResourceScraper:
                 self.logger.error(f"Error loading existing data: {e}")
                 self.scraped_data = []
     
+    def _restore_checkpoint(self):
+        """Add entries processed before an interrupted run to the in-memory data"""
+        restored = 0
+        for entry in self.checkpoint.outputs:
+            url = entry.get('url')
+            if url and url not in self.processed_urls:
+                self.scraped_data.append(entry)
+                self.processed_urls.add(url)
+                restored += 1
+        self.logger.info(f"Restored {restored} entries from checkpoint")
+    
     def _init_driver(self):
         """Initialize Chrome driver with stealth options and Linux compatibility"""
         self.driver = self._setup_driver()
@@ -249,7 +302,6 @@ class ASICResourceScraper:
             
             # Check if chromedriver is accessible
             try:
-                import subprocess
                 result = subprocess.run(['chromedriver', '--version'], capture_output=True, text=True, timeout=5)
                 self.logger.info(f"ChromeDriver version: {result.stdout.strip()}")
             except Exception as cmd_e:
@@ -303,8 +355,15 @@ class ASICResourceScraper:
                 page_source = self.driver.page_source[:1000]
                 self.logger.info(f"Page source snippet: {page_source}")
             
-            # Get all resource entries
-            resource_entries = self._get_all_resource_entries()
+            # Get all resource entries (reusing the list of an interrupted run if resuming)
+            if 'entries' in self.checkpoint.frontier:
+                resource_entries = self.checkpoint.frontier['entries']
+                self.logger.info(f"Using {len(resource_entries)} resource entries from checkpoint")
+            else:
+                resource_entries = self._get_all_resource_entries()
+                if resource_entries:
+                    # Copies: processing adds the scraped content to each entry in place
+                    self.checkpoint.set_frontier(entries=[dict(entry) for entry in resource_entries])
             
             if not resource_entries:
                 self.logger.warning("No resource entries found")
@@ -329,6 +388,7 @@ class ASICResourceScraper:
                             
                 except Exception as e:
                     self.logger.error(f"Error processing entry: {e}")
+                    self.errors += 1
                     continue
             
             self.logger.info(f"Completed processing {processed_count} resources")
@@ -684,6 +744,7 @@ class ASICResourceScraper:
                     
                     # Store the entry
                     self.scraped_data.append(entry)
+                    self.checkpoint.mark_done(url, entry)
                     
                     self.logger.info(f"Successfully processed: {entry.get('title', 'Unknown')}")
                 else:
@@ -693,6 +754,7 @@ class ASICResourceScraper:
                 
         except Exception as e:
             self.logger.error(f"Error processing resource {url}: {e}")
+            self.errors += 1
     
     def _scrape_regulatory_guide(self, url: str) -> Dict:
         """Scrape regulatory guide content"""
@@ -1854,11 +1916,13 @@ class ASICResourceScraper:
                         
                         # Only process if not already processed
                         if checksum not in self.processed_pdfs:
-                            pdf_data['pdf_content'].append({
+                            pdf_entry = {
                                 'url': pdf_url,
                                 'content': pdf_content,
                                 'checksum': checksum
-                            })
+                            }
+                            self._flag_near_duplicate_pdf(pdf_entry)
+                            pdf_data['pdf_content'].append(pdf_entry)
                             pdf_data['pdf_checksums'].append(checksum)
                             self.processed_pdfs.add(checksum)
                         else:
@@ -1873,6 +1937,21 @@ class ASICResourceScraper:
         
         return pdf_data
     
+    def _flag_near_duplicate_pdf(self, pdf_entry: Dict):
+        """Mark a PDF whose text nearly matches an already ingested document"""
+        if self.near_duplicates is None:
+            return
+        try:
+            match = self.near_duplicates.add(f"ASIC/pdfs/{pdf_entry['checksum']}", pdf_entry['content'],
+                                             regulator='ASIC', source='pdfs', url=pdf_entry['url'])
+            if match:
+                pdf_entry['near_duplicate_of'] = match.canonical_key
+                pdf_entry['near_duplicate_similarity'] = round(match.similarity, 3)
+                self.logger.info(f"PDF is a near duplicate ({match.similarity:.2f}) of "
+                                 f"{match.canonical_key}: {pdf_entry['url']}")
+        except Exception as e:
+            self.logger.warning(f"Could not check PDF for near duplicates: {e}")
+    
     def _extract_legislation_pdf(self) -> Optional[str]:
         """Extract PDF content from legislation.gov.au iframe"""
         try:
@@ -1994,6 +2073,9 @@ class ASICResourceScraper:
             # Save data before exit
             self._save_data()
             
+            if self.near_duplicates:
+                self.near_duplicates.close()
+            
             self.logger.info("Cleanup completed successfully")
             
         except Exception as e:
@@ -2003,28 +2085,35 @@ class ASICResourceScraper:
 class ExcelExtractor:
     """Helper class for extracting data from Excel files"""
     
-    @staticmethod
-    def extract_excel_content(file_path: str) -> Dict:
-        """Extract content from Excel file"""
+    _tabular: Dict[Path, TabularExtractor] = {}  # per data directory
+    
+    @classmethod
+    def extract_excel_content(cls, file_path: str, data_dir: str = "data") -> Dict:
+        """Extract content from Excel file (summaries cached under the scraper's data directory)"""
         try:
-            # Read all sheets
-            excel_data = pd.read_excel(file_path, sheet_name=None)
+            cache_dir = Path(data_dir) / "tabular_cache"
+            if cache_dir not in cls._tabular:
+                cls._tabular[cache_dir] = TabularExtractor(cache_dir=cache_dir)
+            tabular = cls._tabular[cache_dir]
+            
+            # Streaming read of all sheets with a column-typed summary per sheet
+            summaries = tabular.summarize_file(file_path)
             
             content = {
                 'sheets': {},
-                'summary': f"Excel file with {len(excel_data)} sheets"
+                'summary': f"Excel file with {len(summaries)} sheets"
             }
             
-            for sheet_name, df in excel_data.items():
-                # Convert to text representation
+            for summary in summaries:
                 sheet_content = {
-                    'name': sheet_name,
-                    'rows': df.shape[0],
-                    'columns': df.shape[1],
-                    'column_names': df.columns.tolist(),
-                    'data': df.to_string(index=False)
+                    'name': summary.name,
+                    'rows': summary.rows,
+                    'columns': len(summary.columns),
+                    'column_names': summary.columns,
+                    'truncated': summary.truncated,
+                    'data': tabular.render_sheet(summary)
                 }
-                content['sheets'][sheet_name] = sheet_content
+                content['sheets'][summary.name] = sheet_content
             
             return content
             
@@ -2046,6 +2135,8 @@ def main():
                        help='Run incremental update (max 3 pages)')
     parser.add_argument('--test', action='store_true',
                        help='Run test mode (single page)')
+    parser.add_argument('--resume', action='store_true',
+                       help='Continue from the checkpoint of an interrupted run (also SCRAPER_RESUME=1)')
     
     args = parser.parse_args()
     
@@ -2058,15 +2149,23 @@ def main():
         max_pages = args.max_pages
     
     # Initialize and run scraper
-    scraper = ASICResourceScraper(max_pages=2, data_dir=args.data_dir)
+    scraper = ASICResourceScraper(max_pages=2, data_dir=args.data_dir,
+                                  resume=args.resume or resume_requested())
     
     try:
         scraper._init_driver()  # Initialize driver first
         scraper.scrape_all_resources()
+        if scraper.errors:
+            scraper.checkpoint.save()
+            scraper.logger.info(f"{scraper.errors} entries failed - checkpoint kept at "
+                                f"{scraper.checkpoint.path} (use --resume)")
+        else:
+            scraper.checkpoint.clear()
         print(f"Scraping completed successfully. Check {scraper.output_file} for results.")
         
     except KeyboardInterrupt:
         scraper.logger.info("Scraping interrupted by user")
+        scraper.checkpoint.save()
         scraper._save_data()
         
     except Exception as e:
@@ -2127,6 +2226,12 @@ def analyze_scraped_data(data_file: str = "data/asic_regulatory_resources.json")
         return None
 
 
+SUMMARY_COLUMNS = (
+    'doc_id', 'type', 'title', 'published_date', 'scraped_date', 'url', 'topics',
+    'content_length', 'pdf_count', 'has_relocated', 'submission_deadline', 'submission_email'
+)
+
+
 def export_to_csv(data_file: str = "data/asic_regulatory_resources.json", 
                  output_file: str = "data/asic_summary.csv"):
     """Export summary data to CSV for analysis"""
@@ -2144,7 +2249,7 @@ def export_to_csv(data_file: str = "data/asic_regulatory_resources.json",
                 'published_date': item.get('published_date', ''),
                 'scraped_date': item.get('scraped_date', ''),
                 'url': item.get('url', ''),
-                'topics': '; '.join(item.get('topics', [])),
+                'topics': item.get('topics', []),
                 'content_length': len(item.get('content_text', '')),
                 'pdf_count': len(item.get('pdf_content', [])),
                 'has_relocated': bool(item.get('relocated_url')),
@@ -2153,12 +2258,12 @@ def export_to_csv(data_file: str = "data/asic_regulatory_resources.json",
             }
             summary_records.append(record)
         
-        # Save to CSV
-        df = pd.DataFrame(summary_records)
-        df.to_csv(output_file, index=False)
+        # Append new/changed rows to the CSV (rewritten only when earlier rows changed)
+        counts = TableExport(output_file, list(SUMMARY_COLUMNS), key_field='url',
+                             list_columns=('topics',), list_format='; '.join).export(summary_records)
         
-        print(f"Summary data exported to {output_file}")
-        return df
+        print(f"Summary data exported to {output_file} ({counts['new']} new, {counts['changed']} changed)")
+        return counts
         
     except Exception as e:
         print(f"Error exporting to CSV: {e}")
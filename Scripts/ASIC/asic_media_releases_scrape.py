@@ -6,13 +6,12 @@ import logging
 import requests
 import urllib3
 from datetime import datetime, timezone
-from typing import List, Dict, Set, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterator, List, Dict, Set, Optional
 from urllib.parse import urljoin, urlparse
 import re
 import io
+import sys
 
-import pandas as pd
 from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
@@ -24,6 +23,13 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
 import PyPDF2
 
+# Shared helpers live in Scripts/common
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.append_log import AppendLog
+from common.pipeline import Pipeline
+from common.search_index import index_records
+from common.table_export import TableExport
+
 # Disable SSL warnings
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -50,6 +56,7 @@ def setup_logging():
 DATA_DIR = "data"
 JSON_PATH = os.path.join(DATA_DIR, "asic_media_releases.json")
 CSV_PATH = os.path.join(DATA_DIR, "asic_media_releases.csv")
+JOURNAL_PATH = os.path.join(DATA_DIR, "journal", "asic_media_releases.jsonl")
 BASE_URL = "https://asic.gov.au"
 MEDIA_RELEASES_URL = f"{BASE_URL}/newsroom/media-releases/"
 HEADERS = {
@@ -58,6 +65,8 @@ HEADERS = {
 
 # --- Enhanced Configuration ---
 MAX_WORKERS = 4
+PERSIST_BATCH_SIZE = 10  # Log completed releases in batches as they finish; JSON is written once at the end
+KNOWN_STOP_STREAK = 5  # Daily mode: stop discovery after this many consecutive stored releases
 ARTICLE_TIMEOUT = 20
 SCROLL_PAUSE = 2
 MAX_SCROLLS = 25
@@ -377,8 +386,12 @@ def validate_data_quality(articles: List[Dict]) -> Dict:
     
     return stats
 
-def save_articles(new_articles: List[Dict]):
-    """Saves new articles to JSON and CSV files with enhanced validation."""
+def save_articles(new_articles: List[Dict], journal: Optional[AppendLog] = None, create_backup: bool = True):
+    """Saves new articles to JSON and CSV files with enhanced validation.
+
+    With a journal, the JSON is published through it (atomic swap, then the
+    journal of this run's articles is cleared).
+    """
     if not new_articles:
         logging.info("No new articles to save.")
         return
@@ -390,8 +403,8 @@ def save_articles(new_articles: List[Dict]):
         
         existing_articles = load_existing_articles()
         
-        # Create timestamped backup if file exists
-        if os.path.exists(JSON_PATH) and existing_articles:
+        # Create timestamped backup if file exists (once per run)
+        if create_backup and os.path.exists(JSON_PATH) and existing_articles:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             backup_path = os.path.join(DATA_DIR, f"asic_media_releases_backup_{timestamp}.json")
             
@@ -423,31 +436,21 @@ def save_articles(new_articles: List[Dict]):
         unique_articles.sort(key=lambda x: x.get('scraped_date', ''), reverse=True)
         
         # Save JSON with proper formatting for LLM consumption
-        with open(JSON_PATH, 'w', encoding='utf-8') as f:
-            json.dump(unique_articles, f, indent=2, ensure_ascii=False, sort_keys=True)
+        if journal is not None:
+            journal.compact(JSON_PATH, unique_articles, indent=2, sort_keys=True)
+        else:
+            with open(JSON_PATH, 'w', encoding='utf-8') as f:
+                json.dump(unique_articles, f, indent=2, ensure_ascii=False, sort_keys=True)
 
-        # Create DataFrame with proper column order for LLM processing
-        df = pd.DataFrame(unique_articles)
-        
-        # Ensure required columns exist in correct order
+        # CSV columns in the order used for LLM processing; only new or changed rows are written
         required_columns = [
             'hash_id', 'headline', 'url', 'published_date', 'scraped_date',
             'article_type', 'content', 'topics', 'related_links', 'summary',
             'media_release_number', 'has_pdf_content', 'content_length', 'llm_ready'
         ]
         
-        for col in required_columns:
-            if col not in df.columns:
-                df[col] = None
-        
-        # Handle list columns for CSV
-        for col in ['topics', 'related_links']:
-            if col in df.columns:
-                df[col] = df[col].apply(lambda x: ', '.join(x) if isinstance(x, list) else str(x))
-        
-        # Reorder columns for optimal LLM consumption
-        df = df[required_columns]
-        df.to_csv(CSV_PATH, index=False, encoding='utf-8')
+        TableExport(CSV_PATH, required_columns, key_field='hash_id',
+                    list_columns=('topics', 'related_links'), list_format=', '.join).export(unique_articles)
         
         logging.info(f"Successfully saved {len(new_articles)} new media releases. Total: {len(unique_articles)}")
         logging.info(f"LLM-ready articles: {quality_stats['llm_ready_articles']}/{len(new_articles)}")
@@ -457,6 +460,8 @@ def save_articles(new_articles: List[Dict]):
         with open(quality_report_path, 'w', encoding='utf-8') as f:
             json.dump(quality_stats, f, indent=2)
         
+        index_records(new_articles, JSON_PATH)
+        
         print(f"SUCCESS: Saved {len(new_articles)} new media releases. Total in database: {len(unique_articles)}")
 
     except Exception as e:
@@ -567,24 +572,51 @@ def fetch_media_release_details(article_summary: Dict, session: requests.Session
     finally:
         driver.quit()
 
-def should_stop_early(article_summaries: List[Dict], existing_ids: Set[str]) -> bool:
+def discover_media_releases(list_driver: WebDriver) -> Iterator[Dict]:
     """
-    Determine if we should stop early based on how many existing articles we've encountered.
-    This is useful for daily runs to avoid processing old content.
+    Yield media release summaries page by page, newest first.
+    Runs as the discovery stage of the pipeline, so details are fetched while paging continues.
     """
-    if not DAILY_MODE:
-        return False
+    logging.info(f"Starting article discovery from: {MEDIA_RELEASES_URL}")
+    list_driver.get(MEDIA_RELEASES_URL)
     
-    # Check the last 10 articles - if most are existing, we've probably hit old content
-    recent_articles = article_summaries[-10:] if len(article_summaries) >= 10 else article_summaries
-    existing_count = sum(1 for article in recent_articles if article["hash_id"] in existing_ids)
+    # Wait for initial content
+    WebDriverWait(list_driver, 20).until(
+        EC.presence_of_element_located((By.CSS_SELECTOR, "#nr-list > li"))
+    )
     
-    # If 80% of recent articles are existing, stop
-    if len(recent_articles) >= 5 and existing_count / len(recent_articles) >= 0.8:
-        logging.info(f"Early stopping: {existing_count}/{len(recent_articles)} recent articles are existing")
-        return True
+    seen_ids = set()
+    current_page = 1
     
-    return False
+    while True:
+        logging.info(f"Processing page {current_page}")
+        
+        # Scrape current page
+        page_articles = scrape_page_with_pagination(list_driver, current_page)
+        
+        if not page_articles:
+            logging.info(f"No articles found on page {current_page}")
+            break
+        
+        for article in page_articles:
+            if article["hash_id"] not in seen_ids:
+                seen_ids.add(article["hash_id"])
+                yield article
+        
+        # Check if we should continue
+        if MAX_PAGES and current_page >= MAX_PAGES:
+            logging.info(f"Reached maximum pages limit: {MAX_PAGES}")
+            break
+        
+        # Check for next page
+        if not check_for_next_page(list_driver):
+            logging.info("No more pages available")
+            break
+        
+        current_page += 1
+        time.sleep(1)  # Respectful delay between pages
+    
+    logging.info(f"Article discovery complete. Found {len(seen_ids)} articles across {current_page} pages.")
 
 def scrape_page_with_pagination(list_driver: WebDriver, page_num: int = 1) -> List[Dict]:
     """Scrape articles from a specific page with pagination support."""
@@ -705,112 +737,60 @@ def main():
     existing_ids = load_existing_hash_ids()
     logging.info(f"Found {len(existing_ids)} existing media releases in database")
 
-    # --- Phase 1: Get all media release summaries with pagination ---
-    list_driver = setup_driver()
-    all_article_summaries = []
-    
-    try:
-        logging.info(f"Starting article discovery from: {MEDIA_RELEASES_URL}")
-        list_driver.get(MEDIA_RELEASES_URL)
-        
-        # Wait for initial content
-        WebDriverWait(list_driver, 20).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "#nr-list > li"))
-        )
-        
-        current_page = 1
-        
-        while True:
-            logging.info(f"Processing page {current_page}")
-            
-            # Scrape current page
-            page_articles = scrape_page_with_pagination(list_driver, current_page)
-            
-            if not page_articles:
-                logging.info(f"No articles found on page {current_page}")
-                break
-            
-            all_article_summaries.extend(page_articles)
-            
-            # Check early stopping for daily mode
-            if DAILY_MODE and should_stop_early(all_article_summaries, existing_ids):
-                logging.info("Early stopping triggered - mostly existing content found")
-                break
-            
-            # Check if we should continue
-            if MAX_PAGES and current_page >= MAX_PAGES:
-                logging.info(f"Reached maximum pages limit: {MAX_PAGES}")
-                break
-            
-            # Check for next page
-            if not check_for_next_page(list_driver):
-                logging.info("No more pages available")
-                break
-            
-            current_page += 1
-            time.sleep(1)  # Respectful delay between pages
-
-        logging.info(f"Article discovery complete. Found {len(all_article_summaries)} total articles across {current_page} pages.")
-
-    except Exception as e:
-        logging.error(f"Fatal error during Phase 1 (article discovery): {e}")
-        return
-    finally:
-        list_driver.quit()
-        logging.info("Phase 1 driver closed.")
-
-    if not all_article_summaries:
-        logging.warning("No article summaries found. Check if the page structure has changed.")
-        return
-
-    # --- Phase 2: Filter for new articles and fetch details with PDF extraction ---
-    new_articles_to_fetch = [
-        article for article in all_article_summaries 
-        if article["hash_id"] not in existing_ids
-    ]
-
-    if not new_articles_to_fetch:
-        logging.info("No new media releases found. Scraper run complete.")
-        print("INFO: No new media releases found - database is up to date")
-        return
+    # Releases logged by a run that died before writing the JSON
+    journal = AppendLog(JOURNAL_PATH, key_field='hash_id')
+    recovered_articles = [article for article in journal.recover() if article.get('hash_id') not in existing_ids]
+    existing_ids.update(article['hash_id'] for article in recovered_articles)
+    if not recovered_articles:
+        journal.clear()  # nothing in it that the JSON does not already hold
 
     # Apply article limits for daily mode
     is_initial_run = len(existing_ids) == 0
+    article_limit = None
     if DAILY_MODE:
         article_limit = INITIAL_RUN_LIMIT if is_initial_run else DAILY_ARTICLE_LIMIT
-        if len(new_articles_to_fetch) > article_limit:
-            logging.info(f"Limiting to {article_limit} articles for {'initial' if is_initial_run else 'daily'} run")
-            new_articles_to_fetch = new_articles_to_fetch[:article_limit]
+        logging.info(f"Limiting to {article_limit} articles for {'initial' if is_initial_run else 'daily'} run")
 
-    logging.info(f"Found {len(new_articles_to_fetch)} new media releases to scrape.")
-    print(f"Processing {len(new_articles_to_fetch)} new media releases...")
-    
+    # --- Discovery, detail fetching and saving overlap in one bounded pipeline ---
     completed_articles = []
 
-    # Use ThreadPoolExecutor for parallel processing with PDF extraction
-    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        # Submit all tasks with session for PDF downloading
-        future_to_article = {
-            executor.submit(fetch_media_release_details, summary, session): summary 
-            for summary in new_articles_to_fetch
-        }
+    def persist_batch(batch: List[Dict]):
+        # Appended to the run journal; the JSON and CSV are rebuilt once after the pipeline
+        journal.append(batch)
+        completed_articles.extend(batch)
+        print(f"Progress: {len(completed_articles)} media releases processed")
 
-        # Process results as they complete
-        for i, future in enumerate(as_completed(future_to_article), 1):
-            try:
-                result = future.result()
-                if result:
-                    completed_articles.append(result)
-                    logging.info(f"Completed {i}/{len(new_articles_to_fetch)}: {result['headline'][:50]}...")
-                    print(f"Progress: {i}/{len(new_articles_to_fetch)} media releases processed")
-            except Exception as e:
-                article_url = future_to_article[future]['url']
-                logging.error(f"Task for URL {article_url} failed: {e}")
+    list_driver = setup_driver()
+    try:
+        pipeline = Pipeline(
+            discover=discover_media_releases(list_driver),
+            fetch=lambda summary: fetch_media_release_details(summary, session),
+            persist=persist_batch,
+            is_known=lambda summary: summary["hash_id"] in existing_ids,
+            # Daily runs stop at the first run of already-stored releases
+            stop_after_known=KNOWN_STOP_STREAK if DAILY_MODE else None,
+            max_items=article_limit,
+            fetch_workers=MAX_WORKERS,
+            persist_batch_size=PERSIST_BATCH_SIZE,
+            name="asic-media-releases",
+        )
+        pipeline_stats = pipeline.run()
+    finally:
+        list_driver.quit()
+        logging.info("Listing driver closed.")
 
-    # --- Phase 3: Save results with quality validation ---
-    if completed_articles:
-        save_articles(completed_articles)
-        
+    if recovered_articles or completed_articles:
+        save_articles(recovered_articles + completed_articles, journal)
+
+    if not pipeline_stats.discovered:
+        logging.warning("No article summaries found. Check if the page structure has changed.")
+        return
+
+    new_articles_found = pipeline_stats.discovered - pipeline_stats.known
+    if not completed_articles:
+        logging.info("No new media releases saved. Scraper run complete.")
+        print("INFO: No new media releases found - database is up to date")
+    else:
         # Final quality report
         quality_stats = validate_data_quality(completed_articles)
         logging.info(f"Final Quality Score: {quality_stats['quality_score']}/100")
@@ -827,8 +807,8 @@ def main():
     print(f"Mode: {mode_text}")
     if DAILY_MODE and len(existing_ids) == 0:
         print("Initial run: Higher article limit applied")
-    print(f"Articles found on pages: {len(all_article_summaries)}")
-    print(f"New articles to process: {len(new_articles_to_fetch)}")
+    print(f"Articles found on pages: {pipeline_stats.discovered}")
+    print(f"New articles to process: {new_articles_found}")
     print(f"Successfully processed: {len(completed_articles)}")
     print(f"Existing articles in database: {len(existing_ids)}")
     total_articles = len(existing_ids) + len(completed_articles)
@@ -7,6 +7,7 @@ Extracts text content from webpages, PDFs, and Excel files for LLM analysis
 
 import json
 import os
+import sys
 import time
 import random
 import asyncio
@@ -17,11 +18,14 @@ from urllib.parse import urljoin, urlparse
 import hashlib
 
 from playwright.async_api import async_playwright, Page, Browser, BrowserContext
-import pdfplumber
 import pandas as pd
 from io import BytesIO
 import requests
 
+# Shared helpers live in Scripts/common
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.pdf_extract import extract_pdf
+
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
@@ -261,20 +265,17 @@ def extract_pdf_text(pdf_url: str) -> str:
         response = requests.get(pdf_url, headers=headers, timeout=60)
         response.raise_for_status()
         
-        pdf_file = BytesIO(response.content)
+        # One layout pass per page yields both the text and any tables
+        pdf = extract_pdf(response.content, source=pdf_url)
         text_content = []
         
-        with pdfplumber.open(pdf_file) as pdf:
-            for page in pdf.pages:
-                text = page.extract_text()
-                if text:
-                    text_content.append(text)
-                
-                # Extract tables if present
-                tables = page.extract_tables()
-                for table in tables:
-                    table_text = '\n'.join([' | '.join([str(cell) for cell in row if cell]) for row in table])
-                    text_content.append(table_text)
+        for page in pdf.pages:
+            if page.text:
+                text_content.append(page.text)
+            
+            for table in page.tables:
+                table_text = '\n'.join([' | '.join([cell for cell in row if cell]) for row in table.rows])
+                text_content.append(table_text)
         
         return clean_text(' '.join(text_content))
     
@@ -17,6 +17,15 @@ from pathlib import Path
 import hashlib
 from typing import Dict, List, Optional, Set
 import random
+import sys
+
+# Shared helpers live in Scripts/common
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.async_http import fetch_all
+
+# Concurrent article detail fetches against dcceew.gov.au
+DETAIL_CONCURRENCY = 4
+DETAIL_MIN_INTERVAL = 0.5  # seconds between request starts
 
 # Document processing libraries
 try:
@@ -340,9 +349,10 @@ class DCCEEWNewsScraper:
         
         return related
     
-    def _extract_article_content(self, article_url: str) -> Optional[Dict]:
-        """Extract full content from an article page"""
-        response = self._make_request(article_url)
+    def _extract_article_content(self, article_url: str, response=None) -> Optional[Dict]:
+        """Extract full content from an article page (optionally from a prefetched response)"""
+        if response is None:
+            response = self._make_request(article_url)
         if not response:
             return None
         
@@ -519,6 +529,7 @@ class DCCEEWNewsScraper:
             articles = self._extract_articles_from_page(page_url)
             self.logger.info(f"Found {len(articles)} articles on page {page_num + 1}")
             
+            new_articles = []
             for article_info in articles:
                 article_id = self._generate_article_id(article_info['url'], article_info['title'])
                 
@@ -527,10 +538,23 @@ class DCCEEWNewsScraper:
                     self.logger.debug(f"Skipping existing article: {article_info['title']}")
                     skipped_count += 1
                     continue
-                
-                # Extract full article content
+                new_articles.append((article_id, article_info))
+            
+            # Fetch this page's article details concurrently, then parse them in order
+            responses = fetch_all(
+                [info['url'] for _, info in new_articles],
+                session=self.session,
+                per_host_limit=DETAIL_CONCURRENCY,
+                min_interval=DETAIL_MIN_INTERVAL,
+                logger=self.logger,
+            )
+            
+            for (article_id, article_info), prefetched in zip(new_articles, responses):
+                # Extract full article content (falls back to a sequential request on fetch failure)
                 self.logger.info(f"Processing: {article_info['title']}")
-                article_data = self._extract_article_content(article_info['url'])
+                article_data = self._extract_article_content(
+                    article_info['url'], response=prefetched if prefetched.ok else None
+                )
                 
                 if article_data:
                     self.existing_articles[article_id] = article_data
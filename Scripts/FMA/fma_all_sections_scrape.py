@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+FMA NZ Library Crawler
+Runs every FMA library section scraper (articles, media releases, speeches,
+guidance, reports and papers, opinions) in one process against
+https://www.fma.govt.nz with a single warmed session.
+
+Run separately, each section scraper opened its own session, visited the home
+page to collect cookies and slept DELAY_RANGE before every request; listing
+pages were fetched twice (once for links, once for the next-page link) and a
+PDF linked from several sections was downloaded once per section.
+
+Here the section scrapers share one session whose GET responses are cached
+for the run, so the home page, repeated listing pages and shared PDFs are
+fetched once. Their per-request sleeps are replaced by one host budget in the
+shared request ledger (Scripts/common/request_ledger.py), and the sections run
+on their own threads so their requests interleave under that budget. Each
+section still parses its own pages and writes its usual JSON/CSV output.
+"""
+
+import argparse
+import importlib
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from urllib.parse import urlparse
+
+import requests
+
+# Shared helpers live in Scripts/common
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.request_ledger import RequestLedger
+
+# Configuration
+BASE_URL = "https://www.fma.govt.nz"
+FMA_HOST = urlparse(BASE_URL).netloc
+DATA_DIR = "data"
+LOG_FILE = os.path.join(DATA_DIR, "fma_crawler.log")
+
+# One budget for the whole host, shared by every section (and by any
+# standalone FMA run using the ledger)
+HOURLY_REQUEST_LIMIT = 1200
+REQUEST_SPACING = (1.0, 2.5)  # Random minimum gap between requests (seconds)
+MAX_CACHE_BYTES = 256 * 1024 * 1024  # Stop caching response bodies beyond this
+
+# section name -> (module, scraper class, accepts is_daily_run)
+SECTIONS = {
+    'articles': ('fma_articles_scrape', 'FMAArticleScraper', False),
+    'media_releases': ('fma_media_releases_scrape', 'FMAMediaReleasesScraper', True),
+    'speeches': ('fma_speeches_scrape', 'FMASpeechesScraper', True),
+    'guidance': ('fma_guidance_scrape', 'FMAGuidanceScraper', False),
+    'reports': ('fma_reports_scrape', 'FMAReportsScraper', True),
+    'opinions': ('fma_opinions_scrape', 'FMAOpinionsScraper', True),
+}
+
+os.makedirs(DATA_DIR, exist_ok=True)
+
+# Configured before the section modules are imported, so their own
+# basicConfig calls are no-ops and every section logs here under its module name
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.FileHandler(LOG_FILE),
+        logging.StreamHandler()
+    ]
+)
+logger = logging.getLogger("fma_crawler")
+
+
+class SharedFMASession(requests.Session):
+    """Session shared by all sections: paced by the host budget, GET responses cached for the run"""
+
+    def __init__(self, ledger):
+        super().__init__()
+        self.ledger = ledger
+        self._cache = {}
+        self._cache_lock = threading.Lock()
+        self._cached_bytes = 0
+        self.stats = {'requests': 0, 'cache_hits': 0, 'waited': 0.0}
+
+    def request(self, method, url, *args, **kwargs):
+        cacheable = method.upper() == 'GET' and not args and not kwargs.get('params')
+        if cacheable:
+            with self._cache_lock:
+                response = self._cache.get(url)
+                if response is not None:
+                    self.stats['cache_hits'] += 1
+                    return response
+
+        if urlparse(url).netloc == FMA_HOST:
+            waited = self.ledger.acquire(FMA_HOST, HOURLY_REQUEST_LIMIT,
+                                         min_interval=random.uniform(*REQUEST_SPACING))
+            with self._cache_lock:
+                self.stats['waited'] += waited
+        response = super().request(method, url, *args, **kwargs)
+
+        with self._cache_lock:
+            self.stats['requests'] += 1
+            if cacheable and response.status_code == 200:
+                size = len(response.content)
+                if self._cached_bytes + size <= MAX_CACHE_BYTES:
+                    self._cache[url] = response
+                    self._cached_bytes += size
+        return response
+
+
+def build_section(name, session, is_daily_run):
+    """Instantiate a section scraper wired to the shared session"""
+    module_name, class_name, accepts_daily = SECTIONS[name]
+    module = importlib.import_module(module_name)
+    scraper_class = getattr(module, class_name)
+    scraper = scraper_class(is_daily_run=is_daily_run) if accepts_daily else scraper_class()
+
+    scraper.session = session
+    # Pacing happens in the shared session, once per actual network request
+    scraper.random_delay = lambda: None
+    return scraper
+
+
+def warm_session(session):
+    """Visit the home page once to collect cookies for every section"""
+    try:
+        logger.info("Establishing shared session with FMA website...")
+        session.get(BASE_URL).raise_for_status()
+        logger.info("Session established successfully")
+        return True
+    except Exception as e:
+        logger.error(f"Failed to establish session: {str(e)}")
+        return False
+
+
+def run_section(name, scraper):
+    started = time.time()
+    logger.info(f"Starting section: {name}")
+    scraper.run()
+    return time.time() - started
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='FMA NZ library crawler (all sections)')
+    parser.add_argument('--daily', action='store_true',
+                        help='Run in daily mode (sections that support it only scrape recent items)')
+    parser.add_argument('--sections', nargs='+', choices=list(SECTIONS), default=list(SECTIONS),
+                        help='Sections to crawl (default: all)')
+    args = parser.parse_args()
+
+    ledger = RequestLedger(logger=logger)
+    session = SharedFMASession(ledger)
+    started = time.time()
+
+    try:
+        scrapers = {name: build_section(name, session, args.daily) for name in args.sections}
+
+        # Headers and retry strategy come from the section scrapers' own setup
+        next(iter(scrapers.values())).setup_session()
+        if not warm_session(session):
+            logger.error("Failed to establish session. Exiting.")
+            return
+
+        failed = []
+        with ThreadPoolExecutor(max_workers=len(scrapers), thread_name_prefix="fma") as executor:
+            futures = {executor.submit(run_section, name, scraper): name
+                       for name, scraper in scrapers.items()}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    elapsed = future.result()
+                    logger.info(f"Section {name} finished in {elapsed:.0f}s")
+                except Exception as e:
+                    failed.append(name)
+                    logger.error(f"Section {name} failed: {str(e)}")
+
+        stats = session.stats
+        logger.info(f"FMA crawl completed in {time.time() - started:.0f}s: "
+                    f"{stats['requests']} requests, {stats['cache_hits']} served from cache, "
+                    f"{stats['waited']:.0f}s waiting for the host budget")
+        if failed:
+            logger.error(f"Failed sections: {', '.join(failed)}")
+            sys.exit(1)
+    finally:
+        session.close()
+        ledger.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -8,7 +8,6 @@ with support for pagination, PDF extraction, and deduplication.
 import requests
 from bs4 import BeautifulSoup
 import json
-import csv
 import os
 import re
 import time
@@ -23,6 +22,11 @@ from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 import random
 from fake_useragent import UserAgent
+import sys
+
+# Shared helpers live in Scripts/common
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.table_export import TableExport
 
 # Configuration
 BASE_URL = "https://www.fma.govt.nz"
@@ -321,7 +325,7 @@ class FMAArticleScraper:
             with open(ARTICLES_JSON, 'w', encoding='utf-8') as f:
                 json.dump(articles, f, indent=2, ensure_ascii=False)
             
-            # Save CSV
+            # Save CSV (only new or changed rows are written)
             if articles:
                 fieldnames = [
                     'id', 'url', 'title', 'description', 'theme', 
@@ -329,16 +333,9 @@ class FMAArticleScraper:
                     'image_url', 'related_links', 'pdf_links', 'content_length'
                 ]
                 
-                with open(ARTICLES_CSV, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.DictWriter(f, fieldnames=fieldnames)
-                    writer.writeheader()
-                    
-                    for article in articles:
-                        # Convert lists to strings for CSV
-                        csv_article = article.copy()
-                        csv_article['related_links'] = json.dumps(article.get('related_links', []))
-                        csv_article['pdf_links'] = json.dumps(article.get('pdf_links', []))
-                        writer.writerow(csv_article)
+                TableExport(ARTICLES_CSV, fieldnames,
+                            list_columns=('related_links', 'pdf_links'),
+                            logger=logger).export(articles)
             
             logger.info(f"Saved {len(articles)} articles to {ARTICLES_JSON} and {ARTICLES_CSV}")
             
@@ -8,7 +8,6 @@ with support for pagination, comprehensive PDF extraction, and deduplication.
 import requests
 from bs4 import BeautifulSoup
 import json
-import csv
 import os
 import re
 import time
@@ -23,6 +22,11 @@ from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 import random
 from fake_useragent import UserAgent
+import sys
+
+# Shared helpers live in Scripts/common
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.table_export import TableExport
 
 # Configuration
 BASE_URL = "https://www.fma.govt.nz"
@@ -474,7 +478,7 @@ class FMAGuidanceScraper:
             with open(GUIDANCE_JSON, 'w', encoding='utf-8') as f:
                 json.dump(guidance_docs, f, indent=2, ensure_ascii=False)
             
-            # Save CSV
+            # Save CSV (only new or changed rows are written)
             if guidance_docs:
                 fieldnames = [
                     'id', 'url', 'title', 'description', 'category', 'guidance_type',
@@ -483,18 +487,9 @@ class FMAGuidanceScraper:
                     'content_length', 'pdf_count'
                 ]
                 
-                with open(GUIDANCE_CSV, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.DictWriter(f, fieldnames=fieldnames)
-                    writer.writeheader()
-                    
-                    for doc in guidance_docs:
-                        # Convert complex data to strings for CSV
-                        csv_doc = doc.copy()
-                        csv_doc['related_links'] = json.dumps(doc.get('related_links', []))
-                        csv_doc['pdf_links'] = json.dumps(doc.get('pdf_links', []))
-                        # Remove complex nested data from CSV
-                        csv_doc.pop('pdf_content', None)
-                        writer.writerow(csv_doc)
+                TableExport(GUIDANCE_CSV, fieldnames,
+                            list_columns=('related_links', 'pdf_links'),
+                            logger=logger).export(guidance_docs)
             
             logger.info(f"Saved {len(guidance_docs)} guidance documents to {GUIDANCE_JSON} and {GUIDANCE_CSV}")
             
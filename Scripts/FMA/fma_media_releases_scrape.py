@@ -8,7 +8,6 @@ with support for pagination, comprehensive PDF extraction, and deduplication.
 import requests
 from bs4 import BeautifulSoup
 import json
-import csv
 import os
 import re
 import time
@@ -23,6 +22,11 @@ from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 import random
 from fake_useragent import UserAgent
+import sys
+
+# Shared helpers live in Scripts/common
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.table_export import TableExport
 
 # Configuration
 BASE_URL = "https://www.fma.govt.nz"
@@ -501,7 +505,7 @@ class FMAMediaReleasesScraper:
             with open(MEDIA_RELEASES_JSON, 'w', encoding='utf-8') as f:
                 json.dump(releases, f, indent=2, ensure_ascii=False)
             
-            # Save CSV
+            # Save CSV (only new or changed rows are written)
             if releases:
                 fieldnames = [
                     'id', 'url', 'title', 'description', 'release_date', 'release_type',
@@ -509,18 +513,9 @@ class FMAMediaReleasesScraper:
                     'image_url', 'related_links', 'pdf_links', 'content_length', 'pdf_count'
                 ]
                 
-                with open(MEDIA_RELEASES_CSV, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.DictWriter(f, fieldnames=fieldnames)
-                    writer.writeheader()
-                    
-                    for release in releases:
-                        # Convert complex data to strings for CSV
-                        csv_release = release.copy()
-                        csv_release['related_links'] = json.dumps(release.get('related_links', []))
-                        csv_release['pdf_links'] = json.dumps(release.get('pdf_links', []))
-                        # Remove complex nested data from CSV
-                        csv_release.pop('pdf_content', None)
-                        writer.writerow(csv_release)
+                TableExport(MEDIA_RELEASES_CSV, fieldnames,
+                            list_columns=('related_links', 'pdf_links'),
+                            logger=logger).export(releases)
             
             logger.info(f"Saved {len(releases)} media releases to {MEDIA_RELEASES_JSON} and {MEDIA_RELEASES_CSV}")
             
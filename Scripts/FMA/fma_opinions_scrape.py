@@ -8,7 +8,6 @@ with support for pagination, comprehensive PDF extraction, and deduplication.
 import requests
 from bs4 import BeautifulSoup
 import json
-import csv
 import os
 import re
 import time
@@ -23,6 +22,11 @@ from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 import random
 from fake_useragent import UserAgent
+import sys
+
+# Shared helpers live in Scripts/common
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.table_export import TableExport
 
 # Configuration
 BASE_URL = "https://www.fma.govt.nz"
@@ -525,7 +529,7 @@ class FMAOpinionsScraper:
             with open(OPINIONS_JSON, 'w', encoding='utf-8') as f:
                 json.dump(opinions, f, indent=2, ensure_ascii=False)
             
-            # Save CSV
+            # Save CSV (only new or changed rows are written)
             if opinions:
                 fieldnames = [
                     'id', 'url', 'title', 'description', 'category', 'publication_date',
@@ -534,18 +538,9 @@ class FMAOpinionsScraper:
                     'content_length', 'pdf_count'
                 ]
                 
-                with open(OPINIONS_CSV, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.DictWriter(f, fieldnames=fieldnames)
-                    writer.writeheader()
-                    
-                    for opinion in opinions:
-                        # Convert complex data to strings for CSV
-                        csv_opinion = opinion.copy()
-                        csv_opinion['related_links'] = json.dumps(opinion.get('related_links', []))
-                        csv_opinion['pdf_links'] = json.dumps(opinion.get('pdf_links', []))
-                        # Remove complex nested data from CSV
-                        csv_opinion.pop('pdf_content', None)
-                        writer.writerow(csv_opinion)
+                TableExport(OPINIONS_CSV, fieldnames,
+                            list_columns=('related_links', 'pdf_links'),
+                            logger=logger).export(opinions)
             
             logger.info(f"Saved {len(opinions)} opinions to {OPINIONS_JSON} and {OPINIONS_CSV}")
             
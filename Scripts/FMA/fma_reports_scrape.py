@@ -8,7 +8,6 @@ with support for pagination, comprehensive PDF extraction, and deduplication.
 import requests
 from bs4 import BeautifulSoup
 import json
-import csv
 import os
 import re
 import time
@@ -23,6 +22,11 @@ from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 import random
 from fake_useragent import UserAgent
+import sys
+
+# Shared helpers live in Scripts/common
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.table_export import TableExport
 
 # Configuration
 BASE_URL = "https://www.fma.govt.nz"
@@ -588,7 +592,7 @@ class FMAReportsScraper:
             with open(REPORTS_JSON, 'w', encoding='utf-8') as f:
                 json.dump(reports, f, indent=2, ensure_ascii=False)
             
-            # Save CSV
+            # Save CSV (only new or changed rows are written)
             if reports:
                 fieldnames = [
                     'id', 'url', 'title', 'description', 'category', 'publication_date',
@@ -596,18 +600,9 @@ class FMAReportsScraper:
                     'image_url', 'related_links', 'pdf_links', 'content_length', 'pdf_count'
                 ]
                 
-                with open(REPORTS_CSV, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.DictWriter(f, fieldnames=fieldnames)
-                    writer.writeheader()
-                    
-                    for report in reports:
-                        # Convert complex data to strings for CSV
-                        csv_report = report.copy()
-                        csv_report['related_links'] = json.dumps(report.get('related_links', []))
-                        csv_report['pdf_links'] = json.dumps(report.get('pdf_links', []))
-                        # Remove complex nested data from CSV
-                        csv_report.pop('pdf_content', None)
-                        writer.writerow(csv_report)
+                TableExport(REPORTS_CSV, fieldnames,
+                            list_columns=('related_links', 'pdf_links'),
+                            logger=logger).export(reports)
             
             logger.info(f"Saved {len(reports)} reports to {REPORTS_JSON} and {REPORTS_CSV}")
             
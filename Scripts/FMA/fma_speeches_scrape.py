@@ -8,7 +8,6 @@ with support for pagination, comprehensive PDF extraction, and deduplication.
 import requests
 from bs4 import BeautifulSoup
 import json
-import csv
 import os
 import re
 import time
@@ -23,6 +22,11 @@ from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 import random
 from fake_useragent import UserAgent
+import sys
+
+# Shared helpers live in Scripts/common
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.table_export import TableExport
 
 # Configuration
 BASE_URL = "https://www.fma.govt.nz"
@@ -578,7 +582,7 @@ class FMASpeechesScraper:
             with open(SPEECHES_JSON, 'w', encoding='utf-8') as f:
                 json.dump(speeches, f, indent=2, ensure_ascii=False)
             
-            # Save CSV
+            # Save CSV (only new or changed rows are written)
             if speeches:
                 fieldnames = [
                     'id', 'url', 'title', 'description', 'category', 'publication_date',
@@ -587,19 +591,9 @@ class FMASpeechesScraper:
                     'content_length', 'pdf_count'
                 ]
                 
-                with open(SPEECHES_CSV, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.DictWriter(f, fieldnames=fieldnames)
-                    writer.writeheader()
-                    
-                    for speech in speeches:
-                        # Convert complex data to strings for CSV
-                        csv_speech = speech.copy()
-                        csv_speech['tags'] = json.dumps(speech.get('tags', []))
-                        csv_speech['related_links'] = json.dumps(speech.get('related_links', []))
-                        csv_speech['pdf_links'] = json.dumps(speech.get('pdf_links', []))
-                        # Remove complex nested data from CSV
-                        csv_speech.pop('pdf_content', None)
-                        writer.writerow(csv_speech)
+                TableExport(SPEECHES_CSV, fieldnames,
+                            list_columns=('tags', 'related_links', 'pdf_links'),
+                            logger=logger).export(speeches)
             
             logger.info(f"Saved {len(speeches)} speeches to {SPEECHES_JSON} and {SPEECHES_CSV}")
             
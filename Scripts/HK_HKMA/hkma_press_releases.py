@@ -11,6 +11,7 @@ import hashlib
 import time
 import random
 import re
+import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Set, Optional
@@ -26,6 +27,10 @@ from PIL import Image
 import io
 import pandas as pd
 
+# Shared helpers live in Scripts/common
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.csv_ingest import csv_to_text
+
 # Configuration
 CONFIG = {
     "base_url": "https://www.hkma.gov.hk",
@@ -566,17 +571,8 @@ class HKMAScraper:
     def _extract_csv_text(self, content: bytes) -> str:
         """Extract text from CSV files."""
         try:
-            # Try different encodings
-            for encoding in ['utf-8', 'latin-1', 'iso-8859-1']:
-                try:
-                    csv_text = content.decode(encoding)
-                    df = pd.read_csv(io.StringIO(csv_text))
-                    return df.to_string(index=False)
-                except UnicodeDecodeError:
-                    continue
-            
-            logger.warning("Could not decode CSV with common encodings")
-            return ""
+            # Encoding and delimiter are sniffed from a prefix, then parsed once
+            return csv_to_text(content, index=False)
             
         except Exception as e:
             logger.error(f"Error extracting CSV: {e}")
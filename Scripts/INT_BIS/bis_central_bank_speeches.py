@@ -11,6 +11,7 @@ pip install requests beautifulsoup4 pandas fake-useragent PyMuPDF openpyxl tikto
 import requests
 import json
 import os
+import sys
 import time
 import re
 import zipfile
@@ -29,7 +30,11 @@ from fake_useragent import UserAgent
 import fitz  # PyMuPDF for PDF extraction
 import openpyxl
 from openpyxl import load_workbook
-import tiktoken
+
+# Shared helpers live in Scripts/common
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.near_duplicates import flag_near_duplicates
+from common.tokens import TokenCounter
 
 # Selenium imports for JavaScript handling
 try:
@@ -61,7 +66,9 @@ class BISSpeechesScraper:
         self.ua = UserAgent()
         self.driver = None
         self.existing_urls = set()
-        self.encoding = tiktoken.get_encoding("cl100k_base")  # GPT-4 tokenizer
+        # cl100k_base (GPT-4) counts, batched at save time and cached by content hash
+        self.token_counter = TokenCounter(cache_path=DATA_DIR / "cache" / "token_counts.json")
+        self._token_texts: Dict[str, str] = {}
         
         # Create data directory
         DATA_DIR.mkdir(exist_ok=True)
@@ -161,13 +168,15 @@ class BISSpeechesScraper:
     
     def count_tokens(self, text: str) -> int:
         """Count tokens using tiktoken encoding"""
-        if not text:
-            return 0
-        try:
-            return len(self.encoding.encode(str(text)))
-        except Exception:
-            # Fallback to word count approximation
-            return int(len(str(text).split()) * 1.3)
+        return self.token_counter.count(text)
+    
+    def fill_token_counts(self, speeches: List[Dict[str, Any]]):
+        """Count tokens for every scraped speech in one batched tokenizer call"""
+        pending = [speech for speech in speeches if speech.get('url') in self._token_texts]
+        texts = [self._token_texts.pop(speech['url']) for speech in pending]
+        for speech, count in zip(pending, self.token_counter.count_many(texts)):
+            speech['token_count'] = count
+        self.token_counter.save()
     
     def is_text_corrupted(self, text: str) -> bool:
         """Definitive corruption detection for text content"""
@@ -548,15 +557,15 @@ class BISSpeechesScraper:
             # Extract PDF content directly
             pdf_text = self.extract_pdf_text(url)
             
-            # Calculate token count
-            token_count = self.count_tokens(pdf_text)
+            # Token count is filled in by fill_token_counts (one batch per run)
+            self._token_texts[url] = pdf_text
             
             # Build final speech data for PDF-only content
             return {
                 **speech_data,
                 'scraped_date': datetime.now().isoformat(),
                 'content': pdf_text if pdf_text else f"Speech Document: {speech_data['headline']}\n\nPDF content could not be extracted cleanly.",
-                'token_count': token_count,
+                'token_count': 0,
                 'related_links': [],
                 'associated_image': "",
                 'attachments': {
@@ -668,16 +677,17 @@ class BISSpeechesScraper:
         canonical_content, content_source = self.choose_canonical_content(web_content, pdf_text)
         print(f"  Content decision: {content_source}")
         
-        # Calculate total token count across chosen content and attachments
+        # Total token count across chosen content and attachments is filled in
+        # by fill_token_counts (one batch per run)
         all_text = canonical_content + attachments['pdf_text'] + attachments['excel_data'] + attachments['tables']
-        token_count = self.count_tokens(all_text)
+        self._token_texts[url] = all_text
         
         # Build final speech data
         return {
             **speech_data,
             'scraped_date': datetime.now().isoformat(),
             'content': canonical_content,
-            'token_count': token_count,
+            'token_count': 0,
             'related_links': related_links,
             'associated_image': associated_image,
             'attachments': attachments
@@ -818,6 +828,8 @@ class BISSpeechesScraper:
     
     def save_data(self, speeches: List[Dict[str, Any]]):
         """Save scraped data to JSON file with deduplication"""
+        self.fill_token_counts(speeches)
+        
         # Load existing data
         existing_data = []
         if OUTPUT_FILE.exists():
@@ -831,6 +843,11 @@ class BISSpeechesScraper:
         existing_urls = {item.get('url') for item in existing_data if item.get('url')}
         new_speeches = [speech for speech in speeches if speech.get('url') not in existing_urls]
         
+        # BIS republishes speeches already scraped from the central banks' own sites
+        flagged = flag_near_duplicates(new_speeches, OUTPUT_FILE)
+        if flagged:
+            print(f"Flagged {flagged} speeches as near duplicates of existing documents")
+        
         combined_data = existing_data + new_speeches
         
         # Sort by published date (newest first)
@@ -8,6 +8,7 @@ Extracts articles, PDFs, Excel files, and metadata with anti-bot evasion
 import requests
 import json
 import os
+import sys
 import time
 import re
 import zipfile
@@ -25,7 +26,10 @@ from fake_useragent import UserAgent
 import fitz  # PyMuPDF for PDF extraction
 import openpyxl
 from openpyxl import load_workbook
-import tiktoken
+
+# Shared helpers live in Scripts/common
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.tokens import TokenCounter
 
 # Optional Selenium imports for JavaScript handling
 try:
@@ -58,7 +62,9 @@ class BISScraper:
         self.driver = None
         self.setup_session()
         self.existing_urls = set()
-        self.encoding = tiktoken.get_encoding("cl100k_base")  # GPT-4 tokenizer
+        # cl100k_base (GPT-4) counts, batched at save time and cached by content hash
+        self.token_counter = TokenCounter(cache_path=DATA_DIR / "cache" / "token_counts.json")
+        self._token_texts: Dict[str, str] = {}
         
         # Create data directory
         DATA_DIR.mkdir(exist_ok=True)
@@ -147,13 +153,15 @@ class BISScraper:
     
     def count_tokens(self, text: str) -> int:
         """Count tokens using tiktoken encoding"""
-        if not text:
-            return 0
-        try:
-            return len(self.encoding.encode(text))
-        except Exception:
-            # Fallback to simple word count * 1.3 approximation
-            return int(len(text.split()) * 1.3)
+        return self.token_counter.count(text)
+    
+    def fill_token_counts(self, articles: List[Dict[str, Any]]):
+        """Count tokens for every scraped article in one batched tokenizer call"""
+        pending = [article for article in articles if article.get('url') in self._token_texts]
+        texts = [self._token_texts.pop(article['url']) for article in pending]
+        for article, count in zip(pending, self.token_counter.count_many(texts)):
+            article['token_count'] = count
+        self.token_counter.save()
     
     def safe_request(self, url: str, retries: int = 3) -> Optional[requests.Response]:
         """Make a safe request with retries and error handling"""
@@ -365,15 +373,15 @@ class BISScraper:
             # Extract PDF content directly
             pdf_text = self.extract_pdf_text(url)
             
-            # Calculate token count
-            token_count = self.count_tokens(pdf_text)
+            # Token count is filled in by fill_token_counts (one batch per run)
+            self._token_texts[url] = pdf_text
             
             # Build final article data for PDF-only content
             final_data = {
                 **article_data,
                 'scraped_date': datetime.now().isoformat(),
                 'content': f"PDF Document: {article_data['headline']}\n\nThis content is available as a PDF document.",
-                'token_count': token_count,
+                'token_count': 0,
                 'related_links': [],
                 'associated_image': "",
                 'attachments': {
@@ -451,16 +459,16 @@ class BISScraper:
                 attachments['excel_data'] += self.extract_zip_contents(file_url) + "\n\n"
                 time.sleep(1)
         
-        # Calculate total token count
+        # Total token count is filled in by fill_token_counts (one batch per run)
         all_text = main_content + attachments['pdf_text'] + attachments['excel_data'] + attachments['tables']
-        token_count = self.count_tokens(all_text)
+        self._token_texts[url] = all_text
         
         # Build final article data
         final_data = {
             **article_data,
             'scraped_date': datetime.now().isoformat(),
             'content': main_content,
-            'token_count': token_count,
+            'token_count': 0,
             'related_links': related_links,
             'associated_image': associated_image,
             'attachments': attachments
@@ -574,6 +582,8 @@ class BISScraper:
     
     def save_data(self, articles: List[Dict[str, Any]]):
         """Save scraped data to JSON file"""
+        self.fill_token_counts(articles)
+        
         # Load existing data
         existing_data = []
         if OUTPUT_FILE.exists():
@@ -22,6 +22,7 @@ import json
 import hashlib
 import logging
 import re
+import sys
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, List, Optional, Set
@@ -37,6 +38,10 @@ from pdf2image import convert_from_bytes
 import io
 import pandas as pd
 
+# Shared helpers live in Scripts/common
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.csv_ingest import csv_to_text
+
 # Configuration
 START_DATE = datetime(2025, 9, 1)  # Configurable start date
 BASE_URL = "https://www.fsa.go.jp"
@@ -787,9 +792,8 @@ class FSAScraper:
     def _extract_csv_text(self, csv_bytes: bytes) -> str:
         """Extract text from CSV bytes"""
         try:
-            csv_text = csv_bytes.decode('utf-8')
-            df = pd.read_csv(io.StringIO(csv_text))
-            return df.to_string()
+            # Encoding and delimiter are sniffed from a prefix, then parsed once
+            return csv_to_text(csv_bytes, index=True)
             
         except Exception as e:
             logger.error(f"Error extracting CSV text: {e}")
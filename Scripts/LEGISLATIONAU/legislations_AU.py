@@ -22,8 +22,9 @@ from urllib.parse import urljoin, quote
 from dataclasses import dataclass, asdict
 import traceback
 import re
+from html import unescape
 from concurrent.futures import ThreadPoolExecutor, as_completed
-import threading
+import queue
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -33,6 +34,20 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 
+# Shared helpers live in Scripts/common
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.async_http import fetch_all
+from common.checkpoint import Checkpoint, resume_requested
+from common.chunker import ChunkWriter, chunks_requested
+from common.documents import document_to_text
+from common.segment_store import SegmentStore
+
+# Direct document fetching (--fetch-mode http)
+HTTP_MIN_INTERVAL = 0.25     # seconds between request starts to legislation.gov.au
+MIN_DOCUMENT_CHARS = 100     # shorter documents are treated as unresolved
+DOCUMENT_LINK_PATTERN = re.compile(r'(?:src|href)="(?P<url>[^"]*(?:epub|/original/)[^"]*)"', re.IGNORECASE)
+PAGE_DATE_PATTERN = re.compile(r'class="[^"]*date-effective-start[^"]*"[^>]*>\s*([^<]+?)\s*<')
+
 
 @dataclass
 class LegislationItem:
@@ -48,6 +63,14 @@ class LegislationItem:
     content_length: int = 0
 
 
+@dataclass
+class WorkerStats:
+    """Utilisation of one content driver during the extraction phase"""
+    items: int = 0
+    failures: int = 0
+    busy_seconds: float = 0.0
+
+
 class PerformanceMonitor:
     """Monitor and log performance metrics"""
     
@@ -90,7 +113,8 @@ class ProductionLegislationScraper:
     
     def __init__(self, max_pages: Optional[int] = 5, enable_headless: bool = True, 
                  incremental_mode: bool = True, days_lookback: int = 7,
-                 max_workers: int = 3, page_timeout: int = 15):
+                 max_workers: int = 3, page_timeout: int = 15, resume: bool = False,
+                 fetch_mode: str = 'http', write_chunks: bool = False):
         """
         Initialize high-performance scraper
         
@@ -101,6 +125,10 @@ class ProductionLegislationScraper:
             days_lookback: Days to look back when no previous sync
             max_workers: Max concurrent workers for content extraction
             page_timeout: Page load timeout in seconds
+            resume: Continue from the last checkpoint if one exists
+            fetch_mode: 'http' reads documents directly over HTTP (browser only for
+                the search list and unresolved items); 'browser' renders every title page
+            write_chunks: Also write token-bounded chunks of new/changed items to data/chunks
         """
         self.max_pages = max_pages or 10
         self.enable_headless = enable_headless
@@ -108,6 +136,9 @@ class ProductionLegislationScraper:
         self.days_lookback = days_lookback
         self.max_workers = max_workers
         self.page_timeout = page_timeout
+        self.resume = resume
+        self.fetch_mode = fetch_mode
+        self.write_chunks = write_chunks
         
         # Performance optimizations
         self.fast_mode = True  # Skip unnecessary waits
@@ -116,11 +147,14 @@ class ProductionLegislationScraper:
         # State management
         self.driver = None
         self.content_drivers = []  # Pool of drivers for content extraction
+        self.driver_pool = queue.Queue()  # Indices of content drivers free to lease
+        self.worker_stats: Dict[int, WorkerStats] = {}
+        self.content_extraction_seconds = 0.0
         self.shutdown_requested = False
         self.processed_count = 0
         self.skipped_count = 0
         self.error_count = 0
-        self.driver_lock = threading.Lock()
+        self.run_completed = False
         
         # Setup directories
         self.data_dir = Path("data")
@@ -136,7 +170,15 @@ class ProductionLegislationScraper:
         # Performance monitoring
         self.perf = PerformanceMonitor(self.logger)
         
+        # Checkpoint of the item list and extracted content, so a killed run can resume
+        self.checkpoint = Checkpoint(
+            self.state_dir / "checkpoint.json",
+            run_key='incremental' if self.incremental_mode else 'full',
+            logger=self.logger
+        )
+        
         # Load existing data for duplicate detection
+        self.stores: Dict[str, SegmentStore] = {}
         self.existing_identifiers = self.load_existing_identifiers()
         self.last_sync_time = self.load_last_sync_time()
         
@@ -186,29 +228,19 @@ class ProductionLegislationScraper:
         signal.signal(signal.SIGTERM, signal_handler)
         
     def load_existing_identifiers(self) -> Dict[str, Set[str]]:
-        """Load existing identifiers efficiently"""
+        """Load existing identifiers from each type's segment index"""
         existing = {
             'Acts': set(),
             'Legislative Instruments': set(),
             'Notifiable Instruments': set()
         }
         
-        # Load from all files since we're processing all types together now
+        # Load from all stores since we're processing all types together now
         for leg_type in existing.keys():
-            filename = f"{leg_type.lower().replace(' ', '_')}.json"
-            filepath = self.data_dir / filename
-            
-            if filepath.exists():
-                try:
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                    
-                    for item_data in data.get('items', []):
-                        if 'identifier' in item_data:
-                            existing[leg_type].add(item_data['identifier'])
-                            
-                except Exception as e:
-                    self.logger.error(f"❌ Error loading existing {leg_type}: {e}")
+            try:
+                existing[leg_type] = self.get_store(leg_type).ids()
+            except Exception as e:
+                self.logger.error(f"❌ Error loading existing {leg_type}: {e}")
         
         return existing
         
@@ -317,15 +349,9 @@ class ProductionLegislationScraper:
             # Main navigation driver
             self.driver = self.create_optimized_driver(for_content=False)
             
-            # Pool of content extraction drivers (lighter weight)
-            self.content_drivers = []
-            for i in range(self.max_workers):
-                try:
-                    content_driver = self.create_optimized_driver(for_content=True)
-                    self.content_drivers.append(content_driver)
-                    self.logger.info(f"✅ Content driver {i+1}/{self.max_workers} ready")
-                except Exception as e:
-                    self.logger.warning(f"⚠️ Failed to create content driver {i+1}: {e}")
+            # In http mode content drivers are only started if some items need the browser
+            if self.fetch_mode == 'browser':
+                self.setup_content_drivers()
                     
             self.perf.end_timer("driver_setup")
             self.logger.info(f"🏁 Driver pool ready: 1 main + {len(self.content_drivers)} content drivers")
@@ -336,6 +362,20 @@ class ProductionLegislationScraper:
             self.logger.error(f"❌ Driver pool setup failed: {e}")
             return False
             
+    def setup_content_drivers(self) -> bool:
+        """Create the pool of content extraction drivers (lighter weight)"""
+        for i in range(self.max_workers):
+            try:
+                content_driver = self.create_optimized_driver(for_content=True)
+                self.driver_pool.put(len(self.content_drivers))
+                self.worker_stats[len(self.content_drivers)] = WorkerStats()
+                self.content_drivers.append(content_driver)
+                self.logger.info(f"✅ Content driver {i+1}/{self.max_workers} ready")
+            except Exception as e:
+                self.logger.warning(f"⚠️ Failed to create content driver {i+1}: {e}")
+                
+        return bool(self.content_drivers)
+        
     def get_cutoff_date(self) -> datetime:
         """Get cutoff date for incremental processing"""
         if self.last_sync_time:
@@ -712,8 +752,9 @@ class ProductionLegislationScraper:
         self.perf.start_timer("content_extraction")
         self.logger.info(f"🔄 Starting parallel content extraction for {len(items_list)} items")
         
-        # Process in batches to manage memory
-        batch_size = min(self.batch_size, len(items_list))
+        # Process in batches to manage memory (large enough that the per-batch
+        # barrier leaves few drivers idle as --max-workers grows)
+        batch_size = min(max(self.batch_size, self.max_workers * 5), len(items_list))
         
         for batch_start in range(0, len(items_list), batch_size):
             if self.shutdown_requested:
@@ -724,21 +765,32 @@ class ProductionLegislationScraper:
             
             self.logger.info(f"📦 Processing batch {batch_start//batch_size + 1}: items {batch_start+1}-{batch_end}")
             
-            # Process batch in parallel
+            remaining = batch
+            if self.fetch_mode == 'http':
+                http_items, remaining = self.extract_batch_http(batch)
+                for result in http_items:
+                    self.record_result(result, processed_items)
+                if remaining:
+                    self.logger.info(f"🌐 {len(remaining)} items not resolved over HTTP - using browser")
+                    
+            if not remaining or self.shutdown_requested:
+                continue
+                
+            if not self.content_drivers and not self.setup_content_drivers():
+                self.logger.error("❌ No content drivers available")
+                self.error_count += len(remaining)
+                continue
+            
+            # Process batch in parallel; each job leases a driver for its whole duration
             with ThreadPoolExecutor(max_workers=min(self.max_workers, len(self.content_drivers))) as executor:
                 # Submit jobs
                 future_to_item = {}
-                for i, item_data in enumerate(batch):
+                for item_data in remaining:
                     if self.shutdown_requested:
                         break
                         
-                    # Get available driver
-                    driver_index = i % len(self.content_drivers)
-                    driver = self.content_drivers[driver_index] if self.content_drivers else None
-                    
-                    if driver:
-                        future = executor.submit(self.extract_single_item_content, item_data, driver)
-                        future_to_item[future] = item_data
+                    future = executor.submit(self.extract_with_leased_driver, item_data)
+                    future_to_item[future] = item_data
                     
                 # Collect results
                 for future in as_completed(future_to_item):
@@ -749,10 +801,7 @@ class ProductionLegislationScraper:
                     try:
                         result = future.result(timeout=60)  # 60 second timeout per item
                         if result:
-                            processed_items.append(result)
-                            self.processed_count += 1
-                            self.perf.increment("items_processed")
-                            self.logger.info(f"✅ {result.identifier}: {result.content_length} chars")
+                            self.record_result(result, processed_items)
                         else:
                             self.error_count += 1
                             self.perf.increment("extraction_failures")
@@ -766,27 +815,131 @@ class ProductionLegislationScraper:
             if batch_end < len(items_list):
                 time.sleep(0.5)
                 
-        self.perf.end_timer("content_extraction")
+        self.content_extraction_seconds += self.perf.end_timer("content_extraction")
         self.logger.info(f"🎯 Content extraction complete: {len(processed_items)} items processed")
         
         return processed_items
         
+    def record_result(self, result: LegislationItem, processed_items: List[LegislationItem]):
+        """Collect a successfully extracted item and checkpoint it"""
+        processed_items.append(result)
+        self.checkpoint.mark_done(result.identifier, asdict(result))
+        self.processed_count += 1
+        self.perf.increment("items_processed")
+        self.logger.info(f"✅ {result.identifier}: {result.content_length} chars")
+        
+    def extract_batch_http(self, batch: List[Dict]) -> Tuple[List[LegislationItem], List[Dict]]:
+        """Fetch a batch's documents over HTTP; returns (extracted items, items left for the browser)"""
+        http_options = dict(per_host_limit=self.max_workers, min_interval=HTTP_MIN_INTERVAL,
+                            timeout=self.page_timeout * 2, logger=self.logger)
+        self.perf.start_timer("http_batch")
+        
+        # Title pages give the registration date and any document links they render
+        pages = fetch_all([self.get_content_url(item_data) for item_data in batch], **http_options)
+        
+        candidates = {}
+        page_dates = {}
+        for index, (item_data, page) in enumerate(zip(batch, pages)):
+            html = page.text if page.ok else ""
+            page_dates[index] = self.extract_page_registration_date_html(html)
+            for doc_key, urls in self.resolve_document_urls(item_data, html).items():
+                if urls:
+                    candidates[(index, doc_key)] = urls
+                    
+        # Each round fetches the next candidate URL of every unresolved document
+        texts = {}
+        while candidates and not self.shutdown_requested:
+            attempt = {key: urls.pop(0) for key, urls in candidates.items()}
+            responses = fetch_all(list(attempt.values()), **http_options)
+            
+            for (key, url), response in zip(attempt.items(), responses):
+                text = None
+                if response.ok:
+                    text = document_to_text(response.content, response.headers.get('content-type', ''),
+                                            response.final_url or url)
+                text = self.clean_text_fast(text or "")
+                
+                if len(text) >= MIN_DOCUMENT_CHARS and not self.is_navigation_content_fast(text):
+                    texts[key] = text
+                    del candidates[key]
+                    self.perf.increment("http_documents")
+                elif not candidates[key]:
+                    del candidates[key]
+                    
+        extracted, remaining = [], []
+        for index, item_data in enumerate(batch):
+            main_content = texts.get((index, 'main'), "")
+            item = None
+            if main_content:
+                item = self.create_item(item_data, main_content, texts.get((index, 'explanatory'), ""),
+                                        page_dates.get(index, ""))
+            if item:
+                extracted.append(item)
+            else:
+                remaining.append(item_data)
+                
+        self.perf.end_timer("http_batch")
+        return extracted, remaining
+        
+    def resolve_document_urls(self, item_data: Dict, html: str) -> Dict[str, List[str]]:
+        """Candidate document URLs per document ('main', plus 'explanatory' for instruments), EPUB first"""
+        found = {'main': []}
+        if item_data['type'] == "Legislative Instruments":
+            found['explanatory'] = []
+            
+        # Reader iframe / download links present in the served page
+        for match in DOCUMENT_LINK_PATTERN.finditer(html):
+            url = urljoin(self.BASE_URL, unescape(match.group('url')))
+            if re.search(r'pdf|word|docx?$', url, re.IGNORECASE):
+                continue
+            doc_key = 'explanatory' if '/es/' in url else 'main'
+            if doc_key in found and url not in found[doc_key]:
+                found[doc_key].append(url)
+                
+        # Published download path of the as-made version
+        reg_date = self.parse_date(item_data.get('registration_date', ''))
+        if reg_date and re.match(r'^[A-Z]\d{4}[A-Z]\d+$', item_data['identifier']):
+            version_url = f"{self.BASE_URL}/{item_data['identifier']}/asmade/{reg_date.strftime('%Y-%m-%d')}"
+            found['main'].append(f"{version_url}/text/original/epub")
+            if 'explanatory' in found:
+                found['explanatory'].append(f"{version_url}/es/original/epub")
+                
+        for urls in found.values():
+            urls.sort(key=lambda url: 0 if 'epub' in url.lower() else 1)
+        return found
+        
+    def extract_page_registration_date_html(self, html: str) -> str:
+        """Registration date from a served title page, if rendered server-side"""
+        match = PAGE_DATE_PATTERN.search(html or "")
+        return unescape(match.group(1)).strip() if match else ""
+        
+    def extract_with_leased_driver(self, item_data: Dict) -> Optional[LegislationItem]:
+        """Lease a free content driver, extract one item with it and return it to the pool"""
+        index = self.driver_pool.get()
+        stats = self.worker_stats[index]
+        started = time.time()
+        
+        try:
+            result = self.extract_single_item_content(item_data, self.content_drivers[index])
+            if result:
+                stats.items += 1
+            else:
+                stats.failures += 1
+            return result
+        finally:
+            # Only the leaseholder touches this driver's stats, so no lock is needed
+            stats.busy_seconds += time.time() - started
+            self.driver_pool.put(index)
+            
     def extract_single_item_content(self, item_data: Dict, driver: webdriver.Chrome) -> Optional[LegislationItem]:
         """Extract content for a single item using dedicated driver"""
         identifier = item_data['identifier']
         
         try:
-            with self.driver_lock:
-                # Navigate to content page
-                content_url = item_data['url']
-                if not content_url.endswith('/text'):
-                    content_url = content_url.replace('/asmade', '/asmade/text')
-                    if not content_url.endswith('/text'):
-                        content_url += '/text'
-                
-                driver.get(content_url)
-                time.sleep(1)
-                
+            # Navigate to content page (the driver is leased exclusively by this worker)
+            driver.get(self.get_content_url(item_data))
+            time.sleep(1)
+            
             # Extract registration date from content page
             page_registration_date = self.extract_page_registration_date_fast(driver)
             
@@ -799,34 +952,47 @@ class ProductionLegislationScraper:
             else:
                 main_content = self.extract_epub_iframe_content_fast(driver)
                 
-            # Use page registration date if available, otherwise use list date
-            final_registration_date = page_registration_date or item_data.get('registration_date', '')
-            
-            # Validate content
-            total_content_length = len(main_content) + len(explanatory_content)
-            if total_content_length < 50:
-                self.logger.warning(f"Very little content for {identifier}: {total_content_length} chars")
-                return None
-            
-            # Create item
-            item = LegislationItem(
-                identifier=identifier,
-                title=item_data['title'],
-                type=item_data['type'],
-                registration_date=final_registration_date,
-                url=item_data['url'],
-                content=main_content,
-                explanatory_content=explanatory_content,
-                scrape_timestamp=datetime.now().isoformat(),
-                content_length=total_content_length
-            )
-            
-            return item
+            return self.create_item(item_data, main_content, explanatory_content, page_registration_date)
             
         except Exception as e:
             self.logger.error(f"Content extraction failed for {identifier}: {e}")
             return None
             
+    def get_content_url(self, item_data: Dict) -> str:
+        """Text view URL of a title"""
+        content_url = item_data['url']
+        if not content_url.endswith('/text'):
+            content_url = content_url.replace('/asmade', '/asmade/text')
+            if not content_url.endswith('/text'):
+                content_url += '/text'
+        return content_url
+        
+    def create_item(self, item_data: Dict, main_content: str, explanatory_content: str,
+                    page_registration_date: str) -> Optional[LegislationItem]:
+        """Validate extracted content and build the item"""
+        identifier = item_data['identifier']
+        
+        # Use page registration date if available, otherwise use list date
+        final_registration_date = page_registration_date or item_data.get('registration_date', '')
+        
+        # Validate content
+        total_content_length = len(main_content) + len(explanatory_content)
+        if total_content_length < 50:
+            self.logger.warning(f"Very little content for {identifier}: {total_content_length} chars")
+            return None
+        
+        return LegislationItem(
+            identifier=identifier,
+            title=item_data['title'],
+            type=item_data['type'],
+            registration_date=final_registration_date,
+            url=item_data['url'],
+            content=main_content,
+            explanatory_content=explanatory_content,
+            scrape_timestamp=datetime.now().isoformat(),
+            content_length=total_content_length
+        )
+            
     def extract_page_registration_date_fast(self, driver: webdriver.Chrome) -> str:
         """Fast registration date extraction from content page"""
         try:
@@ -1029,64 +1195,89 @@ class ProductionLegislationScraper:
             self.save_type_data(leg_type, type_items)
             
     def save_type_data(self, leg_type: str, items: List[LegislationItem]):
-        """Save data for specific type with atomic operations"""
-        filename = f"{leg_type.lower().replace(' ', '_')}.json"
-        filepath = self.data_dir / filename
-        backup_filepath = filepath.with_suffix('.json.backup')
-        
+        """Append items to the type's segment store (only the new records are written)"""
         try:
-            # Load existing data
-            existing_items = {}
-            if filepath.exists():
-                try:
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                    for item_data in data.get('items', []):
-                        if 'identifier' in item_data:
-                            existing_items[item_data['identifier']] = item_data
-                except Exception as e:
-                    self.logger.warning(f"Error loading existing {leg_type}: {e}")
-            
-            # Merge new items
-            for item in items:
-                existing_items[item.identifier] = asdict(item)
-                
-            # Create output
-            output = {
-                'metadata': {
-                    'last_scraped': datetime.now().isoformat(),
-                    'total_count': len(existing_items),
-                    'legislation_type': leg_type,
-                    'scraper_version': '5.0.0'
-                },
-                'items': list(existing_items.values())
-            }
-            
-            # Atomic save
-            if filepath.exists():
-                filepath.replace(backup_filepath)
-                
-            temp_filepath = filepath.with_suffix('.json.tmp')
-            with open(temp_filepath, 'w', encoding='utf-8') as f:
-                json.dump(output, f, indent=2, ensure_ascii=False)
-                
-            temp_filepath.replace(filepath)
+            store = self.get_store(leg_type)
+            new_count = sum(1 for item in items if item.identifier not in store)
+            store.append(asdict(item) for item in items)
             
             # Update cache
             for item in items:
                 self.existing_identifiers[leg_type].add(item.identifier)
             
-            self.logger.info(f"Saved {len(existing_items)} {leg_type} ({len(items)} new)")
+            self.logger.info(f"Saved {len(store)} {leg_type} ({new_count} new)")
             
-            # Clean up backup
-            if backup_filepath.exists():
-                backup_filepath.unlink()
+            if self.write_chunks:
+                self.write_type_chunks(leg_type, items)
                 
         except Exception as e:
             self.logger.error(f"Error saving {leg_type}: {e}")
-            if backup_filepath.exists():
-                backup_filepath.replace(filepath)
-                
+            
+    def write_type_chunks(self, leg_type: str, items: List[LegislationItem]):
+        """Chunk instrument and explanatory text of items that are new or changed"""
+        writer = ChunkWriter(
+            self.data_dir / "chunks",
+            leg_type.lower().replace(' ', '_'),
+            text_fields=('content', 'explanatory_content'),
+            id_field='identifier',
+            metadata_fields=('identifier', 'title', 'type', 'registration_date', 'url'),
+            logger=self.logger
+        )
+        writer.update(asdict(item) for item in items)
+        writer.close()
+            
+    def get_store(self, leg_type: str) -> SegmentStore:
+        """Segment store for a legislation type, migrating a legacy combined file on first use"""
+        if leg_type not in self.stores:
+            store = SegmentStore(
+                self.data_dir,
+                leg_type.lower().replace(' ', '_'),
+                segment_key=self.segment_month,
+                metadata={'legislation_type': leg_type, 'scraper_version': '5.0.0'},
+                logger=self.logger
+            )
+            self.migrate_legacy_file(store)
+            self.stores[leg_type] = store
+        return self.stores[leg_type]
+        
+    def segment_month(self, record: Dict) -> str:
+        """Segment records by registration month"""
+        reg_date = self.parse_date(record.get('registration_date', ''))
+        return reg_date.strftime('%Y-%m') if reg_date else 'undated'
+        
+    def migrate_legacy_file(self, store: SegmentStore):
+        """One-off import of a pre-segment <type>.json into an empty store"""
+        legacy_filepath = self.data_dir / f"{store.name}.json"
+        if not legacy_filepath.exists() or len(store):
+            return
+            
+        try:
+            with open(legacy_filepath, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            items = [item for item in data.get('items', []) if 'identifier' in item]
+            store.append(items)
+            legacy_filepath.replace(legacy_filepath.with_suffix('.json.pre-segments'))
+            self.logger.info(f"Migrated {len(items)} records from {legacy_filepath.name} to segments")
+        except Exception as e:
+            self.logger.error(f"Error migrating {legacy_filepath.name}: {e}")
+            
+    def export_combined(self, output_dir: Path) -> List[Path]:
+        """Write the old single-file view (metadata + items) of every type"""
+        output_dir.mkdir(parents=True, exist_ok=True)
+        written = []
+        
+        for leg_type in self.existing_identifiers:
+            store = self.get_store(leg_type)
+            filepath = output_dir / f"{store.name}.json"
+            temp_filepath = filepath.with_suffix('.json.tmp')
+            with open(temp_filepath, 'w', encoding='utf-8') as f:
+                json.dump(store.load_combined(), f, indent=2, ensure_ascii=False)
+            temp_filepath.replace(filepath)
+            written.append(filepath)
+            self.logger.info(f"Exported {len(store)} {leg_type} to {filepath}")
+            
+        return written
+            
     def generate_performance_report(self, items: List[LegislationItem], total_time: float):
         """Generate detailed performance and summary report"""
         report = {
@@ -1098,7 +1289,8 @@ class ProductionLegislationScraper:
                     'max_pages': self.max_pages,
                     'max_workers': self.max_workers,
                     'incremental_mode': self.incremental_mode,
-                    'page_timeout': self.page_timeout
+                    'page_timeout': self.page_timeout,
+                    'fetch_mode': self.fetch_mode
                 }
             },
             'run_summary': {
@@ -1109,6 +1301,7 @@ class ProductionLegislationScraper:
                 'success_rate': round((len(items) / (len(items) + self.error_count)) * 100, 1) if (len(items) + self.error_count) > 0 else 0
             },
             'performance_counters': self.perf.get_stats(),
+            'worker_utilisation': self.get_worker_utilisation(),
             'summary_by_type': {}
         }
         
@@ -1158,6 +1351,25 @@ class ProductionLegislationScraper:
         for leg_type, stats in report['summary_by_type'].items():
             self.logger.info(f"{leg_type}: {stats['new_items']} new items")
             
+        for worker, stats in report['worker_utilisation'].items():
+            self.logger.info(f"{worker}: {stats['items']} items, {stats['utilisation_pct']:.1f}% busy")
+            
+    def get_worker_utilisation(self) -> Dict[str, Dict]:
+        """Per content driver: items handled and share of the extraction phase spent busy"""
+        phase_seconds = self.content_extraction_seconds
+        utilisation = {}
+        
+        for index, stats in sorted(self.worker_stats.items()):
+            utilisation[f"driver_{index + 1}"] = {
+                'items': stats.items,
+                'failures': stats.failures,
+                'busy_seconds': round(stats.busy_seconds, 2),
+                'utilisation_pct': round(stats.busy_seconds / phase_seconds * 100, 1) if phase_seconds > 0 else 0,
+                'seconds_per_item': round(stats.busy_seconds / stats.items, 2) if stats.items else None
+            }
+            
+        return utilisation
+        
     def cleanup_resources(self):
         """Clean up all resources efficiently"""
         try:
@@ -1177,8 +1389,14 @@ class ProductionLegislationScraper:
                     
             self.logger.info("All drivers closed")
             
-            # Save sync time
-            self.save_last_sync_time()
+            # Only advance the sync time once a run has finished; otherwise the
+            # checkpoint still holds items that a resumed run has to process
+            if self.run_completed:
+                self.checkpoint.clear()
+                self.save_last_sync_time()
+            else:
+                self.checkpoint.save()
+                self.logger.info(f"Run incomplete - checkpoint kept at {self.checkpoint.path} (use --resume)")
             
         except Exception as e:
             self.logger.error(f"Cleanup error: {e}")
@@ -1196,19 +1414,31 @@ class ProductionLegislationScraper:
             if not self.setup_driver_pool():
                 raise Exception("Driver pool setup failed")
                 
-            # Scrape legislation list (all types together)
-            self.logger.info("=== PHASE 1: SCRAPING LEGISLATION LIST ===")
-            items_list = self.scrape_legislation_list_optimized()
+            resumed_items = []
+            if self.resume and self.checkpoint.load() and 'items' in self.checkpoint.frontier:
+                # Skip the list phase and continue with the items not yet extracted
+                self.logger.info("=== PHASE 1: RESUMING LEGISLATION LIST FROM CHECKPOINT ===")
+                items_list = self.checkpoint.pending(self.checkpoint.frontier['items'],
+                                                     key=lambda item: item['identifier'])
+                resumed_items = [LegislationItem(**data) for data in self.checkpoint.outputs]
+                self.logger.info(f"Checkpoint: {len(resumed_items)} items already extracted, {len(items_list)} remaining")
+            else:
+                # Scrape legislation list (all types together)
+                self.logger.info("=== PHASE 1: SCRAPING LEGISLATION LIST ===")
+                items_list = self.scrape_legislation_list_optimized()
+                if items_list:
+                    self.checkpoint.set_frontier(items=items_list)
             
-            if not items_list:
+            if not items_list and not resumed_items:
                 self.logger.info("No new items found")
+                self.run_completed = not self.shutdown_requested
                 return
                 
             self.logger.info(f"Found {len(items_list)} items to process")
             
             # Extract content in parallel
             self.logger.info("=== PHASE 2: EXTRACTING CONTENT ===")
-            processed_items = self.extract_content_parallel(items_list)
+            processed_items = resumed_items + self.extract_content_parallel(items_list)
             
             if processed_items:
                 # Save data
@@ -1223,6 +1453,8 @@ class ProductionLegislationScraper:
             else:
                 self.logger.warning("No items were successfully processed")
                 
+            self.run_completed = not self.shutdown_requested
+                
         except Exception as e:
             self.logger.error(f"Critical error: {e}")
             self.logger.error(traceback.format_exc())
@@ -1255,6 +1487,17 @@ def main():
                        help='Process all items (disable incremental mode)')
     parser.add_argument('--visible', action='store_true',
                        help='Run Chrome in visible mode (for debugging)')
+    parser.add_argument('--fetch-mode', choices=['http', 'browser'], default='http',
+                       help='http: read documents directly over HTTP (browser only for the search '
+                            'list and unresolved items); browser: render every title page in Chrome')
+    parser.add_argument('--export-combined', metavar='DIR', nargs='?', const='data/combined',
+                       help='Write the combined per-type JSON view (metadata + items) to DIR and exit')
+    parser.add_argument('--resume', action='store_true',
+                       help='Continue from the last checkpoint of an interrupted run '
+                            '(also enabled by SCRAPER_RESUME=1)')
+    parser.add_argument('--chunks', action='store_true',
+                       help='Also write token-bounded JSONL chunks of new/changed items to '
+                            'data/chunks (also enabled by SCRAPER_CHUNKS=1)')
     
     # Quick test modes
     parser.add_argument('--test', action='store_true',
@@ -1266,6 +1509,12 @@ def main():
     
     args = parser.parse_args()
     
+    if args.export_combined:
+        scraper = ProductionLegislationScraper(max_pages=args.max_pages)
+        for filepath in scraper.export_combined(Path(args.export_combined)):
+            print(f"Exported {filepath}")
+        return
+        
     # Apply presets
     if args.test:
         args.max_pages = 2
@@ -1289,6 +1538,9 @@ def main():
     print(f"📅 Lookback: {args.days_lookback} days")
     print(f"🔄 Mode: {'Full' if args.full_mode else 'Incremental'}")
     print(f"👁️ Display: {'Visible' if args.visible else 'Headless'}")
+    print(f"📥 Fetch mode: {args.fetch_mode}")
+    print(f"♻️ Resume: {'Yes' if args.resume or resume_requested() else 'No'}")
+    print(f"🧩 Chunks: {'Yes' if args.chunks or chunks_requested() else 'No'}")
     print("=" * 60)
     
     # Run scraper
@@ -1298,7 +1550,10 @@ def main():
         incremental_mode=not args.full_mode,
         days_lookback=args.days_lookback,
         max_workers=args.max_workers,
-        page_timeout=args.page_timeout
+        page_timeout=args.page_timeout,
+        resume=args.resume or resume_requested(),
+        fetch_mode=args.fetch_mode,
+        write_chunks=args.chunks or chunks_requested()
     )
     
     scraper.run()
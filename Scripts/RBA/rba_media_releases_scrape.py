@@ -20,7 +20,6 @@ from datetime import datetime, timezone
 from typing import List, Dict, Set, Iterator, Generator
 from urllib.parse import urljoin, urlparse
 
-import pandas as pd
 import requests
 import urllib3
 from bs4 import BeautifulSoup
@@ -35,6 +34,13 @@ from selenium.webdriver.support.ui import WebDriverWait
 import PyPDF2
 from fake_useragent import UserAgent
 
+# Shared helpers live in Scripts/common
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.near_duplicates import flag_near_duplicates
+from common.search_index import index_records
+from common.table_export import TableExport
+from common.workers import PerThread, ThreadCounters
+
 # Disable insecure request warnings from urllib3
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -70,7 +76,7 @@ HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 }
 
-# Statistics for monitoring
+# Statistics for monitoring (worker threads count into `counters`, merged in print_summary)
 stats = {
     'years_processed': 0,
     'articles_found': 0,
@@ -82,6 +88,8 @@ stats = {
     'run_type': RUN_TYPE
 }
 
+counters = ThreadCounters()
+
 # Global flag for graceful shutdown
 shutdown_flag = False
 logger = None
@@ -240,6 +248,10 @@ def setup_requests_session():
     })
     return session
 
+# One requests session and (only if a page needs rendering) one browser per enrichment worker
+worker_sessions = PerThread(setup_requests_session)
+worker_drivers = PerThread(setup_driver)
+
 def generate_hash_id(headline: str, published_date: str) -> str:
     """Generate unique hash ID using headline and published datetime"""
     # Normalize the data for consistent hashing
@@ -305,7 +317,7 @@ def extract_pdf_text(pdf_url: str, session: requests.Session) -> str:
             
             if logger:
                 logger.info(f"Successfully extracted {len(text)} characters from PDF")
-            stats['pdfs_extracted'] += 1
+            counters.add('pdfs_extracted')
             return text
         else:
             if logger:
@@ -315,7 +327,7 @@ def extract_pdf_text(pdf_url: str, session: requests.Session) -> str:
     except Exception as e:
         if logger:
             logger.error(f"Error extracting PDF {pdf_url}: {e}")
-        stats['errors'] += 1
+        counters.add('errors')
         return ""
 
 def clean_web_content(content: str) -> str:
@@ -355,28 +367,45 @@ def _get_element_text(soup: BeautifulSoup, selectors: List[str], default: str =
             return element.get_text(strip=True)
     return default
 
-def extract_full_article_content(driver: WebDriver, url: str, session: requests.Session) -> Dict:
+CONTENT_SELECTORS = [
+    '[itemprop="text"]', '.rss-mr-content', '#content', '.media-release-content',
+    'article .content', '.main-content', '.page-content'
+]
+
+def fetch_article_soup(url: str, session: requests.Session) -> BeautifulSoup:
+    """Media releases are static HTML: fetch over HTTP, rendering in this worker's browser only as a fallback"""
+    try:
+        response = session.get(url, timeout=ARTICLE_TIMEOUT)
+        if response.status_code == 200:
+            soup = BeautifulSoup(response.text, 'html.parser')
+            if soup.select_one(", ".join(CONTENT_SELECTORS)):
+                return soup
+        if logger:
+            logger.debug(f"HTTP fetch of {url} gave status {response.status_code} without content; rendering")
+    except requests.RequestException as e:
+        if logger:
+            logger.debug(f"HTTP fetch of {url} failed ({type(e).__name__}); rendering")
+    
+    driver = worker_drivers.get()
+    driver.get(url)
+    
+    # Wait for content to load
+    try:
+        WebDriverWait(driver, ARTICLE_TIMEOUT).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, ", ".join(CONTENT_SELECTORS)))
+        )
+    except TimeoutException:
+        if logger:
+            logger.warning(f"Timeout waiting for content to load: {url}")
+    
+    return BeautifulSoup(driver.page_source, 'html.parser')
+
+def extract_full_article_content(url: str, session: requests.Session) -> Dict:
     """Extract complete article content including PDFs"""
     try:
         if logger:
             logger.debug(f"Extracting content from: {url}")
-        driver.get(url)
-        
-        # Wait for content to load
-        content_selectors = [
-            '[itemprop="text"]', '.rss-mr-content', '#content', '.media-release-content',
-            'article .content', '.main-content', '.page-content'
-        ]
-        
-        try:
-            WebDriverWait(driver, ARTICLE_TIMEOUT).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, ", ".join(content_selectors)))
-            )
-        except TimeoutException:
-            if logger:
-                logger.warning(f"Timeout waiting for content to load: {url}")
-        
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
+        soup = fetch_article_soup(url, session)
 
         # Extract basic metadata
         headline = _get_element_text(soup, ["h1", ".rss-mr-title", "h2.title", ".headline"])
@@ -407,7 +436,7 @@ def extract_full_article_content(driver: WebDriver, url: str, session: requests.
 
         # Extract main web content
         web_content = ""
-        for selector in content_selectors:
+        for selector in CONTENT_SELECTORS:
             body = soup.select_one(selector)
             if body and len(body.get_text(strip=True)) > 100:
                 # Remove navigation and non-content elements
@@ -483,7 +512,7 @@ def extract_full_article_content(driver: WebDriver, url: str, session: requests.
     except Exception as e:
         if logger:
             logger.error(f"Content extraction failed for {url}: {e}")
-        stats['errors'] += 1
+        counters.add('errors')
         return {
             "headline": "Extraction failed",
             "release_number": "N/A",
@@ -498,7 +527,7 @@ def extract_full_article_content(driver: WebDriver, url: str, session: requests.
             "total_content_length": 0
         }
 
-def fetch_and_enrich_article(article_metadata: Dict, session: requests.Session) -> Dict:
+def fetch_and_enrich_article(article_metadata: Dict) -> Dict:
     """Fetch and enrich a single article with full content and PDFs"""
     if shutdown_flag: 
         return {**article_metadata, "combined_content": "Skipped due to shutdown."}
@@ -510,21 +539,20 @@ def fetch_and_enrich_article(article_metadata: Dict, session: requests.Session)
         logger.debug(f"Enriching: {url}")
     
     try:
-        with setup_driver() as driver:
-            content_data = extract_full_article_content(driver, url, session)
-            article_metadata.update(content_data)
-            stats['articles_enriched'] += 1
-            
-            if logger:
-                logger.info(f"Enriched: {article_metadata.get('headline', 'Unknown')} "
-                           f"(Web: {content_data.get('content_length', 0)} chars, "
-                           f"PDF: {content_data.get('pdf_content_length', 0)} chars)")
-            
-            return article_metadata
+        content_data = extract_full_article_content(url, worker_sessions.get())
+        article_metadata.update(content_data)
+        counters.add('articles_enriched')
+        
+        if logger:
+            logger.info(f"Enriched: {article_metadata.get('headline', 'Unknown')} "
+                       f"(Web: {content_data.get('content_length', 0)} chars, "
+                       f"PDF: {content_data.get('pdf_content_length', 0)} chars)")
+        
+        return article_metadata
     except Exception as e:
         if logger:
             logger.warning(f"Failed to enrich {url} (Reason: {type(e).__name__})")
-        stats['errors'] += 1
+        counters.add('errors')
         article_metadata["combined_content"] = f"Content extraction failed: {type(e).__name__}"
         article_metadata["web_content"] = ""
         article_metadata["pdf_content"] = ""
@@ -547,7 +575,7 @@ def scrape_year_page(driver: WebDriver, year: int) -> List[Dict]:
     except TimeoutException:
         if logger:
             logger.warning(f"Could not find article list for year {year}. Skipping.")
-        stats['errors'] += 1
+        counters.add('errors')
         return []
     
     soup = BeautifulSoup(driver.page_source, 'html.parser')
@@ -587,8 +615,8 @@ def scrape_year_page(driver: WebDriver, year: int) -> List[Dict]:
             "scraped_date": datetime.now(timezone.utc).isoformat(),
         })
     
-    stats['years_processed'] += 1
-    stats['articles_found'] += len(articles_metadata)
+    counters.add('years_processed')
+    counters.add('articles_found', len(articles_metadata))
     if logger:
         logger.info(f"Found {len(articles_metadata)} articles for year {year}")
     
@@ -613,6 +641,7 @@ def save_articles(new_articles: List[Dict]) -> int:
             if logger:
                 logger.warning("JSON file is corrupted and will be overwritten.")
     
+    flag_near_duplicates(new_articles, JSON_PATH, logger=logger)
     all_articles = existing_articles + new_articles
     
     # Remove duplicates based on hash_id (final cleanup)
@@ -635,12 +664,10 @@ def save_articles(new_articles: List[Dict]) -> int:
     except Exception as e:
         if logger:
             logger.error(f"Failed to save JSON: {e}")
-        stats['errors'] += 1
+        counters.add('errors')
     
     try:
-        df = pd.DataFrame(final_articles)
-        
-        # Reorder columns for better readability
+        # Column order for readability; only new or changed rows are written
         column_order = [
             "hash_id", "year", "release_number", "headline", "url", "published_date", 
             "scraped_date", "combined_content", "web_content", "pdf_content", 
@@ -648,22 +675,18 @@ def save_articles(new_articles: List[Dict]) -> int:
             "total_content_length"
         ]
         
-        # Only include columns that exist
-        df = df.reindex(columns=[c for c in column_order if c in df.columns])
-        
-        # Convert lists to strings for CSV
-        list_columns = ['related_links', 'pdf_links']
-        for col in list_columns:
-            if col in df.columns:
-                df[col] = df[col].apply(lambda x: '|'.join(x) if isinstance(x, list) else x)
-        
-        df.to_csv(CSV_PATH, index=False, encoding='utf-8-sig')
+        TableExport(CSV_PATH, column_order, key_field="hash_id",
+                    list_columns=("related_links", "pdf_links"), list_format="|".join,
+                    encoding="utf-8-sig", content_fields=("combined_content", "web_content", "pdf_content"),
+                    logger=logger).export(final_articles)
         if logger:
             logger.info(f"Saved CSV: {len(final_articles)} total articles")
     except Exception as e:
         if logger:
             logger.error(f"Failed to save CSV: {e}")
-        stats['errors'] += 1
+        counters.add('errors')
+    
+    index_records(new_articles, JSON_PATH, logger=logger)
     
     if logger:
         logger.info(f"Save complete. Total unique articles: {len(final_articles)}")
@@ -674,6 +697,7 @@ def print_summary() -> int:
     """Print summary of scraping results and return exit code"""
     end_time = time.time()
     duration = end_time - stats['start_time']
+    stats.update(counters.totals())
     
     if logger:
         logger.info("\n" + "="*80)
@@ -718,7 +742,6 @@ def main():
     logger.info(f"--- Starting RBA Media Releases Scraper ({RUN_TYPE.upper()} run) ---")
     
     articles_to_enrich = []
-    session = setup_requests_session()
     
     try:
         with setup_driver() as driver:
@@ -739,14 +762,14 @@ def main():
                     articles_to_enrich.extend(new_articles)
                     logger.info(f"Found {len(new_articles)} new articles for {year}.")
                 else:
-                    stats['articles_skipped'] += len(year_articles)
+                    counters.add('articles_skipped', len(year_articles))
                     logger.info(f"No new articles found for {year} (all duplicates).")
                 
                 time.sleep(MIN_DELAY)
                 
     except Exception as e:
         logger.critical(f"Fatal error during metadata collection: {e}")
-        stats['errors'] += 1
+        counters.add('errors')
         print(f"FATAL ERROR: {e}")
         return 1
     
@@ -758,26 +781,30 @@ def main():
     logger.info(f"--- Starting enrichment for {len(articles_to_enrich)} articles using {MAX_WORKERS} workers ---")
     completed_articles = []
     
-    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        future_to_article = {
-            executor.submit(fetch_and_enrich_article, meta, session): meta 
-            for meta in articles_to_enrich
-        }
+    try:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            future_to_article = {
+                executor.submit(fetch_and_enrich_article, meta): meta 
+                for meta in articles_to_enrich
+            }
         
-        for future in as_completed(future_to_article):
-            if shutdown_flag: 
-                for f in future_to_article:
-                    if not f.done():
-                        f.cancel()
-                break
+            for future in as_completed(future_to_article):
+                if shutdown_flag: 
+                    for f in future_to_article:
+                        if not f.done():
+                            f.cancel()
+                    break
                 
-            try:
-                result = future.result()
-                if result: 
-                    completed_articles.append(result)
-            except Exception as e:
-                logger.error(f"A task generated an unhandled exception: {e}")
-                stats['errors'] += 1
+                try:
+                    result = future.result()
+                    if result: 
+                        completed_articles.append(result)
+                except Exception as e:
+                    logger.error(f"A task generated an unhandled exception: {e}")
+                    counters.add('errors')
+    finally:
+        worker_drivers.close()
+        worker_sessions.close()
     
     save_articles(completed_articles)
     exit_code = print_summary()
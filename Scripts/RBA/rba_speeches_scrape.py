@@ -20,7 +20,6 @@ from datetime import datetime, timezone
 from typing import List, Dict, Set, Optional, Iterator, Generator
 from urllib.parse import urljoin, urlparse
 
-import pandas as pd
 import requests
 import urllib3
 from bs4 import BeautifulSoup
@@ -35,6 +34,13 @@ from selenium.webdriver.support.ui import WebDriverWait
 import PyPDF2
 from fake_useragent import UserAgent
 
+# Shared helpers live in Scripts/common
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.near_duplicates import flag_near_duplicates
+from common.search_index import index_records
+from common.table_export import TableExport
+from common.workers import PerThread, ThreadCounters
+
 # Disable insecure request warnings from urllib3
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -72,7 +78,7 @@ HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 }
 
-# Statistics for monitoring
+# Statistics for monitoring (worker threads count into `counters`, merged in print_summary)
 stats = {
     'years_processed': 0,
     'speeches_found': 0,
@@ -84,6 +90,8 @@ stats = {
     'run_type': RUN_TYPE
 }
 
+counters = ThreadCounters()
+
 # Global flag for graceful shutdown
 shutdown_flag = False
 logger = None
@@ -257,6 +265,10 @@ def setup_requests_session():
     })
     return session
 
+# One requests session and (only if a page needs rendering) one browser per enrichment worker
+worker_sessions = PerThread(setup_requests_session)
+worker_drivers = PerThread(setup_driver)
+
 def generate_hash_id(headline: str, published_date: str, speaker: str = "") -> str:
     """Generate unique hash ID using headline, published datetime, and speaker"""
     # Normalize the data for consistent hashing
@@ -346,7 +358,7 @@ def extract_pdf_text(pdf_url: str, session: requests.Session) -> str:
             
             if logger:
                 logger.info(f"Successfully extracted {len(text)} characters from PDF")
-            stats['pdfs_extracted'] += 1
+            counters.add('pdfs_extracted')
             return text
         else:
             if logger:
@@ -356,7 +368,7 @@ def extract_pdf_text(pdf_url: str, session: requests.Session) -> str:
     except Exception as e:
         if logger:
             logger.error(f"Error extracting PDF {pdf_url}: {e}")
-        stats['errors'] += 1
+        counters.add('errors')
         return ""
 
 def clean_web_content(content: str) -> str:
@@ -414,21 +426,35 @@ def wait_for_element(driver, selector, timeout=10, by=By.CSS_SELECTOR):
             logger.warning(f"Timeout waiting for element: {selector}")
         return None
 
-def extract_full_speech_content(driver: WebDriver, url: str, session: requests.Session) -> Dict:
+def fetch_speech_html(url: str, session: requests.Session) -> str:
+    """Speech pages are static HTML: fetch over HTTP, rendering in this worker's browser only as a fallback"""
+    try:
+        response = session.get(url, timeout=ARTICLE_TIMEOUT)
+        if response.status_code == 200 and 'content-style' in response.text:
+            return response.text
+        if logger:
+            logger.debug(f"HTTP fetch of {url} gave status {response.status_code} without content; rendering")
+    except requests.RequestException as e:
+        if logger:
+            logger.debug(f"HTTP fetch of {url} failed ({type(e).__name__}); rendering")
+    
+    driver = worker_drivers.get()
+    driver.get(url)
+    time.sleep(MIN_DELAY)
+    
+    # Wait for content to load
+    content_element = wait_for_element(driver, ".content-style", timeout=ARTICLE_TIMEOUT)
+    if not content_element:
+        if logger:
+            logger.warning(f"Content not found for {url}")
+    return driver.page_source
+
+def extract_full_speech_content(url: str, session: requests.Session) -> Dict:
     """Extract complete speech content including PDFs"""
     try:
         if logger:
             logger.debug(f"Extracting content from: {url}")
-        driver.get(url)
-        time.sleep(MIN_DELAY)
-        
-        # Wait for content to load
-        content_element = wait_for_element(driver, ".content-style", timeout=ARTICLE_TIMEOUT)
-        if not content_element:
-            if logger:
-                logger.warning(f"Content not found for {url}")
-        
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
+        soup = BeautifulSoup(fetch_speech_html(url, session), 'html.parser')
 
         # Extract basic metadata
         headline_elem = soup.select_one(".rss-speech-title")
@@ -552,7 +578,7 @@ def extract_full_speech_content(driver: WebDriver, url: str, session: requests.S
     except Exception as e:
         if logger:
             logger.error(f"Content extraction failed for {url}: {e}")
-        stats['errors'] += 1
+        counters.add('errors')
         return {
             "headline": "Extraction failed",
             "speaker": "N/A",
@@ -615,10 +641,10 @@ def process_speech(speech_tag, year, existing_ids):
         if hash_id in existing_ids:
             if logger:
                 logger.debug(f"Skipping duplicate speech: {headline[:50]}...")
-            stats['speeches_skipped'] += 1
+            counters.add('speeches_skipped')
             return None
 
-        stats['speeches_found'] += 1
+        counters.add('speeches_found')
         return {
             "hash_id": hash_id,
             "headline": headline,
@@ -634,7 +660,7 @@ def process_speech(speech_tag, year, existing_ids):
     except Exception as e:
         if logger:
             logger.error(f"Error processing speech element: {e}")
-        stats['errors'] += 1
+        counters.add('errors')
         return None
 
 def scrape_year_page(driver: WebDriver, year: int, existing_ids: Set[str]) -> List[Dict]:
@@ -671,7 +697,7 @@ def scrape_year_page(driver: WebDriver, year: int, existing_ids: Set[str]) -> Li
             if speech_data:
                 speeches_data.append(speech_data)
 
-        stats['years_processed'] += 1
+        counters.add('years_processed')
         if logger:
             logger.info(f"Found {len(speeches_data)} new speeches for year {year}")
         return speeches_data
@@ -679,10 +705,10 @@ def scrape_year_page(driver: WebDriver, year: int, existing_ids: Set[str]) -> Li
     except Exception as e:
         if logger:
             logger.error(f"Error scraping year {year}: {e}")
-        stats['errors'] += 1
+        counters.add('errors')
         return []
 
-def fetch_and_enrich_speech(speech_metadata: Dict, session: requests.Session) -> Dict:
+def fetch_and_enrich_speech(speech_metadata: Dict) -> Dict:
     """Fetch and enrich a single speech with full content and PDFs"""
     if shutdown_flag: 
         return {**speech_metadata, "combined_content": "Skipped due to shutdown."}
@@ -694,21 +720,20 @@ def fetch_and_enrich_speech(speech_metadata: Dict, session: requests.Session) ->
         logger.debug(f"Enriching: {url}")
     
     try:
-        with setup_driver() as driver:
-            content_data = extract_full_speech_content(driver, url, session)
-            speech_metadata.update(content_data)
-            stats['speeches_enriched'] += 1
-            
-            if logger:
-                logger.info(f"Enriched: {speech_metadata.get('headline', 'Unknown')} "
-                           f"(Web: {content_data.get('content_length', 0)} chars, "
-                           f"PDF: {content_data.get('pdf_content_length', 0)} chars)")
-            
-            return speech_metadata
+        content_data = extract_full_speech_content(url, worker_sessions.get())
+        speech_metadata.update(content_data)
+        counters.add('speeches_enriched')
+        
+        if logger:
+            logger.info(f"Enriched: {speech_metadata.get('headline', 'Unknown')} "
+                       f"(Web: {content_data.get('content_length', 0)} chars, "
+                       f"PDF: {content_data.get('pdf_content_length', 0)} chars)")
+        
+        return speech_metadata
     except Exception as e:
         if logger:
             logger.warning(f"Failed to enrich {url} (Reason: {type(e).__name__})")
-        stats['errors'] += 1
+        counters.add('errors')
         speech_metadata["combined_content"] = f"Content extraction failed: {type(e).__name__}"
         speech_metadata["web_content"] = ""
         speech_metadata["pdf_content"] = ""
@@ -734,6 +759,7 @@ def save_speeches(new_speeches: List[Dict]) -> int:
             if logger:
                 logger.warning("JSON file is corrupted and will be overwritten.")
     
+    flag_near_duplicates(new_speeches, JSON_PATH, logger=logger)
     all_speeches = existing_speeches + new_speeches
     
     # Remove duplicates based on hash_id (final cleanup)
@@ -756,12 +782,10 @@ def save_speeches(new_speeches: List[Dict]) -> int:
     except Exception as e:
         if logger:
             logger.error(f"Failed to save JSON: {e}")
-        stats['errors'] += 1
+        counters.add('errors')
     
     try:
-        df = pd.DataFrame(final_speeches)
-        
-        # Define column order for better readability
+        # Column order for readability; only new or changed rows are written
         column_order = [
             "hash_id", "year", "headline", "speaker", "speaker_position", 
             "event", "venue", "published_date", "url", "scraped_date", 
@@ -769,22 +793,18 @@ def save_speeches(new_speeches: List[Dict]) -> int:
             "pdf_links", "content_length", "pdf_content_length", "total_content_length"
         ]
         
-        # Only include columns that exist
-        df = df.reindex(columns=[c for c in column_order if c in df.columns])
-        
-        # Convert lists to strings for CSV
-        list_columns = ['media_links', 'pdf_links']
-        for col in list_columns:
-            if col in df.columns:
-                df[col] = df[col].apply(lambda x: json.dumps(x) if isinstance(x, list) else x)
-        
-        df.to_csv(CSV_PATH, index=False, encoding='utf-8-sig')
+        TableExport(CSV_PATH, column_order, key_field="hash_id",
+                    list_columns=("media_links", "pdf_links"),
+                    encoding="utf-8-sig", content_fields=("combined_content", "web_content", "pdf_content"),
+                    logger=logger).export(final_speeches)
         if logger:
             logger.info(f"Saved CSV: {len(final_speeches)} total speeches")
     except Exception as e:
         if logger:
             logger.error(f"Failed to save CSV: {e}")
-        stats['errors'] += 1
+        counters.add('errors')
+    
+    index_records(new_speeches, JSON_PATH, logger=logger)
     
     if logger:
         logger.info(f"Save complete. Total unique speeches: {len(final_speeches)}")
@@ -795,6 +815,7 @@ def print_summary() -> int:
     """Print summary of scraping results and return exit code"""
     end_time = time.time()
     duration = end_time - stats['start_time']
+    stats.update(counters.totals())
     
     if logger:
         logger.info("\n" + "="*80)
@@ -839,7 +860,6 @@ def main():
     logger.info(f"--- Starting RBA Speeches Scraper ({RUN_TYPE.upper()} run) ---")
     
     speeches_to_enrich = []
-    session = setup_requests_session()
     
     try:
         with setup_driver() as driver:
@@ -861,7 +881,7 @@ def main():
                 
     except Exception as e:
         logger.critical(f"Fatal error during metadata collection: {e}")
-        stats['errors'] += 1
+        counters.add('errors')
         print(f"FATAL ERROR: {e}")
         return 1
     
@@ -873,26 +893,30 @@ def main():
     logger.info(f"--- Starting enrichment for {len(speeches_to_enrich)} speeches using {MAX_WORKERS} workers ---")
     completed_speeches = []
     
-    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        future_to_speech = {
-            executor.submit(fetch_and_enrich_speech, meta, session): meta 
-            for meta in speeches_to_enrich
-        }
+    try:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            future_to_speech = {
+                executor.submit(fetch_and_enrich_speech, meta): meta 
+                for meta in speeches_to_enrich
+            }
         
-        for future in as_completed(future_to_speech):
-            if shutdown_flag: 
-                for f in future_to_speech:
-                    if not f.done():
-                        f.cancel()
-                break
+            for future in as_completed(future_to_speech):
+                if shutdown_flag: 
+                    for f in future_to_speech:
+                        if not f.done():
+                            f.cancel()
+                    break
                 
-            try:
-                result = future.result()
-                if result: 
-                    completed_speeches.append(result)
-            except Exception as e:
-                logger.error(f"A task generated an unhandled exception: {e}")
-                stats['errors'] += 1
+                try:
+                    result = future.result()
+                    if result: 
+                        completed_speeches.append(result)
+                except Exception as e:
+                    logger.error(f"A task generated an unhandled exception: {e}")
+                    counters.add('errors')
+    finally:
+        worker_drivers.close()
+        worker_sessions.close()
     
     save_speeches(completed_speeches)
     exit_code = print_summary()
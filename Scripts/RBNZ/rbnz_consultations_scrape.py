@@ -9,6 +9,7 @@ import json
 import logging
 import os
 import re
+import sys
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -32,6 +33,13 @@ try:
 except ImportError:
     SELENIUM_AVAILABLE = False
 
+# Shared helpers live in Scripts/common
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.change_tracker import ChangeTracker, append_history
+from common.request_ledger import RequestLedger
+from common.search_index import index_records
+from common.status_index import StatusIndex, content_hash
+
 # Configuration
 CONFIG = {
     'BASE_URL': 'https://www.rbnz.govt.nz',
@@ -40,14 +48,26 @@ CONFIG = {
     'RATE_LIMIT': 292,  # requests per hour
     'REQUEST_DELAY': 3600 / 292,  # seconds between requests (~12.3 seconds)
     'SAFETY_MARGIN': 0.8,  # Use only 80% of allowed rate for safety
+    'MIN_REQUEST_INTERVAL': 1.0,  # seconds between requests while under budget
     'MAX_PAGE': 2,  # Set to None for full scrape, or integer for limited pages
     'OUTPUT_DIR': './data',
     'OUTPUT_FILE': './data/rbnz_consultations.json',
     'LOG_FILE': './consultations_scrape.log',
     'SCRAPED_URLS_FILE': './data/scraped_consultations_urls.json',
-    'REQUEST_LOG_FILE': './data/consultation_request_log.json'
+    'REQUEST_LOG_FILE': './data/consultation_request_log.json',
+    'STATUS_INDEX_FILE': './data/index/consultation_status.json',
+    'CHANGE_STATE_FILE': './data/index/consultation_changes.json'
 }
 
+# Host whose hourly budget all RBNZ scrapers share
+RBNZ_HOST = urlparse(CONFIG['BASE_URL']).netloc
+
+# Fields whose change counts as a content update in the status index
+CONTENT_HASH_FIELDS = ('title', 'overview_content', 'pdf_content', 'excel_content', 'tables_and_charts_data')
+
+# Attachment blocks in pdf_content/excel_content ("--- PDF: <title> ---")
+ATTACHMENT_HEADER = re.compile(r'^--- (PDF|EXCEL): (.*?) ---$', re.MULTILINE)
+
 class RBNZConsultationsScraper:
     def __init__(self, max_pages: Optional[int] = None, use_selenium: bool = False):
         self.session = requests.Session()
@@ -58,13 +78,24 @@ class RBNZConsultationsScraper:
         self.setup_logging()
         self.setup_directories()
         
-        # Rate limiting tracking
-        self.request_times = []
+        # Re-scrape decisions: URL -> status/hash/closing date, loaded once per run
+        self.force_update_open = False
+        self.status_index = StatusIndex(CONFIG['STATUS_INDEX_FILE'], logger=self.logger)
+        if not self.status_index.loaded:
+            self._seed_status_index()
+        
+        # Validators and section fingerprints, so a re-check only re-extracts what changed
+        self.changes = ChangeTracker(CONFIG['CHANGE_STATE_FILE'], logger=self.logger)
+        self._existing_by_url: Optional[Dict[str, Dict]] = None
+        
+        # Rate limiting tracking (budget shared across RBNZ scrapers and runs)
         self.request_count = 0
         self.hourly_limit = int(CONFIG['RATE_LIMIT'] * CONFIG['SAFETY_MARGIN'])
-        self.request_delay = 3600 / self.hourly_limit  # Adjusted delay with safety margin
+        self.request_delay = 3600 / self.hourly_limit  # Average spacing at the full budget
+        self.ledger = RequestLedger(logger=self.logger)
         
-        self.logger.info(f"Rate limiting: {self.hourly_limit} requests/hour, {self.request_delay:.1f}s between requests")
+        self.logger.info(f"Rate limiting: {self.hourly_limit} requests/hour shared by RBNZ scrapers "
+                         f"({self.ledger.usage(RBNZ_HOST)} used in the last hour)")
         
         if self.use_selenium:
             self.setup_selenium()
@@ -133,82 +164,122 @@ class RBNZConsultationsScraper:
         except Exception as e:
             self.logger.error(f"Could not save scraped URLs: {e}")
 
-    def _should_rescrape_consultation(self, url: str) -> bool:
-        """Determine if a consultation should be re-scraped (e.g., to check for status changes)"""
+    def _index_status(self, consultation: Dict) -> str:
+        """Open if either status field says so (as the old re-scrape check did)"""
+        if consultation.get('status') == 'Open' or consultation.get('consultation_status') == 'Open':
+            return 'Open'
+        return consultation.get('status') or 'Unknown'
+
+    def _update_status_index(self, consultation: Dict, closing_date: str = ""):
+        self.status_index.record(
+            consultation['url'],
+            self._index_status(consultation),
+            consultation.get('scraped_date'),
+            content_hash(consultation, CONTENT_HASH_FIELDS),
+            closing_date or consultation.get('closed_date')
+        )
+
+    def _seed_status_index(self):
+        """Build the status index from the existing output file (first run only)"""
         try:
             if not os.path.exists(CONFIG['OUTPUT_FILE']):
-                return True
-                
+                return
             with open(CONFIG['OUTPUT_FILE'], 'r', encoding='utf-8') as f:
                 existing_consultations = json.load(f)
-                
-            # Find existing consultation
-            existing_cons = None
             for cons in existing_consultations:
-                if cons.get('url') == url:
-                    existing_cons = cons
-                    break
-                    
-            if not existing_cons:
-                return True  # New consultation
-                
-            # Always re-scrape Open consultations to check if they've closed
-            if existing_cons.get('status') == 'Open' or existing_cons.get('consultation_status') == 'Open':
-                self.logger.info(f"Re-scraping open consultation: {url}")
-                return True
-                
-            # Re-scrape if last update was more than 7 days ago
-            last_scraped = existing_cons.get('scraped_date')
-            if last_scraped:
-                try:
-                    scraped_datetime = datetime.fromisoformat(last_scraped.replace('Z', '+00:00'))
-                    days_since_scrape = (datetime.now() - scraped_datetime.replace(tzinfo=None)).days
-                    if days_since_scrape > 7:
-                        self.logger.info(f"Re-scraping old consultation ({days_since_scrape} days): {url}")
-                        return True
-                except Exception:
-                    return True  # Re-scrape if date parsing fails
-                    
-            return False  # Skip re-scraping
-            
+                if cons.get('url'):
+                    self._update_status_index(cons)
+            self.logger.info(f"Seeded status index with {len(self.status_index)} consultations")
         except Exception as e:
-            self.logger.warning(f"Error checking if should re-scrape {url}: {e}")
-            return True  # Default to re-scraping on error
+            self.logger.warning(f"Could not seed status index from {CONFIG['OUTPUT_FILE']}: {e}")
+
+    def _existing_consultation(self, url: str) -> Optional[Dict]:
+        """Consultation as stored in the output file (loaded once per run)"""
+        if self._existing_by_url is None:
+            self._existing_by_url = {}
+            try:
+                if os.path.exists(CONFIG['OUTPUT_FILE']):
+                    with open(CONFIG['OUTPUT_FILE'], 'r', encoding='utf-8') as f:
+                        self._existing_by_url = {cons.get('url'): cons for cons in json.load(f)}
+            except Exception as e:
+                self.logger.warning(f"Could not load existing consultations: {e}")
+        return self._existing_by_url.get(url)
+
+    def _attachment_blocks(self, consultation: Dict) -> List[tuple]:
+        """(kind, title, text) for each attachment block of a consultation"""
+        blocks = []
+        for field in ('pdf_content', 'excel_content'):
+            parts = ATTACHMENT_HEADER.split(consultation.get(field) or '')
+            for i in range(1, len(parts) - 2, 3):
+                blocks.append((parts[i], parts[i + 1], parts[i + 2].strip()))
+        return blocks
+
+    def _previous_attachments(self, consultation: Optional[Dict], kind: str) -> Dict[str, str]:
+        """Extracted text of a consultation's attachments by title (ambiguous titles left out)"""
+        if not consultation:
+            return {}
+        previous, repeated = {}, set()
+        for block_kind, title, text in self._attachment_blocks(consultation):
+            if block_kind == kind:
+                if title in previous:
+                    repeated.add(title)
+                previous[title] = text
+        return {title: text for title, text in previous.items() if title not in repeated}
+
+    def _consultation_sections(self, consultation: Dict) -> Dict[str, str]:
+        """Named sections of a consultation, fingerprinted by the change tracker"""
+        sections = {
+            'status': ' / '.join(str(consultation.get(name) or '') for name in
+                                 ('status', 'consultation_status', 'opened_date', 'closed_date')),
+            'overview': consultation.get('overview_content') or '',
+            'contact': json.dumps(consultation.get('contact_info') or {}, sort_keys=True),
+            'related_links': '\n'.join(link.get('url', '') for link in consultation.get('related_links') or []),
+            'tables': consultation.get('tables_and_charts_data') or '',
+        }
+        for kind, title, text in self._attachment_blocks(consultation):
+            name = f"{kind.lower()}: {title}"
+            count = 2
+            while name in sections:
+                name = f"{kind.lower()}: {title} ({count})"
+                count += 1
+            sections[name] = text
+        return sections
+
+    def _record_changes(self, consultation: Dict, existing: Optional[Dict]):
+        """Compare a re-scraped consultation with the stored one, section by section"""
+        previous = self._consultation_sections(existing) if existing else None
+        entry = self.changes.record(consultation['url'], self._consultation_sections(consultation), previous)
+        if not existing:
+            return
+        consultation['change_history'] = existing.get('change_history', [])
+        consultation['changed_sections'] = []
+        if entry:
+            consultation['change_history'] = append_history(consultation['change_history'], entry)
+            consultation['changed_sections'] = entry['added'] + entry['changed']
+            self.logger.info(f"Changed sections: {', '.join(entry['added'] + entry['changed'] + entry['removed'])}")
+
+    def _should_rescrape_consultation(self, url: str) -> bool:
+        """Determine if a consultation should be re-scraped (e.g., to check for status changes)"""
+        due, reason = self.status_index.due(url, force_open=self.force_update_open)
+        if due and reason != 'new':
+            self.logger.info(f"Re-scraping consultation ({reason}): {url}")
+        return due
 
     def _rate_limit(self):
-        """Implement smart rate limiting with request tracking"""
-        current_time = time.time()
-        
-        # Remove requests older than 1 hour
-        self.request_times = [t for t in self.request_times if current_time - t < 3600]
-        
-        # Check if we're approaching the hourly limit
-        if len(self.request_times) >= self.hourly_limit:
-            # Calculate how long to wait until the oldest request is > 1 hour old
-            oldest_request = min(self.request_times)
-            wait_time = 3600 - (current_time - oldest_request) + 1  # +1 second buffer
-            
-            if wait_time > 0:
-                self.logger.warning(f"Rate limit reached. Waiting {wait_time:.1f} seconds...")
-                time.sleep(wait_time)
-                current_time = time.time()
-                # Clean up old requests after waiting
-                self.request_times = [t for t in self.request_times if current_time - t < 3600]
-        
-        # Standard delay between requests
-        time.sleep(self.request_delay)
-        
-        # Record this request
-        self.request_times.append(current_time)
+        """Take a request from the hourly RBNZ budget shared (on disk) with the other RBNZ scrapers"""
+        # Only waits when the budget is nearly used up (or to keep the minimum spacing)
+        self.ledger.acquire(RBNZ_HOST, self.hourly_limit, window=3600,
+                            min_interval=CONFIG['MIN_REQUEST_INTERVAL'])
         self.request_count += 1
         
         # Log progress every 20 requests
         if self.request_count % 20 == 0:
-            requests_in_last_hour = len(self.request_times)
-            self.logger.info(f"Request #{self.request_count}: {requests_in_last_hour}/{self.hourly_limit} requests in last hour")
+            requests_in_last_hour = self.ledger.usage(RBNZ_HOST)
+            self.logger.info(f"Request #{self.request_count}: {requests_in_last_hour}/{self.hourly_limit} requests in last hour (all RBNZ scrapers)")
 
-    def _safe_request(self, url: str, timeout: int = 30) -> Optional[requests.Response]:
-        """Make a rate-limited request with error handling"""
+    def _safe_request(self, url: str, timeout: int = 30,
+                      headers: Optional[Dict[str, str]] = None) -> Optional[requests.Response]:
+        """Make a rate-limited request with error handling (a 304 is returned as is)"""
         max_retries = 3
         retry_delay = 30  # Start with 30 seconds
         
@@ -216,7 +287,7 @@ class RBNZConsultationsScraper:
             try:
                 self._rate_limit()
                 
-                response = self.session.get(url, timeout=timeout)
+                response = self.session.get(url, timeout=timeout, headers=headers)
                 
                 if response.status_code == 429:
                     # Rate limited - wait longer
@@ -270,12 +341,16 @@ class RBNZConsultationsScraper:
             
         return text
 
-    def _extract_pdf_text(self, pdf_url: str) -> str:
-        """Extract text from PDF files with rate limiting"""
+    def _extract_pdf_text(self, pdf_url: str, previous: Optional[str] = None) -> str:
+        """Extract text from PDF files with rate limiting (``previous`` is reused if the file is unchanged)"""
         try:
-            response = self._safe_request(pdf_url, timeout=60)
+            headers = self.changes.conditional_headers(pdf_url) if previous is not None else None
+            response = self._safe_request(pdf_url, timeout=60, headers=headers)
             if not response:
                 return ""
+            if not self.changes.fetched(pdf_url, response) and previous is not None:
+                self.logger.info(f"PDF unchanged, keeping extracted text: {pdf_url}")
+                return previous
             
             pdf_reader = PyPDF2.PdfReader(BytesIO(response.content))
             text_content = []
@@ -291,12 +366,16 @@ class RBNZConsultationsScraper:
             self.logger.error(f"Error extracting PDF {pdf_url}: {e}")
             return ""
 
-    def _extract_excel_data(self, excel_url: str) -> str:
-        """Extract data from Excel files using openpyxl with rate limiting"""
+    def _extract_excel_data(self, excel_url: str, previous: Optional[str] = None) -> str:
+        """Extract data from Excel files using openpyxl with rate limiting (``previous`` is reused if unchanged)"""
         try:
-            response = self._safe_request(excel_url, timeout=60)
+            headers = self.changes.conditional_headers(excel_url) if previous is not None else None
+            response = self._safe_request(excel_url, timeout=60, headers=headers)
             if not response:
                 return ""
+            if not self.changes.fetched(excel_url, response) and previous is not None:
+                self.logger.info(f"Excel file unchanged, keeping extracted data: {excel_url}")
+                return previous
             
             # Try to use openpyxl if available, otherwise skip Excel processing
             try:
@@ -526,10 +605,22 @@ class RBNZConsultationsScraper:
             return "SKIPPED"
             
         try:
-            response = self._safe_request(consultation_url)
+            existing = self._existing_consultation(consultation_url)
+            headers = self.changes.conditional_headers(consultation_url) if existing else None
+            response = self._safe_request(consultation_url, headers=headers)
             if not response:
                 return None
             
+            # Not modified (304) or byte-identical: nothing to re-extract
+            if not self.changes.fetched(consultation_url, response) and existing:
+                self.logger.info(f"Page unchanged since last scrape: {consultation_url}")
+                self.changes.confirm(consultation_url)
+                # Keep the closing date found on the page, which drives the re-check schedule
+                indexed = self.status_index.entries.get(consultation_url) or {}
+                self._update_status_index(dict(existing, scraped_date=datetime.now().isoformat()),
+                                          indexed.get('closing_date') or '')
+                return "SKIPPED"
+            
             soup = BeautifulSoup(response.content, 'html.parser')
             
             # Extract basic information
@@ -578,6 +669,14 @@ class RBNZConsultationsScraper:
             else:
                 status = "Open"
             
+            # The closing date of an open consultation drives its re-check schedule
+            closing_date = closed_date
+            if not closing_date and dates_container:
+                closing_match = re.search(r'Clos\w*\D{0,20}?(\d{1,2}\s+\w+\s+\d{4})',
+                                          self._clean_text(dates_container.get_text(' ')))
+                if closing_match:
+                    closing_date = closing_match.group(1)
+            
             # Extract contact information
             contact_info = {}
             contact_container = soup.find('div', class_='cs-consultation-contact-details')
@@ -750,17 +849,19 @@ class RBNZConsultationsScraper:
                     
             # Process PDF files
             pdf_content = ""
+            previous_pdfs = self._previous_attachments(existing, 'PDF')
             for pdf_info in download_links['pdf_files']:
                 self.logger.info(f"Extracting PDF content from: {pdf_info['title']}")
-                pdf_text = self._extract_pdf_text(pdf_info['url'])
+                pdf_text = self._extract_pdf_text(pdf_info['url'], previous_pdfs.get(pdf_info['title']))
                 if pdf_text:
                     pdf_content += f"\n\n--- PDF: {pdf_info['title']} ---\n\n{pdf_text}"
                     
             # Process Excel files
             excel_content = ""
+            previous_excel = self._previous_attachments(existing, 'EXCEL')
             for excel_info in download_links['excel_files']:
                 self.logger.info(f"Extracting Excel data from: {excel_info['title']}")
-                excel_data = self._extract_excel_data(excel_info['url'])
+                excel_data = self._extract_excel_data(excel_info['url'], previous_excel.get(excel_info['title']))
                 if excel_data:
                     excel_content += f"\n\n--- EXCEL: {excel_info['title']} ---\n\n{excel_data}"
                     
@@ -784,7 +885,7 @@ class RBNZConsultationsScraper:
             # Mark as scraped
             self.scraped_urls.add(consultation_url)
             
-            return {
+            consultation = {
                 'url': consultation_url,
                 'title': title,
                 'status': status,
@@ -801,6 +902,11 @@ class RBNZConsultationsScraper:
                 'excel_content': excel_content,
                 'tables_and_charts_data': tables_and_charts_data
             }
+            self._record_changes(consultation, existing)
+            self.changes.confirm(consultation_url, *(info['url'] for files in download_links.values()
+                                                     for info in files))
+            self._update_status_index(consultation, closing_date)
+            return consultation
             
         except Exception as e:
             self.logger.error(f"Error extracting content from {consultation_url}: {e}")
@@ -843,7 +949,7 @@ class RBNZConsultationsScraper:
                 consultations.append(consultation_data)
                 self.logger.info(f"✓ Scraped: {consultation_data['title'][:60]}...")
             elif consultation_data == "SKIPPED":
-                self.logger.info(f"→ Skipped (recently scraped and closed): {url}")
+                self.logger.info(f"→ Skipped (not due for a re-check, or unchanged): {url}")
                 
                 # Save progress every 10 consultations
                 if len(consultations) % 10 == 0:
@@ -949,8 +1055,13 @@ class RBNZConsultationsScraper:
                 
             self.logger.info(f"Saved results: {new_count} new, {updated_count} updated, {len(all_consultations)} total consultations")
             
-            # Save scraped URLs
+            # New and re-scraped consultations; unchanged ones are skipped by the index
+            index_records(consultations, CONFIG['OUTPUT_FILE'], logger=self.logger)
+            
+            # Save scraped URLs and the re-scrape index
             self._save_scraped_urls()
+            self.status_index.save()
+            self.changes.save()
             
             # Save request statistics
             self._save_request_stats()
@@ -965,9 +1076,9 @@ class RBNZConsultationsScraper:
         try:
             stats = {
                 'total_requests': self.request_count,
-                'requests_in_last_hour': len(self.request_times),
+                'requests_in_last_hour': self.ledger.usage(RBNZ_HOST),
                 'hourly_limit': self.hourly_limit,
-                'last_request_time': max(self.request_times) if self.request_times else None,
+                'last_request_time': self.ledger.last_request(RBNZ_HOST),
                 'scrape_date': datetime.now().isoformat()
             }
             
@@ -988,6 +1099,8 @@ class RBNZConsultationsScraper:
                 self.save_results(consultations)
             else:
                 self.logger.warning("No consultations were scraped")
+                self.status_index.save()
+                self.changes.save()
                 
         except Exception as e:
             self.logger.error(f"Scraping failed: {e}")
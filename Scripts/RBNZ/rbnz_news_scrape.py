@@ -9,6 +9,7 @@ import json
 import logging
 import os
 import re
+import sys
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -32,6 +33,11 @@ try:
 except ImportError:
     SELENIUM_AVAILABLE = False
 
+# Shared helpers live in Scripts/common
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.request_ledger import RequestLedger
+from common.search_index import index_records
+
 # Configuration
 CONFIG = {
     'BASE_URL': 'https://www.rbnz.govt.nz',
@@ -39,6 +45,8 @@ CONFIG = {
     'USER_AGENT': 'rbnz-approved-agent/rg-11701',
     'RATE_LIMIT': 292,  # requests per hour
     'REQUEST_DELAY': 3600 / 292,  # seconds between requests
+    'SAFETY_MARGIN': 0.8,  # Use only 80% of allowed rate for safety
+    'MIN_REQUEST_INTERVAL': 1.0,  # seconds between requests while under budget
     'MAX_PAGE': 1,  # Set to None for full scrape, or integer for limited pages
     'OUTPUT_DIR': './data',
     'OUTPUT_FILE': './data/rbnz_news.json',
@@ -46,6 +54,9 @@ CONFIG = {
     'SCRAPED_URLS_FILE': './data/scraped_urls.json'
 }
 
+# Host whose hourly budget all RBNZ scrapers share
+RBNZ_HOST = urlparse(CONFIG['BASE_URL']).netloc
+
 class RBNZScraper:
     def __init__(self, max_pages: Optional[int] = None, use_selenium: bool = False):
         self.session = requests.Session()
@@ -56,6 +67,10 @@ class RBNZScraper:
         self.setup_logging()
         self.setup_directories()
         
+        # Hourly request budget shared (on disk) with the other RBNZ scrapers
+        self.hourly_limit = int(CONFIG['RATE_LIMIT'] * CONFIG['SAFETY_MARGIN'])
+        self.ledger = RequestLedger(logger=self.logger)
+        
         if self.use_selenium:
             self.setup_selenium()
         
@@ -111,8 +126,9 @@ class RBNZScraper:
             self.logger.error(f"Could not save scraped URLs: {e}")
             
     def _rate_limit(self):
-        """Implement rate limiting"""
-        time.sleep(CONFIG['REQUEST_DELAY'])
+        """Take a request from the shared RBNZ budget; only waits when it is nearly used up"""
+        self.ledger.acquire(RBNZ_HOST, self.hourly_limit, window=3600,
+                            min_interval=CONFIG['MIN_REQUEST_INTERVAL'])
 
     def _clean_text(self, text: str) -> str:
         """Clean and normalize text"""
@@ -438,6 +454,8 @@ class RBNZScraper:
                 
             self.logger.info(f"Saved {len(new_articles)} new articles. Total: {len(all_articles)}")
             
+            index_records(new_articles, CONFIG['OUTPUT_FILE'], logger=self.logger)
+            
             # Save scraped URLs
             self._save_scraped_urls()
             
@@ -9,6 +9,7 @@ import json
 import logging
 import os
 import re
+import sys
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -32,6 +33,11 @@ try:
 except ImportError:
     SELENIUM_AVAILABLE = False
 
+# Shared helpers live in Scripts/common
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.request_ledger import RequestLedger
+from common.search_index import index_records
+
 # Configuration
 CONFIG = {
     'BASE_URL': 'https://www.rbnz.govt.nz',
@@ -40,6 +46,7 @@ CONFIG = {
     'RATE_LIMIT': 292,  # requests per hour
     'REQUEST_DELAY': 3600 / 292,  # seconds between requests (~12.3 seconds)
     'SAFETY_MARGIN': 0.8,  # Use only 80% of allowed rate for safety
+    'MIN_REQUEST_INTERVAL': 1.0,  # seconds between requests while under budget
     'MAX_PAGE': 1,  # Set to None for full scrape, or integer for limited pages
     'OUTPUT_DIR': './data',
     'OUTPUT_FILE': './data/rbnz_publications.json',
@@ -48,6 +55,9 @@ CONFIG = {
     'REQUEST_LOG_FILE': './data/request_log.json'
 }
 
+# Host whose hourly budget all RBNZ scrapers share
+RBNZ_HOST = urlparse(CONFIG['BASE_URL']).netloc
+
 class RBNZPublicationsScraper:
     def __init__(self, max_pages: Optional[int] = None, use_selenium: bool = False):
         self.session = requests.Session()
@@ -58,13 +68,14 @@ class RBNZPublicationsScraper:
         self.setup_logging()
         self.setup_directories()
         
-        # Rate limiting tracking
-        self.request_times = []
+        # Rate limiting tracking (budget shared across RBNZ scrapers and runs)
         self.request_count = 0
         self.hourly_limit = int(CONFIG['RATE_LIMIT'] * CONFIG['SAFETY_MARGIN'])
-        self.request_delay = 3600 / self.hourly_limit  # Adjusted delay with safety margin
+        self.request_delay = 3600 / self.hourly_limit  # Average spacing at the full budget
+        self.ledger = RequestLedger(logger=self.logger)
         
-        self.logger.info(f"Rate limiting: {self.hourly_limit} requests/hour, {self.request_delay:.1f}s between requests")
+        self.logger.info(f"Rate limiting: {self.hourly_limit} requests/hour shared by RBNZ scrapers "
+                         f"({self.ledger.usage(RBNZ_HOST)} used in the last hour)")
         
         if self.use_selenium:
             self.setup_selenium()
@@ -134,36 +145,16 @@ class RBNZPublicationsScraper:
             self.logger.error(f"Could not save scraped URLs: {e}")
             
     def _rate_limit(self):
-        """Implement smart rate limiting with request tracking"""
-        current_time = time.time()
-        
-        # Remove requests older than 1 hour
-        self.request_times = [t for t in self.request_times if current_time - t < 3600]
-        
-        # Check if we're approaching the hourly limit
-        if len(self.request_times) >= self.hourly_limit:
-            # Calculate how long to wait until the oldest request is > 1 hour old
-            oldest_request = min(self.request_times)
-            wait_time = 3600 - (current_time - oldest_request) + 1  # +1 second buffer
-            
-            if wait_time > 0:
-                self.logger.warning(f"Rate limit reached. Waiting {wait_time:.1f} seconds...")
-                time.sleep(wait_time)
-                current_time = time.time()
-                # Clean up old requests after waiting
-                self.request_times = [t for t in self.request_times if current_time - t < 3600]
-        
-        # Standard delay between requests
-        time.sleep(self.request_delay)
-        
-        # Record this request
-        self.request_times.append(current_time)
+        """Take a request from the hourly RBNZ budget shared (on disk) with the other RBNZ scrapers"""
+        # Only waits when the budget is nearly used up (or to keep the minimum spacing)
+        self.ledger.acquire(RBNZ_HOST, self.hourly_limit, window=3600,
+                            min_interval=CONFIG['MIN_REQUEST_INTERVAL'])
         self.request_count += 1
         
         # Log progress every 20 requests
         if self.request_count % 20 == 0:
-            requests_in_last_hour = len(self.request_times)
-            self.logger.info(f"Request #{self.request_count}: {requests_in_last_hour}/{self.hourly_limit} requests in last hour")
+            requests_in_last_hour = self.ledger.usage(RBNZ_HOST)
+            self.logger.info(f"Request #{self.request_count}: {requests_in_last_hour}/{self.hourly_limit} requests in last hour (all RBNZ scrapers)")
 
     def _safe_request(self, url: str, timeout: int = 30) -> Optional[requests.Response]:
         """Make a rate-limited request with error handling"""
@@ -774,6 +765,8 @@ class RBNZPublicationsScraper:
                 
             self.logger.info(f"Saved {len(new_publications)} new publications. Total: {len(all_publications)}")
             
+            index_records(new_publications, CONFIG['OUTPUT_FILE'], logger=self.logger)
+            
             # Save scraped URLs
             self._save_scraped_urls()
             
@@ -788,9 +781,9 @@ class RBNZPublicationsScraper:
         try:
             stats = {
                 'total_requests': self.request_count,
-                'requests_in_last_hour': len(self.request_times),
+                'requests_in_last_hour': self.ledger.usage(RBNZ_HOST),
                 'hourly_limit': self.hourly_limit,
-                'last_request_time': max(self.request_times) if self.request_times else None,
+                'last_request_time': self.ledger.last_request(RBNZ_HOST),
                 'scrape_date': datetime.now().isoformat()
             }
             
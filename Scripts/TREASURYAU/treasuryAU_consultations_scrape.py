@@ -9,6 +9,7 @@ import requests
 import json
 import os
 import re
+import sys
 import time
 import logging
 import io
@@ -16,7 +17,7 @@ import hashlib
 from datetime import datetime
 from urllib.parse import urljoin
 from typing import Dict, List, Optional, Set
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from pathlib import Path
 
 # Required imports
@@ -47,6 +48,10 @@ except ImportError as e:
     print("Install with: pip install selenium webdriver-manager")
     exit(1)
 
+# Shared helpers live in Scripts/common
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.change_tracker import ChangeTracker, append_history, split_sections
+
 # Configuration
 BASE_URL = "https://treasury.gov.au"
 CONSULTATIONS_URL = "https://treasury.gov.au/consultation"
@@ -60,6 +65,10 @@ MAX_RETRIES = 3
 JSON_FILE = DATA_DIR / "treasuryAU_consultations.json"
 CSV_FILE = DATA_DIR / "treasuryAU_consultations.csv"
 LOG_FILE = DATA_DIR / "scraper.log"
+CHANGE_STATE_FILE = DATA_DIR / "index" / "consultation_changes.json"
+
+# PDF blocks in pdf_content ("--- PDF DOCUMENT 2: <description> ---")
+PDF_BLOCK_HEADER = re.compile(r'^--- PDF DOCUMENT \d+: (.*?) ---$', re.MULTILINE)
 
 @dataclass
 class Consultation:
@@ -81,6 +90,9 @@ class Consultation:
     status_history: List[Dict[str, str]]  # List of {status: str, date: str}
     last_status_check: str
     unique_id: str
+    # Section-level changes seen on re-checks: {date, added, removed, changed, diff}
+    change_history: List[Dict] = field(default_factory=list)
+    changed_sections: List[str] = field(default_factory=list)
 
     def to_dict(self) -> Dict:
         """Convert to dictionary for JSON serialization"""
@@ -101,12 +113,15 @@ class TreasuryAUScraper:
         self.setup_directories()
         self.setup_session()
         self.load_existing_data()
+        # Validators and section fingerprints, so a re-check only re-extracts what changed
+        self.changes = ChangeTracker(CHANGE_STATE_FILE, logger=self.logger)
         
         # Stats tracking
         self.stats = {
             'new_consultations': 0,
             'updated_consultations': 0,
             'status_changes': 0,
+            'content_changes': 0,
             'skipped_no_changes': 0,
             'errors': 0
         }
@@ -436,19 +451,16 @@ class TreasuryAUScraper:
                 
                 self.stats['updated_consultations'] += 1
                 
-                # For significant updates, re-extract content
-                if current_status != existing_status or not consultation_data.get('content'):
-                    self.logger.info("Re-extracting content due to status change or missing content")
-                    # Extract fresh content
-                    consultation_data['consultation_period'] = self.extract_consultation_period(soup)
-                    consultation_data['theme'] = self.extract_theme(soup)
-                    consultation_data['content'] = self.extract_main_content(soup)
-                    consultation_data['related_links'] = self.extract_related_links(soup)
-                    consultation_data['image_url'] = self.extract_image_url(soup)
-                    consultation_data['pdf_content'] = self.extract_pdf_content(soup)
-                    consultation_data['published_date'] = self.extract_published_date(soup)
-                else:
-                    self.logger.info("Keeping existing content (status update only)")
+                # Re-read the page; PDFs are only re-downloaded and re-extracted if they changed
+                consultation_data['consultation_period'] = self.extract_consultation_period(soup)
+                consultation_data['theme'] = self.extract_theme(soup)
+                consultation_data['content'] = self.extract_main_content(soup)
+                consultation_data['related_links'] = self.extract_related_links(soup)
+                consultation_data['image_url'] = self.extract_image_url(soup)
+                consultation_data['pdf_content'] = self.extract_pdf_content(
+                    soup, existing_data.get('pdf_content', ''))
+                consultation_data['published_date'] = self.extract_published_date(soup)
+                self._record_changes(consultation_data, existing_data)
             else:
                 # New consultation - extract all content
                 consultation_period = self.extract_consultation_period(soup)
@@ -480,6 +492,7 @@ class TreasuryAUScraper:
                     }],
                     'last_status_check': datetime.now().isoformat()
                 }
+                self._record_changes(consultation_data, None)
                 
                 self.stats['new_consultations'] += 1
 
@@ -494,6 +507,49 @@ class TreasuryAUScraper:
             self.stats['errors'] += 1
             return None
 
+    def _previous_pdf_texts(self, pdf_content: str) -> Dict[str, str]:
+        """Formatted text of each stored PDF by description (ambiguous descriptions left out)"""
+        previous, repeated = {}, set()
+        parts = PDF_BLOCK_HEADER.split(pdf_content or '')
+        for i in range(1, len(parts) - 1, 2):
+            description = parts[i]
+            if description in previous:
+                repeated.add(description)
+            previous[description] = parts[i + 1].strip()
+        return {description: text for description, text in previous.items() if description not in repeated}
+
+    def _consultation_sections(self, consultation_data: Dict) -> Dict[str, str]:
+        """Named sections of a consultation (page headings, PDFs), fingerprinted by the change tracker"""
+        sections = {
+            'status': f"{consultation_data.get('status', '')} / {consultation_data.get('date_range', '')}",
+            'consultation_period': consultation_data.get('consultation_period') or '',
+            'published_date': consultation_data.get('published_date') or '',
+            'related_links': '\n'.join(sorted(consultation_data.get('related_links') or [])),
+        }
+        for heading, text in split_sections(consultation_data.get('content') or '').items():
+            sections[f"content: {heading}"] = text
+        parts = PDF_BLOCK_HEADER.split(consultation_data.get('pdf_content') or '')
+        for i in range(1, len(parts) - 1, 2):
+            name, count = f"pdf: {parts[i]}", 2
+            while name in sections:
+                name, count = f"pdf: {parts[i]} ({count})", count + 1
+            sections[name] = parts[i + 1].strip()
+        return sections
+
+    def _record_changes(self, consultation_data: Dict, existing_data: Optional[Dict]):
+        """Compare a consultation with its stored version section by section, keeping a compact history"""
+        previous = self._consultation_sections(existing_data) if existing_data else None
+        entry = self.changes.record(consultation_data['unique_id'],
+                                    self._consultation_sections(consultation_data), previous)
+        consultation_data['changed_sections'] = []
+        if entry:
+            consultation_data['change_history'] = append_history(consultation_data.get('change_history'), entry)
+            consultation_data['changed_sections'] = entry['added'] + entry['changed']
+            self.stats['content_changes'] += 1
+            self.logger.info(f"Changed sections: {', '.join(entry['added'] + entry['changed'] + entry['removed'])}")
+        elif existing_data:
+            self.logger.info("No content changes since the last check")
+
     def extract_consultation_period(self, soup: BeautifulSoup) -> str:
         """Extract consultation period from page"""
         try:
@@ -758,9 +814,10 @@ class TreasuryAUScraper:
 
         return "Unknown"
 
-    def extract_pdf_content(self, soup: BeautifulSoup) -> str:
-        """Extract text content from linked PDF files"""
+    def extract_pdf_content(self, soup: BeautifulSoup, previous_content: str = '') -> str:
+        """Extract text content from linked PDF files (unchanged PDFs reuse ``previous_content``)"""
         pdf_content = []
+        previous_pdfs = self._previous_pdf_texts(previous_content)
 
         try:
             # Find ALL PDF links using multiple methods
@@ -833,7 +890,7 @@ class TreasuryAUScraper:
                     # Get PDF description from link and surrounding context
                     description = self._get_pdf_description(link)
 
-                    content = self.download_and_extract_pdf(pdf_url)
+                    content = self.download_and_extract_pdf(pdf_url, previous_pdfs.get(description))
                     if content:
                         # Format for LLM analysis with clear separation
                         formatted_content = self._format_pdf_content_for_llm(description, content, i)
@@ -919,18 +976,25 @@ class TreasuryAUScraper:
 
         return formatted
 
-    def download_and_extract_pdf(self, pdf_url: str) -> str:
-        """Download and extract text from PDF"""
+    def download_and_extract_pdf(self, pdf_url: str, previous: Optional[str] = None) -> str:
+        """Download and extract text from PDF (``previous`` is returned if the file is unchanged)"""
         try:
             headers = {
                 'User-Agent': self.ua.random,
                 'Accept': 'application/pdf,application/octet-stream,*/*',
                 'Referer': BASE_URL,
             }
+            if previous is not None:
+                headers.update(self.changes.conditional_headers(pdf_url))
 
             response = self.session.get(pdf_url, timeout=PDF_TIMEOUT, headers=headers)
             response.raise_for_status()
 
+            if not self.changes.fetched(pdf_url, response) and previous is not None:
+                self.logger.info(f"PDF unchanged, keeping extracted text: {pdf_url}")
+                self.changes.confirm(pdf_url)
+                return previous
+
             if len(response.content) < 1000:
                 self.logger.warning(f"PDF seems too small: {len(response.content)} bytes")
                 return ""
@@ -955,6 +1019,7 @@ class TreasuryAUScraper:
                     if text_content:
                         full_text = '\n\n'.join(text_content)
                         self.logger.info(f"Extracted {len(full_text)} characters using pdfplumber")
+                        self.changes.confirm(pdf_url)
                         return full_text
 
             except Exception as e:
@@ -979,6 +1044,7 @@ class TreasuryAUScraper:
                 if text_content:
                     full_text = '\n\n'.join(text_content)
                     self.logger.info(f"Extracted {len(full_text)} characters using PyPDF2")
+                    self.changes.confirm(pdf_url)
                     return full_text
 
             except Exception as e:
@@ -1068,6 +1134,7 @@ class TreasuryAUScraper:
             # Save JSON
             with open(JSON_FILE, 'w', encoding='utf-8') as f:
                 json.dump(updated_data, f, ensure_ascii=False, indent=2)
+            self.changes.save()
 
             # Save CSV
             if updated_data:
@@ -1081,6 +1148,7 @@ class TreasuryAUScraper:
             self.logger.info(f"New consultations: {self.stats['new_consultations']}")
             self.logger.info(f"Updated consultations: {self.stats['updated_consultations']}")
             self.logger.info(f"Status changes detected: {self.stats['status_changes']}")
+            self.logger.info(f"Content changes detected: {self.stats['content_changes']}")
             self.logger.info(f"Skipped (no changes): {self.stats['skipped_no_changes']}")
             self.logger.info(f"Errors: {self.stats['errors']}")
 
@@ -1109,6 +1177,7 @@ class TreasuryAUScraper:
                 self.logger.info("Data saved successfully")
             else:
                 self.logger.warning("No consultations found to update")
+                self.changes.save()
 
         except Exception as e:
             self.logger.error(f"Error in main run: {e}")
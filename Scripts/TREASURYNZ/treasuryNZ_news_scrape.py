@@ -18,6 +18,7 @@ from typing import Dict, List, Optional, Set, Tuple
 from urllib.parse import urljoin, urlparse
 import io
 import random
+import sys
 
 # Configure logging first before any other imports
 os.makedirs('data', exist_ok=True)
@@ -57,15 +58,29 @@ except ImportError:
     logger.warning("cloudscraper not available, using standard requests")
     CLOUDSCRAPER_AVAILABLE = False
 
+# Shared helpers live in Scripts/common
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common import pdf_extract
+from common.chunker import ChunkWriter, chunks_requested
+from common.search_index import index_records
+
+# Single-pass text + table extraction (PyMuPDF or pdfplumber); PyPDF2 otherwise
+PDF_EXTRACT_AVAILABLE = pdf_extract.is_available()
+if not PDF_EXTRACT_AVAILABLE:
+    logger.warning("PyMuPDF/pdfplumber not available, using PyPDF2 text extraction")
+
 class TreasuryNZNewsScraper:
     """Main scraper class for Treasury NZ news articles"""
     
-    def __init__(self, max_pages=1):
+    def __init__(self, max_pages=1, write_chunks=False):
         self.base_url = "https://www.treasury.govt.nz"
         self.news_url = "https://www.treasury.govt.nz/news-and-events/news"
         
         # Set maximum pages to scrape (None = all pages, number = limit pages)
         self.MAX_PAGES = max_pages if max_pages is not None else 3
+
+        # Optional token-bounded chunks of new articles (data/chunks/)
+        self.write_chunks = write_chunks
         
         # Create data directory
         Path("data").mkdir(exist_ok=True)
@@ -380,6 +395,22 @@ class TreasuryNZNewsScraper:
             
             response = self._make_robust_request(pdf_url)
             
+            if PDF_EXTRACT_AVAILABLE:
+                # One layout pass per page yields the text, real tables and page boundaries
+                pdf = pdf_extract.extract_pdf(response.content, source=pdf_url)
+                text = ""
+                for page in pdf.pages:
+                    if page.text:
+                        text += f"\n--- Page {page.number} ---\n{self._clean_text_content(page.text)}\n"
+                tables = [table.to_text() for table in pdf.tables]
+                
+                logger.info(f"Successfully extracted {len(text)} characters and {len(tables)} tables from PDF "
+                            f"in {pdf.seconds:.1f}s ({pdf.engine})")
+                return {
+                    'text': text,
+                    'tables': tables
+                }
+            
             # Read PDF content
             pdf_file = io.BytesIO(response.content)
             pdf_reader = PyPDF2.PdfReader(pdf_file)
@@ -983,10 +1014,24 @@ class TreasuryNZNewsScraper:
             self._save_seen_urls()
             
             logger.info(f"Saved {len(new_articles)} new articles. Total articles: {len(all_articles)}")
+
+            if self.write_chunks:
+                self._write_chunks(new_articles)
+            index_records(new_articles, 'data/treasuryNZ_news.json', logger=logger)
             
         except Exception as e:
             logger.error(f"Failed to save results: {e}")
 
+    def _write_chunks(self, articles: List[Dict]):
+        """Chunk the content (related PDFs and pages included) of new articles"""
+        try:
+            writer = ChunkWriter('data/chunks', 'treasuryNZ_news', text_fields=('content',),
+                                 metadata_fields=('title', 'url', 'published_date'), logger=logger)
+            writer.update(articles)
+            writer.close()
+        except Exception as e:
+            logger.error(f"Failed to write chunks: {e}")
+
     def cleanup(self):
         """Clean up resources"""
         try:
@@ -1013,8 +1058,11 @@ def main():
     
     # You can also set this via command line argument
     import sys
-    if len(sys.argv) > 1:
-        if sys.argv[1] == 'test':
+    # --chunks (or SCRAPER_CHUNKS=1) also writes token-bounded chunks of new articles
+    write_chunks = chunks_requested()
+    args = [arg for arg in sys.argv[1:] if arg != '--chunks']
+    if args:
+        if args[0] == 'test':
             # Test mode
             scraper = TreasuryNZNewsScraper(max_pages=1)
             success = scraper.test_setup()
@@ -1027,12 +1075,12 @@ def main():
                 sys.exit(1)
         
         try:
-            MAX_PAGES = int(sys.argv[1]) if sys.argv[1] != 'all' else None
+            MAX_PAGES = int(args[0]) if args[0] != 'all' else None
             print(f"MAX_PAGES set via command line: {MAX_PAGES}")
         except ValueError:
-            print(f"Invalid MAX_PAGES value: {sys.argv[1]}. Using default: {MAX_PAGES}")
+            print(f"Invalid MAX_PAGES value: {args[0]}. Using default: {MAX_PAGES}")
     
-    scraper = TreasuryNZNewsScraper(max_pages=MAX_PAGES)
+    scraper = TreasuryNZNewsScraper(max_pages=MAX_PAGES, write_chunks=write_chunks)
     
     try:
         if MAX_PAGES is None:
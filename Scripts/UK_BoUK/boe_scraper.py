@@ -17,13 +17,13 @@ import json
 import logging
 import os
 import re
+import sys
 import time
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Set
 from urllib.parse import urljoin, urlparse
 import argparse
-import csv
 import tempfile
 
 # Core dependencies
@@ -32,6 +32,11 @@ from bs4 import BeautifulSoup
 from playwright.async_api import async_playwright, Page, Browser
 import pandas as pd
 
+# Shared helpers live in Scripts/common
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.csv_ingest import csv_to_text
+from common.table_export import TableExport
+
 # PDF and document processing
 try:
     import pdfplumber
@@ -610,9 +615,8 @@ class BOEScraper:
     def _extract_csv_text(self, file_path: Path) -> str:
         """Extract text from CSV files"""
         try:
-            df = pd.read_csv(file_path)
-            df = df.fillna('')  # Replace NaN with empty strings
-            return df.to_string(index=False)
+            # Encoding and delimiter are sniffed from a prefix, then parsed once
+            return csv_to_text(file_path, index=False, na_rep='')
         except Exception as e:
             self.logger.error(f"Error extracting CSV text from {file_path}: {e}")
             return ""
@@ -733,22 +737,10 @@ class BOEScraper:
         self.logger.info(f"Total articles: {len(all_articles)}")
 
     def _save_csv_index(self, articles: List[Dict[str, Any]]) -> None:
-        """Save CSV index of articles"""
+        """Save CSV index of articles (appending only new or changed rows)"""
         csv_path = self.data_path / CSV_INDEX_FILE
-        
-        with open(csv_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(['id', 'headline', 'published_date', 'url', 'scraped_date', 'theme'])
-            
-            for article in articles:
-                writer.writerow([
-                    article.get('id', ''),
-                    article.get('headline', ''),
-                    article.get('published_date', ''),
-                    article.get('url', ''),
-                    article.get('scraped_date', ''),
-                    article.get('theme', '')
-                ])
+        TableExport(csv_path, ['id', 'headline', 'published_date', 'url', 'scraped_date', 'theme'],
+                    key_field='id', logger=self.logger).export(articles)
 
 def main():
     """Main entry point"""
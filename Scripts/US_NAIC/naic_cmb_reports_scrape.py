@@ -6,6 +6,7 @@ Extracts PDFs with OCR for charts, graphs, and images.
 
 import json
 import os
+import sys
 import time
 import random
 import hashlib
@@ -23,12 +24,14 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium_stealth import stealth
 import PyPDF2
-import pdfplumber
-from PIL import Image
 import pytesseract
 import io
 import re
-import fitz  # PyMuPDF for better image extraction
+
+# Shared helpers live in Scripts/common
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.ocr_triage import OcrTriage
+from common.pdf_extract import extract_pdf
 
 
 # ==================== CONFIGURATION ====================
@@ -42,6 +45,7 @@ DELAY_MAX = 5  # Maximum delay between requests (seconds)
 
 # Tesseract configuration for better OCR
 TESSERACT_CONFIG = '--oem 3 --psm 6'  # LSTM OCR, assume uniform block of text
+OCR_WORKERS = min(8, os.cpu_count() or 1)  # Parallel Tesseract processes
 
 
 # ==================== UTILITY FUNCTIONS ====================
@@ -109,69 +113,6 @@ def create_driver() -> webdriver.Chrome:
 
 
 # ==================== ENHANCED PDF EXTRACTION WITH OCR ====================
-def extract_images_from_pdf(pdf_content: bytes) -> List[Image.Image]:
-    """Extract all images from PDF using PyMuPDF."""
-    images = []
-    
-    try:
-        # Open PDF with PyMuPDF
-        pdf_document = fitz.open(stream=pdf_content, filetype="pdf")
-        
-        for page_num in range(len(pdf_document)):
-            page = pdf_document[page_num]
-            
-            # Get images from page
-            image_list = page.get_images(full=True)
-            
-            for img_index, img in enumerate(image_list):
-                xref = img[0]
-                
-                try:
-                    # Extract image
-                    base_image = pdf_document.extract_image(xref)
-                    image_bytes = base_image["image"]
-                    
-                    # Convert to PIL Image
-                    image = Image.open(io.BytesIO(image_bytes))
-                    
-                    # Only process reasonably sized images (likely to contain charts/text)
-                    if image.width > 100 and image.height > 100:
-                        images.append(image)
-                
-                except Exception as e:
-                    print(f"    Error extracting image {img_index} from page {page_num}: {e}")
-                    continue
-        
-        pdf_document.close()
-    
-    except Exception as e:
-        print(f"    Error extracting images from PDF: {e}")
-    
-    return images
-
-
-def ocr_image(image: Image.Image) -> str:
-    """Perform OCR on an image to extract text."""
-    try:
-        # Convert to grayscale for better OCR
-        if image.mode != 'L':
-            image = image.convert('L')
-        
-        # Enhance contrast
-        from PIL import ImageEnhance
-        enhancer = ImageEnhance.Contrast(image)
-        image = enhancer.enhance(2)
-        
-        # Perform OCR
-        text = pytesseract.image_to_string(image, config=TESSERACT_CONFIG)
-        
-        return clean_text(text)
-    
-    except Exception as e:
-        print(f"    Error performing OCR: {e}")
-        return ""
-
-
 def extract_text_from_pdf_with_ocr(pdf_content: bytes) -> str:
     """Extract text from PDF including OCR for images, charts, and graphs."""
     text_parts = []
@@ -179,26 +120,20 @@ def extract_text_from_pdf_with_ocr(pdf_content: bytes) -> str:
     print("    Extracting text from PDF...")
     
     try:
-        # First, extract regular text using pdfplumber
-        with pdfplumber.open(io.BytesIO(pdf_content)) as pdf:
-            for page_num, page in enumerate(pdf.pages, 1):
-                print(f"      Processing page {page_num}/{len(pdf.pages)}...")
-                
-                # Extract text
-                page_text = page.extract_text()
-                if page_text:
-                    text_parts.append(f"[PAGE {page_num}]\n{page_text}")
-                
-                # Extract tables separately for better structure
-                tables = page.extract_tables()
-                for table_num, table in enumerate(tables, 1):
-                    if table:
-                        # Convert table to text format
-                        table_text = '\n'.join(['\t'.join([str(cell) if cell else '' for cell in row]) for row in table])
-                        text_parts.append(f"\n[TABLE {table_num} - PAGE {page_num}]\n{table_text}\n")
+        # First, extract regular text and tables (one layout pass per page)
+        pdf = extract_pdf(pdf_content)
+        for page in pdf.pages:
+            if page.text:
+                text_parts.append(f"[PAGE {page.number}]\n{page.text}")
+            
+            for table in page.tables:
+                text_parts.append(f"\n[TABLE {table.index} - PAGE {page.number}]\n{table.to_text()}\n")
+        
+        slowest = ', '.join(f"p{page.number} {page.seconds:.1f}s" for page in pdf.slowest_pages())
+        print(f"    {len(pdf.pages)} pages, {len(pdf.tables)} tables in {pdf.seconds:.1f}s ({pdf.engine}; slowest: {slowest})")
     
     except Exception as e:
-        print(f"    Error extracting text with pdfplumber: {e}")
+        print(f"    Error extracting text with PyMuPDF/pdfplumber: {e}")
         
         # Fallback to PyPDF2
         try:
@@ -210,16 +145,25 @@ def extract_text_from_pdf_with_ocr(pdf_content: bytes) -> str:
         except Exception as e2:
             print(f"    Error with PyPDF2 fallback: {e2}")
     
-    # Now extract and OCR images
-    print("    Extracting images for OCR...")
-    images = extract_images_from_pdf(pdf_content)
+    # Now OCR the images worth OCRing: unique, not page furniture, not already in the text layer
+    print("    Triaging images for OCR...")
+    triage = OcrTriage(tesseract_config=TESSERACT_CONFIG, workers=OCR_WORKERS)
+    try:
+        jobs = triage.plan(pdf_content)
+    except Exception as e:
+        print(f"    Error extracting images from PDF: {e}")
+        jobs = []
+    
+    stats = triage.stats
+    print(f"    Found {stats.images_seen} images: {stats.queued} to OCR, skipped {stats.duplicates} duplicate, "
+          f"{stats.repeated} repeated, {stats.too_small} small, {stats.covered_by_text} covered by text")
     
-    if images:
-        print(f"    Found {len(images)} images. Performing OCR...")
+    if jobs:
+        results = triage.run(jobs)
+        print(f"    OCR of {len(jobs)} images took {stats.ocr_seconds:.1f}s ({OCR_WORKERS} workers)")
         
-        for img_num, image in enumerate(images, 1):
-            print(f"      OCR on image {img_num}/{len(images)}...")
-            ocr_text = ocr_image(image)
+        for img_num, result in enumerate(results, 1):
+            ocr_text = clean_text(result.text)
             
             if ocr_text and len(ocr_text.strip()) > 20:  # Only include if meaningful text found
                 text_parts.append(f"\n[IMAGE/CHART {img_num} - OCR TEXT]\n{ocr_text}\n")
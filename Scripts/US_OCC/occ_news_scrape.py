@@ -23,6 +23,7 @@ import asyncio
 import json
 import logging
 import re
+import sys
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, List, Optional, Set
@@ -36,6 +37,10 @@ import aiohttp
 import PyPDF2
 import pandas as pd
 
+# Shared helpers live in Scripts/common
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.csv_ingest import read_csv
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -287,8 +292,8 @@ class OCCNewsScraper:
             Text representation of CSV data
         """
         try:
-            csv_file = BytesIO(csv_bytes)
-            df = pd.read_csv(csv_file)
+            # Encoding and delimiter are sniffed from a prefix, then parsed once
+            df = read_csv(csv_bytes)
             text_parts = []
             
             for col in df.columns:
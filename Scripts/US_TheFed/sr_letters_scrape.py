@@ -17,6 +17,7 @@ from typing import Dict, List, Optional
 from urllib.parse import urljoin
 import re
 import io
+import sys
 
 from bs4 import BeautifulSoup
 import PyPDF2
@@ -25,12 +26,22 @@ from PIL import Image
 import pytesseract
 import pandas as pd
 
+# Shared helpers live in Scripts/common
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.async_http import fetch_all
+from common.resource_cache import ResourceCache
+
 # Configuration
 BASE_URL = "https://www.federalreserve.gov"
 SR_LETTERS_BASE = f"{BASE_URL}/supervisionreg/srletters"
 OUTPUT_DIR = Path("data")
 OUTPUT_FILE = OUTPUT_DIR / "fed_reg_letters.json"
 
+# Linked pages and attachments, shared by the Fed scrapers and fetched once per nightly run
+LINKED_CACHE_FILE = OUTPUT_DIR / "cache" / "linked_resources.sqlite3"
+LINKED_PAGE_CONCURRENCY = 4     # concurrent linked-page fetches per host
+LINKED_PAGE_MIN_INTERVAL = 0.5  # seconds between request starts to the host
+
 # Create directories
 OUTPUT_DIR.mkdir(exist_ok=True)
 
@@ -41,6 +52,8 @@ class SRLettersScraper:
     def __init__(self, debug: bool = False):
         self.debug = debug
         self.session = requests.Session()
+        self.linked_cache = ResourceCache(LINKED_CACHE_FILE)
+        self.linked_cache.prune()
         self.existing_data = self._load_existing_data()
         self.existing_ids = {item['id'] for item in self.existing_data}
         self.scraped_date = datetime.utcnow().isoformat() + 'Z'
@@ -340,6 +353,7 @@ class SRLettersScraper:
         """Extract text from linked pages, only supervision/regulation-related content."""
         linked_pages = []
         seen_urls = set()
+        candidate_urls = []
         
         # Only look for links within the main article content area
         article = soup.select_one('#article')
@@ -411,13 +425,47 @@ class SRLettersScraper:
                 continue
             
             seen_urls.add(full_url)
-            
-            # Fetch and extract
-            page_data = self._fetch_linked_page(full_url)
-            if page_data:
-                linked_pages.append(page_data)
+            candidate_urls.append(full_url)
+        
+        return self._fetch_linked_pages(candidate_urls)
+    
+    def _fetch_linked_pages(self, urls: List[str]) -> List[Dict]:
+        """
+        Fetch linked pages in order, taking shared pages from the linked-resource cache
+        and fetching the rest concurrently under the per-host limit.
+        """
+        pages = self.linked_cache.get_many(urls)
+        missing = [url for url in urls if url not in pages]
+        if self.debug and pages:
+            print(f"  DEBUG: {len(pages)} linked pages from cache")
         
-        return linked_pages
+        responses = []
+        if missing:
+            try:
+                responses = fetch_all(missing, session=self.session,
+                                      per_host_limit=LINKED_PAGE_CONCURRENCY,
+                                      min_interval=LINKED_PAGE_MIN_INTERVAL)
+            except ImportError:
+                pass  # No async HTTP client installed: fetch one at a time below
+        
+        for i, url in enumerate(missing):
+            if i < len(responses) and responses[i].ok:
+                try:
+                    pages[url] = self._parse_linked_page(url, responses[i].content)
+                except Exception as e:
+                    # Parse errors are not cached, so the page is tried again next time
+                    if self.debug:
+                        print(f"      ✗ Error: {e}")
+                    pages[url] = None
+                    continue
+                self.linked_cache.put(url, pages[url])
+            else:
+                # Failed fetches are retried once here; errors are never cached
+                pages[url] = self._fetch_linked_page(url)
+                if pages[url]:
+                    self.linked_cache.put(url, pages[url])
+        
+        return [pages[url] for url in urls if pages[url]]
     
     def _fetch_linked_page(self, url: str) -> Optional[Dict]:
         """Fetch and extract text from a linked page."""
@@ -429,25 +477,31 @@ class SRLettersScraper:
             response.raise_for_status()
             time.sleep(1)
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            page_text = self._extract_main_text(soup)
-            
-            if page_text and len(page_text) > 50:
-                if self.debug:
-                    print(f"      ✓ Extracted {len(page_text)} characters")
-                return {
-                    'url': url,
-                    'text': page_text,
-                }
-            else:
-                if self.debug:
-                    print(f"      ✗ Insufficient content")
+            return self._parse_linked_page(url, response.content)
         except Exception as e:
             if self.debug:
                 print(f"      ✗ Error: {e}")
         
         return None
     
+    def _parse_linked_page(self, url: str, content: bytes) -> Optional[Dict]:
+        """Extract text from a fetched linked page (None if it has no meaningful content; parse errors raise)."""
+        soup = BeautifulSoup(content, 'html.parser')
+        page_text = self._extract_main_text(soup)
+        
+        if page_text and len(page_text) > 50:
+            if self.debug:
+                print(f"      ✓ Extracted {len(page_text)} characters")
+            return {
+                'url': url,
+                'text': page_text,
+            }
+        else:
+            if self.debug:
+                print(f"      ✗ Insufficient content")
+        
+        return None
+    
     def _extract_attachments(self, soup: BeautifulSoup, base_url: str) -> Dict:
         """Extract and process all attachments."""
         attachments = {
@@ -472,19 +526,19 @@ class SRLettersScraper:
             # Process by file type
             if full_url.endswith('.pdf'):
                 processed_urls.add(full_url)
-                pdf_data = self._extract_pdf(full_url)
+                pdf_data = self.linked_cache.get_or_fetch(full_url, self._extract_pdf)
                 if pdf_data:
                     attachments['pdfs'].append(pdf_data)
             
             elif full_url.endswith(('.xlsx', '.xls')):
                 processed_urls.add(full_url)
-                excel_data = self._extract_excel(full_url)
+                excel_data = self.linked_cache.get_or_fetch(full_url, self._extract_excel)
                 if excel_data:
                     attachments['excels'].append(excel_data)
             
             elif full_url.endswith('.csv'):
                 processed_urls.add(full_url)
-                csv_data = self._extract_csv(full_url)
+                csv_data = self.linked_cache.get_or_fetch(full_url, self._extract_csv)
                 if csv_data:
                     attachments['csvs'].append(csv_data)
         
@@ -729,6 +783,9 @@ class SRLettersScraper:
             
             time.sleep(2)  # Rate limiting
         
+        stats = self.linked_cache.stats
+        print(f"\nLinked pages and attachments: {stats['hits']} from cache, {stats['misses']} fetched")
+        
         # Save results
         if scraped_letters:
             self.save_results(scraped_letters)
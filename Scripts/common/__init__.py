@@ -0,0 +1,11 @@
+"""
+Shared helpers for the regulator scrapers.
+
+Scraper scripts run from their own regulator folder, so they make this
+package importable with:
+
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+Modules are imported individually (e.g. ``from common.tabular import
+TabularExtractor``) so a scraper only pays for the dependencies it uses.
+"""
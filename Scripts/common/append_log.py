@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Append log for incremental saves with end-of-run compaction
+
+Scrapers that re-sort and re-dump their whole published JSON on every
+progress save pay for the entire historical corpus each time. Instead, new
+records are appended (and fsynced) to a JSON-lines log as they are scraped,
+and the published file is rebuilt once at the end of the run:
+
+    log = AppendLog(DATA_FOLDER / "journal" / "accc_news.jsonl")
+    recovered = log.recover()      # records left behind by a crashed run
+    ...
+    log.append([article])          # during the run
+    ...
+    log.compact(OUTPUT_JSON, document)   # atomic swap, then the log is cleared
+
+``compact`` writes the document to a temporary file and swaps it in with
+``os.replace``, so readers never see a half-written file. The log is only
+removed after the swap; if the run dies at any point before that, the next
+run's ``recover`` returns the logged records so they can be merged back in
+(merging is by key, so replaying a log twice is harmless).
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+
+def write_json_atomic(path: Union[str, Path], data: Any, **dump_kwargs):
+    """Write JSON to path via a temporary file and os.replace"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_suffix(path.suffix + '.tmp')
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, **dump_kwargs)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+class AppendLog:
+    """JSON-lines log of records scraped since the published file was last compacted"""
+
+    def __init__(self, path: Union[str, Path], key_field: str = 'url',
+                 logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            path: log file (conventionally data/journal/<name>.jsonl)
+            key_field: record field identifying a record; the last logged
+                version of a key wins on recovery
+        """
+        self.path = Path(path)
+        self.key_field = key_field
+        self.logger = logger or logging.getLogger(__name__)
+        self.appended = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def __len__(self) -> int:
+        return self.appended
+
+    def recover(self) -> List[Dict]:
+        """Records left in the log by a run that did not compact, in log order"""
+        if not self.path.exists():
+            return []
+
+        records: Dict[str, Dict] = {}
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from an interrupted append
+                    self.logger.warning(f"Skipping unreadable line in {self.path.name}")
+                    continue
+                key = str(record.get(self.key_field))
+                records.pop(key, None)  # keep the order of the latest write
+                records[key] = record
+
+        if records:
+            self.logger.info(f"Recovered {len(records)} records from unfinished run log {self.path}")
+        return list(records.values())
+
+    def append(self, records: Iterable[Dict], **dump_kwargs) -> int:
+        """Append records to the log and fsync; returns the number written"""
+        lines = [json.dumps(record, ensure_ascii=False, **dump_kwargs) + '\n' for record in records]
+        written = len(lines)
+        if not written:
+            return 0
+        with open(self.path, 'a+b') as f:
+            # Start on a fresh line if an interrupted append left a torn record
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    lines.insert(0, '\n')
+            f.write(''.join(lines).encode('utf-8'))
+            f.flush()
+            os.fsync(f.fileno())
+        self.appended += written
+        return written
+
+    def compact(self, target: Union[str, Path], document: Any, **dump_kwargs):
+        """Atomically publish the full document, then drop the log it supersedes"""
+        dump_kwargs.setdefault('ensure_ascii', False)
+        write_json_atomic(target, document, **dump_kwargs)
+        self.clear()
+
+    def clear(self):
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+        self.appended = 0
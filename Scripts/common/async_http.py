@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Shared asyncio HTTP client for the requests-based scrapers
+
+Fetches many pages concurrently over pooled connections, using HTTP/2 when
+httpx and h2 are installed (aiohttp otherwise), with a concurrency limit
+per host, retries with exponential backoff for 429/5xx and connection
+errors, and an optional minimum spacing between requests to the same host.
+
+Scrapers keep their existing BeautifulSoup parse code: ``fetch_all`` is a
+synchronous bridge that returns response-like ``FetchResult`` objects
+(``status_code``, ``content``, ``text``, ``headers``, ``url``).
+"""
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    httpx = None
+    HTTPX_AVAILABLE = False
+
+try:
+    import h2  # noqa: F401 - presence enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = HTTPX_AVAILABLE
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    aiohttp = None
+    AIOHTTP_AVAILABLE = False
+
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Negotiated by the client itself (and connection-specific headers are illegal in HTTP/2)
+HOP_BY_HOP_HEADERS = {'accept-encoding', 'connection', 'keep-alive', 'upgrade-insecure-requests'}
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+
+@dataclass
+class FetchResult:
+    """Response-like result of one fetch, compatible with the parse code written for requests"""
+    url: str
+    status_code: int = 0
+    content: bytes = b''
+    headers: Dict[str, str] = field(default_factory=dict)
+    final_url: str = ''
+    elapsed: float = 0.0
+    attempts: int = 0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and 200 <= self.status_code < 400
+
+    @property
+    def encoding(self) -> str:
+        content_type = self.headers.get('content-type', '')
+        for part in content_type.split(';'):
+            part = part.strip()
+            if part.lower().startswith('charset='):
+                return part.split('=', 1)[1].strip('"\' ') or 'utf-8'
+        return 'utf-8'
+
+    @property
+    def text(self) -> str:
+        try:
+            return self.content.decode(self.encoding, errors='replace')
+        except LookupError:
+            return self.content.decode('utf-8', errors='replace')
+
+
+class AsyncHttpClient:
+    """Pooled async HTTP client with per-host concurrency limits and retries"""
+
+    def __init__(self, headers: Optional[Dict[str, str]] = None,
+                 cookies: Optional[Dict[str, str]] = None,
+                 per_host_limit: int = 4,
+                 total_limit: int = 16,
+                 timeout: float = 30,
+                 retries: int = 3,
+                 backoff: float = 2.0,
+                 min_interval: float = 0.0,
+                 verify: bool = True,
+                 http2: bool = True,
+                 logger: Optional[logging.Logger] = None):
+        self.headers = {'User-Agent': DEFAULT_USER_AGENT}
+        self.headers.update({k: v for k, v in (headers or {}).items()
+                             if k.lower() not in HOP_BY_HOP_HEADERS})
+        self.cookies = dict(cookies or {})
+        self.per_host_limit = per_host_limit
+        self.total_limit = total_limit
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.min_interval = min_interval
+        self.verify = verify
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self.logger = logger or logging.getLogger(__name__)
+
+        self._client = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._host_last_request: Dict[str, float] = {}
+        self._host_locks: Dict[str, asyncio.Lock] = {}
+
+        if not HTTPX_AVAILABLE and not AIOHTTP_AVAILABLE:
+            raise ImportError("AsyncHttpClient needs httpx (pip install 'httpx[http2]') or aiohttp")
+
+    @classmethod
+    def from_session(cls, session, **kwargs) -> 'AsyncHttpClient':
+        """Build a client that reuses the headers and cookies of a warmed requests.Session"""
+        return cls(headers=dict(session.headers), cookies=session.cookies.get_dict(), **kwargs)
+
+    async def __aenter__(self):
+        if HTTPX_AVAILABLE:
+            self._client = httpx.AsyncClient(
+                headers=self.headers,
+                cookies=self.cookies,
+                http2=self.http2,
+                verify=self.verify,
+                timeout=self.timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=self.total_limit,
+                                    max_keepalive_connections=self.total_limit),
+            )
+        else:
+            connector = aiohttp.TCPConnector(limit=self.total_limit,
+                                             limit_per_host=self.per_host_limit,
+                                             ssl=None if self.verify else False)
+            self._client = aiohttp.ClientSession(
+                headers=self.headers,
+                cookies=self.cookies,
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if self._client is not None:
+            if HTTPX_AVAILABLE:
+                await self._client.aclose()
+            else:
+                await self._client.close()
+            self._client = None
+
+    def _semaphore(self, host: str) -> asyncio.Semaphore:
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.per_host_limit)
+            self._host_locks[host] = asyncio.Lock()
+        return self._host_semaphores[host]
+
+    async def _respect_interval(self, host: str):
+        """Space out request starts to one host by min_interval seconds"""
+        if self.min_interval <= 0:
+            return
+        async with self._host_locks[host]:
+            wait = self._host_last_request.get(host, 0) + self.min_interval - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._host_last_request[host] = time.monotonic()
+
+    async def _request_once(self, url: str) -> FetchResult:
+        if HTTPX_AVAILABLE:
+            response = await self._client.get(url)
+            return FetchResult(url=url, status_code=response.status_code, content=response.content,
+                               headers={k.lower(): v for k, v in response.headers.items()},
+                               final_url=str(response.url))
+        async with self._client.get(url) as response:
+            content = await response.read()
+            return FetchResult(url=url, status_code=response.status, content=content,
+                               headers={k.lower(): v for k, v in response.headers.items()},
+                               final_url=str(response.url))
+
+    async def fetch(self, url: str) -> FetchResult:
+        """GET one URL, retrying transient failures with exponential backoff"""
+        if self._client is None:
+            raise RuntimeError("AsyncHttpClient must be used as 'async with AsyncHttpClient() as client'")
+
+        host = urlparse(url).netloc
+        started = time.monotonic()
+        result = FetchResult(url=url)
+
+        for attempt in range(1, self.retries + 1):
+            async with self._semaphore(host):
+                await self._respect_interval(host)
+                try:
+                    result = await self._request_once(url)
+                    result.error = None
+                except Exception as e:
+                    result = FetchResult(url=url, error=f"{type(e).__name__}: {e}")
+
+            result.attempts = attempt
+            if result.error is None and result.status_code not in RETRY_STATUSES:
+                break
+
+            if attempt < self.retries:
+                delay = self._retry_delay(result, attempt)
+                reason = result.error or f"status {result.status_code}"
+                self.logger.warning(f"Retry {attempt}/{self.retries - 1} for {url} in {delay:.1f}s ({reason})")
+                await asyncio.sleep(delay)
+
+        result.elapsed = time.monotonic() - started
+        if result.error is None and result.status_code >= 400:
+            result.error = f"HTTP {result.status_code}"
+        return result
+
+    def _retry_delay(self, result: FetchResult, attempt: int) -> float:
+        retry_after = result.headers.get('retry-after')
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return self.backoff ** attempt + random.uniform(0, 1)
+
+    async def fetch_many(self, urls: Iterable[str]) -> List[FetchResult]:
+        """Fetch URLs concurrently, returning results in input order"""
+        return await asyncio.gather(*(self.fetch(url) for url in urls))
+
+
+async def _fetch_all(urls: List[str], client_kwargs: Dict) -> List[FetchResult]:
+    async with AsyncHttpClient(**client_kwargs) as client:
+        return await client.fetch_many(urls)
+
+
+def fetch_all(urls: Iterable[str], session=None, **client_kwargs) -> List[FetchResult]:
+    """Synchronous bridge: fetch URLs concurrently and return results in input order.
+
+    If a warmed ``requests.Session`` is passed its headers and cookies are reused.
+    """
+    urls = list(urls)
+    if not urls:
+        return []
+    if session is not None:
+        client_kwargs.setdefault('headers', dict(session.headers))
+        client_kwargs.setdefault('cookies', session.cookies.get_dict())
+    return asyncio.run(_fetch_all(urls, client_kwargs))
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Content-change detection with per-section fingerprints and compact diffs
+
+Consultations and guidance pages keep changing after they are first scraped:
+a summary of submissions is attached, a section is reworded, a PDF is
+re-issued. Scrapers either never look at a URL again once it is processed or
+re-scrape it wholesale, downloading and re-extracting every attachment only
+to find that nothing changed.
+
+``ChangeTracker`` remembers, per URL, the HTTP validators (ETag and
+Last-Modified) and a fingerprint of the last body fetched, and per record a
+fingerprint of every named section (page sections, attachments):
+
+    changes = ChangeTracker(DATA_DIR / "index" / "consultation_changes.json")
+    response = session.get(url, headers=changes.conditional_headers(url))
+    if response.status_code == 304 or not changes.fetched(url, response):
+        ...                                   # unchanged: keep the stored record
+    entry = changes.record(url, new_sections, old_sections)
+    if entry:                                 # sections added, removed or changed
+        record['change_history'] = append_history(old.get('change_history'), entry)
+    changes.confirm(url)                      # once the record has been extracted
+    ...
+    changes.save()                            # after the output file is written
+
+Validators from ``fetched`` stay pending until ``confirm``ed, so a page whose
+extraction failed is not mistaken for an unchanged one on the next run.
+
+A conditional GET costs one request and no body when the server supports
+validators; otherwise an identical body is still recognised by its
+fingerprint, before anything is parsed or extracted. History entries are
+compact: the names of the sections that changed plus a few added and removed
+lines of each (``difflib`` without context), never the full text.
+"""
+
+import difflib
+import hashlib
+import json
+import logging
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from .append_log import write_json_atomic
+
+STATE_VERSION = 1
+HISTORY_LIMIT = 20       # history entries kept per record
+DIFF_LINES = 10          # added/removed lines kept per changed section
+DIFF_LINE_CHARS = 200
+HEADING = re.compile(r'^#{1,6}\s+(.+?)\s*$', re.MULTILINE)
+
+
+def fingerprint(text: Any) -> str:
+    """Whitespace-insensitive fingerprint of a section's text"""
+    normalised = ' '.join(str(text or '').split())
+    return hashlib.sha1(normalised.encode('utf-8', errors='replace')).hexdigest()[:16]
+
+
+def split_sections(text: str, heading: re.Pattern = HEADING) -> Dict[str, str]:
+    """Split text on heading lines ('## Title' by default) into {heading: body}, in order"""
+    sections: Dict[str, str] = {}
+    matches = list(heading.finditer(text or ''))
+    intro = (text or '')[:matches[0].start() if matches else None].strip()
+    if intro:
+        sections['(intro)'] = intro
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        name = match.group(1)
+        if name in sections:
+            # Repeated headings ("Overview" twice) keep their order
+            count = 2
+            while f"{name} ({count})" in sections:
+                count += 1
+            name = f"{name} ({count})"
+        sections[name] = text[match.end():end].strip()
+    return sections
+
+
+def compact_diff(old: str, new: str, max_lines: int = DIFF_LINES) -> List[str]:
+    """Added ('+') and removed ('-') lines between two texts, without context"""
+    lines = []
+    for line in difflib.unified_diff(str(old or '').splitlines(), str(new or '').splitlines(),
+                                     lineterm='', n=0):
+        if line.startswith(('+++', '---', '@@')) or not line[1:].strip():
+            continue
+        if len(lines) == max_lines:
+            lines.append('...')
+            break
+        lines.append(line[:DIFF_LINE_CHARS])
+    return lines
+
+
+def append_history(history: Optional[List[Dict[str, Any]]], entry: Dict[str, Any],
+                   limit: int = HISTORY_LIMIT) -> List[Dict[str, Any]]:
+    """Record history with ``entry`` appended, oldest entries dropped beyond ``limit``"""
+    return (list(history or []) + [entry])[-limit:]
+
+
+class ChangeTracker:
+    """HTTP validators and body fingerprints per URL, section fingerprints per record"""
+
+    def __init__(self, path: Union[str, Path], diff_lines: int = DIFF_LINES,
+                 logger: Optional[logging.Logger] = None):
+        self.path = Path(path)
+        self.diff_lines = diff_lines
+        self.logger = logger or logging.getLogger(__name__)
+        self.urls: Dict[str, Dict[str, Any]] = {}
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._load()
+        self._dirty = False
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == STATE_VERSION:
+                self.urls = data.get('urls', {})
+                self.records = data.get('records', {})
+        except Exception as e:
+            self.logger.warning(f"Rebuilding unreadable change state {self.path}: {e}")
+
+    def save(self):
+        if not self._dirty:
+            return
+        write_json_atomic(self.path, {'version': STATE_VERSION, 'updated': datetime.now().isoformat(),
+                                      'urls': self.urls, 'records': self.records}, indent=1)
+        self._dirty = False
+
+    # ------------------------------------------------------------------
+    # Fetches
+    # ------------------------------------------------------------------
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since headers for a URL fetched before"""
+        entry = self.urls.get(url, {})
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def fetched(self, url: str, response) -> bool:
+        """Stage a response's validators (see ``confirm``); False if it is a 304 or the same body as last time"""
+        if response.status_code == 304:
+            return False
+        body = hashlib.sha1(response.content).hexdigest()
+        self._pending[url] = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'body': body,
+        }
+        return self.urls.get(url, {}).get('body') != body
+
+    def confirm(self, *urls: str):
+        """Keep the staged validators of URLs whose content was extracted successfully"""
+        for url in urls:
+            entry = self._pending.pop(url, None)
+            if entry is not None:
+                self.urls[url] = entry
+                self._dirty = True
+
+    # ------------------------------------------------------------------
+    # Sections
+    # ------------------------------------------------------------------
+
+    def record(self, key: str, sections: Dict[str, Any],
+               previous: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Store the section fingerprints of a record; returns a history entry if they changed.
+
+        Args:
+            key: record identifier (usually its URL)
+            sections: section name -> current text
+            previous: section name -> text as last stored, used for the diff lines
+                (and as the baseline for records tracked for the first time)
+        """
+        current = {name: fingerprint(text) for name, text in sections.items()}
+        stored = self.records.get(key, {}).get('sections')
+        if stored is None and previous is not None:
+            stored = {name: fingerprint(text) for name, text in previous.items()}
+        self.records[key] = {'sections': current, 'checked': datetime.now().isoformat()}
+        self._dirty = True
+        if stored is None or stored == current:
+            return None
+
+        changed = [name for name in current if name in stored and stored[name] != current[name]]
+        entry = {
+            'date': datetime.now().isoformat(),
+            'added': [name for name in current if name not in stored],
+            'removed': [name for name in stored if name not in current],
+            'changed': changed,
+        }
+        if previous is not None:
+            entry['diff'] = {name: compact_diff(previous.get(name, ''), sections[name], self.diff_lines)
+                             for name in changed}
+        return entry
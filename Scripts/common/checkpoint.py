@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Checkpoint/resume support for long scraper runs
+
+A checkpoint is a JSON file holding the run's frontier (whatever the
+scraper needs to carry on, e.g. the discovered item list) and the ids of
+items already completed, plus a JSON-lines journal of their partial outputs
+next to it. The JSON file is written atomically every few completed items /
+seconds and only new outputs are appended to the journal, so saving costs
+the same however many full-content outputs have piled up, and a run that is
+killed (for example by the orchestrator's timeout) loses at most the last
+interval of work. The next
+run started with ``--resume`` (or ``SCRAPER_RESUME=1``, which the
+orchestrator sets) restores it and skips completed items; a run that
+finishes normally clears the checkpoint.
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+CHECKPOINT_VERSION = 2
+RESUME_ENV_VAR = 'SCRAPER_RESUME'
+
+
+def resume_requested(argv: Optional[List[str]] = None) -> bool:
+    """True if --resume was passed or SCRAPER_RESUME is set to a truthy value"""
+    argv = sys.argv[1:] if argv is None else argv
+    if '--resume' in argv:
+        return True
+    return os.environ.get(RESUME_ENV_VAR, '').strip().lower() in ('1', 'true', 'yes')
+
+
+class Checkpoint:
+    """Periodically persisted frontier, completed ids and partial outputs"""
+
+    def __init__(self, path: Union[str, Path],
+                 run_key: str = '',
+                 save_every: int = 5,
+                 save_interval: float = 30.0,
+                 max_age_hours: float = 72.0,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            path: checkpoint file (written via a .tmp file and os.replace);
+                outputs are appended to ``<path stem>.outputs.jsonl`` beside it
+            run_key: identifies the run configuration; a checkpoint written
+                with a different key is ignored on resume
+            save_every: save after this many completed items
+            save_interval: ...or after this many seconds, whichever comes first
+            max_age_hours: checkpoints older than this are treated as stale
+        """
+        self.path = Path(path)
+        self.outputs_path = self.path.with_name(self.path.stem + '.outputs.jsonl')
+        self.run_key = run_key
+        self.save_every = max(1, save_every)
+        self.save_interval = save_interval
+        self.max_age_hours = max_age_hours
+        self.logger = logger or logging.getLogger(__name__)
+
+        self.frontier: Dict[str, Any] = {}
+        self.completed: Dict[str, None] = {}  # insertion-ordered set
+        self.outputs: List[Any] = []
+        self.created = datetime.now().isoformat()
+        self.resumed = False
+
+        # Re-entrant so a signal handler can save while the main thread holds it
+        self._lock = threading.RLock()
+        self._dirty = 0
+        self._last_save = time.monotonic()
+        self._outputs_saved = 0  # outputs already in the journal...
+        self._outputs_size = 0   # ...and its length in bytes at the last save
+
+    # ------------------------------------------------------------------
+    # Load / save
+    # ------------------------------------------------------------------
+
+    def load(self) -> bool:
+        """Restore state from disk; returns True if a usable checkpoint was found"""
+        if not self.path.exists():
+            return False
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable checkpoint {self.path}: {e}")
+            return False
+
+        if data.get('version') != CHECKPOINT_VERSION or data.get('run_key', '') != self.run_key:
+            self.logger.info(f"Ignoring checkpoint {self.path}: written by a different run configuration")
+            return False
+
+        try:
+            updated = datetime.fromisoformat(data.get('updated', ''))
+            if datetime.now() - updated > timedelta(hours=self.max_age_hours):
+                self.logger.info(f"Ignoring stale checkpoint from {updated.isoformat()}")
+                return False
+        except ValueError:
+            return False
+
+        # Outputs appended after the last checkpoint write are dropped with their ids
+        size = data.get('outputs_size') or 0
+        try:
+            with open(self.outputs_path, 'rb') as f:
+                outputs = [json.loads(line) for line in f.read(size).splitlines() if line.strip()]
+            if size and len(outputs) != data.get('outputs_count'):
+                raise ValueError(f"{len(outputs)} outputs, expected {data.get('outputs_count')}")
+        except FileNotFoundError:
+            outputs = []
+            size = 0
+        except ValueError as e:
+            self.logger.warning(f"Ignoring checkpoint {self.path}: unreadable outputs ({e})")
+            return False
+
+        with self._lock:
+            self.frontier = data.get('frontier') or {}
+            self.completed = dict.fromkeys(data.get('completed') or [])
+            self.outputs = outputs
+            self.created = data.get('created') or self.created
+            self.resumed = True
+            self._outputs_saved = len(outputs)
+            self._outputs_size = size
+
+        self.logger.info(f"Resuming from checkpoint {self.path}: "
+                         f"{len(self.completed)} completed, {len(self.outputs)} partial outputs")
+        return True
+
+    def save(self):
+        """Append new outputs to the journal, then write the checkpoint atomically"""
+        with self._lock:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                new_outputs = self.outputs[self._outputs_saved:]
+                if new_outputs or not self._outputs_size:
+                    # A fresh run starts the journal over; otherwise trim anything
+                    # appended after the last checkpoint write before adding to it
+                    with open(self.outputs_path, 'ab' if self._outputs_size else 'wb') as f:
+                        f.truncate(self._outputs_size)
+                        for output in new_outputs:
+                            f.write(json.dumps(output, ensure_ascii=False).encode('utf-8') + b'\n')
+                        f.flush()
+                        self._outputs_size = f.tell()
+                    self._outputs_saved = len(self.outputs)
+
+                data = {
+                    'version': CHECKPOINT_VERSION,
+                    'run_key': self.run_key,
+                    'created': self.created,
+                    'updated': datetime.now().isoformat(),
+                    'frontier': self.frontier,
+                    'completed': list(self.completed),
+                    'outputs_count': self._outputs_saved,
+                    'outputs_size': self._outputs_size,
+                }
+                temp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(temp_path, self.path)
+            except Exception as e:
+                self.logger.error(f"Failed to write checkpoint {self.path}: {e}")
+            self._dirty = 0
+            self._last_save = time.monotonic()
+
+    def maybe_save(self):
+        """Save if enough items have completed or enough time has passed"""
+        with self._lock:
+            due = self._dirty > 0 and (
+                self._dirty >= self.save_every
+                or time.monotonic() - self._last_save >= self.save_interval
+            )
+        if due:
+            self.save()
+
+    def clear(self):
+        """Remove the checkpoint after a run has completed normally"""
+        with self._lock:
+            self.frontier = {}
+            self.completed = {}
+            self.outputs = []
+            self._dirty = 0
+            self._outputs_saved = 0
+            self._outputs_size = 0
+        for path in (self.path, self.outputs_path):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                self.logger.warning(f"Failed to remove checkpoint {path}: {e}")
+
+    # ------------------------------------------------------------------
+    # State updates
+    # ------------------------------------------------------------------
+
+    def set_frontier(self, save: bool = True, **values):
+        """Record what is left to do (e.g. the discovered item list or current phase)"""
+        with self._lock:
+            self.frontier.update(values)
+            self._dirty += 1
+        if save:
+            self.save()
+
+    def is_done(self, item_id: str) -> bool:
+        return item_id in self.completed
+
+    def mark_done(self, item_id: str, output: Any = None):
+        """Record a completed item (and its output, if any), saving periodically"""
+        with self._lock:
+            self.completed[item_id] = None
+            if output is not None:
+                self.outputs.append(output)
+            self._dirty += 1
+        self.maybe_save()
+
+    def pending(self, items: Iterable[Any], key) -> List[Any]:
+        """Items whose key(item) is not yet completed, in their original order"""
+        return [item for item in items if key(item) not in self.completed]
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Token-bounded chunk output for LLM ingestion
+
+Scrapers emit one large text field per record (LEGISLATIONAU instruments
+average ~76 KB; TREASURYNZ appends every linked PDF and page to ``content``)
+and the indexer re-splits all of it. ``ChunkWriter`` is an optional output
+stage that splits the text fields of new or changed records into chunks of
+up to ``max_tokens`` tokens and writes them as JSON lines next to the
+normal output:
+
+    data/chunks/<name>.manifest.json     record id -> content hash, chunk count, file
+    data/chunks/<name>/<run>.jsonl       chunks written by one run (the delta)
+
+Each chunk carries a stable ``chunk_id`` (record, field and position), the
+character ``start``/``end`` offsets into the source field, its token count
+and the ``record_hash`` it was cut from. Records whose text (and chunking
+parameters) did not change since the manifest was written are skipped, so a
+run only produces chunks for its daily delta; the indexer consumes the new
+run files and replaces all chunks of a ``record_id`` with the latest ones.
+
+Chunks are cut on line and sentence boundaries, counted with the shared
+batched ``TokenCounter``. Enable it with ``--chunks`` or ``SCRAPER_CHUNKS=1``,
+or backfill an existing output file:
+
+    python -m common.chunker data/treasuryNZ_news.json --fields content
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .tokens import TokenCounter, shared_counter
+
+CHUNKS_ENV_VAR = 'SCRAPER_CHUNKS'
+MANIFEST_VERSION = 1
+DEFAULT_MAX_TOKENS = 512
+DEFAULT_OVERLAP_TOKENS = 64
+
+SENTENCE_END = re.compile(r'(?<=[.!?;:])\s+')
+LINE = re.compile(r'[^\n]+')
+
+
+def chunks_requested(argv: Optional[List[str]] = None) -> bool:
+    """True if --chunks was passed or SCRAPER_CHUNKS is set to a truthy value"""
+    argv = sys.argv[1:] if argv is None else argv
+    if '--chunks' in argv:
+        return True
+    return os.environ.get(CHUNKS_ENV_VAR, '').strip().lower() in ('1', 'true', 'yes')
+
+
+@dataclass
+class Chunk:
+    chunk_id: str
+    record_id: str
+    field: str
+    index: int
+    chunk_count: int
+    start: int
+    end: int
+    token_count: int
+    record_hash: str
+    text: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+def _hard_split(start: int, end: int, max_chars: int) -> List[Tuple[int, int]]:
+    return [(s, min(s + max_chars, end)) for s in range(start, end, max_chars)]
+
+
+def text_units(text: str, max_chars: int) -> List[Tuple[int, int]]:
+    """(start, end) spans of lines, split into sentences (then characters) when too long"""
+    spans = []
+    for line in LINE.finditer(text):
+        start, end = line.span()
+        if end - start <= max_chars:
+            spans.append((start, end))
+            continue
+        piece_start = start
+        for match in SENTENCE_END.finditer(text, start, end):
+            spans.extend(_hard_split(piece_start, match.start(), max_chars))
+            piece_start = match.end()
+        spans.extend(_hard_split(piece_start, end, max_chars))
+    return [(start, end) for start, end in spans if text[start:end].strip()]
+
+
+class ChunkWriter:
+    """Chunks new/changed records into per-run JSONL files with a manifest"""
+
+    def __init__(self, root: Union[str, Path], name: str,
+                 text_fields: Sequence[str],
+                 id_field: str = 'url',
+                 metadata_fields: Sequence[str] = ('title', 'url', 'published_date'),
+                 max_tokens: int = DEFAULT_MAX_TOKENS,
+                 overlap_tokens: int = DEFAULT_OVERLAP_TOKENS,
+                 counter: Optional[TokenCounter] = None,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            root: chunk directory (conventionally data/chunks)
+            name: output name (manifest/folder stem)
+            text_fields: record fields to chunk
+            metadata_fields: record fields copied onto every chunk
+            max_tokens: token budget per chunk (units are packed up to it; the
+                re-counted chunk can differ by the whitespace between units)
+            overlap_tokens: tokens of trailing context repeated at the start of the next chunk
+        """
+        self.root = Path(root)
+        self.name = name
+        self.text_fields = tuple(text_fields)
+        self.id_field = id_field
+        self.metadata_fields = tuple(metadata_fields)
+        self.max_tokens = max_tokens
+        self.overlap_tokens = min(overlap_tokens, max_tokens // 2)
+        self.counter = counter or shared_counter()
+        self.logger = logger or logging.getLogger(__name__)
+
+        self.manifest_path = self.root / f"{name}.manifest.json"
+        self.run_dir = self.root / name
+        self.run_file = self.run_dir / f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.jsonl"
+        self.manifest = self._load_manifest()
+        self._dirty = False
+        self.records_chunked = 0
+        self.chunks_written = 0
+
+    # ------------------------------------------------------------------
+    # Manifest
+    # ------------------------------------------------------------------
+
+    @property
+    def params(self) -> Dict[str, Any]:
+        return {
+            'max_tokens': self.max_tokens,
+            'overlap_tokens': self.overlap_tokens,
+            'encoding': self.counter.encoding_name,
+            'text_fields': list(self.text_fields),
+        }
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        if self.manifest_path.exists():
+            try:
+                with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                    manifest = json.load(f)
+                if manifest.get('version') == MANIFEST_VERSION:
+                    return manifest
+            except Exception as e:
+                self.logger.warning(f"Rebuilding unreadable chunk manifest {self.manifest_path}: {e}")
+        return {'version': MANIFEST_VERSION, 'records': {}}
+
+    def close(self):
+        """Write the manifest (atomically) if this run chunked anything"""
+        if not self._dirty:
+            return
+        self.manifest['params'] = self.params
+        self.manifest['updated'] = datetime.now().isoformat()
+        self.manifest['total_records'] = len(self.manifest['records'])
+        temp_path = self.manifest_path.with_suffix('.json.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, ensure_ascii=False)
+        os.replace(temp_path, self.manifest_path)
+        self._dirty = False
+        self.logger.info(f"Chunked {self.records_chunked} records into {self.chunks_written} chunks ({self.run_file})")
+
+    # ------------------------------------------------------------------
+    # Chunking
+    # ------------------------------------------------------------------
+
+    def record_hash(self, record: Dict[str, Any]) -> str:
+        digest = hashlib.sha1(json.dumps(self.params, sort_keys=True).encode('utf-8'))
+        for name in self.text_fields:
+            digest.update(b'\x00' + str(record.get(name) or '').encode('utf-8', errors='replace'))
+        return digest.hexdigest()
+
+    def _pack(self, text: str) -> List[Tuple[int, int]]:
+        """Group text units into (start, end) chunk spans of at most max_tokens"""
+        units = text_units(text, max_chars=self.max_tokens * 2)
+        if not units:
+            return []
+        counts = self.counter.count_many(text[start:end] for start, end in units)
+
+        spans = []
+        first = 0
+        while first < len(units):
+            last, total = first, counts[first]
+            while last + 1 < len(units) and total + counts[last + 1] <= self.max_tokens:
+                last += 1
+                total += counts[last]
+            spans.append((units[first][0], units[last][1]))
+            if last + 1 >= len(units):
+                break
+
+            # Step back over trailing units that fit in the overlap budget
+            next_first, overlap = last + 1, 0
+            while next_first - 1 > first and overlap + counts[next_first - 1] <= self.overlap_tokens:
+                next_first -= 1
+                overlap += counts[next_first]
+            first = next_first
+        return spans
+
+    def chunk_record(self, record: Dict[str, Any], record_hash: Optional[str] = None) -> List[Chunk]:
+        record_id = str(record[self.id_field])
+        record_hash = record_hash or self.record_hash(record)
+        record_key = hashlib.sha1(record_id.encode('utf-8')).hexdigest()[:16]
+        metadata = {name: record.get(name) for name in self.metadata_fields if record.get(name) is not None}
+
+        chunks: List[Chunk] = []
+        for name in self.text_fields:
+            text = str(record.get(name) or '')
+            spans = self._pack(text)
+            texts = [text[start:end] for start, end in spans]
+            for index, ((start, end), chunk_text, tokens) in enumerate(
+                    zip(spans, texts, self.counter.count_many(texts))):
+                chunks.append(Chunk(
+                    chunk_id=f"{record_key}-{name}-{index:04d}",
+                    record_id=record_id, field=name, index=index, chunk_count=len(spans),
+                    start=start, end=end, token_count=tokens, record_hash=record_hash,
+                    text=chunk_text, metadata=metadata,
+                ))
+        return chunks
+
+    def update(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Chunk records that are new or changed since the manifest; returns chunks written"""
+        lines = []
+        for record in records:
+            if not record.get(self.id_field):
+                continue
+            record_id = str(record[self.id_field])
+            record_hash = self.record_hash(record)
+            if self.manifest['records'].get(record_id, {}).get('hash') == record_hash:
+                continue
+
+            chunks = self.chunk_record(record, record_hash)
+            lines.extend(json.dumps(asdict(chunk), ensure_ascii=False) + '\n' for chunk in chunks)
+            self.manifest['records'][record_id] = {
+                'hash': record_hash,
+                'chunks': len(chunks),
+                'file': f"{self.name}/{self.run_file.name}",
+            }
+            self.records_chunked += 1
+            self._dirty = True
+
+        if lines:
+            self.run_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.run_file, 'a', encoding='utf-8') as f:
+                f.writelines(lines)
+            self.chunks_written += len(lines)
+        return len(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write token-bounded chunks for a scraper output file")
+    parser.add_argument('json_file', help='scraper output (a list of records, or a dict holding one)')
+    parser.add_argument('--fields', nargs='+', default=['content'], help='text fields to chunk')
+    parser.add_argument('--id-field', default='url')
+    parser.add_argument('--max-tokens', type=int, default=DEFAULT_MAX_TOKENS)
+    parser.add_argument('--overlap', type=int, default=DEFAULT_OVERLAP_TOKENS)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    path = Path(args.json_file)
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = next((value for value in data.values() if isinstance(value, list)), [])
+
+    writer = ChunkWriter(path.parent / 'chunks', path.stem, args.fields, id_field=args.id_field,
+                         max_tokens=args.max_tokens, overlap_tokens=args.overlap)
+    writer.update(record for record in data if isinstance(record, dict))
+    writer.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Columnar snapshot of every scraper's output for cross-regulator analytics
+
+Aggregates over the corpus (records per regulator and type, per month,
+content length, topics) used to mean loading each regulator's JSON output
+in full -- gigabytes for LEGISLATIONAU and TREASURYNZ -- to read a handful
+of small fields.
+
+``CorpusSnapshot`` compacts ``Scripts/*/data/*.json`` (and segment stores)
+into one Hive-partitioned Parquet dataset with normalised metadata columns:
+
+    regulator, source, record_id, url, title, type, published_date,
+    scraped_date, topics, content_length, metadata (JSON), content
+
+``content`` is its own column, so metadata queries never read the text, and
+``regulator`` is the partition key, so filtering on it skips whole files:
+
+    snapshot/corpus/regulator=ASIC/asic_media_releases.parquet
+    snapshot/corpus_manifest.json     source file -> size/mtime, rows, part
+
+The nightly build only re-reads sources whose size or mtime changed since
+the manifest was written and rewrites their part files; everything else is
+left as is. Requires pyarrow:
+
+    python -m common.corpus_snapshot build
+    python -m common.corpus_snapshot stats --by regulator type --since 2024-01-01
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+from .append_log import write_json_atomic
+from .lazy_import import is_installed, lazy_import
+from .segment_store import SegmentStore
+from .status_index import parse_date
+
+pa = lazy_import('pyarrow', 'pip install pyarrow')
+pc = lazy_import('pyarrow.compute', 'pip install pyarrow')
+pq = lazy_import('pyarrow.parquet', 'pip install pyarrow')
+ds = lazy_import('pyarrow.dataset', 'pip install pyarrow')
+
+SNAPSHOT_ENV_VAR = 'SCRAPER_SNAPSHOT_DIR'
+SCRIPTS_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_SNAPSHOT_DIR = SCRIPTS_ROOT / 'snapshot'
+MANIFEST_VERSION = 1
+
+# Candidate source fields for each normalised column, in order of preference
+ID_FIELDS = ('hash_id', 'content_hash', 'identifier', 'id', 'doc_id', 'url')
+TITLE_FIELDS = ('title', 'headline', 'name')
+TYPE_FIELDS = ('type', 'article_type', 'document_type', 'release_type', 'report_type',
+               'guidance_type', 'opinion_type', 'category')
+DATE_FIELDS = ('published_date', 'release_date', 'publication_date', 'date',
+               'effective_date', 'registration_date')
+TOPIC_FIELDS = ('topics', 'tags', 'theme', 'themes', 'keywords')
+CONTENT_FIELDS = ('content', 'combined_content', 'content_text', 'full_text', 'text', 'web_content')
+EXTRA_DATE_FORMATS = ('%B %d, %Y', '%b %d, %Y', '%d-%m-%Y', '%Y/%m/%d')
+MAX_METADATA_VALUE_CHARS = 500
+
+# Wrapper keys under which scrapers nest their record lists
+RECORD_LIST_KEYS = ('data', 'records', 'items', 'results', 'articles', 'news', 'releases', 'entries')
+
+
+def normalise_date(value: Any) -> Optional[date]:
+    if not value or not isinstance(value, str):
+        return None
+    parsed = parse_date(value)
+    if parsed is None:
+        value = value.strip()
+        for fmt in EXTRA_DATE_FORMATS:
+            try:
+                parsed = datetime.strptime(value, fmt)
+                break
+            except ValueError:
+                continue
+    if parsed is None and len(value) >= 10:
+        # '2025-03-12T09:00:00+13:00'-style stamps with offsets parse_date rejects
+        parsed = parse_date(value[:10])
+    return parsed.date() if parsed else None
+
+
+def _first(record: Dict[str, Any], fields: Sequence[str]) -> Any:
+    for name in fields:
+        value = record.get(name)
+        if value not in (None, '', [], {}):
+            return value
+    return None
+
+
+def _topics(value: Any) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return [str(item) for item in value if item not in (None, '')]
+    return [part.strip() for part in str(value).replace(';', ',').split(',') if part.strip()]
+
+
+def normalise_record(record: Dict[str, Any], regulator: str, source: str) -> Dict[str, Any]:
+    """Map one scraper record onto the snapshot columns"""
+    content = _first(record, CONTENT_FIELDS)
+    if not isinstance(content, str):
+        content = '' if content is None else json.dumps(content, ensure_ascii=False)
+    record_id = _first(record, ID_FIELDS)
+    if record_id is None:
+        record_id = hashlib.sha1(json.dumps(record, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    mapped = set(CONTENT_FIELDS + ID_FIELDS + TITLE_FIELDS + TYPE_FIELDS + TOPIC_FIELDS) | {'scraped_date'}
+    metadata = {}
+    for name, value in record.items():
+        if name in mapped or value in (None, '', [], {}):
+            continue
+        text = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False, default=str)
+        if len(text) <= MAX_METADATA_VALUE_CHARS:
+            metadata[name] = value
+
+    title = _first(record, TITLE_FIELDS)
+    doc_type = _first(record, TYPE_FIELDS)
+    return {
+        'source': source,
+        'record_id': str(record_id),
+        'url': str(record.get('url') or ''),
+        'title': str(title) if title is not None else '',
+        'type': str(doc_type) if doc_type is not None else '',
+        'published_date': normalise_date(_first(record, DATE_FIELDS)),
+        'scraped_date': str(record.get('scraped_date') or ''),
+        'topics': _topics(_first(record, TOPIC_FIELDS)),
+        'content_length': len(content),
+        'metadata': json.dumps(metadata, ensure_ascii=False, default=str),
+        'content': content,
+    }
+
+
+SCHEMA_FIELDS = [
+    ('source', 'string'), ('record_id', 'string'), ('url', 'string'), ('title', 'string'),
+    ('type', 'string'), ('published_date', 'date32'), ('scraped_date', 'string'),
+    ('topics', 'list<string>'), ('content_length', 'int64'), ('metadata', 'string'),
+    ('content', 'string'),
+]
+
+
+def snapshot_schema():
+    types = {'string': pa.string(), 'date32': pa.date32(), 'int64': pa.int64(),
+             'list<string>': pa.list_(pa.string())}
+    return pa.schema([(name, types[kind]) for name, kind in SCHEMA_FIELDS])
+
+
+def iter_source_records(path: Path) -> Iterator[Dict[str, Any]]:
+    """Records of one output file: a list, a dict wrapping a list, or a segment store manifest"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        metadata = data.get('metadata')
+        if path.name.endswith('.manifest.json') and isinstance(metadata, dict) \
+                and metadata.get('layout') == 'segments':
+            name = path.name[:-len('.manifest.json')]
+            yield from SegmentStore(path.parent, name, segment_key=lambda record: '').iter_records()
+            return
+        data = next((data[key] for key in RECORD_LIST_KEYS if isinstance(data.get(key), list)),
+                    next((value for value in data.values() if isinstance(value, list)), []))
+    if isinstance(data, list):
+        yield from (record for record in data if isinstance(record, dict))
+
+
+def discover_sources(scripts_root: Path) -> Dict[str, Path]:
+    """'<REGULATOR>/<file name>' -> path for every top-level JSON file in Scripts/*/data"""
+    sources = {}
+    for path in sorted(scripts_root.glob('*/data/*.json')):
+        sources[f"{path.parent.parent.name}/{path.name}"] = path
+    return sources
+
+
+class CorpusSnapshot:
+    """Incrementally rebuilt, regulator-partitioned Parquet dataset over all scraper outputs"""
+
+    def __init__(self, snapshot_dir: Optional[Union[str, Path]] = None,
+                 scripts_root: Union[str, Path] = SCRIPTS_ROOT,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            snapshot_dir: output directory (default Scripts/snapshot, or $SCRAPER_SNAPSHOT_DIR)
+            scripts_root: folder holding the regulator folders
+        """
+        self.snapshot_dir = Path(snapshot_dir or os.environ.get(SNAPSHOT_ENV_VAR) or DEFAULT_SNAPSHOT_DIR)
+        self.scripts_root = Path(scripts_root)
+        self.dataset_dir = self.snapshot_dir / 'corpus'
+        self.manifest_path = self.snapshot_dir / 'corpus_manifest.json'
+        self.logger = logger or logging.getLogger(__name__)
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        if self.manifest_path.exists():
+            try:
+                with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                    manifest = json.load(f)
+                if manifest.get('version') == MANIFEST_VERSION:
+                    return manifest
+            except Exception as e:
+                self.logger.warning(f"Rebuilding unreadable snapshot manifest {self.manifest_path}: {e}")
+        return {'version': MANIFEST_VERSION, 'sources': {}}
+
+    # ------------------------------------------------------------------
+    # Build
+    # ------------------------------------------------------------------
+
+    def _part_path(self, source: str) -> Path:
+        regulator, file_name = source.split('/', 1)
+        return self.dataset_dir / f"regulator={regulator}" / f"{Path(file_name).stem}.parquet"
+
+    def _write_part(self, source: str, path: Path) -> int:
+        regulator = source.split('/', 1)[0]
+        rows = [normalise_record(record, regulator, path.stem) for record in iter_source_records(path)]
+        part_path = self._part_path(source)
+        if not rows:
+            if part_path.exists():
+                part_path.unlink()
+            return 0
+        table = pa.Table.from_pylist(rows, schema=snapshot_schema())
+        part_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = part_path.with_suffix('.parquet.tmp')
+        pq.write_table(table, str(temp_path), compression='zstd')
+        os.replace(temp_path, part_path)
+        return len(rows)
+
+    def build(self, force: bool = False) -> Dict[str, int]:
+        """Rewrite the parts of new/changed sources and drop those of vanished ones; returns counts"""
+        if not is_installed('pyarrow'):
+            raise RuntimeError("pyarrow is required for the corpus snapshot (pip install pyarrow)")
+        started = time.time()
+        known = self.manifest['sources']
+        current = discover_sources(self.scripts_root)
+        counts = {'sources': len(current), 'rebuilt': 0, 'unchanged': 0, 'removed': 0, 'failed': 0, 'rows': 0}
+
+        for source, path in current.items():
+            stat = path.stat()
+            entry = known.get(source)
+            if (not force and entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns
+                    and (not entry['rows'] or self._part_path(source).exists())):
+                counts['unchanged'] += 1
+                continue
+            try:
+                rows = self._write_part(source, path)
+            except Exception as e:
+                # Keep the previous part; a half-written output file is retried next run
+                self.logger.warning(f"Could not snapshot {source}: {e}")
+                counts['failed'] += 1
+                continue
+            known[source] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'rows': rows,
+                             'snapshot_at': datetime.now().isoformat()}
+            counts['rebuilt'] += 1
+
+        for source in sorted(set(known) - set(current)):
+            part_path = self._part_path(source)
+            if part_path.exists():
+                part_path.unlink()
+            del known[source]
+            counts['removed'] += 1
+
+        counts['rows'] = sum(entry['rows'] for entry in known.values())
+        self.manifest['updated'] = datetime.now().isoformat()
+        self.manifest['total_rows'] = counts['rows']
+        write_json_atomic(self.manifest_path, self.manifest, indent=1)
+        self.logger.info(f"Corpus snapshot: {counts['rebuilt']} sources rebuilt, {counts['unchanged']} unchanged, "
+                         f"{counts['removed']} removed, {counts['rows']} rows ({time.time() - started:.1f}s)")
+        return counts
+
+    # ------------------------------------------------------------------
+    # Query
+    # ------------------------------------------------------------------
+
+    def dataset(self):
+        if not self.dataset_dir.exists():
+            raise FileNotFoundError(f"No corpus snapshot in {self.snapshot_dir}; run 'build' first")
+        return ds.dataset(str(self.dataset_dir), format='parquet', partitioning='hive')
+
+    def query(self, columns: Optional[Sequence[str]] = None,
+              regulators: Optional[Iterable[str]] = None,
+              types: Optional[Iterable[str]] = None,
+              since: Optional[date] = None, until: Optional[date] = None):
+        """A pyarrow Table of the matching rows; filters are pushed down to the Parquet scan"""
+        clauses = []
+        if regulators:
+            clauses.append(ds.field('regulator').isin(list(regulators)))
+        if types:
+            clauses.append(ds.field('type').isin(list(types)))
+        if since:
+            clauses.append(ds.field('published_date') >= pa.scalar(since, pa.date32()))
+        if until:
+            clauses.append(ds.field('published_date') <= pa.scalar(until, pa.date32()))
+        condition = None
+        for clause in clauses:
+            condition = clause if condition is None else condition & clause
+        return self.dataset().to_table(columns=list(columns) if columns else None, filter=condition)
+
+    def stats(self, by: Sequence[str] = ('regulator',), **filters):
+        """Record count and content length per group, without reading the content column"""
+        group_columns = [column for column in by if column != 'month']
+        columns = list(dict.fromkeys(group_columns + ['record_id', 'content_length', 'published_date']))
+        table = self.query(columns=columns, **filters)
+        if 'month' in by:
+            month = pc.strftime(table['published_date'], format='%Y-%m')
+            table = table.append_column('month', month)
+        return (table.group_by(list(by))
+                .aggregate([('record_id', 'count'), ('content_length', 'sum'), ('content_length', 'mean')])
+                .sort_by([(column, 'ascending') for column in by]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the columnar corpus snapshot")
+    parser.add_argument('--snapshot-dir', help='snapshot directory (default Scripts/snapshot)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build = commands.add_parser('build', help='refresh the snapshot from Scripts/*/data')
+    build.add_argument('--force', action='store_true', help='rebuild every source')
+
+    stats = commands.add_parser('stats', help='record counts and content length per group')
+    stats.add_argument('--by', nargs='+', default=['regulator'],
+                       help='group columns (regulator, source, type, month, ...)')
+    stats.add_argument('--regulator', nargs='+')
+    stats.add_argument('--type', nargs='+')
+    stats.add_argument('--since', type=lambda value: datetime.strptime(value, '%Y-%m-%d').date())
+    stats.add_argument('--until', type=lambda value: datetime.strptime(value, '%Y-%m-%d').date())
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    snapshot = CorpusSnapshot(args.snapshot_dir)
+    if args.command == 'build':
+        counts = snapshot.build(force=args.force)
+        sys.exit(1 if counts['failed'] else 0)
+
+    table = snapshot.stats(by=args.by, regulators=args.regulator, types=args.type,
+                           since=args.since, until=args.until)
+    print(table.to_pandas().to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+CSV ingestion with encoding and dialect sniffing
+
+Detects the encoding (BOM, strict UTF-8, then charset-normalizer/chardet
+when installed) and the delimiter/quoting from a bounded prefix of the
+payload, then parses the file exactly once with chunked pandas reads.
+Replaces the "try utf-8, latin-1, cp1252 ..." loops that re-parsed whole
+attachments for every failed encoding.
+"""
+
+import codecs
+import csv
+import logging
+from dataclasses import dataclass
+from io import BytesIO
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple, Union
+
+from .lazy_import import is_installed, lazy_import
+
+# pandas is only imported once a CSV is actually read
+pd = lazy_import('pandas', 'pip install pandas')
+PANDAS_AVAILABLE = is_installed('pandas')
+
+try:
+    from charset_normalizer import from_bytes as detect_charset
+    CHARSET_NORMALIZER_AVAILABLE = True
+except ImportError:
+    detect_charset = None
+    CHARSET_NORMALIZER_AVAILABLE = False
+
+try:
+    import chardet
+    CHARDET_AVAILABLE = True
+except ImportError:
+    chardet = None
+    CHARDET_AVAILABLE = False
+
+
+SNIFF_BYTES = 64 * 1024      # prefix used for encoding/dialect detection
+DEFAULT_CHUNK_ROWS = 20_000
+CANDIDATE_DELIMITERS = ',;\t|'
+
+BOMS = [
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CsvFormat:
+    """Encoding and dialect detected from a CSV prefix"""
+    encoding: str = 'utf-8'
+    delimiter: str = ','
+    quotechar: str = '"'
+    confidence: str = 'default'
+
+
+def _decodes_cleanly(sample: bytes, encoding: str) -> bool:
+    """Strict decode of a prefix, tolerating a multi-byte sequence cut at the end"""
+    try:
+        codecs.getincrementaldecoder(encoding)(errors='strict').decode(sample, final=False)
+        return True
+    except (UnicodeDecodeError, LookupError):
+        return False
+
+
+def detect_encoding(sample: bytes) -> Tuple[str, str]:
+    """Return (encoding, how it was detected) for a byte prefix"""
+    for bom, encoding in BOMS:
+        if sample.startswith(bom):
+            return encoding, 'bom'
+
+    if _decodes_cleanly(sample, 'utf-8'):
+        return 'utf-8', 'strict'
+
+    if CHARSET_NORMALIZER_AVAILABLE:
+        best = detect_charset(sample).best()
+        if best is not None and best.encoding:
+            return best.encoding, 'charset_normalizer'
+
+    if CHARDET_AVAILABLE:
+        guess = chardet.detect(sample)
+        if guess.get('encoding') and (guess.get('confidence') or 0) >= 0.5:
+            return guess['encoding'], 'chardet'
+
+    # cp1252 covers most government exports; latin-1 decodes any byte sequence
+    if _decodes_cleanly(sample, 'cp1252'):
+        return 'cp1252', 'fallback'
+    return 'latin-1', 'fallback'
+
+
+def sniff_csv(sample: bytes) -> CsvFormat:
+    """Detect encoding and dialect from the first SNIFF_BYTES of a CSV payload"""
+    sample = sample[:SNIFF_BYTES]
+    encoding, confidence = detect_encoding(sample)
+    fmt = CsvFormat(encoding=encoding, confidence=confidence)
+
+    text = codecs.getincrementaldecoder(encoding)(errors='replace').decode(sample, final=False)
+    # Only sniff complete lines so a truncated quoted field does not confuse the sniffer
+    if len(sample) >= SNIFF_BYTES and '\n' in text:
+        text = text[:text.rfind('\n')]
+    try:
+        dialect = csv.Sniffer().sniff(text, delimiters=CANDIDATE_DELIMITERS)
+        fmt.delimiter = dialect.delimiter
+        fmt.quotechar = dialect.quotechar or '"'
+    except csv.Error:
+        pass
+    return fmt
+
+
+def _read_prefix(source: Union[bytes, str, Path]) -> bytes:
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source[:SNIFF_BYTES])
+    with open(source, 'rb') as f:
+        return f.read(SNIFF_BYTES)
+
+
+def iter_csv_chunks(source: Union[bytes, str, Path], fmt: Optional[CsvFormat] = None,
+                    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                    max_rows: Optional[int] = None) -> Iterator['pd.DataFrame']:
+    """Parse a CSV once with the sniffed format, yielding DataFrame chunks"""
+    if fmt is None:
+        fmt = sniff_csv(_read_prefix(source))
+    handle = BytesIO(source) if isinstance(source, (bytes, bytearray)) else source
+    reader = pd.read_csv(
+        handle,
+        sep=fmt.delimiter,
+        quotechar=fmt.quotechar,
+        encoding=fmt.encoding,
+        encoding_errors='replace',
+        chunksize=chunk_rows,
+        nrows=max_rows,
+        on_bad_lines='skip',
+    )
+    with reader:
+        for chunk in reader:
+            yield chunk
+
+
+def read_csv(source: Union[bytes, str, Path], fmt: Optional[CsvFormat] = None,
+             max_rows: Optional[int] = None) -> 'pd.DataFrame':
+    """Parse a whole CSV into one DataFrame (single parse, sniffed format)"""
+    chunks = list(iter_csv_chunks(source, fmt=fmt, max_rows=max_rows))
+    if not chunks:
+        return pd.DataFrame()
+    return pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+
+
+def csv_to_text(source: Union[bytes, str, Path], index: bool = False, na_rep: str = 'NaN',
+                max_rows: Optional[int] = None) -> str:
+    """
+    Render a CSV as a right-aligned text table, as DataFrame.to_string does.
+
+    The CSV is parsed once in chunks; cells are formatted per chunk and the
+    column widths are taken over the whole file, so rows of every chunk line
+    up under the single header.
+    """
+    fmt = sniff_csv(_read_prefix(source))
+    logger.debug(f"CSV format: encoding={fmt.encoding} ({fmt.confidence}), delimiter={fmt.delimiter!r}")
+
+    header: Optional[List[str]] = None
+    columns: List[List[str]] = []
+    rows = 0
+    for chunk in iter_csv_chunks(source, fmt=fmt, max_rows=max_rows):
+        if header is None:
+            header = [str(name) for name in chunk.columns]
+            columns = [[] for _ in header]
+        if chunk.empty:
+            continue
+        for position, cells in enumerate(columns):
+            text = chunk.iloc[:, position].to_string(index=False, na_rep=na_rep)
+            cells.extend(cell.strip() for cell in text.split('\n'))
+        rows += len(chunk)
+    if header is None:
+        return ''
+
+    widths = [max([len(name)] + [len(cell) for cell in cells]) for name, cells in zip(header, columns)]
+    lines = ['  '.join(name.rjust(width) for name, width in zip(header, widths))]
+    lines.extend('  '.join(cells[row].rjust(width) for cells, width in zip(columns, widths))
+                 for row in range(rows))
+    if index:
+        # Row numbers run on across chunks, left-aligned like a DataFrame index
+        index_width = len(str(rows - 1)) if rows else 0
+        lines = [' ' * index_width + '  ' + lines[0]] + [
+            str(row).ljust(index_width) + '  ' + line for row, line in enumerate(lines[1:])]
+    return '\n'.join(lines)
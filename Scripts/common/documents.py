@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Text extraction from downloaded EPUB and HTML documents
+
+Lets scrapers read a document's source (the EPUB behind an embedded reader
+iframe, or the iframe's HTML itself) straight from the bytes fetched over
+HTTP instead of rendering it in a browser and scraping ``body.text``.
+"""
+
+import logging
+import posixpath
+import re
+import zipfile
+from io import BytesIO
+from typing import List, Optional
+from xml.etree import ElementTree
+
+try:
+    from bs4 import BeautifulSoup
+    BS4_AVAILABLE = True
+except ImportError:
+    BeautifulSoup = None
+    BS4_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+ZIP_MAGIC = b'PK\x03\x04'
+HTML_SUFFIXES = ('.xhtml', '.html', '.htm')
+BLOCK_TAGS = r'p|div|br|li|tr|h[1-6]|table|section|article|blockquote'
+
+
+def html_to_text(markup: bytes) -> str:
+    """Visible text of an HTML/XHTML document, one block element per line"""
+    if BS4_AVAILABLE:
+        soup = BeautifulSoup(markup, 'html.parser')
+        for tag in soup(['script', 'style', 'nav', 'header', 'footer', 'noscript']):
+            tag.decompose()
+        text = soup.get_text('\n')
+    else:
+        text = markup.decode('utf-8', errors='replace')
+        text = re.sub(r'<(script|style)[^>]*>.*?</\1>', '', text, flags=re.DOTALL | re.IGNORECASE)
+        text = re.sub(rf'</?(?:{BLOCK_TAGS})\b[^>]*>', '\n', text, flags=re.IGNORECASE)
+        text = re.sub(r'<[^>]+>', ' ', text)
+    lines = (re.sub(r'[ \t\xa0]+', ' ', line).strip() for line in text.splitlines())
+    return '\n'.join(line for line in lines if line)
+
+
+def _epub_spine(archive: zipfile.ZipFile) -> List[str]:
+    """Content documents in reading order, from container.xml -> OPF spine"""
+    container = ElementTree.fromstring(archive.read('META-INF/container.xml'))
+    rootfile = container.find('.//{*}rootfile')
+    opf_path = rootfile.get('full-path')
+    opf = ElementTree.fromstring(archive.read(opf_path))
+    base = posixpath.dirname(opf_path)
+
+    manifest = {item.get('id'): item.get('href') for item in opf.findall('.//{*}item')}
+    spine = []
+    for itemref in opf.findall('.//{*}itemref'):
+        href = manifest.get(itemref.get('idref'))
+        if href:
+            spine.append(posixpath.normpath(posixpath.join(base, href.split('#')[0])))
+    return spine
+
+
+def epub_to_text(payload: bytes) -> str:
+    """Text of an EPUB, chapter by chapter in spine order"""
+    with zipfile.ZipFile(BytesIO(payload)) as archive:
+        names = set(archive.namelist())
+        try:
+            documents = [name for name in _epub_spine(archive) if name in names]
+        except Exception as e:
+            logger.debug(f"EPUB spine unreadable, using archive order: {e}")
+            documents = []
+        if not documents:
+            documents = sorted(name for name in names if name.lower().endswith(HTML_SUFFIXES))
+
+        parts = [html_to_text(archive.read(name)) for name in documents]
+    return '\n\n'.join(part for part in parts if part)
+
+
+def document_to_text(payload: bytes, content_type: str = '', url: str = '') -> Optional[str]:
+    """Text of a fetched EPUB or HTML document; None for formats this module does not read"""
+    if not payload:
+        return None
+    content_type = (content_type or '').lower()
+    path = url.lower().split('?')[0]
+
+    if payload.startswith(ZIP_MAGIC) or 'epub' in content_type or path.endswith('.epub'):
+        try:
+            return epub_to_text(payload)
+        except (zipfile.BadZipFile, KeyError) as e:
+            logger.debug(f"Not a readable EPUB ({url}): {e}")
+            return None
+
+    if 'html' in content_type or path.endswith(HTML_SUFFIXES) or payload.lstrip()[:1] == b'<':
+        return html_to_text(payload)
+
+    return None
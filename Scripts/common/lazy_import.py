@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Lazy imports for heavy optional dependencies
+
+pandas, PyMuPDF, pdfplumber, pytesseract, tiktoken and openpyxl together
+add seconds to every scraper start, yet most runs never see a PDF or a
+spreadsheet. ``lazy_import`` returns a stand-in that imports the real module
+on first attribute access, and ``is_installed`` answers the usual
+``*_AVAILABLE`` question from the import system's metadata without
+importing anything:
+
+    from common.lazy_import import lazy_import, is_installed
+
+    pd = lazy_import('pandas')
+    PANDAS_AVAILABLE = is_installed('pandas')
+    ...
+    df = pd.DataFrame(rows)   # pandas is imported here, once
+
+Each deferred import is timed and logged at debug level, so it is visible
+which runs actually paid for which library.
+"""
+
+import importlib
+import importlib.util
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_installed: Dict[str, bool] = {}
+
+
+def is_installed(name: str) -> bool:
+    """True if the module can be imported (checked without importing it)"""
+    if name not in _installed:
+        try:
+            _installed[name] = importlib.util.find_spec(name) is not None
+        except (ImportError, ValueError):
+            # A parent package is missing, or the module is a broken stub
+            _installed[name] = False
+    return _installed[name]
+
+
+class LazyModule:
+    """Stand-in for a module that is imported on first attribute access"""
+
+    def __init__(self, name: str, install_hint: Optional[str] = None):
+        self.__dict__['_name'] = name
+        self.__dict__['_install_hint'] = install_hint
+        self.__dict__['_module'] = None
+        self.__dict__['_lock'] = threading.Lock()
+
+    def _load(self):
+        module = self.__dict__['_module']
+        if module is not None:
+            return module
+        with self.__dict__['_lock']:
+            module = self.__dict__['_module']
+            if module is None:
+                name = self.__dict__['_name']
+                started = time.perf_counter()
+                try:
+                    module = importlib.import_module(name)
+                except ImportError as e:
+                    hint = self.__dict__['_install_hint']
+                    if hint:
+                        raise ImportError(f"{e} (install with: {hint})") from e
+                    raise
+                logger.debug(f"Lazily imported {name} in {time.perf_counter() - started:.2f}s")
+                self.__dict__['_module'] = module
+        return module
+
+    @property
+    def loaded(self) -> bool:
+        return self.__dict__['_module'] is not None
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr: str, value: Any):
+        setattr(self._load(), attr, value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = 'loaded' if self.loaded else 'not loaded'
+        return f"<lazy module '{self.__dict__['_name']}' ({state})>"
+
+
+def lazy_import(name: str, install_hint: Optional[str] = None) -> LazyModule:
+    """A module stand-in that imports ``name`` the first time it is used"""
+    return LazyModule(name, install_hint)
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate detection across regulators (MinHash LSH)
+
+Deduplication was exact only (MD5 of extracted PDF text, ``content_hash``,
+``hash_id`` of headline and date), so the same joint statement published by
+three agencies, a BIS-hosted copy of a central bank speech, or a PDF
+re-issued with a new footer was stored, extracted and sent downstream again.
+
+``NearDuplicateIndex`` keeps a MinHash signature of the word shingles of
+every ingested text in a shared SQLite database, bucketed by LSH bands, so
+a new text is compared only with the few documents that share a band:
+
+    index = NearDuplicateIndex()
+    match = index.add('RBA/rba_speeches/abc123', text, regulator='RBA')
+    if match:        # Jaccard similarity >= threshold with an earlier text
+        record['near_duplicate_of'] = match.canonical_key
+
+With 128 permutations in 16 bands of 8 rows, pairs above ~0.7 Jaccard
+similarity almost always share a band; candidates are then confirmed against
+``threshold`` (0.8 by default) on the full signature. Every duplicate points
+at the first-seen document of its cluster (the canonical copy).
+
+Scrapers call ``flag_near_duplicates(new_records, JSON_PATH)`` at ingest;
+flagged records carry ``near_duplicate_of`` and
+``near_duplicate_similarity`` so LLM processing can skip them.
+``SCRAPER_NEAR_DUPLICATES`` overrides the database path (default
+Scripts/state/near_duplicates.sqlite3) or disables the check with ``off``.
+numpy speeds up signatures when installed.
+
+    python -m common.near_duplicates index        # backfill Scripts/*/data
+    python -m common.near_duplicates clusters     # largest duplicate clusters
+"""
+
+import argparse
+import hashlib
+import logging
+import os
+import random
+import re
+import sqlite3
+import threading
+import zlib
+from array import array
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+from .corpus_snapshot import SCRIPTS_ROOT, discover_sources, iter_source_records, normalise_record
+from .lazy_import import is_installed, lazy_import
+from .search_index import source_of
+
+np = lazy_import('numpy', 'pip install numpy')
+
+NEAR_DUPLICATES_ENV_VAR = 'SCRAPER_NEAR_DUPLICATES'
+DEFAULT_INDEX_PATH = SCRIPTS_ROOT / 'state' / 'near_duplicates.sqlite3'
+DISABLED_VALUES = ('0', 'off', 'false', 'no')
+
+NUM_PERM = 128
+BANDS = 16
+SHINGLE_WORDS = 5
+MIN_WORDS = 50            # shorter texts (headlines, stubs) are not compared
+DEFAULT_THRESHOLD = 0.8
+SEED = 1
+
+PRIME = 4294967311        # smallest prime above 2**32
+MAX_HASH = 0xFFFFFFFF
+WORD = re.compile(r'\w+')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS settings (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS documents (
+    doc_key TEXT PRIMARY KEY,
+    regulator TEXT,
+    source TEXT,
+    record_id TEXT,
+    url TEXT,
+    title TEXT,
+    words INTEGER NOT NULL,
+    signature BLOB NOT NULL,
+    canonical_key TEXT,
+    similarity REAL,
+    added_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS documents_canonical ON documents (canonical_key);
+CREATE TABLE IF NOT EXISTS buckets (
+    band INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    doc_key TEXT NOT NULL,
+    PRIMARY KEY (band, bucket, doc_key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS sources (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+"""
+
+
+@dataclass
+class Match:
+    canonical_key: str      # first-seen document of the cluster
+    matched_key: str        # the most similar existing document
+    similarity: float       # estimated Jaccard similarity with matched_key
+
+
+def near_duplicates_disabled() -> bool:
+    return os.environ.get(NEAR_DUPLICATES_ENV_VAR, '').strip().lower() in DISABLED_VALUES
+
+
+def shingle_hashes(text: str, size: int = SHINGLE_WORDS) -> List[int]:
+    """32-bit hashes of the distinct word n-grams of a text (case and punctuation ignored)"""
+    words = WORD.findall(text.lower())
+    if len(words) < size:
+        return []
+    return list({zlib.crc32(' '.join(words[i:i + size]).encode('utf-8'))
+                 for i in range(len(words) - size + 1)})
+
+
+class MinHasher:
+    """Universal-hash MinHash over 32-bit shingle hashes (numpy-vectorised when available)"""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = SEED):
+        rng = random.Random(seed)
+        # a < 2**31 keeps a * hash + b inside uint64
+        self.a = [rng.randint(1, (1 << 31) - 1) for _ in range(num_perm)]
+        self.b = [rng.randint(0, MAX_HASH) for _ in range(num_perm)]
+        self.num_perm = num_perm
+
+    def signature(self, hashes: Sequence[int]) -> array:
+        if is_installed('numpy'):
+            a = np.array(self.a, dtype=np.uint64)
+            b = np.array(self.b, dtype=np.uint64)
+            values = np.array(hashes, dtype=np.uint64)
+            result = np.full(self.num_perm, MAX_HASH, dtype=np.uint64)
+            for start in range(0, len(values), 8192):
+                block = values[start:start + 8192, None]
+                result = np.minimum(result, ((block * a + b) % PRIME).min(axis=0))
+            return array('I', (result & MAX_HASH).astype(np.uint32).tolist())
+        return array('I', (min((a * value + b) % PRIME for value in hashes) & MAX_HASH
+                           for a, b in zip(self.a, self.b)))
+
+
+def estimate_similarity(left: array, right: array) -> float:
+    return sum(1 for x, y in zip(left, right) if x == y) / len(left)
+
+
+class NearDuplicateIndex:
+    """Shared MinHash LSH index that flags texts nearly identical to ones already ingested"""
+
+    def __init__(self, path: Optional[Union[str, Path]] = None,
+                 threshold: float = DEFAULT_THRESHOLD,
+                 min_words: int = MIN_WORDS,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            path: index database (default Scripts/state/near_duplicates.sqlite3,
+                or $SCRAPER_NEAR_DUPLICATES)
+            threshold: estimated Jaccard similarity at which a text is a near duplicate
+            min_words: texts with fewer words are neither indexed nor flagged
+        """
+        env_path = os.environ.get(NEAR_DUPLICATES_ENV_VAR, '').strip()
+        if env_path.lower() in DISABLED_VALUES:
+            env_path = ''
+        self.path = Path(path or env_path or DEFAULT_INDEX_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.threshold = threshold
+        self.min_words = min_words
+        self.rows = NUM_PERM // BANDS
+        self.hasher = MinHasher(NUM_PERM, SEED)
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=60, isolation_level=None,
+                                     check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._check_settings()
+
+    def _check_settings(self):
+        settings = {'num_perm': NUM_PERM, 'bands': BANDS, 'shingle_words': SHINGLE_WORDS, 'seed': SEED}
+        stored = dict(self._conn.execute("SELECT name, value FROM settings").fetchall())
+        if not stored:
+            self._conn.executemany("INSERT INTO settings (name, value) VALUES (?, ?)",
+                                   [(name, str(value)) for name, value in settings.items()])
+        elif stored != {name: str(value) for name, value in settings.items()}:
+            raise ValueError(f"{self.path} was built with different MinHash settings {stored}; "
+                             f"delete it and re-run 'python -m common.near_duplicates index'")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Signatures
+    # ------------------------------------------------------------------
+
+    def signature(self, text: str) -> Optional[array]:
+        """MinHash signature, or None when the text is too short to compare"""
+        if len(WORD.findall(text)) < self.min_words:
+            return None
+        hashes = shingle_hashes(text)
+        return self.hasher.signature(hashes) if hashes else None
+
+    def _buckets(self, signature: array) -> List[int]:
+        buckets = []
+        for band in range(BANDS):
+            rows = signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            buckets.append(int.from_bytes(hashlib.blake2b(rows, digest_size=8).digest(), 'big', signed=True))
+        return buckets
+
+    def _best_match(self, signature: array, buckets: List[int], exclude: str) -> Optional[Match]:
+        conn = self._conn
+        candidates = set()
+        for band, bucket in enumerate(buckets):
+            candidates.update(row[0] for row in conn.execute(
+                "SELECT doc_key FROM buckets WHERE band = ? AND bucket = ?", (band, bucket)))
+        candidates.discard(exclude)
+
+        best = None
+        for doc_key in candidates:
+            row = conn.execute("SELECT signature, canonical_key FROM documents WHERE doc_key = ?",
+                               (doc_key,)).fetchone()
+            if row is None:
+                continue
+            other = array('I')
+            other.frombytes(row[0])
+            similarity = estimate_similarity(signature, other)
+            if similarity >= self.threshold and (best is None or similarity > best.similarity):
+                best = Match(canonical_key=row[1] or doc_key, matched_key=doc_key, similarity=similarity)
+        return best
+
+    # ------------------------------------------------------------------
+    # Ingest
+    # ------------------------------------------------------------------
+
+    def check(self, text: str) -> Optional[Match]:
+        """Near duplicate of an indexed document, without adding the text"""
+        signature = self.signature(text)
+        if signature is None:
+            return None
+        with self._lock:
+            return self._best_match(signature, self._buckets(signature), exclude='')
+
+    def add(self, doc_key: str, text: str, regulator: str = '', source: str = '',
+            record_id: str = '', url: str = '', title: str = '') -> Optional[Match]:
+        """Index a text under ``doc_key``; returns the match if it nearly duplicates an earlier one"""
+        signature = self.signature(text)
+        if signature is None:
+            return None
+        buckets = self._buckets(signature)
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                existing = conn.execute("SELECT signature, canonical_key, similarity FROM documents "
+                                        "WHERE doc_key = ?", (doc_key,)).fetchone()
+                if existing and existing[0] == signature.tobytes():
+                    # Same text ingested again (e.g. a re-run): keep its original verdict
+                    conn.execute("COMMIT")
+                    return Match(existing[1], existing[1], existing[2]) if existing[1] else None
+
+                match = self._best_match(signature, buckets, exclude=doc_key)
+                conn.execute("DELETE FROM buckets WHERE doc_key = ?", (doc_key,))
+                conn.execute("INSERT OR REPLACE INTO documents (doc_key, regulator, source, record_id, url, "
+                             "title, words, signature, canonical_key, similarity, added_at) "
+                             "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                             (doc_key, regulator, source, record_id, url, title, len(WORD.findall(text)),
+                              signature.tobytes(), match.canonical_key if match else None,
+                              match.similarity if match else None, datetime.now().isoformat()))
+                conn.executemany("INSERT OR IGNORE INTO buckets (band, bucket, doc_key) VALUES (?, ?, ?)",
+                                 [(band, bucket, doc_key) for band, bucket in enumerate(buckets)])
+                conn.execute("COMMIT")
+                return match
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def add_records(self, records: Iterable[Dict[str, Any]], regulator: str, source: str) -> List[Dict[str, Any]]:
+        """Index records of one source and flag near duplicates in place; returns the flagged records"""
+        flagged = []
+        for record in records:
+            if not isinstance(record, dict):
+                continue
+            row = normalise_record(record, regulator, source)
+            match = self.add(f"{regulator}/{source}/{row['record_id']}", row['content'],
+                             regulator=regulator, source=source, record_id=row['record_id'],
+                             url=row['url'], title=row['title'])
+            if match:
+                record['near_duplicate_of'] = match.canonical_key
+                record['near_duplicate_similarity'] = round(match.similarity, 3)
+                flagged.append(record)
+            else:
+                record.pop('near_duplicate_of', None)
+                record.pop('near_duplicate_similarity', None)
+        return flagged
+
+    def index_corpus(self, scripts_root: Union[str, Path] = SCRIPTS_ROOT, force: bool = False) -> Dict[str, int]:
+        """Backfill from every Scripts/*/data output, skipping files unchanged since their last pass"""
+        totals = {'sources': 0, 'skipped': 0, 'flagged': 0, 'failed': 0}
+        for name, path in discover_sources(Path(scripts_root)).items():
+            totals['sources'] += 1
+            stat = path.stat()
+            with self._lock:
+                seen = self._conn.execute("SELECT size, mtime_ns FROM sources WHERE path = ?",
+                                          (str(path),)).fetchone()
+            if not force and seen and tuple(seen) == (stat.st_size, stat.st_mtime_ns):
+                totals['skipped'] += 1
+                continue
+            regulator, source = source_of(path)
+            try:
+                flagged = self.add_records(iter_source_records(path), regulator, source)
+            except Exception as e:
+                self.logger.warning(f"Could not index {name}: {e}")
+                totals['failed'] += 1
+                continue
+            totals['flagged'] += len(flagged)
+            with self._lock:
+                self._conn.execute("INSERT OR REPLACE INTO sources (path, size, mtime_ns) VALUES (?, ?, ?)",
+                                   (str(path), stat.st_size, stat.st_mtime_ns))
+            if flagged:
+                self.logger.info(f"{name}: {len(flagged)} near duplicates")
+        return totals
+
+    def clusters(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Largest clusters: canonical document and its near duplicates"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT canonical_key, COUNT(*) AS duplicates, GROUP_CONCAT(doc_key, '\n') "
+                "FROM documents WHERE canonical_key IS NOT NULL "
+                "GROUP BY canonical_key ORDER BY duplicates DESC LIMIT ?", (limit,)).fetchall()
+        return [{'canonical_key': row[0], 'duplicates': row[1], 'members': row[2].split('\n')} for row in rows]
+
+
+def flag_near_duplicates(records: Iterable[Dict[str, Any]], output_path: Union[str, Path],
+                         logger: Optional[logging.Logger] = None) -> int:
+    """Check a scraper's new records against the shared index, flagging them in place; never raises"""
+    if near_duplicates_disabled():
+        return 0
+    logger = logger or logging.getLogger(__name__)
+    try:
+        regulator, source = source_of(output_path)
+        index = NearDuplicateIndex(logger=logger)
+        try:
+            flagged = index.add_records(records, regulator, source)
+        finally:
+            index.close()
+        for record in flagged:
+            logger.info(f"Near duplicate ({record['near_duplicate_similarity']:.2f}) of "
+                        f"{record['near_duplicate_of']}: {record.get('url') or record.get('title', '')}")
+        return len(flagged)
+    except Exception as e:
+        logger.warning(f"Could not check near duplicates: {e}")
+        return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Near-duplicate index over the scraped corpus")
+    parser.add_argument('--index-path', help='index database (default Scripts/state/near_duplicates.sqlite3)')
+    commands = parser.add_subparsers(dest='command', required=True)
+    index = commands.add_parser('index', help='index new/changed outputs from Scripts/*/data')
+    index.add_argument('--force', action='store_true', help='re-read every output file')
+    clusters = commands.add_parser('clusters', help='list the largest near-duplicate clusters')
+    clusters.add_argument('--limit', type=int, default=20)
+    check = commands.add_parser('check', help='check a text file against the index')
+    check.add_argument('text_file')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    near_duplicates = NearDuplicateIndex(args.index_path)
+    try:
+        if args.command == 'index':
+            totals = near_duplicates.index_corpus(force=args.force)
+            print(f"{totals['sources']} sources ({totals['skipped']} unchanged files), "
+                  f"{totals['flagged']} near duplicates flagged")
+        elif args.command == 'clusters':
+            for cluster in near_duplicates.clusters(args.limit):
+                print(f"{cluster['canonical_key']}  ({cluster['duplicates']} near duplicates)")
+                for member in cluster['members']:
+                    print(f"    {member}")
+        else:
+            text = Path(args.text_file).read_text(encoding='utf-8', errors='replace')
+            match = near_duplicates.check(text)
+            print(f"near duplicate of {match.matched_key} ({match.similarity:.2f}), cluster {match.canonical_key}"
+                  if match else "no near duplicate")
+    finally:
+        near_duplicates.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+OCR triage for images embedded in PDFs
+
+OCR is by far the slowest step of PDF extraction, and most embedded images
+are not worth it: logos and decorative banners repeat on every page, the
+same image object is referenced from several pages, and many charts already
+carry their labels in the PDF text layer. Triage (PyMuPDF only, no
+rendering) drops:
+
+  * images smaller than ``min_size`` in either dimension
+  * images placed on ``repeat_pages`` or more pages (logos, page furniture)
+  * duplicates, by xref and by content hash
+  * images whose placement on the page already contains ``min_covered_words``
+    words of the text layer
+
+and the remaining images are OCRed in parallel on a process pool.
+"""
+
+import hashlib
+import io
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from .lazy_import import is_installed, lazy_import
+
+# Imported when the first PDF is triaged / the first image is OCRed
+fitz = lazy_import('fitz', 'pip install pymupdf')  # PyMuPDF
+FITZ_AVAILABLE = is_installed('fitz')
+
+pytesseract = lazy_import('pytesseract', 'pip install pytesseract')
+pil_image = lazy_import('PIL.Image', 'pip install pillow')
+pil_enhance = lazy_import('PIL.ImageEnhance', 'pip install pillow')
+OCR_AVAILABLE = is_installed('PIL') and is_installed('pytesseract')
+
+DEFAULT_TESSERACT_CONFIG = '--oem 3 --psm 6'
+
+
+@dataclass
+class OcrJob:
+    """One unique image selected for OCR"""
+    page_number: int
+    xref: int
+    digest: str
+    image_bytes: bytes
+
+
+@dataclass
+class OcrResult:
+    page_number: int
+    xref: int
+    text: str
+
+
+@dataclass
+class TriageStats:
+    """Why images were or were not OCRed"""
+    images_seen: int = 0
+    too_small: int = 0
+    repeated: int = 0
+    duplicates: int = 0
+    covered_by_text: int = 0
+    queued: int = 0
+    ocr_seconds: float = 0.0
+    per_page_queued: Dict[int, int] = field(default_factory=dict)
+
+    @property
+    def skipped(self) -> int:
+        return self.too_small + self.repeated + self.duplicates + self.covered_by_text
+
+
+def _init_worker():
+    # Tesseract is multi-threaded by default; one thread per process avoids
+    # oversubscribing the CPU when several processes run in parallel
+    os.environ['OMP_THREAD_LIMIT'] = '1'
+
+
+def _ocr_image_bytes(image_bytes: bytes, config: str) -> str:
+    """OCR one image (grayscale + contrast boost); runs in a worker process"""
+    try:
+        image = pil_image.open(io.BytesIO(image_bytes))
+        if image.mode != 'L':
+            image = image.convert('L')
+        image = pil_enhance.Contrast(image).enhance(2)
+        return pytesseract.image_to_string(image, config=config)
+    except Exception:
+        return ""
+
+
+class OcrTriage:
+    """Select the PDF images worth OCRing and OCR them on a process pool"""
+
+    def __init__(self, min_size: int = 100,
+                 repeat_pages: int = 3,
+                 min_covered_words: int = 12,
+                 workers: Optional[int] = None,
+                 tesseract_config: str = DEFAULT_TESSERACT_CONFIG,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            min_size: skip images narrower or shorter than this (pixels)
+            repeat_pages: skip images placed on at least this many pages (0 disables)
+            min_covered_words: skip images whose area already holds this many
+                text-layer words (0 disables)
+            workers: OCR processes (default: CPU count, capped at 8)
+        """
+        self.min_size = min_size
+        self.repeat_pages = repeat_pages
+        self.min_covered_words = min_covered_words
+        self.workers = workers or min(8, os.cpu_count() or 1)
+        self.tesseract_config = tesseract_config
+        self.logger = logger or logging.getLogger(__name__)
+        self.stats = TriageStats()
+
+    @staticmethod
+    def is_available() -> bool:
+        return FITZ_AVAILABLE and OCR_AVAILABLE
+
+    # ------------------------------------------------------------------
+    # Triage
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _words_inside(words: List[tuple], rect) -> int:
+        """Number of text-layer words whose centre lies inside rect"""
+        count = 0
+        for word in words:
+            cx = (word[0] + word[2]) / 2
+            cy = (word[1] + word[3]) / 2
+            if rect.x0 <= cx <= rect.x1 and rect.y0 <= cy <= rect.y1:
+                count += 1
+        return count
+
+    def plan(self, pdf_content: bytes) -> List[OcrJob]:
+        """Pick the unique, uncovered, non-decorative images of a PDF"""
+        self.stats = TriageStats()
+        jobs: List[OcrJob] = []
+        seen_xrefs = set()
+        seen_digests = set()
+
+        document = fitz.open(stream=pdf_content, filetype="pdf")
+        try:
+            # How many pages place each image (logos/banners repeat on every page)
+            placements: Dict[int, int] = {}
+            for page in document:
+                for xref in {img[0] for img in page.get_images(full=True)}:
+                    placements[xref] = placements.get(xref, 0) + 1
+
+            for page_number, page in enumerate(document, 1):
+                words = None
+                for img in page.get_images(full=True):
+                    xref, width, height = img[0], img[2], img[3]
+                    self.stats.images_seen += 1
+
+                    if xref in seen_xrefs:
+                        self.stats.duplicates += 1
+                        continue
+                    seen_xrefs.add(xref)
+
+                    if width <= self.min_size or height <= self.min_size:
+                        self.stats.too_small += 1
+                        continue
+
+                    if self.repeat_pages and placements.get(xref, 0) >= self.repeat_pages:
+                        self.stats.repeated += 1
+                        continue
+
+                    if self.min_covered_words:
+                        if words is None:
+                            words = page.get_text("words")
+                        try:
+                            rects = page.get_image_rects(xref)
+                        except Exception:
+                            rects = []
+                        if rects and max(self._words_inside(words, rect) for rect in rects) >= self.min_covered_words:
+                            self.stats.covered_by_text += 1
+                            continue
+
+                    try:
+                        image_bytes = document.extract_image(xref)["image"]
+                    except Exception as e:
+                        self.logger.debug(f"Could not extract image xref {xref} on page {page_number}: {e}")
+                        continue
+
+                    digest = hashlib.sha1(image_bytes).hexdigest()
+                    if digest in seen_digests:
+                        self.stats.duplicates += 1
+                        continue
+                    seen_digests.add(digest)
+
+                    jobs.append(OcrJob(page_number, xref, digest, image_bytes))
+                    self.stats.per_page_queued[page_number] = self.stats.per_page_queued.get(page_number, 0) + 1
+        finally:
+            document.close()
+
+        self.stats.queued = len(jobs)
+        return jobs
+
+    # ------------------------------------------------------------------
+    # OCR
+    # ------------------------------------------------------------------
+
+    def run(self, jobs: List[OcrJob]) -> List[OcrResult]:
+        """OCR the jobs (in parallel when there is more than one), preserving order"""
+        started = time.time()
+        payloads = [job.image_bytes for job in jobs]
+        configs = [self.tesseract_config] * len(jobs)
+        texts: List[str] = []
+
+        if len(jobs) > 1 and self.workers > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=min(self.workers, len(jobs)),
+                                         initializer=_init_worker) as pool:
+                    texts = list(pool.map(_ocr_image_bytes, payloads, configs))
+            except Exception as e:
+                self.logger.warning(f"OCR process pool failed ({e}); running serially")
+                texts = []
+
+        if len(texts) != len(jobs):
+            texts = [_ocr_image_bytes(payload, config) for payload, config in zip(payloads, configs)]
+
+        self.stats.ocr_seconds = time.time() - started
+        return [OcrResult(job.page_number, job.xref, text) for job, text in zip(jobs, texts)]
+
+    def ocr_pdf(self, pdf_content: bytes) -> List[OcrResult]:
+        """Triage and OCR the images of a PDF"""
+        return self.run(self.plan(pdf_content))
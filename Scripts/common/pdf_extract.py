@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Single-pass PDF text and table extraction
+
+Scrapers used to call pdfplumber's ``page.extract_text()`` and then
+``page.extract_tables()``, running a separate layout analysis for each.
+``extract_pdf`` walks each page once and returns its text, tables and page
+boundaries together, with per-page timings so slow (table-heavy) documents
+can be spotted in the logs.
+
+PyMuPDF is the fast path: one text page per page, reused for the text, with
+its table finder run only on pages that have ruling lines/rectangles to
+detect tables from. pdfplumber is the fallback, sharing each page's parsed
+objects between text and table extraction and likewise skipping the table
+pass on pages without ruling.
+"""
+
+import io
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from .lazy_import import is_installed, lazy_import
+
+# Imported on the first PDF, not when a scraper starts
+fitz = lazy_import('fitz', 'pip install pymupdf')  # PyMuPDF
+FITZ_AVAILABLE = is_installed('fitz')
+
+pdfplumber = lazy_import('pdfplumber', 'pip install pdfplumber')
+PDFPLUMBER_AVAILABLE = is_installed('pdfplumber')
+
+logger = logging.getLogger(__name__)
+
+SLOW_PAGE_SECONDS = 2.0
+
+
+@dataclass
+class PdfTable:
+    page_number: int
+    index: int
+    rows: List[List[str]]
+
+    def to_text(self, separator: str = '\t') -> str:
+        return '\n'.join(separator.join(cell for cell in row) for row in self.rows)
+
+
+@dataclass
+class PdfPage:
+    number: int
+    text: str = ''
+    tables: List[PdfTable] = field(default_factory=list)
+    seconds: float = 0.0
+
+
+@dataclass
+class PdfContent:
+    """Everything extracted from one PDF"""
+    pages: List[PdfPage] = field(default_factory=list)
+    engine: str = ''
+    seconds: float = 0.0
+
+    @property
+    def tables(self) -> List[PdfTable]:
+        return [table for page in self.pages for table in page.tables]
+
+    def text(self, page_separator: str = '\n\n') -> str:
+        return page_separator.join(page.text for page in self.pages if page.text)
+
+    def slowest_pages(self, count: int = 3) -> List[PdfPage]:
+        return sorted(self.pages, key=lambda page: page.seconds, reverse=True)[:count]
+
+
+def is_available() -> bool:
+    return FITZ_AVAILABLE or PDFPLUMBER_AVAILABLE
+
+
+def _fitz_has_tables() -> bool:
+    # Page.find_tables arrived in PyMuPDF 1.23
+    return hasattr(fitz.Page, 'find_tables')
+
+
+def _clean_rows(rows) -> List[List[str]]:
+    cleaned = []
+    for row in rows or []:
+        cells = ['' if cell is None else str(cell).strip() for cell in row]
+        if any(cells):
+            cleaned.append(cells)
+    return cleaned
+
+
+def _extract_with_fitz(payload: bytes, tables: bool, max_pages: Optional[int]) -> List[PdfPage]:
+    pages = []
+    with fitz.open(stream=payload, filetype="pdf") as document:
+        for number, page in enumerate(document, 1):
+            if max_pages and number > max_pages:
+                break
+            started = time.time()
+            result = PdfPage(number=number)
+
+            textpage = page.get_textpage()
+            result.text = page.get_text("text", textpage=textpage).strip()
+
+            # Table detection needs ruling; skip it on pure-text pages
+            if tables and _fitz_has_tables() and page.get_drawings():
+                try:
+                    for index, table in enumerate(page.find_tables().tables, 1):
+                        rows = _clean_rows(table.extract())
+                        if rows:
+                            result.tables.append(PdfTable(number, index, rows))
+                except Exception as e:
+                    logger.debug(f"Table detection failed on page {number}: {e}")
+
+            result.seconds = time.time() - started
+            pages.append(result)
+    return pages
+
+
+def _extract_with_pdfplumber(payload: bytes, tables: bool, max_pages: Optional[int]) -> List[PdfPage]:
+    pages = []
+    with pdfplumber.open(io.BytesIO(payload)) as pdf:
+        for number, page in enumerate(pdf.pages, 1):
+            if max_pages and number > max_pages:
+                break
+            started = time.time()
+            result = PdfPage(number=number)
+
+            # Text and tables share the page's parsed objects
+            result.text = (page.extract_text() or '').strip()
+            if tables and (page.lines or page.rects):
+                for index, table in enumerate(page.extract_tables(), 1):
+                    rows = _clean_rows(table)
+                    if rows:
+                        result.tables.append(PdfTable(number, index, rows))
+
+            result.seconds = time.time() - started
+            pages.append(result)
+            page.flush_cache()
+    return pages
+
+
+def extract_pdf(payload: bytes, tables: bool = True, max_pages: Optional[int] = None,
+                source: str = '') -> PdfContent:
+    """Extract text, tables and page boundaries from a PDF in one pass per page"""
+    if not is_available():
+        raise ImportError("extract_pdf needs PyMuPDF (pip install pymupdf) or pdfplumber")
+
+    started = time.time()
+    content = PdfContent()
+    if FITZ_AVAILABLE:
+        try:
+            content.pages = _extract_with_fitz(payload, tables, max_pages)
+            content.engine = 'pymupdf'
+        except Exception as e:
+            if not PDFPLUMBER_AVAILABLE:
+                raise
+            logger.warning(f"PyMuPDF failed on {source or 'PDF'} ({e}); falling back to pdfplumber")
+    if not content.engine:
+        content.pages = _extract_with_pdfplumber(payload, tables, max_pages)
+        content.engine = 'pdfplumber'
+    content.seconds = time.time() - started
+
+    slow = [page for page in content.pages if page.seconds >= SLOW_PAGE_SECONDS]
+    logger.debug(f"{source or 'PDF'}: {len(content.pages)} pages, {len(content.tables)} tables "
+                 f"in {content.seconds:.2f}s ({content.engine})")
+    if slow:
+        logger.info(f"{source or 'PDF'}: slow pages " +
+                    ', '.join(f"{page.number} ({page.seconds:.1f}s, {len(page.tables)} tables)" for page in slow))
+    return content
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Bounded producer/consumer pipeline for scrapers
+
+    discover -> fetch -> extract -> persist
+
+Discovery runs in the calling thread (so a Selenium listing driver stays on
+the thread that created it) and feeds a bounded queue; fetch and extract
+stages run on worker threads; persistence runs on a single thread and is
+handed results in small batches as soon as they complete. Stages overlap,
+queues apply back-pressure so discovery never runs far ahead of fetching,
+and discovery stops as soon as it reaches items that are already known.
+"""
+
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, List, Optional
+
+_SENTINEL = object()
+
+
+@dataclass
+class PipelineStats:
+    """Counters for one pipeline run"""
+    discovered: int = 0
+    known: int = 0
+    fetched: int = 0
+    extracted: int = 0
+    persisted: int = 0
+    errors: int = 0
+    stopped_early: bool = False
+    elapsed: float = 0.0
+
+
+class Pipeline:
+    """Runs discover/fetch/extract/persist stages concurrently with bounded queues"""
+
+    def __init__(self,
+                 discover: Iterable[Any],
+                 fetch: Callable[[Any], Any],
+                 persist: Callable[[List[Any]], None],
+                 extract: Optional[Callable[[Any], Any]] = None,
+                 is_known: Optional[Callable[[Any], bool]] = None,
+                 stop_after_known: Optional[int] = 1,
+                 max_items: Optional[int] = None,
+                 fetch_workers: int = 4,
+                 extract_workers: int = 1,
+                 queue_size: int = 16,
+                 persist_batch_size: int = 10,
+                 name: str = "pipeline",
+                 logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            discover: iterable (usually a generator) of work items in listing order
+            fetch: item -> fetched payload, or None to drop the item
+            persist: called with a list of finished results; runs on one thread
+            extract: optional payload -> result step, run on its own workers
+            is_known: item -> True if it is already stored
+            stop_after_known: stop discovery after this many consecutive known
+                items (None = skip known items but keep discovering)
+            max_items: stop discovery once this many new items are queued
+        """
+        self.discover = discover
+        self.fetch = fetch
+        self.extract = extract
+        self.persist = persist
+        self.is_known = is_known
+        self.stop_after_known = stop_after_known
+        self.max_items = max_items
+        self.fetch_workers = max(1, fetch_workers)
+        self.extract_workers = max(1, extract_workers)
+        self.persist_batch_size = max(1, persist_batch_size)
+        self.name = name
+        self.logger = logger or logging.getLogger(__name__)
+
+        self.fetch_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.extract_queue: Optional[queue.Queue] = queue.Queue(maxsize=queue_size) if extract else None
+        self.persist_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+
+        self.stats = PipelineStats()
+        self._stats_lock = threading.Lock()
+
+    def _count(self, field_name: str, n: int = 1):
+        with self._stats_lock:
+            setattr(self.stats, field_name, getattr(self.stats, field_name) + n)
+
+    # ------------------------------------------------------------------
+    # Stage workers
+    # ------------------------------------------------------------------
+
+    def _stage_worker(self, stage: str, func: Callable, inbox: queue.Queue, outbox: queue.Queue, counter: str):
+        while True:
+            item = inbox.get()
+            if item is _SENTINEL:
+                break
+            try:
+                result = func(item)
+                if result is not None:
+                    self._count(counter)
+                    outbox.put(result)
+            except Exception as e:
+                self._count('errors')
+                self.logger.error(f"[{self.name}] {stage} stage failed: {e}")
+
+    def _persist_worker(self):
+        batch = []
+        while True:
+            item = self.persist_queue.get()
+            if item is not _SENTINEL:
+                batch.append(item)
+            if batch and (item is _SENTINEL or len(batch) >= self.persist_batch_size):
+                try:
+                    self.persist(batch)
+                    self._count('persisted', len(batch))
+                except Exception as e:
+                    self._count('errors')
+                    self.logger.error(f"[{self.name}] persist failed for {len(batch)} results: {e}")
+                batch = []
+            if item is _SENTINEL:
+                break
+
+    def _start(self, count: int, target: Callable, *args) -> List[threading.Thread]:
+        threads = []
+        for i in range(count):
+            thread = threading.Thread(target=target, args=args, name=f"{self.name}-{target.__name__}-{i}", daemon=True)
+            thread.start()
+            threads.append(thread)
+        return threads
+
+    @staticmethod
+    def _drain(threads: List[threading.Thread], inbox: queue.Queue):
+        for _ in threads:
+            inbox.put(_SENTINEL)
+        for thread in threads:
+            thread.join()
+
+    # ------------------------------------------------------------------
+    # Run
+    # ------------------------------------------------------------------
+
+    def run(self) -> PipelineStats:
+        """Run discovery in this thread until exhausted/stopped, then drain every stage"""
+        start = time.time()
+        fetch_out = self.extract_queue if self.extract else self.persist_queue
+
+        persist_threads = self._start(1, self._persist_worker)
+        extract_threads = []
+        if self.extract:
+            extract_threads = self._start(self.extract_workers, self._stage_worker,
+                                          'extract', self.extract, self.extract_queue, self.persist_queue, 'extracted')
+        fetch_threads = self._start(self.fetch_workers, self._stage_worker,
+                                    'fetch', self.fetch, self.fetch_queue, fetch_out, 'fetched')
+
+        try:
+            self._run_discovery()
+        except Exception as e:
+            self._count('errors')
+            self.logger.error(f"[{self.name}] discovery failed, finishing queued work: {e}")
+        finally:
+            # Everything already discovered is still fetched and persisted
+            self._drain(fetch_threads, self.fetch_queue)
+            if self.extract:
+                self._drain(extract_threads, self.extract_queue)
+            self._drain(persist_threads, self.persist_queue)
+            self.stats.elapsed = time.time() - start
+
+        self.logger.info(
+            f"[{self.name}] discovered={self.stats.discovered} known={self.stats.known} "
+            f"fetched={self.stats.fetched} persisted={self.stats.persisted} "
+            f"errors={self.stats.errors} in {self.stats.elapsed:.1f}s"
+        )
+        return self.stats
+
+    def _run_discovery(self):
+        known_streak = 0
+        queued = 0
+        iterator = iter(self.discover)
+        try:
+            for item in iterator:
+                self.stats.discovered += 1
+
+                if self.is_known and self.is_known(item):
+                    self.stats.known += 1
+                    known_streak += 1
+                    if self.stop_after_known and known_streak >= self.stop_after_known:
+                        self.logger.info(f"[{self.name}] reached {known_streak} known item(s) - stopping discovery")
+                        self.stats.stopped_early = True
+                        return
+                    continue
+                known_streak = 0
+
+                # Blocks while the fetch stage is saturated (back-pressure)
+                self.fetch_queue.put(item)
+                queued += 1
+                if self.max_items and queued >= self.max_items:
+                    self.logger.info(f"[{self.name}] reached item limit ({self.max_items}) - stopping discovery")
+                    self.stats.stopped_early = True
+                    return
+        finally:
+            close = getattr(iterator, 'close', None)
+            if close:
+                close()
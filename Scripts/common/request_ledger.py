@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Cross-process request budget per host
+
+Some hosts grant a fixed request budget (RBNZ: 292 requests/hour for our
+agent) that is shared by every scraper hitting them. An in-process sliding
+window forgets its history when the process exits, so back-to-back jobs each
+assumed a full budget; it also slept a fixed delay before every request even
+when far below the limit.
+
+``RequestLedger`` keeps the window in a small SQLite database that all
+processes share. Each host has a ring buffer with one slot per allowed
+request: the slot the next request would overwrite holds the timestamp of
+the request made ``limit`` requests ago, so "is the budget exhausted?" is a
+single-row lookup. A request only waits when that timestamp is still inside
+the window (or to keep an optional minimum spacing):
+
+    ledger = RequestLedger()
+    ledger.acquire('www.rbnz.govt.nz', limit=233, window=3600, min_interval=1.0)
+    response = session.get(url)
+
+Transactions use ``BEGIN IMMEDIATE`` so concurrent processes serialise on
+the ledger instead of racing for the same slot.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+LEDGER_ENV_VAR = 'SCRAPER_REQUEST_LEDGER'
+DEFAULT_LEDGER_PATH = Path(__file__).resolve().parent.parent / 'state' / 'request_ledger.sqlite3'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS hosts (
+    host TEXT PRIMARY KEY,
+    capacity INTEGER NOT NULL,
+    head INTEGER NOT NULL DEFAULT 0,
+    last_request REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS slots (
+    host TEXT NOT NULL,
+    slot INTEGER NOT NULL,
+    ts REAL NOT NULL,
+    PRIMARY KEY (host, slot)
+) WITHOUT ROWID;
+"""
+
+
+class RequestLedger:
+    """Per-host request budget shared by all processes through SQLite"""
+
+    def __init__(self, path: Optional[Union[str, Path]] = None,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            path: ledger database (default Scripts/state/request_ledger.sqlite3,
+                or $SCRAPER_REQUEST_LEDGER)
+        """
+        self.path = Path(path or os.environ.get(LEDGER_ENV_VAR) or DEFAULT_LEDGER_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=60, isolation_level=None,
+                                     check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _try_acquire(self, host: str, limit: int, window: float, min_interval: float) -> float:
+        """Record a request and return 0, or return how long to wait"""
+        conn = self._conn
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT capacity, head, last_request FROM hosts WHERE host = ?",
+                               (host,)).fetchone()
+            if row is None or row[0] != limit:
+                # New host or a changed limit: start a fresh ring
+                conn.execute("DELETE FROM slots WHERE host = ?", (host,))
+                conn.execute("INSERT OR REPLACE INTO hosts (host, capacity, head, last_request) "
+                             "VALUES (?, ?, 0, ?)", (host, limit, row[2] if row else 0))
+                head, last_request = 0, (row[2] if row else 0)
+            else:
+                _, head, last_request = row
+
+            wait = last_request + min_interval - now
+            slot = head % limit
+            oldest = conn.execute("SELECT ts FROM slots WHERE host = ? AND slot = ?",
+                                  (host, slot)).fetchone()
+            if oldest is not None:
+                wait = max(wait, oldest[0] + window - now)
+            if wait > 0:
+                conn.execute("ROLLBACK")
+                return wait
+
+            conn.execute("INSERT OR REPLACE INTO slots (host, slot, ts) VALUES (?, ?, ?)",
+                         (host, slot, now))
+            conn.execute("UPDATE hosts SET head = ?, last_request = ? WHERE host = ?",
+                         (head + 1, now, host))
+            conn.execute("COMMIT")
+            return 0.0
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def acquire(self, host: str, limit: int, window: float = 3600.0,
+                min_interval: float = 0.0) -> float:
+        """Block until a request to ``host`` fits the budget, record it, and return the seconds waited"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                wait = self._try_acquire(host, limit, window, min_interval)
+            if wait <= 0:
+                return waited
+            if wait > 5:
+                self.logger.warning(f"Request budget for {host} exhausted ({limit} per {window:.0f}s); "
+                                    f"waiting {wait:.1f} seconds...")
+            time.sleep(wait)
+            waited += wait
+
+    def usage(self, host: str, window: float = 3600.0) -> int:
+        """Requests to ``host`` recorded (by any process) within the window"""
+        with self._lock:
+            row = self._conn.execute("SELECT COUNT(*) FROM slots WHERE host = ? AND ts > ?",
+                                     (host, time.time() - window)).fetchone()
+        return row[0]
+
+    def last_request(self, host: str) -> Optional[float]:
+        with self._lock:
+            row = self._conn.execute("SELECT last_request FROM hosts WHERE host = ?", (host,)).fetchone()
+        return row[0] if row and row[0] else None
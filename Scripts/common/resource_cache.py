@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Persisted cache of extracted linked resources shared by related scrapers
+
+Releases link to the same statements, FAQs, meeting pages and attachments:
+a rate decision links the implementation note that the next three releases
+link again, and scrapers of the same site (press releases, enforcement
+actions, SR letters) all follow links to the same Board pages. Each scraper
+fetched and re-extracted every one of them per release.
+
+``ResourceCache`` stores the extracted result of a linked URL (any JSON
+value, including None for "fetched, nothing usable") in SQLite, shared by
+every scraper and run pointing at the same file. Entries expire after
+``max_age`` (a day by default), so a page shared by several releases and
+scrapers is fetched once per nightly run:
+
+    cache = ResourceCache(OUTPUT_DIR / "cache" / "linked_resources.sqlite3")
+    hits = cache.get_many(urls)              # fresh entries only
+    for url in urls:
+        if url not in hits:
+            cache.put(url, extract(url))
+
+Transient failures should not be stored, so they are retried next time.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Union
+
+DEFAULT_MAX_AGE = 20 * 3600  # seconds; shorter than a day so each nightly run refreshes
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS resources (
+    url TEXT PRIMARY KEY,
+    value TEXT,
+    fetched_at REAL NOT NULL
+);
+"""
+
+
+class ResourceCache:
+    """URL -> extracted value, persisted in SQLite with a maximum age"""
+
+    def __init__(self, path: Union[str, Path], max_age: float = DEFAULT_MAX_AGE,
+                 logger: Optional[logging.Logger] = None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_age = max_age
+        self.logger = logger or logging.getLogger(__name__)
+        self.stats = {'hits': 0, 'misses': 0}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=60, isolation_level=None,
+                                     check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def get_many(self, urls: Iterable[str]) -> Dict[str, Any]:
+        """Fresh cached values for the given URLs (missing or expired URLs are left out)"""
+        urls = list(dict.fromkeys(urls))
+        found: Dict[str, Any] = {}
+        cutoff = time.time() - self.max_age
+        with self._lock:
+            for start in range(0, len(urls), 500):
+                batch = urls[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT url, value FROM resources WHERE fetched_at >= ? "
+                    f"AND url IN ({', '.join('?' * len(batch))})", [cutoff] + batch).fetchall()
+                for url, value in rows:
+                    found[url] = json.loads(value) if value is not None else None
+            self.stats['hits'] += len(found)
+            self.stats['misses'] += len(urls) - len(found)
+        return found
+
+    def put(self, url: str, value: Any):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO resources (url, value, fetched_at) VALUES (?, ?, ?)",
+                               (url, None if value is None else json.dumps(value, ensure_ascii=False),
+                                time.time()))
+
+    def get_or_fetch(self, url: str, fetch: Callable[[str], Any]) -> Any:
+        """Cached value of ``url``, or ``fetch(url)`` stored when it is not None"""
+        found = self.get_many([url])
+        if url in found:
+            return found[url]
+        value = fetch(url)
+        if value is not None:
+            self.put(url, value)
+        return value
+
+    def prune(self):
+        """Drop expired entries"""
+        with self._lock:
+            removed = self._conn.execute("DELETE FROM resources WHERE fetched_at < ?",
+                                         (time.time() - self.max_age,)).rowcount
+        if removed:
+            self.logger.info(f"Pruned {removed} expired entries from {self.path.name}")
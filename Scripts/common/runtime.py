@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+"""
+Regulator plugin API and the shared scraper runtime
+
+Most scrapers re-implement the same machinery: a requests session with
+retries and browser headers, polite delays, loading the existing output for
+deduplication, PDF/spreadsheet extraction and the final JSON save. A
+regulator written as a ``RegulatorPlugin`` only declares what is specific to
+its site:
+
+  * ``listing_urls``   the listing pages to walk
+  * ``parse_listing``  listing page -> item URLs (or ``ListingItem``s)
+  * ``parse_item``     item page -> record dict
+  * ``map_fields``     optional final field mapping / clean-up
+
+and ``ScraperRuntime`` owns everything else: fetching (thread-local
+sessions, retries, per-host spacing, a per-run page cache), concurrency (the
+discover/fetch/persist ``Pipeline``), document extraction (loaded only when
+a plugin first asks for it) and persistence (known-item skipping, an append
+log during the run and one atomic compaction at the end). Improvements made
+here apply to every ported regulator at once.
+
+    class AmsaNews(RegulatorPlugin):
+        name = "amsa_news"
+        base_url = "https://www.amsa.gov.au"
+        output_file = "amsa_news.json"
+        ...
+
+    if __name__ == "__main__":
+        run_plugin(AmsaNews())
+"""
+
+import argparse
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urljoin, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .append_log import AppendLog
+from .pipeline import Pipeline, PipelineStats
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+DEFAULT_HEADERS = {
+    'User-Agent': DEFAULT_USER_AGENT,
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+
+@dataclass
+class ListingItem:
+    """One item found on a listing page, with anything the listing already told us"""
+    url: str
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class Page:
+    """A fetched page; ``soup`` is parsed on first use and kept"""
+    url: str
+    status_code: int
+    content: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+    _soup: Any = field(default=None, repr=False)
+
+    @property
+    def content_type(self) -> str:
+        return self.headers.get('Content-Type', self.headers.get('content-type', '')).lower()
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8', errors='replace')
+
+    @property
+    def soup(self):
+        if self._soup is None:
+            from bs4 import BeautifulSoup
+            self._soup = BeautifulSoup(self.content, 'html.parser')
+        return self._soup
+
+
+class RegulatorPlugin:
+    """Site-specific part of a scraper; subclass and override the parse hooks"""
+
+    name: str = ''                     # used for logs and the run log file
+    base_url: str = ''
+    output_file: str = ''              # under the data directory
+    id_field: str = 'url'
+    max_pages: int = 2
+    warmup_url: Optional[str] = None   # fetched once to collect cookies
+    headers: Dict[str, str] = {}
+
+    # Runtime tuning
+    fetch_workers: int = 4
+    request_delay: float = 0.5         # minimum spacing between requests to one host
+    timeout: float = 30
+    stop_after_known: Optional[int] = None  # None: skip known items but keep walking the listing
+    dump_kwargs: Dict[str, Any] = {'indent': 2}
+    token_count_fields: Tuple[str, ...] = ()  # fields summed into a 'token_count' (empty: none)
+    chunk_fields: Tuple[str, ...] = ()        # fields chunked to data/chunks with --chunks (empty: none)
+
+    # ------------------------------------------------------------------
+    # Discovery and parsing (override these)
+    # ------------------------------------------------------------------
+
+    def listing_urls(self) -> Iterable[str]:
+        """Listing pages in order; the runtime stops at the first page with no items"""
+        raise NotImplementedError
+
+    def parse_listing(self, page: Page) -> Iterable[Union[str, ListingItem]]:
+        """Item URLs (relative URLs are resolved against the page) found on a listing page"""
+        raise NotImplementedError
+
+    def parse_item(self, item: ListingItem, page: Page, runtime: 'ScraperRuntime') -> Optional[Dict[str, Any]]:
+        """Build the record for one item page; return None to drop it"""
+        raise NotImplementedError
+
+    def map_fields(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Final field mapping applied to every record before it is stored"""
+        return record
+
+    # ------------------------------------------------------------------
+    # Output format (override for wrapped documents)
+    # ------------------------------------------------------------------
+
+    def load_records(self, data: Any) -> List[Dict[str, Any]]:
+        """Records from the published output file"""
+        if isinstance(data, list):
+            return data
+        for key in ('articles', 'items', 'records'):
+            if isinstance(data, dict) and isinstance(data.get(key), list):
+                return data[key]
+        return []
+
+    def build_output(self, records: List[Dict[str, Any]]) -> Any:
+        """The published document for the full record list"""
+        return records
+
+
+@dataclass
+class RunStats:
+    existing: int = 0
+    recovered: int = 0
+    new: int = 0
+    listing_pages: int = 0
+    pipeline: Optional[PipelineStats] = None
+
+
+class ScraperRuntime:
+    """Fetching, concurrency, extraction and persistence shared by all plugins"""
+
+    def __init__(self, plugin: RegulatorPlugin,
+                 data_dir: Union[str, Path] = 'data',
+                 max_pages: Optional[int] = None,
+                 write_chunks: bool = False,
+                 logger: Optional[logging.Logger] = None):
+        self.plugin = plugin
+        self.data_dir = Path(data_dir)
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.output_path = self.data_dir / plugin.output_file
+        self.max_pages = max_pages if max_pages is not None else plugin.max_pages
+        self.logger = logger or logging.getLogger(plugin.name or __name__)
+
+        self.headers = dict(DEFAULT_HEADERS)
+        self.headers.update(plugin.headers)
+        self._cookies: Dict[str, str] = {}
+        self._local = threading.local()
+
+        self._host_lock = threading.Lock()
+        self._host_next: Dict[str, float] = {}
+        self._page_cache: Dict[str, Page] = {}
+        self._cache_lock = threading.Lock()
+
+        self._pdf_extract = None
+        self._tabular = None
+
+        self.records: Dict[str, Dict[str, Any]] = {}
+        # Listing URL -> record id, so known items are skipped whatever the plugin's id_field
+        self._ids_by_url: Dict[str, str] = {}
+        self.journal = AppendLog(self.data_dir / 'journal' / f"{self.output_path.stem}.jsonl",
+                                 key_field=plugin.id_field, logger=self.logger)
+        self.stats = RunStats()
+
+        # Records stored this run, chunked at save time when chunks are enabled
+        self.write_chunks = write_chunks and bool(plugin.chunk_fields)
+        self._unchunked: List[Dict[str, Any]] = []
+        # ...and added to the shared search index at save time
+        self._unindexed: List[Dict[str, Any]] = []
+
+    # ------------------------------------------------------------------
+    # Fetching
+    # ------------------------------------------------------------------
+
+    def _new_session(self) -> requests.Session:
+        session = requests.Session()
+        retry = Retry(total=3, backoff_factor=1,
+                      status_forcelist=[429, 500, 502, 503, 504],
+                      allowed_methods=["HEAD", "GET", "OPTIONS"])
+        adapter = HTTPAdapter(max_retries=retry, pool_connections=4, pool_maxsize=4)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update(self.headers)
+        session.cookies.update(self._cookies)
+        return session
+
+    @property
+    def session(self) -> requests.Session:
+        """This thread's session (requests sessions are not safe to share across threads)"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = self._new_session()
+        return session
+
+    def warm_up(self):
+        if not self.plugin.warmup_url:
+            return
+        try:
+            self.session.get(self.plugin.warmup_url, timeout=10)
+            self._cookies = self.session.cookies.get_dict()
+            self.logger.info("Session initialized and cookies gathered.")
+        except requests.exceptions.RequestException as e:
+            self.logger.error(f"Failed to initialize session: {e}")
+
+    def _wait_for_host(self, url: str):
+        if self.plugin.request_delay <= 0:
+            return
+        host = urlparse(url).netloc
+        with self._host_lock:
+            now = time.monotonic()
+            start = max(now, self._host_next.get(host, now))
+            self._host_next[host] = start + self.plugin.request_delay
+        if start > now:
+            time.sleep(start - now)
+
+    def get(self, url: str, cache: bool = True, timeout: Optional[float] = None) -> Optional[Page]:
+        """GET a URL (served from the per-run cache when already fetched); None on failure"""
+        if cache:
+            with self._cache_lock:
+                cached = self._page_cache.get(url)
+            if cached is not None:
+                return cached
+
+        self._wait_for_host(url)
+        try:
+            response = self.session.get(url, timeout=timeout or self.plugin.timeout)
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            self.logger.error(f"Failed to fetch {url}: {e}")
+            return None
+
+        page = Page(url=response.url, status_code=response.status_code,
+                    content=response.content, headers=dict(response.headers))
+        if cache:
+            with self._cache_lock:
+                self._page_cache[url] = page
+        return page
+
+    # ------------------------------------------------------------------
+    # Extraction (extractor modules are imported on first use)
+    # ------------------------------------------------------------------
+
+    def pdf_text(self, url: str, max_pages: Optional[int] = None) -> Optional[str]:
+        """Text of a linked PDF, or None if it could not be fetched or read"""
+        if self._pdf_extract is None:
+            from . import pdf_extract
+            self._pdf_extract = pdf_extract
+        if not self._pdf_extract.is_available():
+            self.logger.warning("No PDF library installed (pip install pymupdf) - skipping PDF content")
+            return None
+
+        page = self.get(url, cache=False, timeout=max(self.plugin.timeout, 60))
+        if page is None or not page.content:
+            return None
+        try:
+            content = self._pdf_extract.extract_pdf(page.content, tables=False, max_pages=max_pages, source=url)
+            return content.text('\n')
+        except Exception as e:
+            self.logger.error(f"Failed to process PDF {url}: {e}")
+            return None
+
+    def spreadsheet_text(self, url: str) -> Optional[str]:
+        """Column-typed summary of a linked Excel/CSV file"""
+        if self._tabular is None:
+            from .tabular import TabularExtractor
+            self._tabular = TabularExtractor(cache_dir=self.data_dir / 'cache' / 'tabular', logger=self.logger)
+        page = self.get(url, cache=False, timeout=max(self.plugin.timeout, 60))
+        if page is None or not page.content:
+            return None
+        try:
+            return self._tabular.extract_text(page.content, Path(urlparse(url).path).name) or None
+        except Exception as e:
+            self.logger.error(f"Failed to process spreadsheet {url}: {e}")
+            return None
+
+    def document_text(self, url: str) -> Optional[str]:
+        """Text of a linked HTML or EPUB document"""
+        from .documents import document_to_text
+        page = self.get(url, cache=False)
+        if page is None:
+            return None
+        return document_to_text(page.content, page.content_type, url)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def load_existing(self):
+        if self.output_path.exists():
+            try:
+                with open(self.output_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                for record in self.plugin.load_records(data):
+                    if isinstance(record, dict) and record.get(self.plugin.id_field):
+                        self._remember(record)
+                self.logger.info(f"Loaded {len(self.records)} existing records.")
+            except (ValueError, OSError) as e:
+                self.logger.warning(f"Could not read existing data file ({e}). Starting fresh.")
+        self.stats.existing = len(self.records)
+
+        # Records logged by a run that died before compacting
+        for record in self.journal.recover():
+            self._remember(record)
+            self.stats.recovered += 1
+            self._unindexed.append(record)
+            if self.write_chunks:
+                self._unchunked.append(record)
+
+    def _remember(self, record: Dict[str, Any]):
+        record_id = record[self.plugin.id_field]
+        self.records[record_id] = record
+        if record.get('url'):
+            self._ids_by_url[record['url']] = record_id
+
+    def _is_known(self, item: ListingItem) -> bool:
+        return item.url in self._ids_by_url or item.url in self.records
+
+    def _count_tokens(self, batch: List[Dict[str, Any]]):
+        from .tokens import shared_counter
+        texts = [''.join(str(record.get(name) or '') for name in self.plugin.token_count_fields)
+                 for record in batch]
+        for record, count in zip(batch, shared_counter().count_many(texts)):
+            record['token_count'] = count
+
+    def _persist(self, batch: List[Dict[str, Any]]):
+        if self.plugin.token_count_fields:
+            self._count_tokens(batch)
+        from .near_duplicates import flag_near_duplicates
+        flag_near_duplicates(batch, self.output_path, logger=self.logger)
+        self.journal.append(batch)
+        for record in batch:
+            self._remember(record)
+        self.stats.new += len(batch)
+        self._unindexed.extend(batch)
+        if self.write_chunks:
+            self._unchunked.extend(batch)
+
+    def save(self):
+        records = list(self.records.values())
+        self.journal.compact(self.output_path, self.plugin.build_output(records), **self.plugin.dump_kwargs)
+        self.logger.info(f"Successfully saved {len(records)} total records to {self.output_path}")
+        if self._unindexed:
+            from .search_index import index_records
+            index_records(self._unindexed, self.output_path, logger=self.logger)
+            self._unindexed = []
+        if self._unchunked:
+            self.save_chunks()
+
+    def save_chunks(self):
+        from .chunker import ChunkWriter
+        writer = ChunkWriter(self.data_dir / 'chunks', self.output_path.stem,
+                             text_fields=self.plugin.chunk_fields, id_field=self.plugin.id_field,
+                             logger=self.logger)
+        try:
+            writer.update(self._unchunked)
+            writer.close()
+            self._unchunked = []
+        except Exception as e:
+            self.logger.error(f"Failed to write chunks: {e}")
+
+    # ------------------------------------------------------------------
+    # Run
+    # ------------------------------------------------------------------
+
+    def _discover(self) -> Iterator[ListingItem]:
+        seen = set()
+        for page_number, listing_url in enumerate(self.plugin.listing_urls(), 1):
+            if self.max_pages and page_number > self.max_pages:
+                break
+            self.logger.info(f"Scraping listing page: {listing_url}")
+            page = self.get(listing_url, cache=False)
+            if page is None:
+                break
+            self.stats.listing_pages += 1
+
+            items = []
+            for item in self.plugin.parse_listing(page):
+                if isinstance(item, str):
+                    item = ListingItem(url=item)
+                item.url = urljoin(page.url, item.url)
+                if item.url not in seen:
+                    seen.add(item.url)
+                    items.append(item)
+            if not items:
+                self.logger.warning(f"No items found on listing page {page_number}. Last page reached.")
+                break
+            yield from items
+
+    def _fetch_item(self, item: ListingItem) -> Optional[Dict[str, Any]]:
+        page = self.get(item.url, cache=False)
+        if page is None:
+            return None
+        try:
+            record = self.plugin.parse_item(item, page, self)
+        except Exception as e:
+            self.logger.error(f"An error occurred while scraping {item.url}: {e}", exc_info=True)
+            return None
+        if not record:
+            return None
+        record = self.plugin.map_fields(record)
+        record.setdefault(self.plugin.id_field, item.url)
+        self._ids_by_url[item.url] = record[self.plugin.id_field]
+        return record
+
+    def run(self) -> RunStats:
+        """Discover, fetch and parse new items concurrently, then compact the output once"""
+        self.load_existing()
+        self.warm_up()
+
+        pipeline = Pipeline(
+            discover=self._discover(),
+            fetch=self._fetch_item,
+            persist=self._persist,
+            is_known=self._is_known,
+            stop_after_known=self.plugin.stop_after_known,
+            fetch_workers=self.plugin.fetch_workers,
+            persist_batch_size=10,
+            name=self.plugin.name or 'plugin',
+            logger=self.logger,
+        )
+        try:
+            self.stats.pipeline = pipeline.run()
+        finally:
+            if self.stats.new or self.stats.recovered or not self.output_path.exists():
+                self.save()
+
+        self.logger.info(f"Scraping complete. Found {self.stats.new} new records "
+                         f"({self.stats.existing} existing, {self.stats.recovered} recovered).")
+        return self.stats
+
+
+def run_plugin(plugin: RegulatorPlugin, argv: Optional[List[str]] = None,
+               data_dir: Union[str, Path] = 'data',
+               logger: Optional[logging.Logger] = None) -> RunStats:
+    """Command-line entry point for a plugin script"""
+    parser = argparse.ArgumentParser(description=f"{plugin.name or 'Regulator'} scraper")
+    parser.add_argument('--max-pages', type=int, default=None,
+                        help=f"listing pages to walk (default {plugin.max_pages})")
+    parser.add_argument('--chunks', action='store_true',
+                        help="also write token-bounded chunks of new records (or SCRAPER_CHUNKS=1)")
+    args = parser.parse_args(argv)
+    from .chunker import chunks_requested
+    return ScraperRuntime(plugin, data_dir=data_dir, max_pages=args.max_pages,
+                          write_chunks=args.chunks or chunks_requested([]),
+                          logger=logger).run()
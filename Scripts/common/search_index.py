@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Full-text search over the scraped corpus (SQLite FTS5)
+
+Finding "every APRA, RBNZ and MAS item mentioning climate stress testing
+since 2024" meant grepping each regulator's JSON output. ``SearchIndex``
+keeps one SQLite database with an FTS5 index over title and content plus a
+metadata table for filtering:
+
+    documents       doc_key (regulator/source/record_id), url, title, type,
+                    published_date (ISO), scraped_date, content_hash
+    documents_fts   title, content (porter-stemmed, unicode61)
+
+Records are mapped onto those columns exactly as in the corpus snapshot, so
+the ``record_id`` is the id the scraper already computes (``hash_id``,
+``content_hash``, ``identifier``, ...). Updates are incremental: a record
+whose indexed text and metadata hash is unchanged is skipped, a changed one
+replaces its previous entry, so a nightly run only touches its new items.
+
+Scrapers call ``index_records(new_records, JSON_PATH)`` when they save;
+``SCRAPER_SEARCH_INDEX`` overrides the database path (default
+Scripts/state/search_index.sqlite3), or disables indexing with ``off``.
+Existing outputs are backfilled, and the index queried, from the CLI:
+
+    python -m common.search_index index
+    python -m common.search_index search "climate stress testing" \\
+        --regulator APRA RBNZ SIN_MAS --since 2024-01-01
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from .corpus_snapshot import SCRIPTS_ROOT, discover_sources, iter_source_records, normalise_record
+
+SEARCH_INDEX_ENV_VAR = 'SCRAPER_SEARCH_INDEX'
+DEFAULT_INDEX_PATH = SCRIPTS_ROOT / 'state' / 'search_index.sqlite3'
+DISABLED_VALUES = ('0', 'off', 'false', 'no')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    doc_key TEXT NOT NULL UNIQUE,
+    regulator TEXT NOT NULL,
+    source TEXT NOT NULL,
+    record_id TEXT NOT NULL,
+    url TEXT,
+    title TEXT,
+    type TEXT,
+    published_date TEXT,
+    scraped_date TEXT,
+    content_hash TEXT NOT NULL,
+    indexed_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS documents_regulator_date ON documents (regulator, published_date);
+CREATE TABLE IF NOT EXISTS sources (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    indexed_at TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(title, content, tokenize='porter unicode61');
+"""
+
+
+def search_index_disabled() -> bool:
+    return os.environ.get(SEARCH_INDEX_ENV_VAR, '').strip().lower() in DISABLED_VALUES
+
+
+def source_of(output_path: Union[str, Path]):
+    """(regulator, source) for an output file: Scripts/<REGULATOR>/data/<source>.json"""
+    path = Path(output_path).resolve()
+    source = path.stem[:-len('.manifest')] if path.stem.endswith('.manifest') else path.stem
+    return path.parent.parent.name, source
+
+
+class SearchIndex:
+    """Incrementally updated FTS5 index of scraped records with metadata filters"""
+
+    def __init__(self, path: Optional[Union[str, Path]] = None,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            path: index database (default Scripts/state/search_index.sqlite3,
+                or $SCRAPER_SEARCH_INDEX)
+        """
+        env_path = os.environ.get(SEARCH_INDEX_ENV_VAR, '').strip()
+        if env_path.lower() in DISABLED_VALUES:
+            env_path = ''
+        self.path = Path(path or env_path or DEFAULT_INDEX_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=60, isolation_level=None,
+                                     check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def update(self, records: Iterable[Dict[str, Any]], regulator: str, source: str) -> Dict[str, int]:
+        """Index new/changed records of one source; returns {'indexed': n, 'unchanged': n}"""
+        counts = {'indexed': 0, 'unchanged': 0}
+        now = datetime.now().isoformat()
+        rows = [normalise_record(record, regulator, source) for record in records if isinstance(record, dict)]
+        if not rows:
+            return counts
+
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for row in rows:
+                    published = row['published_date'].isoformat() if row['published_date'] else None
+                    digest = hashlib.sha1('\x00'.join(
+                        (row['title'], row['type'], published or '', row['url'], row['content'])
+                    ).encode('utf-8', errors='replace')).hexdigest()
+                    doc_key = f"{regulator}/{source}/{row['record_id']}"
+
+                    existing = conn.execute("SELECT id, content_hash FROM documents WHERE doc_key = ?",
+                                            (doc_key,)).fetchone()
+                    if existing and existing['content_hash'] == digest:
+                        counts['unchanged'] += 1
+                        continue
+                    values = (regulator, source, row['record_id'], row['url'], row['title'], row['type'],
+                              published, row['scraped_date'], digest, now)
+                    if existing:
+                        doc_id = existing['id']
+                        conn.execute("UPDATE documents SET regulator = ?, source = ?, record_id = ?, url = ?, "
+                                     "title = ?, type = ?, published_date = ?, scraped_date = ?, "
+                                     "content_hash = ?, indexed_at = ? WHERE id = ?", values + (doc_id,))
+                        conn.execute("DELETE FROM documents_fts WHERE rowid = ?", (doc_id,))
+                    else:
+                        doc_id = conn.execute(
+                            "INSERT INTO documents (regulator, source, record_id, url, title, type, "
+                            "published_date, scraped_date, content_hash, indexed_at, doc_key) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", values + (doc_key,)).lastrowid
+                    conn.execute("INSERT INTO documents_fts (rowid, title, content) VALUES (?, ?, ?)",
+                                 (doc_id, row['title'], row['content']))
+                    counts['indexed'] += 1
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return counts
+
+    def index_corpus(self, scripts_root: Union[str, Path] = SCRIPTS_ROOT, force: bool = False) -> Dict[str, int]:
+        """Backfill from every Scripts/*/data output, skipping files unchanged since their last pass"""
+        totals = {'sources': 0, 'skipped': 0, 'indexed': 0, 'unchanged': 0, 'failed': 0}
+        for name, path in discover_sources(Path(scripts_root)).items():
+            totals['sources'] += 1
+            stat = path.stat()
+            with self._lock:
+                seen = self._conn.execute("SELECT size, mtime_ns FROM sources WHERE path = ?",
+                                          (str(path),)).fetchone()
+            if not force and seen and (seen['size'], seen['mtime_ns']) == (stat.st_size, stat.st_mtime_ns):
+                totals['skipped'] += 1
+                continue
+            regulator, source = source_of(path)
+            try:
+                counts = self.update(iter_source_records(path), regulator, source)
+            except Exception as e:
+                self.logger.warning(f"Could not index {name}: {e}")
+                totals['failed'] += 1
+                continue
+            totals['indexed'] += counts['indexed']
+            totals['unchanged'] += counts['unchanged']
+            with self._lock:
+                self._conn.execute("INSERT OR REPLACE INTO sources (path, size, mtime_ns, indexed_at) "
+                                   "VALUES (?, ?, ?, ?)",
+                                   (str(path), stat.st_size, stat.st_mtime_ns, datetime.now().isoformat()))
+            if counts['indexed']:
+                self.logger.info(f"Indexed {counts['indexed']} records from {name}")
+        return totals
+
+    def optimize(self):
+        """Merge FTS segments (worth running after a large backfill)"""
+        with self._lock:
+            self._conn.execute("INSERT INTO documents_fts (documents_fts) VALUES ('optimize')")
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def search(self, query: str,
+               regulators: Optional[Iterable[str]] = None,
+               types: Optional[Iterable[str]] = None,
+               since: Optional[date] = None, until: Optional[date] = None,
+               limit: int = 20) -> List[Dict[str, Any]]:
+        """Best-matching records (bm25) with a highlighted snippet, newest first among equals"""
+        clauses, params = ["documents_fts MATCH ?"], [query]
+        if regulators:
+            regulators = list(regulators)
+            clauses.append(f"d.regulator IN ({', '.join('?' * len(regulators))})")
+            params.extend(regulators)
+        if types:
+            types = list(types)
+            clauses.append(f"d.type IN ({', '.join('?' * len(types))})")
+            params.extend(types)
+        if since:
+            clauses.append("d.published_date >= ?")
+            params.append(since.isoformat())
+        if until:
+            clauses.append("d.published_date <= ?")
+            params.append(until.isoformat())
+        sql = ("SELECT d.regulator, d.source, d.record_id, d.url, d.title, d.type, d.published_date, "
+               "snippet(documents_fts, 1, '[', ']', ' ... ', 16) AS snippet, "
+               "bm25(documents_fts, 4.0, 1.0) AS score "
+               "FROM documents_fts JOIN documents d ON d.id = documents_fts.rowid "
+               f"WHERE {' AND '.join(clauses)} "
+               "ORDER BY score, d.published_date DESC LIMIT ?")
+        params.append(limit)
+
+        with self._lock:
+            try:
+                rows = self._conn.execute(sql, params).fetchall()
+            except sqlite3.OperationalError:
+                # Not valid FTS5 syntax (e.g. 'climate-related'): search the words as plain terms
+                params[0] = ' '.join('"' + term.replace('"', '""') + '"' for term in query.split())
+                rows = self._conn.execute(sql, params).fetchall()
+        return [dict(row) for row in rows]
+
+
+def index_records(records: Iterable[Dict[str, Any]], output_path: Union[str, Path],
+                  logger: Optional[logging.Logger] = None) -> int:
+    """Add a scraper's new/changed records to the shared search index; never raises"""
+    if search_index_disabled():
+        return 0
+    logger = logger or logging.getLogger(__name__)
+    try:
+        regulator, source = source_of(output_path)
+        index = SearchIndex(logger=logger)
+        try:
+            counts = index.update(records, regulator, source)
+        finally:
+            index.close()
+        if counts['indexed']:
+            logger.info(f"Search index: {counts['indexed']} records indexed ({regulator}/{source})")
+        return counts['indexed']
+    except Exception as e:
+        logger.warning(f"Could not update search index: {e}")
+        return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Full-text search over the scraped corpus")
+    parser.add_argument('--index-path', help='index database (default Scripts/state/search_index.sqlite3)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    index = commands.add_parser('index', help='index new/changed records from Scripts/*/data')
+    index.add_argument('--force', action='store_true', help='re-read every output file')
+
+    search = commands.add_parser('search', help='query the index')
+    search.add_argument('query', help='FTS5 query, e.g. climate "stress test*"')
+    search.add_argument('--regulator', nargs='+', help='regulator folders, e.g. APRA RBNZ SIN_MAS')
+    search.add_argument('--type', nargs='+')
+    search.add_argument('--since', type=lambda value: datetime.strptime(value, '%Y-%m-%d').date())
+    search.add_argument('--until', type=lambda value: datetime.strptime(value, '%Y-%m-%d').date())
+    search.add_argument('--limit', type=int, default=20)
+    search.add_argument('--json', action='store_true', help='print results as JSON lines')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    search_index = SearchIndex(args.index_path)
+    try:
+        if args.command == 'index':
+            totals = search_index.index_corpus(force=args.force)
+            if totals['indexed']:
+                search_index.optimize()
+            print(f"{totals['sources']} sources ({totals['skipped']} unchanged files), "
+                  f"{totals['indexed']} records indexed, {len(search_index)} in index")
+            return
+
+        results = search_index.search(args.query, regulators=args.regulator, types=args.type,
+                                      since=args.since, until=args.until, limit=args.limit)
+        for result in results:
+            if args.json:
+                print(json.dumps(result, ensure_ascii=False))
+                continue
+            print(f"{result['published_date'] or '----------'}  {result['regulator']:<14} "
+                  f"{result['type'][:20]:<20} {result['title']}")
+            print(f"    {result['url']}")
+            print(f"    {result['snippet']}\n")
+        if not args.json:
+            print(f"{len(results)} results")
+    finally:
+        search_index.close()
+
+
+if __name__ == "__main__":
+    main()
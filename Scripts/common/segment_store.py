@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Append-only segmented record store
+
+Replaces "load the whole JSON, merge, dump it all again" saves. Records are
+appended as JSON lines to segment files chosen by a key function (e.g. the
+registration month), an append-only index maps identifiers to segments, and
+a small manifest holds the totals. Saving N new records writes roughly N
+records' worth of bytes however large the store is.
+
+Layout under ``root``::
+
+    <name>.manifest.json          totals, last_scraped, per-segment counts
+    <name>/index.tsv              identifier<TAB>segment, one line per write
+    <name>/segments/<key>.jsonl   records, one JSON object per line
+
+A record written again (same identifier) is appended again; readers keep the
+last version, so ``load_combined`` reproduces the old single-file view.
+"""
+
+import json
+import logging
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Union
+
+MANIFEST_VERSION = 1
+
+
+class SegmentStore:
+    """Records appended to keyed JSONL segments with an identifier index and manifest"""
+
+    def __init__(self, root: Union[str, Path], name: str,
+                 segment_key: Callable[[Dict], str],
+                 id_field: str = 'identifier',
+                 metadata: Optional[Dict[str, Any]] = None,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            root: directory holding the manifest and the store's folder
+            name: store name (file/folder stem)
+            segment_key: record -> segment name (e.g. '2025-09')
+            id_field: record field holding the unique identifier
+            metadata: static fields written into the manifest metadata
+        """
+        self.root = Path(root)
+        self.name = name
+        self.segment_key = segment_key
+        self.id_field = id_field
+        self.static_metadata = dict(metadata or {})
+        self.logger = logger or logging.getLogger(__name__)
+
+        self.store_dir = self.root / name
+        self.segments_dir = self.store_dir / "segments"
+        self.index_path = self.store_dir / "index.tsv"
+        self.manifest_path = self.root / f"{name}.manifest.json"
+
+        self.segments_dir.mkdir(parents=True, exist_ok=True)
+        self.index: Dict[str, str] = self._load_index()
+        self.manifest: Dict[str, Any] = self._load_manifest()
+
+    # ------------------------------------------------------------------
+    # Index / manifest
+    # ------------------------------------------------------------------
+
+    def _load_index(self) -> Dict[str, str]:
+        index = {}
+        if self.index_path.exists():
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    identifier, _, segment = line.rstrip('\n').partition('\t')
+                    # A torn final line from an interrupted append has no segment
+                    if identifier and segment:
+                        index[identifier] = segment
+        return index
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        if self.manifest_path.exists():
+            try:
+                with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                self.logger.warning(f"Rebuilding unreadable manifest {self.manifest_path}: {e}")
+        return {'metadata': {}, 'segments': {}}
+
+    def _write_manifest(self):
+        self.manifest['metadata'].update(self.static_metadata)
+        self.manifest['metadata'].update({
+            'layout': 'segments',
+            'manifest_version': MANIFEST_VERSION,
+            'total_count': len(self.index),
+            'last_scraped': datetime.now().isoformat(),
+        })
+        temp_path = self.manifest_path.with_suffix('.json.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, self.manifest_path)
+
+    @staticmethod
+    def _safe_segment(key: str) -> str:
+        return re.sub(r'[^A-Za-z0-9_.-]', '_', key or 'undated')
+
+    @staticmethod
+    def _append_lines(path: Path, payload: bytes) -> int:
+        """Append newline-terminated lines and fsync; returns the file's size afterwards"""
+        with open(path, 'a+b') as f:
+            # Start on a fresh line if an interrupted append left a torn record
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    payload = b'\n' + payload
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+            return f.tell()
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def ids(self) -> Set[str]:
+        return set(self.index)
+
+    def __contains__(self, identifier: str) -> bool:
+        return identifier in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def append(self, records: Iterable[Dict]) -> int:
+        """Append records to their segments, then the index, then the manifest"""
+        by_segment: Dict[str, List[Dict]] = {}
+        for record in records:
+            by_segment.setdefault(self._safe_segment(self.segment_key(record)), []).append(record)
+        if not by_segment:
+            return 0
+
+        index_lines = []
+        written = 0
+        for segment, segment_records in by_segment.items():
+            lines = [json.dumps(record, ensure_ascii=False) + '\n' for record in segment_records]
+            size = self._append_lines(self.segments_dir / f"{segment}.jsonl", ''.join(lines).encode('utf-8'))
+
+            info = self.manifest['segments'].setdefault(segment, {'records': 0, 'bytes': 0})
+            info['file'] = f"{self.name}/segments/{segment}.jsonl"
+            info['records'] += len(segment_records)
+            info['bytes'] = size
+            for record in segment_records:
+                identifier = str(record[self.id_field])
+                self.index[identifier] = segment
+                index_lines.append(f"{identifier}\t{segment}\n")
+            written += len(segment_records)
+
+        # Segments are durable before the index points at them
+        self._append_lines(self.index_path, ''.join(index_lines).encode('utf-8'))
+        self._write_manifest()
+        return written
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def iter_records(self) -> Iterator[Dict]:
+        """Every stored record once (latest version), segment by segment"""
+        for segment_path in sorted(self.segments_dir.glob("*.jsonl")):
+            latest: Dict[str, Dict] = {}
+            with open(segment_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn final line from an interrupted append
+                        self.logger.warning(f"Skipping unreadable line in {segment_path.name}")
+                        continue
+                    latest[str(record.get(self.id_field))] = record
+            segment = segment_path.stem
+            for identifier, record in latest.items():
+                # A record re-filed under another segment is yielded from there
+                if self.index.get(identifier, segment) == segment:
+                    yield record
+
+    def load_combined(self) -> Dict[str, Any]:
+        """The pre-segment single-file view: {'metadata': ..., 'items': [...]}"""
+        items = list(self.iter_records())
+        metadata = dict(self.manifest.get('metadata', {}))
+        metadata['total_count'] = len(items)
+        return {'metadata': metadata, 'items': items}
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Persisted status index and re-check schedule for stateful items
+
+Consultations change after they are first scraped: an Open consultation
+closes, gains submissions or a summary document. Deciding whether to re-scrape
+one used to mean re-reading the whole output file and scanning it for the URL,
+for every URL, and re-fetching every Open item on every run.
+
+``StatusIndex`` keeps one small entry per URL (status, scraped date, content
+hash, closing date and the next due check), loaded once per run and consulted
+with a dict lookup. The schedule concentrates re-checks where a change is
+likely:
+
+  * Open, closing date far away     every ``open_far_days``
+  * Open, closing within a fortnight every ``open_near_days``
+  * Open, closing within 3 days, or
+    past its closing date           every run
+  * Open, closing date unknown      every run (the previous behaviour)
+  * anything else (Closed)          every ``stale_days``
+
+A scraper seeds the index from its output file the first time (one pass)
+and writes it atomically with ``save``.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple, Union
+
+INDEX_VERSION = 1
+DATE_FORMATS = ('%d %B %Y', '%d %b %Y', '%Y-%m-%d', '%d/%m/%Y')
+
+
+def parse_date(value: Optional[str]) -> Optional[datetime]:
+    """Parse '12 March 2025'-style (or ISO) dates; None if unparseable"""
+    if not value:
+        return None
+    value = value.strip()
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+
+def content_hash(record: Dict[str, Any], fields: Sequence[str]) -> str:
+    digest = hashlib.sha1()
+    for name in fields:
+        digest.update(b'\x00' + str(record.get(name) or '').encode('utf-8', errors='replace'))
+    return digest.hexdigest()
+
+
+class StatusIndex:
+    """URL -> status/hash/closing date entries with a closing-date-aware re-check schedule"""
+
+    def __init__(self, path: Union[str, Path],
+                 open_statuses: Iterable[str] = ('Open',),
+                 stale_days: int = 7,
+                 open_far_days: int = 7,
+                 open_near_days: int = 2,
+                 logger: Optional[logging.Logger] = None):
+        self.path = Path(path)
+        self.open_statuses = set(open_statuses)
+        self.stale_days = stale_days
+        self.open_far_days = open_far_days
+        self.open_near_days = open_near_days
+        self.logger = logger or logging.getLogger(__name__)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.loaded = self._load()
+        self._dirty = False
+
+    def _load(self) -> bool:
+        if not self.path.exists():
+            return False
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == INDEX_VERSION:
+                self.entries = data.get('entries', {})
+                return True
+        except Exception as e:
+            self.logger.warning(f"Rebuilding unreadable status index {self.path}: {e}")
+        return False
+
+    def save(self):
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_VERSION, 'updated': datetime.now().isoformat(),
+                       'entries': self.entries}, f, indent=1)
+        os.replace(temp_path, self.path)
+        self._dirty = False
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    # ------------------------------------------------------------------
+    # Schedule
+    # ------------------------------------------------------------------
+
+    def next_check(self, status: str, scraped: datetime, closing: Optional[datetime]) -> datetime:
+        if status not in self.open_statuses:
+            return scraped + timedelta(days=self.stale_days)
+        if closing is None:
+            return scraped
+        days_to_close = (closing - scraped).days
+        if days_to_close > 14:
+            # Never sleep past the closing date itself
+            return min(scraped + timedelta(days=self.open_far_days), closing)
+        if days_to_close > 3:
+            return min(scraped + timedelta(days=self.open_near_days), closing)
+        return scraped
+
+    def record(self, url: str, status: str, scraped_date: Optional[str] = None,
+               content_hash: str = '', closing_date: Optional[str] = None) -> Dict[str, Any]:
+        """Store the latest observation of an item and schedule its next check"""
+        scraped = parse_date(scraped_date) or datetime.now()
+        closing = parse_date(closing_date)
+        entry = {
+            'status': status,
+            'scraped_date': scraped.isoformat(),
+            'content_hash': content_hash,
+            'closing_date': closing.date().isoformat() if closing else None,
+            'next_check': self.next_check(status, scraped, closing).isoformat(),
+        }
+        self.entries[url] = entry
+        self._dirty = True
+        return entry
+
+    def due(self, url: str, now: Optional[datetime] = None,
+            force_open: bool = False) -> Tuple[bool, str]:
+        """(should re-scrape, reason) for a URL"""
+        entry = self.entries.get(url)
+        if entry is None:
+            return True, 'new'
+        if force_open and entry.get('status') in self.open_statuses:
+            return True, 'open (forced)'
+        now = now or datetime.now()
+        next_check = parse_date(entry.get('next_check'))
+        if next_check is None or now >= next_check:
+            if entry.get('status') in self.open_statuses:
+                closing = entry.get('closing_date')
+                return True, f"open, closing {closing}" if closing else 'open'
+            return True, f"last scraped {entry.get('scraped_date', '')[:10]}"
+        return False, f"next check {next_check.date().isoformat()}"
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Incremental CSV (and optional Parquet/Arrow) export of scraper output
+
+Scrapers mirror their JSON output into a CSV for analysts by rewriting the
+whole file on every save: every row is re-serialised (list columns through
+``json.dumps``, the full ``content`` text included) even when the run added
+three records to a file of thousands.
+
+``TableExport`` remembers a hash of every row it exported and, on the next
+save, only writes the delta:
+
+  * new rows are appended to the CSV;
+  * the CSV is rewritten (atomically) only when an exported row changed or
+    disappeared, the columns changed, or the file no longer matches what was
+    last written (edited or truncated by something else);
+  * with a columnar format enabled, new and changed rows are written to a
+    new part file, with large text fields stored once by content hash
+    instead of inline.
+
+Layout next to the CSV::
+
+    data/<name>.csv
+    data/tables/<name>.state.json                 row hashes, columns, CSV size
+    data/tables/<name>/part-<run>.parquet         delta rows of one export
+    data/tables/<name>/content/<ab>/<sha1>.txt    text fields stored by reference
+
+Part files hold ``<field>_ref``/``<field>_length`` in place of each content
+field; readers keep the last row per key (``read_columnar`` does this).
+Columnar output needs pyarrow and is enabled per scraper or with
+``SCRAPER_COLUMNAR=parquet`` (or ``arrow``):
+
+    TableExport(CSV_PATH, columns, key_field='url',
+                list_columns=('related_links', 'pdf_links')).export(records)
+"""
+
+import csv
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Union
+
+from .append_log import write_json_atomic
+from .lazy_import import is_installed, lazy_import
+
+pa = lazy_import('pyarrow', 'pip install pyarrow')
+pq = lazy_import('pyarrow.parquet', 'pip install pyarrow')
+feather = lazy_import('pyarrow.feather', 'pip install pyarrow')
+
+COLUMNAR_ENV_VAR = 'SCRAPER_COLUMNAR'
+STATE_VERSION = 1
+COLUMNAR_SUFFIXES = {'parquet': '.parquet', 'arrow': '.arrow'}
+
+
+def columnar_format(value: Optional[str] = None) -> Optional[str]:
+    """'parquet', 'arrow' or None, from ``value`` or $SCRAPER_COLUMNAR"""
+    value = (value if value is not None else os.environ.get(COLUMNAR_ENV_VAR, '')).strip().lower()
+    if value in ('', '0', 'false', 'no', 'none'):
+        return None
+    if value in ('arrow', 'feather', 'ipc'):
+        return 'arrow'
+    return 'parquet'
+
+
+def _row_hash(values: Sequence[str]) -> str:
+    return hashlib.sha1(json.dumps(values, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+class TableExport:
+    """Keeps a CSV (and optional columnar parts) in step with a record list by writing only the delta"""
+
+    def __init__(self, csv_path: Union[str, Path], columns: Sequence[str],
+                 key_field: str = 'url',
+                 list_columns: Sequence[str] = (),
+                 list_format: Callable[[Any], str] = json.dumps,
+                 encoding: str = 'utf-8',
+                 columnar: Optional[str] = None,
+                 content_fields: Sequence[str] = ('content',),
+                 logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            csv_path: CSV file to maintain
+            columns: CSV columns, in order (missing record fields export as '')
+            key_field: record field identifying a row
+            list_columns: columns whose list/dict values are passed through ``list_format``
+            encoding: CSV encoding (e.g. 'utf-8-sig' for Excel)
+            columnar: 'parquet' or 'arrow' to also write delta part files
+                (default: $SCRAPER_COLUMNAR)
+            content_fields: columns stored by reference in the columnar parts
+        """
+        self.csv_path = Path(csv_path)
+        self.columns = list(columns)
+        self.key_field = key_field
+        self.list_columns = set(list_columns)
+        self.list_format = list_format
+        self.encoding = encoding
+        self.content_fields = [name for name in content_fields if name in self.columns]
+        self.logger = logger or logging.getLogger(__name__)
+
+        self.columnar = columnar_format(columnar)
+        if self.columnar and not is_installed('pyarrow'):
+            self.logger.warning("pyarrow is not installed; skipping columnar export (pip install pyarrow)")
+            self.columnar = None
+
+        stem = self.csv_path.stem
+        self.table_dir = self.csv_path.parent / 'tables' / stem
+        self.state_path = self.csv_path.parent / 'tables' / f"{stem}.state.json"
+        self.state = self._load_state()
+
+    # ------------------------------------------------------------------
+    # State
+    # ------------------------------------------------------------------
+
+    def _load_state(self) -> Dict[str, Any]:
+        if self.state_path.exists():
+            try:
+                with open(self.state_path, 'r', encoding='utf-8') as f:
+                    state = json.load(f)
+                if state.get('version') == STATE_VERSION:
+                    return state
+            except Exception as e:
+                self.logger.warning(f"Rebuilding unreadable export state {self.state_path}: {e}")
+        return {'version': STATE_VERSION, 'columns': [], 'rows': {}}
+
+    def _csv_in_sync(self) -> bool:
+        """True if the CSV is exactly the file this exporter last wrote"""
+        if self.state.get('columns') != self.columns or self.state.get('encoding') != self.encoding:
+            return False
+        try:
+            stat = self.csv_path.stat()
+        except OSError:
+            return False
+        return stat.st_size == self.state.get('csv_size') and stat.st_mtime_ns == self.state.get('csv_mtime_ns')
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    def _csv_value(self, name: str, value: Any) -> str:
+        if value is None:
+            return ''
+        if name in self.list_columns and isinstance(value, (list, tuple, dict)):
+            return self.list_format(value)
+        return str(value)
+
+    def export(self, records: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        """Bring the CSV (and columnar parts) up to date with ``records``; returns counts"""
+        latest: Dict[str, Dict[str, Any]] = {}
+        for record in records:
+            key = record.get(self.key_field)
+            if key:
+                latest[str(key)] = record
+
+        previous = self.state.get('rows', {})
+        rows: Dict[str, List[str]] = {}
+        hashes: Dict[str, str] = {}
+        for key, record in latest.items():
+            values = [self._csv_value(name, record.get(name)) for name in self.columns]
+            rows[key] = values
+            hashes[key] = _row_hash(values)
+
+        new_keys = [key for key in rows if key not in previous]
+        changed_keys = [key for key in rows if key in previous and previous[key] != hashes[key]]
+        removed = len(previous.keys() - rows.keys())
+
+        rewrite = bool(changed_keys or removed) or not self._csv_in_sync()
+        if rewrite:
+            self._rewrite_csv(rows.values())
+        elif new_keys:
+            self._append_csv(rows[key] for key in new_keys)
+
+        delta_keys = new_keys + changed_keys
+        if self.columnar and delta_keys:
+            self._write_part([latest[key] for key in delta_keys])
+
+        stat = self.csv_path.stat()
+        self.state.update({
+            'columns': self.columns,
+            'encoding': self.encoding,
+            'key_field': self.key_field,
+            'rows': hashes,
+            'csv_size': stat.st_size,
+            'csv_mtime_ns': stat.st_mtime_ns,
+            'updated': datetime.now().isoformat(),
+        })
+        write_json_atomic(self.state_path, self.state)
+
+        counts = {'rows': len(rows), 'new': len(new_keys), 'changed': len(changed_keys),
+                  'removed': removed, 'rewritten': int(rewrite)}
+        self.logger.info(f"Exported {self.csv_path.name}: {counts['new']} new, {counts['changed']} changed, "
+                         f"{counts['rows']} rows ({'rewritten' if rewrite else 'appended'})")
+        return counts
+
+    def _rewrite_csv(self, rows: Iterable[List[str]]):
+        self.csv_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.csv_path.with_suffix(self.csv_path.suffix + '.tmp')
+        with open(temp_path, 'w', newline='', encoding=self.encoding) as f:
+            writer = csv.writer(f)
+            writer.writerow(self.columns)
+            writer.writerows(rows)
+        os.replace(temp_path, self.csv_path)
+
+    def _append_csv(self, rows: Iterable[List[str]]):
+        # Appending to a non-empty file does not repeat a utf-8-sig BOM
+        with open(self.csv_path, 'a', newline='', encoding=self.encoding) as f:
+            csv.writer(f).writerows(rows)
+
+    # ------------------------------------------------------------------
+    # Columnar parts
+    # ------------------------------------------------------------------
+
+    def _store_content(self, text: str) -> str:
+        ref = hashlib.sha1(text.encode('utf-8')).hexdigest()
+        path = self.table_dir / 'content' / ref[:2] / f"{ref}.txt"
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_suffix('.tmp')
+            temp_path.write_text(text, encoding='utf-8')
+            os.replace(temp_path, path)
+        return ref
+
+    def load_content(self, ref: str) -> str:
+        return (self.table_dir / 'content' / ref[:2] / f"{ref}.txt").read_text(encoding='utf-8')
+
+    @staticmethod
+    def _arrow_column(values: List[Any]):
+        try:
+            return pa.array(values)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # Mixed types: fall back to strings (JSON for lists/dicts)
+            return pa.array([None if value is None else value if isinstance(value, str)
+                             else json.dumps(value, ensure_ascii=False, default=str)
+                             for value in values], type=pa.string())
+
+    def _write_part(self, records: List[Dict[str, Any]]):
+        exported_at = datetime.now().isoformat()
+        columns: Dict[str, Any] = {}
+        for name in self.columns:
+            values = [record.get(name) for record in records]
+            if name in self.content_fields:
+                texts = ['' if value is None else str(value) for value in values]
+                columns[f"{name}_ref"] = pa.array([self._store_content(text) for text in texts], type=pa.string())
+                columns[f"{name}_length"] = pa.array([len(text) for text in texts], type=pa.int64())
+            else:
+                columns[name] = self._arrow_column(values)
+        columns['_exported_at'] = pa.array([exported_at] * len(records), type=pa.string())
+        table = pa.table(columns)
+
+        self.table_dir.mkdir(parents=True, exist_ok=True)
+        part_path = self.table_dir / f"part-{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}{COLUMNAR_SUFFIXES[self.columnar]}"
+        if self.columnar == 'arrow':
+            feather.write_feather(table, str(part_path), compression='zstd')
+        else:
+            pq.write_table(table, str(part_path), compression='zstd')
+
+    def read_columnar(self, resolve_content: bool = False):
+        """All part files as one pandas DataFrame, keeping the latest row per key"""
+        tables = []
+        for part_path in sorted(self.table_dir.glob('part-*')):
+            if part_path.suffix == '.parquet':
+                tables.append(pq.read_table(str(part_path)))
+            elif part_path.suffix == '.arrow':
+                tables.append(feather.read_table(str(part_path)))
+        if not tables:
+            return None
+        df = pa.concat_tables(tables, promote_options='default').to_pandas()
+        df = df.drop_duplicates(subset=[self.key_field], keep='last').reset_index(drop=True)
+        if resolve_content:
+            for name in self.content_fields:
+                df[name] = df[f"{name}_ref"].map(self.load_content)
+        return df
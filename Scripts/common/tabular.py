@@ -0,0 +1,491 @@
+#!/usr/bin/env python3
+"""
+Shared Excel/CSV attachment summarizer
+
+Reads workbooks with a streaming reader (calamine when installed, otherwise
+openpyxl in read-only mode) and CSV payloads in chunks, and builds a
+column-typed summary of every sheet in a single vectorized pass per chunk.
+CSV encoding and dialect are sniffed from a prefix (see csv_ingest). Row and
+output-size caps keep very large statistical workbooks bounded, and
+summaries are cached by payload hash so the same file is only read once.
+"""
+
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field, asdict, replace
+from io import BytesIO
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .csv_ingest import SNIFF_BYTES, iter_csv_chunks, sniff_csv
+from .lazy_import import is_installed, lazy_import
+
+# Imported on first use: most runs never open a spreadsheet
+pd = lazy_import('pandas', 'pip install pandas')
+PANDAS_AVAILABLE = is_installed('pandas')
+
+python_calamine = lazy_import('python_calamine')
+CALAMINE_AVAILABLE = is_installed('python_calamine')
+
+openpyxl = lazy_import('openpyxl', 'pip install openpyxl')
+OPENPYXL_AVAILABLE = is_installed('openpyxl')
+
+
+DEFAULT_MAX_ROWS = 200_000        # rows read per sheet before truncating
+DEFAULT_MAX_TEXT_BYTES = 200_000  # rendered summary size per file
+DEFAULT_CHUNK_ROWS = 20_000       # rows per vectorized pass
+DEFAULT_SAMPLE_ROWS = 10
+DEFAULT_CATEGORY_LIMIT = 50       # top values only for low-cardinality columns
+CACHE_VERSION = 1
+
+EXCEL_EXTENSIONS = {'.xlsx', '.xlsm', '.xls', '.xlsb', '.ods'}
+CSV_EXTENSIONS = {'.csv', '.txt', '.tsv'}
+
+
+@dataclass
+class SheetSummary:
+    """Column-typed summary of one sheet (or CSV file)"""
+    name: str
+    rows: int = 0
+    columns: List[str] = field(default_factory=list)
+    truncated: bool = False
+    numeric: Dict[str, Dict] = field(default_factory=dict)
+    text: Dict[str, Dict] = field(default_factory=dict)
+    dates: Dict[str, Dict] = field(default_factory=dict)
+    sample: List[List[str]] = field(default_factory=list)
+
+
+class _SheetAccumulator:
+    """Merges per-chunk vectorized aggregates into one sheet summary"""
+
+    def __init__(self, name: str, sample_rows: int, category_limit: int):
+        self.summary = SheetSummary(name=name)
+        self.sample_rows = sample_rows
+        self.category_limit = category_limit
+        self.kinds: Dict[str, str] = {}
+        self.numeric_stats = None
+        self.category_counts = None
+        self.text_non_null = None
+        self.high_cardinality: Dict[str, int] = {}
+        self.date_min = None
+        self.date_max = None
+
+    def _assign_kinds(self, df):
+        for col in df.select_dtypes(include=['number']).columns:
+            self.kinds.setdefault(col, 'numeric')
+        for col in df.select_dtypes(include=['datetime', 'datetimetz']).columns:
+            self.kinds.setdefault(col, 'date')
+        for col in df.columns:
+            self.kinds.setdefault(col, 'text')
+
+    def add(self, df):
+        if df.empty:
+            return
+
+        if not self.summary.columns:
+            self.summary.columns = [str(c) for c in df.columns]
+            sample = df.head(self.sample_rows).astype(str).replace(['nan', 'NaT', 'None', '<NA>'], '')
+            self.summary.sample = sample.values.tolist()
+
+        self.summary.rows += len(df)
+        self._assign_kinds(df)
+
+        numeric_cols = [c for c in df.columns if self.kinds.get(c) == 'numeric']
+        date_cols = [c for c in df.columns if self.kinds.get(c) == 'date']
+        text_cols = [c for c in df.columns if self.kinds.get(c) == 'text']
+
+        if numeric_cols:
+            num = df[numeric_cols].apply(pd.to_numeric, errors='coerce')
+            chunk_stats = pd.DataFrame({
+                'count': num.count(),
+                'sum': num.sum(),
+                'sumsq': (num * num).sum(),
+                'min': num.min(),
+                'max': num.max(),
+            })
+            if self.numeric_stats is None:
+                self.numeric_stats = chunk_stats
+            else:
+                prev = self.numeric_stats.reindex(self.numeric_stats.index.union(chunk_stats.index))
+                cur = chunk_stats.reindex(prev.index)
+                merged = prev[['count', 'sum', 'sumsq']].add(cur[['count', 'sum', 'sumsq']], fill_value=0)
+                merged['min'] = pd.concat([prev['min'], cur['min']], axis=1).min(axis=1)
+                merged['max'] = pd.concat([prev['max'], cur['max']], axis=1).max(axis=1)
+                self.numeric_stats = merged
+
+        if date_cols:
+            dates = df[date_cols].apply(pd.to_datetime, errors='coerce')
+            chunk_min, chunk_max = dates.min(), dates.max()
+            if self.date_min is None:
+                self.date_min, self.date_max = chunk_min, chunk_max
+            else:
+                self.date_min = pd.concat([self.date_min, chunk_min], axis=1).min(axis=1)
+                self.date_max = pd.concat([self.date_max, chunk_max], axis=1).max(axis=1)
+
+        if text_cols:
+            non_null = df[text_cols].count()
+            self.text_non_null = non_null if self.text_non_null is None else self.text_non_null.add(non_null, fill_value=0)
+
+            # One groupby over (column, value) pairs instead of a value_counts per column
+            tracked = [c for c in text_cols if c not in self.high_cardinality]
+            melted = df[tracked].melt(var_name='__column__', value_name='__value__').dropna() if tracked else None
+            if melted is not None and not melted.empty:
+                melted['__column__'] = melted['__column__'].astype(str)
+                melted['__value__'] = melted['__value__'].astype(str)
+                counts = melted.groupby(['__column__', '__value__'], sort=False).size()
+                if self.category_counts is None:
+                    self.category_counts = counts
+                else:
+                    self.category_counts = self.category_counts.add(counts, fill_value=0)
+                self._drop_high_cardinality()
+
+    def _drop_high_cardinality(self):
+        """Stop tracking value counts for columns with too many distinct values"""
+        uniques = self.category_counts.groupby(level=0).size()
+        too_many = uniques[uniques > self.category_limit]
+        if too_many.empty:
+            return
+        for col, n in too_many.items():
+            self.high_cardinality[col] = int(n)
+        keep = ~self.category_counts.index.get_level_values(0).isin(too_many.index)
+        self.category_counts = self.category_counts[keep]
+
+    def finish(self, truncated: bool) -> SheetSummary:
+        summary = self.summary
+        summary.truncated = truncated
+
+        if self.numeric_stats is not None:
+            stats = self.numeric_stats
+            count = stats['count'].replace(0, float('nan'))
+            mean = stats['sum'] / count
+            variance = (stats['sumsq'] - count * mean * mean) / (count - 1)
+            std = variance.clip(lower=0) ** 0.5
+            for col in stats.index:
+                if not stats.at[col, 'count']:
+                    continue
+                summary.numeric[str(col)] = {
+                    'count': int(stats.at[col, 'count']),
+                    'mean': _round(mean[col]),
+                    'std': _round(std[col]),
+                    'min': _round(stats.at[col, 'min']),
+                    'max': _round(stats.at[col, 'max']),
+                }
+
+        if self.date_min is not None:
+            for col in self.date_min.index:
+                if pd.isna(self.date_min[col]):
+                    continue
+                summary.dates[str(col)] = {
+                    'min': str(self.date_min[col]),
+                    'max': str(self.date_max[col]),
+                }
+
+        if self.text_non_null is not None:
+            top_values: Dict[str, List] = {}
+            if self.category_counts is not None and not self.category_counts.empty:
+                ordered = self.category_counts.sort_values(ascending=False, kind='stable')
+                for (col, value), n in ordered.groupby(level=0, sort=False).head(10).items():
+                    top_values.setdefault(col, []).append([value, int(n)])
+                uniques = self.category_counts.groupby(level=0).size()
+            else:
+                uniques = {}
+            for col, non_null in self.text_non_null.items():
+                col = str(col)
+                if col in self.high_cardinality:
+                    unique = f">{self.category_limit}"
+                else:
+                    unique = int(uniques.get(col, 0))
+                summary.text[col] = {
+                    'non_null': int(non_null),
+                    'unique': unique,
+                    'top': top_values.get(col, []),
+                }
+
+        return summary
+
+
+def _round(value):
+    if value is None or pd.isna(value):
+        return None
+    return round(float(value), 6)
+
+
+def _dedupe_header(values) -> List[str]:
+    header, seen = [], {}
+    for i, value in enumerate(values):
+        name = str(value).strip() if value is not None and str(value).strip() else f"Unnamed: {i}"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        header.append(name)
+    return header
+
+
+class TabularExtractor:
+    """Streaming Excel/CSV reader that emits cached, column-typed summaries"""
+
+    def __init__(self, cache_dir: Optional[Path] = None,
+                 max_rows: int = DEFAULT_MAX_ROWS,
+                 max_text_bytes: int = DEFAULT_MAX_TEXT_BYTES,
+                 chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                 sample_rows: int = DEFAULT_SAMPLE_ROWS,
+                 category_limit: int = DEFAULT_CATEGORY_LIMIT,
+                 logger: Optional[logging.Logger] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_rows = max_rows
+        self.max_text_bytes = max_text_bytes
+        self.chunk_rows = chunk_rows
+        self.sample_rows = sample_rows
+        self.category_limit = category_limit
+        self.logger = logger or logging.getLogger(__name__)
+        self._memory_cache: Dict[str, List[SheetSummary]] = {}
+
+    @staticmethod
+    def is_available() -> bool:
+        return PANDAS_AVAILABLE
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def summarize_bytes(self, payload: bytes, filename: str,
+                        encoding: Optional[str] = None) -> List[SheetSummary]:
+        """Summarize an Excel or CSV payload, reusing a cached result when possible"""
+        if not PANDAS_AVAILABLE:
+            self.logger.warning("pandas not available - tabular extraction disabled")
+            return []
+
+        cache_key = self._cache_key(payload, encoding)
+        cached = self._load_cached(cache_key)
+        if cached is not None:
+            self.logger.debug(f"Tabular cache hit for {filename}")
+            return cached
+
+        extension = Path(filename).suffix.lower()
+        if extension in CSV_EXTENSIONS:
+            summaries = [self._summarize_csv(payload, encoding, extension)]
+        else:
+            summaries = self._summarize_workbook(payload, extension)
+
+        summaries = [s for s in summaries if s.rows or s.columns]
+        self._store_cached(cache_key, summaries)
+        return summaries
+
+    def summarize_file(self, file_path, encoding: Optional[str] = None) -> List[SheetSummary]:
+        """Summarize a workbook or CSV already on disk"""
+        path = Path(file_path)
+        return self.summarize_bytes(path.read_bytes(), path.name, encoding=encoding)
+
+    def extract_text(self, payload: bytes, filename: str,
+                     encoding: Optional[str] = None, csv_title: str = "CSV Data") -> str:
+        """Summarize a payload and render every sheet as LLM-friendly text"""
+        summaries = self.summarize_bytes(payload, filename, encoding=encoding)
+        if Path(filename).suffix.lower() in CSV_EXTENSIONS:
+            # Copies: the summaries may be shared with the in-memory cache
+            summaries = [replace(summary, name=csv_title) for summary in summaries]
+        return self.render_text(summaries)
+
+    def render_text(self, summaries: List[SheetSummary]) -> str:
+        parts, size = [], 0
+        for summary in summaries:
+            text = self.render_sheet(summary)
+            encoded_len = len(text.encode('utf-8'))
+            if size + encoded_len > self.max_text_bytes:
+                remaining = self.max_text_bytes - size
+                if remaining > 200:
+                    parts.append(text.encode('utf-8')[:remaining].decode('utf-8', errors='ignore'))
+                parts.append(f"[Output truncated at {self.max_text_bytes} bytes]")
+                break
+            parts.append(text)
+            size += encoded_len
+        return '\n\n'.join(parts)
+
+    @staticmethod
+    def render_sheet(summary: SheetSummary) -> str:
+        lines = [f"DATA SHEET: {summary.name}"]
+        dimensions = f"Dimensions: {summary.rows} rows × {len(summary.columns)} columns"
+        if summary.truncated:
+            dimensions += " (row limit reached - statistics cover the rows read)"
+        lines.append(dimensions)
+        lines.append(f"Columns: {', '.join(summary.columns)}")
+
+        if summary.numeric:
+            lines.append(f"Numeric columns: {', '.join(summary.numeric)}")
+        if summary.text:
+            lines.append(f"Text columns: {', '.join(summary.text)}")
+        if summary.dates:
+            lines.append(f"Date columns: {', '.join(summary.dates)}")
+
+        if summary.sample:
+            lines.append(f"Sample data (first {len(summary.sample)} rows):")
+            sample_df = pd.DataFrame(summary.sample, columns=summary.columns[:len(summary.sample[0])])
+            lines.append(sample_df.to_string(index=False))
+
+        if summary.numeric:
+            lines.append("Summary statistics for numeric columns:")
+            stats_df = pd.DataFrame(summary.numeric).reindex(['count', 'mean', 'std', 'min', 'max'])
+            lines.append(stats_df.to_string())
+
+        for col, info in summary.dates.items():
+            lines.append(f"Date range in '{col}': {info['min']} to {info['max']}")
+
+        for col, info in summary.text.items():
+            if info['top']:
+                lines.append(f"Top values in '{col}':")
+                lines.append('\n'.join(f"{value}    {count}" for value, count in info['top']))
+
+        return '\n'.join(lines)
+
+    # ------------------------------------------------------------------
+    # Readers
+    # ------------------------------------------------------------------
+
+    def _summarize_csv(self, payload: bytes, encoding: Optional[str], extension: str) -> SheetSummary:
+        acc = _SheetAccumulator("CSV Data", self.sample_rows, self.category_limit)
+        # Encoding and dialect come from a bounded prefix; the payload is parsed once
+        fmt = sniff_csv(payload[:SNIFF_BYTES])
+        if encoding:
+            fmt.encoding = encoding
+        if extension == '.tsv':
+            fmt.delimiter = '\t'
+        rows = 0
+        truncated = False
+        for chunk in iter_csv_chunks(payload, fmt=fmt, chunk_rows=self.chunk_rows, max_rows=self.max_rows + 1):
+            if rows + len(chunk) > self.max_rows:
+                chunk = chunk.iloc[:self.max_rows - rows]
+                truncated = True
+            rows += len(chunk)
+            acc.add(chunk)
+            if truncated:
+                break
+        return acc.finish(truncated)
+
+    def _summarize_workbook(self, payload: bytes, extension: str) -> List[SheetSummary]:
+        summaries = []
+        for sheet_name, rows in self._iter_sheet_rows(payload, extension):
+            try:
+                acc = _SheetAccumulator(str(sheet_name), self.sample_rows, self.category_limit)
+                truncated = False
+                for frame, hit_limit in self._rows_to_frames(rows):
+                    acc.add(frame)
+                    truncated = truncated or hit_limit
+                summaries.append(acc.finish(truncated))
+            except Exception as e:
+                self.logger.warning(f"Error summarizing sheet '{sheet_name}': {e}")
+        return summaries
+
+    def _iter_sheet_rows(self, payload: bytes, extension: str) -> Iterator[Tuple[str, Iterator]]:
+        """Yield (sheet name, row iterator) using the fastest available streaming reader"""
+        if CALAMINE_AVAILABLE:
+            yielded = False
+            try:
+                workbook = python_calamine.CalamineWorkbook.from_filelike(BytesIO(payload))
+                for name in workbook.sheet_names:
+                    sheet = workbook.get_sheet_by_name(name)
+                    if hasattr(sheet, 'iter_rows'):
+                        rows = sheet.iter_rows()
+                    else:
+                        rows = iter(sheet.to_python(nrows=self.max_rows + 1))
+                    yielded = True
+                    yield name, rows
+                return
+            except Exception as e:
+                if yielded:
+                    # Falling back now would summarize the sheets already read a second time
+                    self.logger.warning(f"calamine failed partway through the workbook, skipping remaining sheets: {e}")
+                    return
+                self.logger.debug(f"calamine could not read workbook, falling back: {e}")
+
+        if OPENPYXL_AVAILABLE and extension in ('.xlsx', '.xlsm'):
+            workbook = openpyxl.load_workbook(BytesIO(payload), read_only=True, data_only=True)
+            try:
+                for worksheet in workbook.worksheets:
+                    yield worksheet.title, worksheet.iter_rows(values_only=True)
+            finally:
+                workbook.close()
+            return
+
+        # Legacy .xls without calamine - pandas/xlrd, still row-capped
+        sheets = pd.read_excel(BytesIO(payload), sheet_name=None, header=None, nrows=self.max_rows + 1)
+        for name, df in sheets.items():
+            yield name, df.itertuples(index=False, name=None)
+
+    def _rows_to_frames(self, rows: Iterator) -> Iterator[Tuple['pd.DataFrame', bool]]:
+        """Turn a row iterator into typed DataFrame chunks, header taken from the first non-empty row"""
+        header = None
+        buffer = []
+        read = 0
+        for row in rows:
+            if header is None:
+                if row is None or all(v is None or str(v).strip() == '' for v in row):
+                    continue
+                header = _dedupe_header(row)
+                continue
+
+            if read >= self.max_rows:
+                if buffer:
+                    yield self._frame(buffer, header), True
+                else:
+                    yield pd.DataFrame(columns=header), True
+                return
+
+            row = list(row[:len(header)]) + [None] * (len(header) - len(row))
+            buffer.append(row)
+            read += 1
+            if len(buffer) >= self.chunk_rows:
+                yield self._frame(buffer, header), False
+                buffer = []
+
+        if buffer:
+            yield self._frame(buffer, header), False
+
+    @staticmethod
+    def _frame(rows: List[List], header: List[str]):
+        df = pd.DataFrame(rows, columns=header)
+        # NaN rather than None: replace('', None) pad-fills from the row above on pandas 1.x
+        df = df.replace('', float('nan')).infer_objects()
+        return df.dropna(how='all')
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+
+    def _cache_key(self, payload: bytes, encoding: Optional[str]) -> str:
+        digest = hashlib.sha256(payload).hexdigest()
+        params = f"{CACHE_VERSION}|{self.max_rows}|{self.sample_rows}|{self.category_limit}|{encoding}"
+        return hashlib.sha256(f"{digest}|{params}".encode('utf-8')).hexdigest()
+
+    def _load_cached(self, key: str) -> Optional[List[SheetSummary]]:
+        if key in self._memory_cache:
+            return [SheetSummary(**asdict(s)) for s in self._memory_cache[key]]
+        if not self.cache_dir:
+            return None
+        cache_file = self.cache_dir / f"{key}.json"
+        if not cache_file.exists():
+            return None
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                summaries = [SheetSummary(**item) for item in json.load(f)]
+            self._memory_cache[key] = summaries
+            return [SheetSummary(**asdict(s)) for s in summaries]
+        except Exception as e:
+            self.logger.debug(f"Ignoring unreadable tabular cache entry {cache_file}: {e}")
+            return None
+
+    def _store_cached(self, key: str, summaries: List[SheetSummary]):
+        self._memory_cache[key] = summaries
+        if not self.cache_dir:
+            return
+        cache_file = self.cache_dir / f"{key}.json"
+        try:
+            tmp_file = cache_file.with_suffix('.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump([asdict(s) for s in summaries], f, ensure_ascii=False, default=str)
+            tmp_file.replace(cache_file)
+        except Exception as e:
+            self.logger.debug(f"Could not write tabular cache entry {cache_file}: {e}")
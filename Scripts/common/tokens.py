@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Shared token counting
+
+Scrapers that report ``token_count`` used to build a tiktoken encoding in
+every scraper instance and encode each text (whole PDFs included) one at a
+time. ``TokenCounter`` instead:
+
+  * loads each encoding once per process (tiktoken itself is imported lazily)
+  * counts many texts with one ``encode_ordinary_batch`` call, which encodes
+    on tiktoken's thread pool
+  * caches counts by content hash, optionally on disk, so unchanged texts
+    are never re-encoded
+  * offers ``approximate`` (characters / 4, no encoding at all) for gating
+    decisions such as "is this worth chunking / sending"
+
+Counting uses ``encode_ordinary``, so text that happens to contain special
+token markers (``<|endoftext|>``) is counted as plain text instead of
+raising.
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+from .lazy_import import is_installed, lazy_import
+
+tiktoken = lazy_import('tiktoken', 'pip install tiktoken')
+TIKTOKEN_AVAILABLE = is_installed('tiktoken')
+
+DEFAULT_ENCODING = "cl100k_base"  # GPT-4 tokenizer
+APPROX_CHARS_PER_TOKEN = 4.0
+CACHE_VERSION = 1
+
+
+@functools.lru_cache(maxsize=None)
+def get_encoding(name: str = DEFAULT_ENCODING):
+    """The tiktoken encoding, loaded once per process"""
+    return tiktoken.get_encoding(name)
+
+
+def approximate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English prose)"""
+    if not text:
+        return 0
+    return max(1, int(len(text) / APPROX_CHARS_PER_TOKEN + 0.5))
+
+
+def _fallback_count(text: str) -> int:
+    # What the scrapers used when tiktoken failed: words * 1.3
+    return int(len(text.split()) * 1.3)
+
+
+class TokenCounter:
+    """Batched, hash-cached token counts for one encoding"""
+
+    def __init__(self, encoding_name: str = DEFAULT_ENCODING,
+                 cache_path: Optional[Union[str, Path]] = None,
+                 max_cache_entries: int = 100_000,
+                 num_threads: int = 8,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            cache_path: JSON file persisting hash -> count between runs (optional)
+            max_cache_entries: oldest entries are dropped beyond this
+            num_threads: tiktoken threads for batch encoding
+        """
+        self.encoding_name = encoding_name
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.max_cache_entries = max_cache_entries
+        self.num_threads = num_threads
+        self.logger = logger or logging.getLogger(__name__)
+
+        self._cache: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.hits = 0
+        self.encoded = 0
+        self._load_cache()
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+
+    def _digest(self, text: str) -> str:
+        return hashlib.sha1(text.encode('utf-8', errors='replace')).hexdigest()
+
+    def _load_cache(self):
+        if not self.cache_path or not self.cache_path.exists():
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == CACHE_VERSION and data.get('encoding') == self.encoding_name:
+                self._cache = data.get('counts', {})
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable token cache {self.cache_path}: {e}")
+
+    def save(self):
+        """Persist the count cache (no-op without a cache path or new counts)"""
+        if not self.cache_path or not self._dirty:
+            return
+        with self._lock:
+            if len(self._cache) > self.max_cache_entries:
+                keep = list(self._cache.items())[-self.max_cache_entries:]
+                self._cache = dict(keep)
+            data = {'version': CACHE_VERSION, 'encoding': self.encoding_name, 'counts': self._cache}
+            self._dirty = False
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.cache_path.with_suffix(self.cache_path.suffix + '.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(temp_path, self.cache_path)
+        except Exception as e:
+            self.logger.warning(f"Failed to write token cache {self.cache_path}: {e}")
+
+    # ------------------------------------------------------------------
+    # Counting
+    # ------------------------------------------------------------------
+
+    def count_many(self, texts: Iterable[Optional[str]]) -> List[int]:
+        """Token counts for many texts, encoding only uncached ones in a single batch"""
+        texts = [str(text) if text else '' for text in texts]
+        digests = [self._digest(text) if text else '' for text in texts]
+
+        missing: Dict[str, str] = {}
+        with self._lock:
+            for text, digest in zip(texts, digests):
+                if digest and digest not in self._cache and digest not in missing:
+                    missing[digest] = text
+            self.hits += sum(1 for digest in digests if digest and digest not in missing)
+
+        if missing:
+            counts = self._encode_batch(list(missing.values()))
+            with self._lock:
+                self._cache.update(zip(missing.keys(), counts))
+                self.encoded += len(missing)
+                self._dirty = True
+
+        with self._lock:
+            return [self._cache.get(digest, 0) if digest else 0 for digest in digests]
+
+    def count(self, text: Optional[str]) -> int:
+        return self.count_many([text])[0]
+
+    def _encode_batch(self, texts: List[str]) -> List[int]:
+        if TIKTOKEN_AVAILABLE:
+            try:
+                encoding = get_encoding(self.encoding_name)
+                tokens = encoding.encode_ordinary_batch(texts, num_threads=self.num_threads)
+                return [len(token_ids) for token_ids in tokens]
+            except Exception as e:
+                self.logger.warning(f"tiktoken batch encoding failed ({e}); using word-count estimates")
+        return [_fallback_count(text) for text in texts]
+
+    @staticmethod
+    def approximate(text: Optional[str]) -> int:
+        return approximate_tokens(str(text) if text else '')
+
+
+_shared: Dict[str, TokenCounter] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_counter(encoding_name: str = DEFAULT_ENCODING) -> TokenCounter:
+    """A process-wide in-memory counter for the encoding"""
+    with _shared_lock:
+        if encoding_name not in _shared:
+            _shared[encoding_name] = TokenCounter(encoding_name)
+        return _shared[encoding_name]
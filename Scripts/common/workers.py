@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Per-worker resources and lock-free counters for thread pools
+
+Enrichment stages run on a ``ThreadPoolExecutor`` and used to either open a
+fresh Chrome per item (``with setup_driver() as driver`` inside the task) or
+share one ``requests.Session`` and one stats dict across all threads.
+
+``PerThread`` gives every worker thread its own resource, created on first
+use and reused for the rest of the run, and closes them all at the end:
+
+    drivers = PerThread(setup_driver)            # a context manager factory
+    sessions = PerThread(setup_requests_session)
+    ...
+    driver = drivers.get()                       # this worker's browser
+    ...
+    drivers.close()                              # quit every worker's browser
+
+``ThreadCounters`` replaces ``stats['errors'] += 1`` from several threads
+(a read-modify-write that can lose updates) with per-thread dicts that are
+only summed when read.
+"""
+
+import threading
+from contextlib import ExitStack
+from typing import Any, Callable, Dict, List
+
+
+class PerThread:
+    """One resource per thread, created lazily by ``factory`` and closed together"""
+
+    def __init__(self, factory: Callable[[], Any]):
+        """
+        Args:
+            factory: creates the resource; if it returns a context manager
+                (e.g. a ``@contextmanager`` driver factory or a requests
+                Session) it is entered, and exited by ``close``
+        """
+        self._factory = factory
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._stack = ExitStack()
+        self.created = 0
+
+    def get(self) -> Any:
+        resource = getattr(self._local, 'resource', None)
+        if resource is None:
+            resource = self._factory()
+            if hasattr(resource, '__enter__') and hasattr(resource, '__exit__'):
+                with self._lock:
+                    resource = self._stack.enter_context(resource)
+            self._local.resource = resource
+            self.created += 1
+        return resource
+
+    def close(self):
+        """Close every thread's resource (call once the pool has finished)"""
+        with self._lock:
+            self._stack.close()
+            self._stack = ExitStack()
+        self._local = threading.local()
+
+
+class ThreadCounters:
+    """Counters each thread increments in its own dict; totals are summed on read"""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._all: List[Dict[str, int]] = []
+
+    def _counts(self) -> Dict[str, int]:
+        counts = getattr(self._local, 'counts', None)
+        if counts is None:
+            counts = self._local.counts = {}
+            with self._lock:
+                self._all.append(counts)
+        return counts
+
+    def add(self, name: str, amount: int = 1):
+        counts = self._counts()
+        counts[name] = counts.get(name, 0) + amount
+
+    def totals(self) -> Dict[str, int]:
+        with self._lock:
+            # dict() copies in one step, so a concurrent add cannot break the iteration
+            snapshots = [dict(counts) for counts in self._all]
+        totals: Dict[str, int] = {}
+        for counts in snapshots:
+            for name, value in counts.items():
+                totals[name] = totals.get(name, 0) + value
+        return totals
+
+    def __getitem__(self, name: str) -> int:
+        return self.totals().get(name, 0)
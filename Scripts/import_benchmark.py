@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Scraper cold-start benchmark
+
+Imports every scraper script in a fresh interpreter (the way the orchestrator
+starts them, from the regulator folder, but without running ``main``) and
+records how long the import took and which top-level modules dominated it,
+using ``python -X importtime``. Each run is appended to
+logs/import_benchmark.jsonl and compared with the previous run, so a scraper
+whose start-up cost jumps (e.g. a new eager pandas import) is flagged.
+
+    python import_benchmark.py                  # all regulators
+    python import_benchmark.py --only ASIC RBA  # some folders
+    python import_benchmark.py --repeat 3       # best of 3 per script
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+BASE_DIR = Path(__file__).resolve().parent
+HISTORY_FILE = BASE_DIR / "logs" / "import_benchmark.jsonl"
+SKIP_FOLDERS = {'common', 'logs', '__pycache__'}
+
+# Flag a script when it got this much slower (both must hold)
+REGRESSION_RATIO = 1.25
+REGRESSION_SECONDS = 0.2
+
+# Loads the script under a non-__main__ name so its main() does not run
+IMPORT_SNIPPET = """
+import importlib.util, sys, time
+started = time.perf_counter()
+spec = importlib.util.spec_from_file_location('scraper_under_benchmark', sys.argv[1])
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+print(f'IMPORT_SECONDS={time.perf_counter() - started:.4f}')
+"""
+
+
+def find_scripts(only: Optional[List[str]] = None) -> List[Path]:
+    scripts = []
+    for folder in sorted(BASE_DIR.iterdir()):
+        if not folder.is_dir() or folder.name in SKIP_FOLDERS or folder.name.startswith('.'):
+            continue
+        if only and folder.name not in only:
+            continue
+        scripts.extend(sorted(folder.glob("*.py")))
+    return scripts
+
+
+def parse_importtime(stderr: str, top: int = 5) -> List[Dict]:
+    """Heaviest top-level imports from -X importtime output"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        name = parts[2]
+        # Nested imports are indented under their importer
+        if name.startswith('  ') or name.strip() in ('', 'package'):
+            continue
+        entries.append({'module': name.strip(), 'seconds': int(parts[1]) / 1e6})
+    entries.sort(key=lambda entry: entry['seconds'], reverse=True)
+    return entries[:top]
+
+
+def benchmark_script(script: Path, timeout: float = 120) -> Dict:
+    """Import one script in a fresh interpreter"""
+    result = {'script': f"{script.parent.name}/{script.name}", 'ok': False}
+    started = time.perf_counter()
+    try:
+        process = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', IMPORT_SNIPPET, script.name],
+            cwd=script.parent, capture_output=True, text=True, timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        result['error'] = f"timed out after {timeout}s"
+        return result
+
+    result['wall_seconds'] = round(time.perf_counter() - started, 4)
+    for line in process.stdout.splitlines():
+        if line.startswith('IMPORT_SECONDS='):
+            result['import_seconds'] = float(line.split('=', 1)[1])
+            result['ok'] = True
+    if not result['ok']:
+        errors = [line for line in process.stderr.splitlines() if not line.startswith('import time:')]
+        result['error'] = (errors[-1] if errors else f"exit code {process.returncode}")[:300]
+    result['heaviest'] = parse_importtime(process.stderr)
+    return result
+
+
+def load_previous_run() -> Dict[str, Dict]:
+    if not HISTORY_FILE.exists():
+        return {}
+    last_line = None
+    with open(HISTORY_FILE, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                last_line = line
+    if not last_line:
+        return {}
+    try:
+        return {entry['script']: entry for entry in json.loads(last_line).get('results', [])}
+    except (ValueError, KeyError):
+        return {}
+
+
+def find_regressions(results: List[Dict], previous: Dict[str, Dict]) -> List[str]:
+    regressions = []
+    for entry in results:
+        before = previous.get(entry['script'], {}).get('import_seconds')
+        after = entry.get('import_seconds')
+        if before is None or after is None:
+            continue
+        if after >= before * REGRESSION_RATIO and after - before >= REGRESSION_SECONDS:
+            regressions.append(f"{entry['script']}: {before:.2f}s -> {after:.2f}s")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure scraper import (cold-start) time")
+    parser.add_argument('--only', nargs='+', help='regulator folders to benchmark')
+    parser.add_argument('--repeat', type=int, default=1, help='imports per script; the fastest is kept')
+    parser.add_argument('--no-save', action='store_true', help='do not append to the history file')
+    args = parser.parse_args()
+
+    previous = load_previous_run()
+    results = []
+    for script in find_scripts(args.only):
+        runs = [benchmark_script(script) for _ in range(max(1, args.repeat))]
+        successful = [run for run in runs if run['ok']]
+        best = min(successful, key=lambda run: run['import_seconds']) if successful else runs[-1]
+        results.append(best)
+
+        if best['ok']:
+            heaviest = ', '.join(f"{entry['module']} {entry['seconds']:.2f}s" for entry in best['heaviest'][:3])
+            print(f"{best['import_seconds']:7.2f}s  {best['script']}  ({heaviest})")
+        else:
+            print(f"  error   {best['script']}  {best.get('error', '')}")
+
+    timed = [entry['import_seconds'] for entry in results if entry['ok']]
+    print(f"\n{len(timed)}/{len(results)} scripts imported, total {sum(timed):.1f}s")
+
+    regressions = find_regressions(results, previous)
+    if regressions:
+        print("\nImport time regressions since the previous run:")
+        for line in regressions:
+            print(f"  {line}")
+
+    if not args.no_save:
+        HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(HISTORY_FILE, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({
+                'timestamp': datetime.now().isoformat(),
+                'python': sys.version.split()[0],
+                'results': results,
+            }) + '\n')
+        print(f"\nSaved to {HISTORY_FILE}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
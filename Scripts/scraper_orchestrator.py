@@ -35,6 +35,9 @@ class ComprehensiveScraperOrchestrator:
         self.setup_logging()
         self.active_processes = []
         
+        # Seconds a timed-out scraper gets after SIGTERM to write its checkpoint
+        self.termination_grace = 15
+        
         # Default timeouts for different types of scrapers
         self.default_timeouts = {
             'standard': 300,      # 5 minutes - most scrapers
@@ -120,6 +123,10 @@ class ComprehensiveScraperOrchestrator:
                         for key in ['data', 'records', 'items', 'results', 'articles', 'news', 'releases', 'entries']:
                             if key in data and isinstance(data[key], list):
                                 return len(data[key])
+                        # Segment store manifests carry the total in their metadata
+                        metadata = data.get('metadata')
+                        if isinstance(metadata, dict) and isinstance(metadata.get('total_count'), int):
+                            return metadata['total_count']
                         # If no common key found, count the dict keys
                         return len(data)
                     else:
@@ -267,6 +274,7 @@ class ComprehensiveScraperOrchestrator:
             'PYTHONUNBUFFERED': '1',  # Ensure real-time output
             'PYTHONIOENCODING': 'utf-8',  # Handle encoding issues
             'DISPLAY': ':0',  # WSL display setting (if needed)
+            'SCRAPER_RESUME': '1',  # Continue from the checkpoint of a previous timed-out run
         })
         
         process = None
@@ -357,9 +365,13 @@ class ComprehensiveScraperOrchestrator:
                 
                 # Kill the process and all its children (WSL-compatible)
                 try:
-                    # In WSL/Linux, use process group
+                    # In WSL/Linux, use process group. SIGTERM first so scrapers
+                    # with checkpoints can save progress for the next (resumed) run
                     os.killpg(os.getpgid(process.pid), signal.SIGTERM)
-                    time.sleep(2)
+                    try:
+                        process.communicate(timeout=self.termination_grace)
+                    except subprocess.TimeoutExpired:
+                        pass
                     try:
                         os.killpg(os.getpgid(process.pid), signal.SIGKILL)
                     except:
@@ -646,6 +658,17 @@ DETAILED RESULTS:
         
         self.logger.info("✅ Final cleanup completed")
     
+    def build_corpus_snapshot(self) -> bool:
+        """Refresh the columnar snapshot of all scraper outputs (only changed sources are re-read)"""
+        try:
+            from common.corpus_snapshot import CorpusSnapshot
+            counts = CorpusSnapshot(scripts_root=self.base_directory, logger=self.logger).build()
+            self.logger.info(f"🗄️ Corpus snapshot refreshed: {counts['rebuilt']} sources rebuilt, {counts['rows']} records")
+            return True
+        except Exception as e:
+            self.logger.warning(f"⚠️ Corpus snapshot failed: {e}")
+            return False
+    
     def get_default_regulators(self) -> List[Tuple]:
         """Get default regulator configurations"""
         return [
@@ -696,12 +719,8 @@ DETAILED RESULTS:
             # New Zealand Regulators
            # ("RBNZ News and Events", "RBNZ", ["rbnz_news_and_events_scrape.py"], 480, "complex"),  
             ("MBIE", "MBIE", None, 300, "standard"),
-            ("FMA Articles", "FMA", ["fma_articles_scrape.py"], 300, "standard"),
-            ("FMA Media Releases", "FMA", ["fma_media_releases_scrape.py"], 300, "standard"),
-            ("FMA Speeches", "FMA", ["fma_speeches_scrape.py"], 300, "standard"),
-            ("FMA Guidance", "FMA", ["fma_guidance_scrape.py"], 300, "standard"),
-            ("FMA Reports", "FMA", ["fma_reports_scrape.py"], 300, "standard"),
-            ("FMA Opinions", "FMA", ["fma_opinions_scrape.py"], 300, "standard"),
+            # All six FMA library sections in one process sharing one session and host budget
+            ("FMA Library", "FMA", ["fma_all_sections_scrape.py"], 1800, "heavy"),
             ("COMCOMNZ News", "COMCOMNZ", ["comcom_all_news_scrape.py"], 300, "standard"),
             ("TREASURYNZ News", "TREASURYNZ", ["treasuryNZ_news_scrape.py"], 900, "heavy"),
             ("RBNZ News", "RBNZ", ["rbnz_news_scrape.py"], 300, "standard"),
@@ -883,6 +902,7 @@ Examples:
   %(prog)s --dry-run                         # Test configuration without running
   %(prog)s --base-dir /path/to/scripts       # Use custom base directory
   %(prog)s --timeout-multiplier 2.0          # Double all timeouts
+  %(prog)s --snapshot                        # Refresh the corpus snapshot after scraping
         """
     )
     
@@ -902,6 +922,8 @@ Examples:
                        help='Run only scrapers in specified categories (can be repeated)')
     parser.add_argument('--timeout-multiplier', type=float, default=1.0,
                        help='Multiply all timeouts by this factor (default: 1.0)')
+    parser.add_argument('--snapshot', action='store_true',
+                       help='Refresh the columnar corpus snapshot (Scripts/snapshot) after scraping')
     
     # Logging and notification options
     parser.add_argument('--verbose', '-v', action='store_true', 
@@ -1011,6 +1033,10 @@ def main():
             dry_run=args.dry_run
         )
         
+        # Nightly compaction of all outputs into the columnar snapshot
+        if args.snapshot and not args.dry_run:
+            orchestrator.build_corpus_snapshot()
+        
         # Log final exit information
         exit_messages = {
             0: "✅ SUCCESS - All scrapers completed successfully or with minor issues",